@@ -241,6 +241,8 @@ def load_model():
                 dtype=dtype,
                 trust_remote_code=kwargs["trust_remote_code"],
                 request_logger=request_logger,
+                max_batch_size=kwargs.get("max_batch_size", None),
+                max_batch_latency_ms=kwargs.get("max_batch_latency_ms", 5.0),
             )
         else:
             # Convert dtype from string to torch dtype. Default to float32
@@ -252,6 +254,17 @@ def load_model():
                 args.predictor_protocol,
                 args.predictor_use_ssl,
                 args.predictor_request_timeout_seconds,
+                args.predictor_grpc_raw_inputs,
+                args.predictor_http2,
+                args.predictor_max_connections,
+                args.predictor_max_keepalive_connections,
+                args.predictor_keepalive_expiry_seconds,
+                args.predictor_pool_timeout_seconds,
+                args.predictor_grpc_channels,
+                args.predictor_grpc_channel_selection,
+                args.predictor_grpc_dns_load_balancing,
+                args.predictor_grpc_channel_max_age_seconds,
+                args.predictor_hedging_percentile,
             )
             logger.info(f"Loading encoder model for task '{task.name}' in {dtype}")
             model = HuggingfaceEncoderModel(
@@ -13,15 +13,19 @@
 # limitations under the License.
 
 import asyncio
+import copy
 import pathlib
 import queue
 import time
+from collections import deque
 from threading import Thread
 from typing import (
     Any,
     AsyncIterator,
+    Deque,
     Dict,
     Iterable,
+    List,
     Optional,
     TypedDict,
     Union,
@@ -77,6 +81,23 @@ class _GenerateRequest(TypedDict):
     loop: asyncio.AbstractEventLoop
 
 
+def _pad_and_concat(
+    tensors: List[torch.Tensor], pad_value: int, padding_side: str
+) -> torch.Tensor:
+    """
+    Pad the 2D tensors to the same sequence length and concatenate them along the batch dimension.
+    """
+    max_length = max(tensor.shape[-1] for tensor in tensors)
+    padded = []
+    for tensor in tensors:
+        padding = max_length - tensor.shape[-1]
+        if padding > 0:
+            pad = (padding, 0) if padding_side == "left" else (0, padding)
+            tensor = torch.nn.functional.pad(tensor, pad, value=pad_value)
+        padded.append(tensor)
+    return torch.cat(padded, dim=0)
+
+
 class CompletionStreamer:
     def __init__(
         self,
@@ -138,6 +159,8 @@ class HuggingfaceGenerativeModel(
     _model: PreTrainedModel
     _device: torch.device
     _request_queue: queue.Queue[Optional[_GenerateRequest]]
+    max_batch_size: int
+    max_batch_latency_ms: float
 
     def __init__(
         self,
@@ -153,6 +176,8 @@ class HuggingfaceGenerativeModel(
         trust_remote_code: bool = False,
         system_fingerprint: Optional[str] = None,
         request_logger: Optional[RequestLogger] = None,
+        max_batch_size: Optional[int] = None,
+        max_batch_latency_ms: float = 5.0,
     ):
         super().__init__(name)
         self.model_config = model_config
@@ -167,6 +192,10 @@ class HuggingfaceGenerativeModel(
         self._device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self._request_queue = queue.Queue()
         self.request_logger = request_logger
+        # Non-streaming requests with the same generation parameters that are queued within
+        # max_batch_latency_ms are generated together, up to max_batch_size sequences.
+        self.max_batch_size = max_batch_size or 1
+        self.max_batch_latency_ms = max_batch_latency_ms
 
         if model_config:
             self.model_config = model_config
@@ -320,20 +349,151 @@ class HuggingfaceGenerativeModel(
             )
             queue_put(outputs)
 
+    def _handle_batch(self, batch: List[_GenerateRequest]):
+        """
+        Handle multiple non-streaming generation requests with the same generation config
+        in a single generate call. The batch generates up to the largest max_new_tokens of the
+        requests and the output of each request is truncated to its own max_new_tokens.
+        """
+        generation_config = copy.deepcopy(batch[0]["kwargs"]["generation_config"])
+        generation_config.max_new_tokens = max(
+            req["kwargs"]["generation_config"].max_new_tokens for req in batch
+        )
+        input_ids = [req["kwargs"]["input_ids"] for req in batch]
+        attention_masks = [
+            req["kwargs"].get(
+                "attention_mask", torch.ones_like(req["kwargs"]["input_ids"])
+            )
+            for req in batch
+        ]
+        padding_side = self._tokenizer.padding_side
+        try:
+            batch_input_ids = _pad_and_concat(
+                input_ids, self._tokenizer.pad_token_id, padding_side
+            )
+            batch_attention_mask = _pad_and_concat(attention_masks, 0, padding_side)
+            outputs = self._model.generate(
+                input_ids=batch_input_ids,
+                attention_mask=batch_attention_mask,
+                generation_config=generation_config,
+            )
+        except Exception as e:
+            logger.warning(
+                f"Batched generation of {len(batch)} requests failed, retrying one by one: {e}"
+            )
+            for req in batch:
+                self._handle_request(req)
+            return
+        # Encoder-decoder models do not include the input tokens in the output
+        output_start = 0 if self.is_encoder_decoder else batch_input_ids.shape[-1]
+        row = 0
+        for req in batch:
+            num_rows = req["kwargs"]["input_ids"].shape[0]
+            max_new_tokens = req["kwargs"]["generation_config"].max_new_tokens
+            # The output of encoder-decoder models starts with the decoder start token
+            output_end = output_start + max_new_tokens + int(self.is_encoder_decoder)
+            req_outputs = outputs[row : row + num_rows, output_start:output_end]
+            row += num_rows
+            # Trim the padding after the sequences that finished before the rest of the batch
+            non_pad_positions = (req_outputs != self._tokenizer.pad_token_id).nonzero()
+            if len(non_pad_positions) > 0:
+                req_outputs = req_outputs[:, : int(non_pad_positions[:, 1].max()) + 1]
+            stats: LLMStats = req["request"].context[LLM_STATS_KEY]
+            stats.num_generation_tokens = req_outputs.shape[-1] * num_rows
+            texts = self._tokenizer.batch_decode(req_outputs, skip_special_tokens=True)
+            req["loop"].call_soon_threadsafe(req["response_queue"].put_nowait, texts)
+
+    @staticmethod
+    def _batch_key(req: _GenerateRequest) -> Optional[str]:
+        """
+        Returns the key of the requests that can be generated together, or None if the request
+        has to be handled on its own.
+        """
+        params = req["request"].params
+        kwargs = req["kwargs"]
+        # Streaming, seeds and stop sequences apply to the whole batch of a generate call.
+        if (
+            params.stream
+            or params.echo
+            or params.seed is not None
+            or kwargs["stopping_criteria"] is not None
+        ):
+            return None
+        generation_config = kwargs["generation_config"].to_diff_dict()
+        generation_config.pop("max_new_tokens", None)
+        return repr(sorted(generation_config.items()))
+
+    def _collect_batch(
+        self, req: _GenerateRequest, pending: Deque[Optional[_GenerateRequest]]
+    ) -> List[_GenerateRequest]:
+        """
+        Collect the requests that can be generated together with the given request, from the
+        requests already taken off the queue and the requests queued within the batch latency.
+        Requests that can not be batched are left in pending in their original order.
+        """
+        key = self._batch_key(req)
+        batch = [req]
+        if key is None or self.max_batch_size <= 1:
+            return batch
+        batch_size = req["kwargs"]["input_ids"].shape[0]
+        max_input_length = req["kwargs"]["input_ids"].shape[-1]
+        max_new_tokens = req["kwargs"]["generation_config"].max_new_tokens
+        deadline = time.monotonic() + self.max_batch_latency_ms / 1000
+        skipped: Deque[Optional[_GenerateRequest]] = deque()
+        while batch_size < self.max_batch_size:
+            if pending:
+                other = pending.popleft()
+            else:
+                timeout = deadline - time.monotonic()
+                try:
+                    if timeout > 0:
+                        other = self._request_queue.get(timeout=timeout)
+                    else:
+                        other = self._request_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if not other:
+                # Stop collecting on shutdown, the stop signal is handled after this batch.
+                skipped.append(other)
+                break
+            num_rows = other["kwargs"]["input_ids"].shape[0]
+            input_length = max(max_input_length, other["kwargs"]["input_ids"].shape[-1])
+            new_tokens = max(
+                max_new_tokens, other["kwargs"]["generation_config"].max_new_tokens
+            )
+            if (
+                self._batch_key(other) != key
+                or batch_size + num_rows > self.max_batch_size
+                # The padded batch must still fit in the context length of the model
+                or input_length + new_tokens > self.max_length
+            ):
+                skipped.append(other)
+                continue
+            batch.append(other)
+            batch_size += num_rows
+            max_input_length, max_new_tokens = input_length, new_tokens
+        pending.extendleft(reversed(skipped))
+        return batch
+
     @torch.no_grad()
     def _process_requests(self):
         """
         Process requests from the request queue in a background thread.
         This ensures we don't block the event loop while running generation.
         """
+        pending: Deque[Optional[_GenerateRequest]] = deque()
         while True:
-            req = self._request_queue.get()
+            req = pending.popleft() if pending else self._request_queue.get()
 
             # If request is None we should stop processing
             if not req:
                 break
 
-            self._handle_request(req)
+            batch = self._collect_batch(req, pending)
+            if len(batch) == 1:
+                self._handle_request(req)
+            else:
+                self._handle_batch(batch)
 
     def _submit_request(
         self, kwargs: Dict[str, Any], request: CompletionRequest
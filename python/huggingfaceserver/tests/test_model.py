@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+
 import pytest
 import torch
 from kserve.model import PredictorConfig
@@ -171,6 +173,40 @@ async def test_t5(t5_model: HuggingfaceGenerativeModel):
     assert response.usage.completion_tokens == 7
 
 
+@pytest.mark.asyncio
+async def test_t5_batched_completions(t5_model: HuggingfaceGenerativeModel):
+    prompts = [
+        ("translate from English to German: we are making words", 10),
+        ("translate from English to German: the house is wonderful", 10),
+        ("translate from English to German: we are making words", 3),
+    ]
+
+    async def complete(prompt: str, max_tokens: int):
+        params = CreateCompletionRequest(
+            model="t5-small", prompt=prompt, max_tokens=max_tokens, stream=False
+        )
+        return await t5_model.create_completion(
+            CompletionRequest(params=params, context={})
+        )
+
+    expected = [await complete(prompt, max_tokens) for prompt, max_tokens in prompts]
+    t5_model.max_batch_size = 4
+    t5_model.max_batch_latency_ms = 100
+    try:
+        responses = await asyncio.gather(
+            *[complete(prompt, max_tokens) for prompt, max_tokens in prompts]
+        )
+    finally:
+        t5_model.max_batch_size = 1
+    for response, expected_response in zip(responses, expected):
+        assert response.choices[0].text == expected_response.choices[0].text
+        assert (
+            response.usage.completion_tokens
+            == expected_response.usage.completion_tokens
+        )
+    assert responses[0].choices[0].text == "wir setzen Worte"
+
+
 @pytest.mark.asyncio
 async def test_t5_stopping_criteria(t5_model: HuggingfaceGenerativeModel):
     params = CreateCompletionRequest(
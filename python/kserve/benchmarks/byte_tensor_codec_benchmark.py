@@ -0,0 +1,112 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Micro-benchmark of the BYTES tensor codec of the binary tensor data extension.
+
+Compares serialize_byte_tensor / deserialize_bytes_tensor with the previous per element
+implementation, which is kept below for reference.
+
+Usage:
+    python benchmarks/byte_tensor_codec_benchmark.py --num_elements 100000 --repeat 5
+"""
+
+import argparse
+import struct
+import timeit
+
+import numpy as np
+
+from kserve.protocol.infer_type import deserialize_bytes_tensor, serialize_byte_tensor
+
+
+def legacy_serialize_byte_tensor(input_tensor: np.ndarray) -> np.ndarray:
+    if input_tensor.size == 0:
+        return np.empty([0], dtype=np.object_)
+    flattened_ls = []
+    for obj in np.nditer(input_tensor, flags=["refs_ok"], order="C"):
+        if input_tensor.dtype == np.object_:
+            if type(obj.item()) == bytes:
+                s = obj.item()
+            else:
+                s = str(obj.item()).encode("utf-8")
+        else:
+            s = obj.item()
+        flattened_ls.append(struct.pack("<I", len(s)))
+        flattened_ls.append(s)
+    flattened = b"".join(flattened_ls)
+    return np.asarray(flattened, dtype=np.object_)
+
+
+def legacy_deserialize_bytes_tensor(encoded_tensor: bytes) -> np.ndarray:
+    strs = list()
+    offset = 0
+    val_buf = encoded_tensor
+    while offset < len(val_buf):
+        length = struct.unpack_from("<I", val_buf, offset)[0]
+        offset += 4
+        sb = struct.unpack_from("<{}s".format(length), val_buf, offset)[0]
+        offset += length
+        strs.append(sb)
+    return np.array(strs, dtype=np.object_)
+
+
+def make_tensor(num_elements: int, max_length: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    lengths = rng.integers(0, max_length, size=num_elements)
+    return np.array(
+        [b"x" * int(length) for length in lengths], dtype=np.object_
+    ).reshape(-1, 1)
+
+
+def bench(name: str, fn, repeat: int) -> float:
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    print(f"{name:<40} {best * 1000:10.2f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num_elements", type=int, default=100000)
+    parser.add_argument("--max_length", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tensor = make_tensor(args.num_elements, args.max_length)
+    encoded = serialize_byte_tensor(tensor).item()
+    assert encoded == legacy_serialize_byte_tensor(tensor).item()
+    np.testing.assert_array_equal(
+        deserialize_bytes_tensor(encoded), legacy_deserialize_bytes_tensor(encoded)
+    )
+
+    print(
+        f"{args.num_elements} elements, up to {args.max_length} bytes, {len(encoded)} bytes encoded"
+    )
+    legacy = bench(
+        "serialize (legacy)", lambda: legacy_serialize_byte_tensor(tensor), args.repeat
+    )
+    current = bench("serialize", lambda: serialize_byte_tensor(tensor), args.repeat)
+    print(f"{'speedup':<40} {legacy / current:10.2f} x")
+    legacy = bench(
+        "deserialize (legacy)",
+        lambda: legacy_deserialize_bytes_tensor(encoded),
+        args.repeat,
+    )
+    current = bench(
+        "deserialize", lambda: deserialize_bytes_tensor(encoded), args.repeat
+    )
+    print(f"{'speedup':<40} {legacy / current:10.2f} x")
+
+
+if __name__ == "__main__":
+    main()
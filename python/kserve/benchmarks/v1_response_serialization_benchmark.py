@@ -0,0 +1,96 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Micro-benchmark of the encoding of v1 predict responses.
+
+Encodes sklearn style 2D float outputs (e.g. the result of predict_proba) and DataFrame outputs
+the way the v1 predict endpoint did before, with the results converted to lists or per row dicts
+and encoded by the stdlib json encoder of JSONResponse, and with NumpyJSONResponse.
+
+Usage:
+    python benchmarks/v1_response_serialization_benchmark.py --rows 10000 --columns 10 --repeat 5
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+import orjson
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+from kserve.protocol.rest.v1_endpoints import NumpyJSONResponse
+
+
+def legacy_dataframe_predictions(result: pd.DataFrame) -> list:
+    infer_outputs = []
+    for label, row in result.iterrows():
+        infer_outputs.append(row.to_dict())
+    return infer_outputs
+
+
+def bench(name: str, fn, repeat: int) -> float:
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    print(f"{name:<48} {best * 1000:10.2f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    result = rng.random((args.rows, args.columns))
+    assert orjson.loads(
+        NumpyJSONResponse({"predictions": result}).body
+    ) == orjson.loads(JSONResponse({"predictions": result.tolist()}).body)
+
+    print(f"{args.rows} x {args.columns} float64 predictions")
+    legacy = bench(
+        "tolist + JSONResponse (legacy)",
+        lambda: JSONResponse({"predictions": result.tolist()}),
+        args.repeat,
+    )
+    current = bench(
+        "tolist + NumpyJSONResponse",
+        lambda: NumpyJSONResponse({"predictions": result.tolist()}),
+        args.repeat,
+    )
+    print(f"{'speedup':<48} {legacy / current:10.2f} x")
+    current = bench(
+        "ndarray + NumpyJSONResponse",
+        lambda: NumpyJSONResponse({"predictions": result}),
+        args.repeat,
+    )
+    print(f"{'speedup':<48} {legacy / current:10.2f} x")
+
+    frame = pd.DataFrame(result, columns=[f"class_{i}" for i in range(args.columns)])
+    legacy = bench(
+        "iterrows + JSONResponse (legacy)",
+        lambda: JSONResponse({"predictions": legacy_dataframe_predictions(frame)}),
+        args.repeat,
+    )
+    current = bench(
+        "records + NumpyJSONResponse",
+        lambda: NumpyJSONResponse({"predictions": frame.to_dict(orient="records")}),
+        args.repeat,
+    )
+    print(f"{'speedup':<48} {legacy / current:10.2f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,9 +14,17 @@
 
 from __future__ import absolute_import
 
+import sys
+
+from .supervisor import configure_prometheus_multiprocess
+
+# Must run before prometheus_client is imported, which selects how the metric values are stored.
+configure_prometheus_multiprocess(sys.argv[1:])
+
 from .model import Model
 from .model_server import ModelServer
 from .inference_client import InferenceGRPCClient, InferenceRESTClient, RESTConfig
+from .bulk_infer import BulkInferStats
 from .protocol.infer_type import InferRequest, InferInput, InferResponse, InferOutput
 from .model_repository import ModelRepository
 from .constants import constants
@@ -0,0 +1,371 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Union
+
+import numpy as np
+
+from .errors import InferenceError
+from .logging import logger
+from .metrics import BATCH_SIZE_HIST, get_labels
+from .protocol.infer_type import (
+    InferInput,
+    InferOutput,
+    InferRequest,
+    InferResponse,
+    to_http_parameters,
+)
+from .utils.deadline import current_deadline, override_deadline
+from .utils.utils import generate_uuid
+
+V1_INSTANCE_KEYS = ("instances", "inputs")
+
+PredictFn = Callable[[Union[Dict, InferRequest], Dict[str, str]], Awaitable[Any]]
+
+
+class _BatchItem:
+    def __init__(
+        self,
+        payload: Union[Dict, InferRequest],
+        batch_key: Optional[Hashable],
+        size: int,
+        future: asyncio.Future,
+        headers: Dict[str, str],
+        deadline: Optional[float],
+    ):
+        self.payload = payload
+        self.headers = headers
+        self.deadline = deadline
+        self.batch_key = batch_key
+        self.size = size
+        self.future = future
+
+
+class DynamicBatcher:
+    """Server side dynamic batcher for the predict handler of a model.
+
+    Concurrent requests are queued and merged along the batch (first) axis until
+    ``max_batch_size`` rows are collected or the oldest queued request waited for
+    ``max_latency_ms``. The merged payload is passed to a single predict call and the
+    outputs are split back to each caller.
+
+    V1 payloads are merged by concatenating their ``instances`` (or ``inputs``) lists and the
+    ``predictions`` of the response are split by the number of instances of each request.
+    V2 payloads are merged by concatenating the inputs with the same name, datatype and
+    non-batch dimensions, and every output of the response is split along its first axis.
+    Requests that can not be merged, e.g. with differing parameters, are predicted as a
+    batch of their own.
+
+    A request predicted alone is passed its own headers. A merged payload is passed the headers
+    shared by all the requests of the batch with the same value, so a per-request header like
+    ``x-request-id`` is only passed when it is the same for every request. Likewise, a request
+    predicted alone runs under its own deadline, and a merged payload under the latest deadline of
+    its requests, or none if any of them has no deadline.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        predict_fn: PredictFn,
+        max_batch_size: int = 32,
+        max_latency_ms: float = 5.0,
+    ):
+        """
+        Args:
+            model_name: The name of the model, used for the batch size metric.
+            predict_fn: The coroutine function to run the prediction of a (merged) payload.
+            max_batch_size: The maximum number of rows in a batch.
+            max_latency_ms: The maximum time in milliseconds a request waits for the batch to fill up.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size should be greater than 0")
+        if max_latency_ms < 0:
+            raise ValueError("max_latency_ms should not be negative")
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_latency_ms = max_latency_ms
+        self._predict_fn = predict_fn
+        self._pending: List[_BatchItem] = []
+        self._pending_size = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+
+    async def submit(
+        self,
+        payload: Union[Dict, InferRequest],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        """Queue the payload for the next batch and wait for its own prediction result.
+
+        Args:
+            payload: The validated request payload passed to the predict handler.
+            headers: The headers of the request.
+
+        Returns:
+            The prediction result for this payload.
+        """
+        loop = asyncio.get_running_loop()
+        batch_key, size = _batch_signature(payload)
+        item = _BatchItem(
+            payload,
+            batch_key,
+            size,
+            loop.create_future(),
+            headers or {},
+            current_deadline(),
+        )
+        if self._pending and self._pending_size + size > self.max_batch_size:
+            self._flush()
+        self._pending.append(item)
+        self._pending_size += size
+        if self._pending_size >= self.max_batch_size or self.max_latency_ms == 0:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_latency_ms / 1000, self._flush)
+        return await item.future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_size = self._pending, [], 0
+        # Keep a reference to the task, so it is not garbage collected before it is done.
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[_BatchItem]):
+        groups: Dict[Hashable, List[_BatchItem]] = {}
+        singles = []
+        for item in batch:
+            if item.batch_key is None:
+                singles.append([item])
+            else:
+                groups.setdefault(item.batch_key, []).append(item)
+        await asyncio.gather(
+            *[self._run_group(items) for items in [*groups.values(), *singles]]
+        )
+
+    async def _run_group(self, items: List[_BatchItem]):
+        BATCH_SIZE_HIST.labels(**get_labels(self.model_name)).observe(
+            sum(item.size for item in items)
+        )
+        try:
+            # The batch runs in the context of the request that flushed it, so the deadline is reset.
+            with override_deadline(merge_deadlines([item.deadline for item in items])):
+                if len(items) == 1:
+                    results = [
+                        await self._predict_fn(items[0].payload, items[0].headers)
+                    ]
+                else:
+                    payloads = [item.payload for item in items]
+                    merged = merge_payloads(payloads)
+                    response = await self._predict_fn(
+                        merged, merge_headers([item.headers for item in items])
+                    )
+                    results = split_response(
+                        response, payloads, [item.size for item in items]
+                    )
+        except Exception as e:
+            if len(items) > 1:
+                logger.error(
+                    f"Failed to predict batch of {len(items)} requests for model {self.model_name}: {e}"
+                )
+            for item in items:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+        for item, result in zip(items, results):
+            if not item.future.done():
+                item.future.set_result(result)
+
+
+def _batch_signature(payload: Any):
+    """Returns the key grouping payloads that can be merged together and the batch size of the payload.
+
+    The key is None if the payload can not be merged with other payloads.
+    """
+    if isinstance(payload, dict):
+        if len(payload) != 1:
+            return None, 1
+        key = next(iter(payload))
+        instances = payload[key]
+        if key not in V1_INSTANCE_KEYS or not isinstance(instances, list):
+            return None, 1
+        if len(instances) == 0:
+            return None, 1
+        return ("v1", key), len(instances)
+    if isinstance(payload, InferRequest):
+        if not payload.inputs:
+            return None, 1
+        batch_size = None
+        inputs_key = []
+        for infer_input in payload.inputs:
+            if not infer_input.shape or (
+                batch_size is not None and infer_input.shape[0] != batch_size
+            ):
+                return None, 1
+            batch_size = infer_input.shape[0]
+            inputs_key.append(
+                (infer_input.name, infer_input.datatype, tuple(infer_input.shape[1:]))
+            )
+        outputs_key = (
+            tuple(
+                (output.name, repr(output.parameters))
+                for output in payload.request_outputs
+            )
+            if payload.request_outputs
+            else None
+        )
+        parameters_key = (
+            repr(sorted(to_http_parameters(payload.parameters).items()))
+            if payload.parameters
+            else None
+        )
+        if batch_size < 1:
+            return None, 1
+        return (
+            "v2",
+            tuple(inputs_key),
+            outputs_key,
+            parameters_key,
+            payload.from_grpc,
+            payload.use_binary_outputs,
+        ), batch_size
+    return None, 1
+
+
+def merge_payloads(
+    payloads: List[Union[Dict, InferRequest]]
+) -> Union[Dict, InferRequest]:
+    """Merge the payloads with the same batch signature along the batch axis."""
+    first = payloads[0]
+    if isinstance(first, dict):
+        key = next(iter(first))
+        instances = []
+        for payload in payloads:
+            instances.extend(payload[key])
+        return {key: instances}
+    infer_inputs = []
+    for i, first_input in enumerate(first.inputs):
+        tensors = [payload.inputs[i] for payload in payloads]
+        data = np.concatenate([tensor.as_numpy() for tensor in tensors], axis=0)
+        infer_input = InferInput(
+            name=first_input.name,
+            shape=list(data.shape),
+            datatype=first_input.datatype,
+        )
+        # Keep the representation of the original inputs, the predict handler may access the data directly.
+        binary_data = all(tensor._raw_data is not None for tensor in tensors)
+        infer_input.set_data_from_numpy(data, binary_data=binary_data)
+        if binary_data and any(tensor._lazy_data for tensor in tensors):
+            infer_input.set_lazy_raw_data(infer_input._raw_data)
+        infer_inputs.append(infer_input)
+    return InferRequest(
+        model_name=first.model_name,
+        infer_inputs=infer_inputs,
+        request_id=generate_uuid(),
+        from_grpc=first.from_grpc,
+        parameters=first.parameters,
+        request_outputs=first.request_outputs,
+    )
+
+
+def merge_headers(headers: List[Dict[str, str]]) -> Dict[str, str]:
+    """The headers with the same value in all the headers of the merged payloads."""
+    merged = dict(headers[0])
+    for item_headers in headers[1:]:
+        merged = {
+            key: value
+            for key, value in merged.items()
+            if item_headers.get(key) == value
+        }
+    return merged
+
+
+def merge_deadlines(deadlines: List[Optional[float]]) -> Optional[float]:
+    """The latest of the deadlines of the merged payloads, or None if any of them has none."""
+    if any(deadline is None for deadline in deadlines):
+        return None
+    return max(deadlines)
+
+
+def split_response(
+    response: Any, payloads: List[Union[Dict, InferRequest]], sizes: List[int]
+) -> List[Any]:
+    """Split the prediction result of a merged payload into one result per original payload."""
+    total = sum(sizes)
+    offsets = np.cumsum([0] + sizes)
+    if isinstance(payloads[0], dict):
+        predictions = (
+            response.get("predictions") if isinstance(response, dict) else None
+        )
+        if predictions is None or len(predictions) != total:
+            raise InferenceError(
+                f"Can not split the batched response, expected 'predictions' with {total} elements"
+            )
+        return [
+            {"predictions": predictions[offsets[i] : offsets[i + 1]]}
+            for i in range(len(payloads))
+        ]
+    if not isinstance(response, InferResponse):
+        raise InferenceError(
+            f"Can not split the batched response of type {type(response).__name__}, expected InferResponse"
+        )
+    outputs_data = []
+    for output in response.outputs:
+        data = output.data if isinstance(output.data, np.ndarray) else output.as_numpy()
+        if data.ndim == 0 or data.shape[0] != total:
+            raise InferenceError(
+                f"Can not split the batched output '{output.name}' with shape {list(data.shape)} "
+                f"into {len(payloads)} responses with total batch size {total}"
+            )
+        outputs_data.append(data)
+    results = []
+    for i, payload in enumerate(payloads):
+        infer_outputs = []
+        for output, data in zip(response.outputs, outputs_data):
+            data = data[offsets[i] : offsets[i + 1]]
+            parameters = None
+            if output.parameters:
+                parameters = {
+                    k: v
+                    for k, v in to_http_parameters(output.parameters).items()
+                    if k != "binary_data_size"
+                }
+            infer_output = InferOutput(
+                name=output.name,
+                shape=list(data.shape),
+                datatype=output.datatype,
+                parameters=parameters or None,
+            )
+            infer_output.set_data_from_numpy(
+                data, binary_data=payload.use_binary_outputs
+            )
+            infer_outputs.append(infer_output)
+        results.append(
+            InferResponse(
+                response_id=payload.id if payload.id else generate_uuid(),
+                model_name=response.model_name,
+                model_version=response.model_version,
+                infer_outputs=infer_outputs,
+                parameters=response.parameters,
+                use_binary_outputs=payload.use_binary_outputs,
+                requested_outputs=payload.request_outputs,
+            )
+        )
+    return results
@@ -0,0 +1,227 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from .batcher import _batch_signature, merge_payloads, split_response
+from .errors import InvalidInput
+from .protocol.infer_type import InferInput, InferRequest, InferResponse
+from .utils.numpy_codec import from_np_dtype
+
+# A row is the data of a single input, or a dict of the data of the inputs by name.
+Item = Union[InferRequest, np.ndarray, List, Dict[str, Any]]
+Items = Union[AsyncIterable[Item], Iterable[Item]]
+InferFn = Callable[[InferRequest], Awaitable[InferResponse]]
+
+
+class BulkInferStats:
+    """Throughput and latency of a bulk inference, updated as its requests complete."""
+
+    def __init__(self):
+        self.requests = 0
+        self.rows = 0
+        self.retries = 0
+        self.elapsed_seconds = 0.0
+        self.latencies_ms: List[float] = []
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def latency_percentile_ms(self, percentile: float) -> float:
+        """The latency percentile of the requests in milliseconds, retries included."""
+        if not self.latencies_ms:
+            return 0.0
+        return float(np.percentile(self.latencies_ms, percentile))
+
+    def __repr__(self):
+        return (
+            f"BulkInferStats(requests={self.requests}, rows={self.rows}, retries={self.retries}, "
+            f"rows_per_second={self.rows_per_second:.1f}, "
+            f"p50_ms={self.latency_percentile_ms(50):.2f}, p99_ms={self.latency_percentile_ms(99):.2f})"
+        )
+
+
+def _row_request(
+    row: Any, index: int, model_name: Optional[str], input_name: str
+) -> InferRequest:
+    if model_name is None:
+        raise InvalidInput("model_name is required to infer rows")
+    row_inputs = row if isinstance(row, dict) else {input_name: row}
+    infer_inputs = []
+    for name, data in row_inputs.items():
+        data = np.asarray(data)
+        if data.dtype.kind in ("U", "S"):
+            data = data.astype(np.object_)
+        # The row is sent as a batch of one.
+        data = data[np.newaxis, ...]
+        infer_input = InferInput(name, list(data.shape), from_np_dtype(data.dtype))
+        infer_input.set_data_from_numpy(data)
+        infer_inputs.append(infer_input)
+    return InferRequest(
+        model_name=model_name, infer_inputs=infer_inputs, request_id=str(index)
+    )
+
+
+async def _batches(
+    items: Items, batch_size: int, model_name: Optional[str], input_name: str
+) -> AsyncIterator[Tuple[List[InferRequest], List[int]]]:
+    """Group the items into batches of up to batch_size rows of requests that can be merged."""
+    batch: List[InferRequest] = []
+    sizes: List[int] = []
+    batch_key = None
+
+    async def iterate():
+        if isinstance(items, AsyncIterable):
+            async for item in items:
+                yield item
+        else:
+            for item in items:
+                yield item
+
+    index = 0
+    async for item in iterate():
+        if isinstance(item, InferRequest):
+            request = item
+        else:
+            request = _row_request(item, index, model_name, input_name)
+        index += 1
+        key, size = _batch_signature(request)
+        if batch and (
+            key is None or key != batch_key or sum(sizes) + size > batch_size
+        ):
+            yield batch, sizes
+            batch, sizes = [], []
+        batch.append(request)
+        sizes.append(size)
+        batch_key = key
+    if batch:
+        yield batch, sizes
+
+
+async def _infer_with_retries(
+    infer: InferFn,
+    request: InferRequest,
+    retries: int,
+    retry_backoff_seconds: float,
+    is_transient: Callable[[Exception], bool],
+    stats: BulkInferStats,
+) -> InferResponse:
+    start = time.perf_counter()
+    attempt = 0
+    while True:
+        try:
+            response = await infer(request)
+            break
+        except Exception as e:
+            if attempt >= retries or not is_transient(e):
+                raise
+            stats.retries += 1
+            await asyncio.sleep(retry_backoff_seconds * 2**attempt)
+            attempt += 1
+    stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+    return response
+
+
+async def bulk_infer(
+    infer: InferFn,
+    items: Items,
+    is_transient: Callable[[Exception], bool],
+    model_name: Optional[str] = None,
+    input_name: str = "input-0",
+    batch_size: int = 1,
+    max_in_flight: int = 8,
+    retries: int = 3,
+    retry_backoff_seconds: float = 0.1,
+    stats: Optional[BulkInferStats] = None,
+) -> AsyncIterator[InferResponse]:
+    """Run the inference of a stream of items, with up to max_in_flight batched requests in flight.
+
+    The items are read lazily, packed into requests of up to batch_size rows and the responses
+    are split back into one response per item, yielded in the order of the items. The requests
+    failing with a transient error are retried with an exponential backoff.
+
+    Args:
+        infer: The coroutine function sending a request.
+        items: The InferRequest objects, or rows, to infer.
+        is_transient: Whether an error of the infer function is transient, so the request is retried.
+        model_name: The name of the model of the rows.
+        input_name: The name of the input of the rows which are not a dict of inputs.
+        batch_size: The maximum number of rows of a request.
+        max_in_flight: The maximum number of requests in flight.
+        retries: The maximum number of retries of a request.
+        retry_backoff_seconds: The delay before the first retry of a request, doubled on each retry.
+        stats: The statistics of the bulk inference to update.
+
+    Raises:
+        InvalidInput: If the rows are inferred without model_name.
+    """
+    if batch_size < 1 or max_in_flight < 1:
+        raise InvalidInput("batch_size and max_in_flight must be at least 1")
+    stats = stats if stats is not None else BulkInferStats()
+    pending: Deque[Tuple[asyncio.Task, List[InferRequest], List[int]]] = deque()
+
+    def send(batch: List[InferRequest]) -> asyncio.Task:
+        request = batch[0] if len(batch) == 1 else merge_payloads(batch)
+        return asyncio.create_task(
+            _infer_with_retries(
+                infer, request, retries, retry_backoff_seconds, is_transient, stats
+            )
+        )
+
+    async def complete() -> List[InferResponse]:
+        task, batch, sizes = pending.popleft()
+        response = await task
+        stats.requests += 1
+        stats.rows += sum(sizes)
+        stats.elapsed_seconds = time.perf_counter() - start
+        if len(batch) == 1:
+            return [response]
+        return split_response(response, batch, sizes)
+
+    start = time.perf_counter()
+    try:
+        async for batch, sizes in _batches(items, batch_size, model_name, input_name):
+            pending.append((send(batch), batch, sizes))
+            if len(pending) >= max_in_flight:
+                for response in await complete():
+                    yield response
+        while pending:
+            for response in await complete():
+                yield response
+    finally:
+        for task, _, _ in pending:
+            task.cancel()
@@ -75,6 +75,8 @@ GENERATION = "generation"
 
 PREDICTOR_BASE_URL_FORMAT = "{0}://{1}"
 EXPLAINER_BASE_URL_FORMAT = "{0}://{1}"
+# Scheme of the predictor host of a predictor registered in the same model server as the transformer.
+LOCAL_PREDICTOR_SCHEME = "local://"
 
 
 class PredictorProtocol(Enum):
@@ -94,6 +96,18 @@ V1_ROUTE_PREFIX = "/v1"
 
 DEFAULT_HTTP_PORT = 8080
 DEFAULT_GRPC_PORT = 8081
+DEFAULT_FLIGHT_PORT = 8815
 
 # Header containing the json length in case of REST raw response.
 INFERENCE_CONTENT_LENGTH_HEADER = "inference-header-content-length"
+
+# Header containing the remaining time budget of a request in milliseconds, propagated to the predictor.
+REQUEST_TIMEOUT_HEADER = "x-request-timeout-ms"
+
+# Parameters of the tensors whose data is held in a registered system shared memory region.
+SHARED_MEMORY_REGION_PARAMETER = "shared_memory_region"
+SHARED_MEMORY_BYTE_SIZE_PARAMETER = "shared_memory_byte_size"
+SHARED_MEMORY_OFFSET_PARAMETER = "shared_memory_offset"
+
+# Content type of the requests and responses encoded as Apache Arrow IPC streams.
+ARROW_STREAM_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
@@ -51,6 +51,13 @@ class InvalidInput(ValueError):
         return self.reason
 
 
+class PayloadTooLarge(InvalidInput):
+    """
+    Exception class indicating the request body is too large.
+    HTTP Servers should return HTTP_413 (Payload Too Large).
+    """
+
+
 class ModelNotFound(Exception):
     """
     Exception class indicating requested model does not exist.
@@ -112,6 +119,13 @@ async def invalid_input_handler(_, exc):
     return JSONResponse(status_code=HTTPStatus.BAD_REQUEST, content={"error": str(exc)})
 
 
+async def payload_too_large_handler(_, exc):
+    logger.error("Exception:", exc_info=exc)
+    return JSONResponse(
+        status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE, content={"error": str(exc)}
+    )
+
+
 async def inference_error_handler(_, exc):
     logger.error("Exception:", exc_info=exc)
     return JSONResponse(
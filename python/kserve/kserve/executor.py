@@ -0,0 +1,200 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+from .logging import logger
+
+# Buffers smaller than this are pickled in-band, as the shared memory setup costs more than the copy.
+SHARED_MEMORY_MIN_BYTES = 64 * 1024
+
+
+class ExecutionPolicy(str, Enum):
+    """Where the synchronous predict handler of a model is executed.
+
+    ``inline`` runs it on the event loop thread, ``thread`` in the default executor of the event
+    loop (sized by ``--max_asyncio_workers``) and ``process`` in a pool of worker processes forked
+    with the loaded model.
+    """
+
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class _SharedBuffer:
+    """Picklable reference to a buffer copied into a shared memory block. The receiver copies the
+    buffer out of the block and unlinks it."""
+
+    def __init__(self, buffer: pickle.PickleBuffer):
+        raw = buffer.raw()
+        self.size = raw.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=self.size)
+        shm.buf[: self.size] = raw
+        self.name = shm.name
+        shm.close()
+
+    def load(self) -> bytearray:
+        shm = shared_memory.SharedMemory(name=self.name)
+        try:
+            return bytearray(shm.buf[: self.size])
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def release(self):
+        try:
+            shm = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return
+        shm.close()
+        shm.unlink()
+
+
+def dumps(obj: Any) -> Tuple[bytes, List[_SharedBuffer]]:
+    """Pickle the object, shipping the large out-of-band buffers (e.g. the data of the numpy arrays
+    of the request and response tensors) through shared memory instead of the pipe."""
+    shared_buffers = []
+
+    def buffer_callback(buffer: pickle.PickleBuffer) -> bool:
+        if buffer.raw().nbytes < SHARED_MEMORY_MIN_BYTES:
+            return True
+        shared_buffers.append(_SharedBuffer(buffer))
+        return False
+
+    try:
+        data = pickle.dumps(obj, protocol=5, buffer_callback=buffer_callback)
+    except BaseException:
+        for shared_buffer in shared_buffers:
+            shared_buffer.release()
+        raise
+    return data, shared_buffers
+
+
+def loads(data: bytes, shared_buffers: List[_SharedBuffer]) -> Any:
+    return pickle.loads(data, buffers=[buffer.load() for buffer in shared_buffers])
+
+
+_worker_model = None
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _predict_in_worker(
+    data: bytes, shared_buffers: List[_SharedBuffer], with_response_headers: bool
+) -> Tuple[bytes, List[_SharedBuffer]]:
+    payload, headers = loads(data, shared_buffers)
+    if with_response_headers:
+        response_headers = {}
+        response = _worker_model.predict(payload, headers, response_headers)
+    else:
+        response_headers = None
+        response = _worker_model.predict(payload, headers)
+    return dumps((response, response_headers))
+
+
+class ProcessPoolPredictor:
+    """Runs the synchronous predict handler of a model in a pool of worker processes.
+
+    The worker processes are forked with the loaded model, so the model does not need to be
+    picklable and its memory is shared copy-on-write. The request and response tensors are shipped
+    through shared memory. The pool must be started in the process serving the model, before the
+    servers start their threads, as forking a process running threads is unsafe.
+
+    Args:
+        model: The loaded model.
+        workers: Number of worker processes. Defaults to the number of CPUs.
+    """
+
+    def __init__(self, model, workers: Optional[int] = None):
+        self.model = model
+        self.workers = workers or os.cpu_count()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pid: Optional[int] = None
+
+    def start(self):
+        """Fork the worker processes. A pool started by a parent process, e.g. before the model
+        server worker processes are forked, is replaced."""
+        if self._pool is not None and self._pid == os.getpid():
+            return
+        # The forked workers share the resource tracker of this process, so a block created in
+        # one process and unlinked in another is unregistered from the tracker it was registered
+        # with, rather than reported as leaked by one tracker and missing by the other.
+        resource_tracker.ensure_running()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(self.model,),
+        )
+        self._pid = os.getpid()
+        # With the fork context all the workers are forked on the first submit, before the pool
+        # starts its management thread. Wait for them so no fork happens once the servers run.
+        for future in [self._pool.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+        logger.info(
+            f"Started {self.workers} predict worker processes for model {self.model.name}"
+        )
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None or self._pid != os.getpid():
+            raise RuntimeError(
+                f"The predict worker processes of model {self.model.name} are not started"
+            )
+        return self._pool
+
+    async def predict(
+        self,
+        payload: Any,
+        headers: Optional[Dict[str, str]] = None,
+        response_headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        data, shared_buffers = dumps((payload, headers))
+        try:
+            response_data, response_buffers = await loop.run_in_executor(
+                self.pool,
+                _predict_in_worker,
+                data,
+                shared_buffers,
+                response_headers is not None,
+            )
+        finally:
+            # The worker unlinks the blocks it read, this cleans up if it failed before.
+            for shared_buffer in shared_buffers:
+                shared_buffer.release()
+        response, worker_response_headers = loads(response_data, response_buffers)
+        if response_headers is not None:
+            response_headers.update(worker_response_headers)
+        return response
+
+    def shutdown(self):
+        if self._pool is not None and self._pid == os.getpid():
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        self._pool = None
@@ -0,0 +1,131 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import numpy as np
+
+from .metrics import HEDGED_REQUESTS, HEDGED_REQUESTS_WON
+
+T = TypeVar("T")
+
+
+class HedgingPolicy:
+    """Hedging of the slow requests of an inference client.
+
+    A request still running after the ``percentile`` of the latencies of the recent requests is
+    duplicated, and the first successful response is used while the other attempts are
+    cancelled. With the default 95th percentile, about 5% more requests are sent to cut the tail
+    latency caused by a slow replica. Requests are not hedged until ``min_samples`` latencies are
+    recorded.
+
+    Args:
+        percentile: The percentile of the recent latencies after which a request is hedged.
+        max_hedges: The maximum number of duplicates of a request.
+        min_delay_seconds: The minimum delay before a request is hedged.
+        window_size: The number of recent latencies the percentile is computed from.
+        min_samples: The number of latencies to record before hedging requests.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_hedges: int = 1,
+        min_delay_seconds: float = 0.0,
+        window_size: int = 1000,
+        min_samples: int = 20,
+    ):
+        if not 0 < percentile <= 100:
+            raise ValueError(f"percentile must be in (0, 100], got {percentile}")
+        self.percentile = percentile
+        self.max_hedges = max_hedges
+        self.min_delay_seconds = min_delay_seconds
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window_size)
+        self._delay: Optional[float] = None
+
+    def record(self, latency_seconds: float):
+        """Record the latency of a completed attempt."""
+        self._latencies.append(latency_seconds)
+        # Recomputed lazily, the percentile is only needed when a request starts.
+        self._delay = None
+
+    def delay_seconds(self) -> Optional[float]:
+        """The delay before a request is hedged, or ``None`` if not enough latencies are recorded."""
+        if len(self._latencies) < self.min_samples:
+            return None
+        if self._delay is None:
+            self._delay = max(
+                float(np.percentile(self._latencies, self.percentile)),
+                self.min_delay_seconds,
+            )
+        return self._delay
+
+    async def run(self, attempt: Callable[[int], Awaitable[T]]) -> T:
+        """Run a request, hedged with duplicates if it is slow.
+
+        Args:
+            attempt: The coroutine function sending the request, called with the number of the
+                attempt, 0 for the original request.
+
+        Returns:
+            The result of the first successful attempt.
+
+        Raises:
+            Exception: The error of the first failed attempt, if all the attempts failed.
+        """
+
+        async def timed(number: int) -> T:
+            start = time.monotonic()
+            result = await attempt(number)
+            self.record(time.monotonic() - start)
+            return result
+
+        delay = self.delay_seconds()
+        attempts = [asyncio.ensure_future(timed(0))]
+        pending = set(attempts)
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                can_hedge = (
+                    delay is not None
+                    and error is None
+                    and len(attempts) <= self.max_hedges
+                )
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    HEDGED_REQUESTS.inc()
+                    hedge = asyncio.ensure_future(timed(len(attempts)))
+                    attempts.append(hedge)
+                    pending.add(hedge)
+                    continue
+                for task in attempts:
+                    if task not in done:
+                        continue
+                    if task.exception() is None:
+                        if task is not attempts[0]:
+                            HEDGED_REQUESTS_WON.inc()
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
@@ -12,17 +12,42 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import json
 import ssl
-from typing import Union, List, Tuple, Any, Optional, Sequence, Mapping, Dict
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import (
+    Union,
+    List,
+    Tuple,
+    Any,
+    Optional,
+    Sequence,
+    Mapping,
+    Dict,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    NamedTuple,
+)
 
 import grpc
 import httpx
 from orjson import orjson
 
-from .constants.constants import PredictorProtocol, INFERENCE_CONTENT_LENGTH_HEADER
-from .errors import UnsupportedProtocol, InvalidInput
+from .bulk_infer import BulkInferStats, Items, bulk_infer
+from .constants.constants import (
+    PredictorProtocol,
+    INFERENCE_CONTENT_LENGTH_HEADER,
+    REQUEST_TIMEOUT_HEADER,
+)
+from .errors import UnsupportedProtocol, InvalidInput, InferenceError
+from .hedging import HedgingPolicy
 from .logging import trace_logger as logger
+from .metrics import GRPC_CLIENT_INFLIGHT_REQUESTS
 from .protocol.grpc.grpc_predict_v2_pb2 import (
     ServerReadyResponse,
     ServerLiveResponse,
@@ -30,9 +55,15 @@ from .protocol.grpc.grpc_predict_v2_pb2 import (
     ServerReadyRequest,
     ServerLiveRequest,
     ModelReadyRequest,
+    SystemSharedMemoryRegisterRequest,
+    SystemSharedMemoryStatusRequest,
+    SystemSharedMemoryStatusResponse,
+    SystemSharedMemoryUnregisterRequest,
 )
 from .protocol.grpc.grpc_predict_v2_pb2_grpc import GRPCInferenceServiceStub
 from .protocol.infer_type import InferRequest, InferResponse
+from .utils.compression import compress
+from .utils.deadline import deadline_timeout
 from .utils.utils import is_v2, is_v1
 
 
@@ -57,6 +88,35 @@ class _UseClientDefault:
 
 USE_CLIENT_DEFAULT = _UseClientDefault()
 
+ROUND_ROBIN = "round_robin"
+LEAST_OUTSTANDING = "least_outstanding"
+
+_TRANSIENT_GRPC_CODES = (
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+)
+_TRANSIENT_HTTP_STATUS_CODES = (429, 502, 503, 504)
+
+
+def _is_transient_grpc_error(error: Exception) -> bool:
+    return isinstance(error, grpc.RpcError) and error.code() in _TRANSIENT_GRPC_CODES
+
+
+def _is_transient_http_error(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in _TRANSIENT_HTTP_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+
+class _PooledChannel:
+    """A channel of the gRPC client with the number of its calls in flight."""
+
+    def __init__(self, channel: grpc.aio.Channel):
+        self.channel = channel
+        self.stub = GRPCInferenceServiceStub(channel)
+        self.in_flight = 0
+        self.created_at = time.monotonic()
+
 
 class InferenceGRPCClient:
     """
@@ -94,6 +154,28 @@ class InferenceGRPCClient:
                          the channel.
     :param timeout (optional) The maximum end-to-end time, in seconds, the request is allowed to take. By default,
                    client timeout is 60 seconds. To disable timeout explicitly set it to 'None'.
+    :param use_raw_inputs: (optional) A boolean to send all the inputs in the raw input contents of the request rather
+                           than in the typed contents. The inputs backed by numpy arrays are always sent as raw
+                           contents. Defaults to False.
+    :param compression: (optional) The compression of the requests, e.g. grpc.Compression.Gzip. The compressed
+                        responses are always accepted. Defaults to None, the requests are not compressed.
+    :param num_channels: (optional) The number of channels of the client. Each channel has its own connections, so
+                         the calls are not limited by the maximum concurrent streams of a single HTTP/2 connection.
+                         Defaults to 1.
+    :param channel_selection: (optional) How a call picks its channel, "round_robin" or "least_outstanding" to pick
+                              the channel with the fewest calls in flight. Defaults to "round_robin".
+    :param dns_load_balancing: (optional) A boolean to resolve all the addresses of the host, e.g. the endpoints of a
+                               headless service, and to balance the calls of each channel across them. The host is
+                               resolved again when a connection fails. Defaults to False.
+    :param channel_max_age_seconds: (optional) The seconds after which a channel is replaced by a new one, so the host
+                                    is resolved again and new endpoints get calls. The replaced channel is closed once
+                                    its calls complete. Defaults to None, the channels are never replaced.
+    :param hedging: (optional) A HedgingPolicy to duplicate the slow infer calls on another channel, the first
+                    response is used and the other calls are cancelled. Requires num_channels > 1 to send the
+                    duplicates over other connections. Defaults to None, the calls are not hedged.
+
+    The timeout of the calls made while a request is served by the model server is shortened to the remaining time
+    budget of the request, so its deadline is propagated to the server.
     """
 
     def __init__(
@@ -107,7 +189,21 @@ class InferenceGRPCClient:
         creds: grpc.ChannelCredentials = None,
         channel_args: List[Tuple[str, Any]] = None,
         timeout: Optional[float] = 60,
+        use_raw_inputs: bool = False,
+        compression: Optional[grpc.Compression] = None,
+        num_channels: int = 1,
+        channel_selection: str = ROUND_ROBIN,
+        dns_load_balancing: bool = False,
+        channel_max_age_seconds: Optional[float] = None,
+        hedging: Optional[HedgingPolicy] = None,
     ):
+        if num_channels < 1:
+            raise ValueError(f"num_channels must be at least 1, got {num_channels}")
+        if channel_selection not in (ROUND_ROBIN, LEAST_OUTSTANDING):
+            raise ValueError(
+                f"Unsupported channel selection {channel_selection}, expected "
+                f"{ROUND_ROBIN} or {LEAST_OUTSTANDING}"
+            )
 
         # requires appending the port to the predictor host for gRPC to work
         if ":" not in url:
@@ -154,9 +250,16 @@ class InferenceGRPCClient:
                 ("grpc.service_config", service_config_json),
             ]
 
-        if creds:
-            self._channel = grpc.aio.secure_channel(url, creds, options=channel_opt)
-        elif use_ssl:
+        if dns_load_balancing:
+            # Connects to all the resolved addresses and spreads the calls across them.
+            channel_opt.append(("grpc.lb_policy_name", "round_robin"))
+            if not url.startswith("dns:"):
+                url = f"dns:///{url}"
+        if num_channels > 1:
+            # Otherwise the channels with the same arguments share their connections.
+            channel_opt.append(("grpc.use_local_subchannel_pool", 1))
+
+        if not creds and use_ssl:
             rc_bytes = pk_bytes = cc_bytes = None
             if root_certificates is not None:
                 with open(root_certificates, "rb") as rc_fs:
@@ -172,12 +275,89 @@ class InferenceGRPCClient:
                 private_key=pk_bytes,
                 certificate_chain=cc_bytes,
             )
-            self._channel = grpc.aio.secure_channel(url, creds, options=channel_opt)
-        else:
-            self._channel = grpc.aio.insecure_channel(url, options=channel_opt)
-        self._client_stub = GRPCInferenceServiceStub(self._channel)
+        self._url = url
+        self._creds = creds
+        self._channel_opt = channel_opt
+        self._compression = compression
+        self._channel_selection = channel_selection
+        self._channel_max_age_seconds = channel_max_age_seconds
+        self._hedging = hedging
+        self._channels = [
+            _PooledChannel(self._create_channel()) for _ in range(num_channels)
+        ]
+        self._retired_channels: List[_PooledChannel] = []
+        self._next_channel = 0
         self._verbose = verbose
         self._timeout = timeout
+        self._use_raw_inputs = use_raw_inputs
+
+    def _create_channel(self) -> grpc.aio.Channel:
+        if self._creds:
+            return grpc.aio.secure_channel(
+                self._url,
+                self._creds,
+                options=self._channel_opt,
+                compression=self._compression,
+            )
+        return grpc.aio.insecure_channel(
+            self._url, options=self._channel_opt, compression=self._compression
+        )
+
+    def _pick_channel(self) -> Tuple[int, _PooledChannel]:
+        num_channels = len(self._channels)
+        start = self._next_channel
+        self._next_channel = (start + 1) % num_channels
+        index = start
+        if self._channel_selection == LEAST_OUTSTANDING:
+            # Ties are broken in round-robin order.
+            index = min(
+                ((start + i) % num_channels for i in range(num_channels)),
+                key=lambda i: self._channels[i].in_flight,
+            )
+        return index, self._channels[index]
+
+    async def _renew_channel(self, index: int) -> _PooledChannel:
+        expired_channel = self._channels[index]
+        pooled_channel = _PooledChannel(self._create_channel())
+        self._channels[index] = pooled_channel
+        # The calls in flight on the expired channel are completed before it is closed.
+        if expired_channel.in_flight == 0:
+            await expired_channel.channel.close()
+        else:
+            self._retired_channels.append(expired_channel)
+        return pooled_channel
+
+    @asynccontextmanager
+    async def _stub(self) -> AsyncIterator[GRPCInferenceServiceStub]:
+        """Pick a channel for a call and count the call in flight on the channel until it completes."""
+        index, pooled_channel = self._pick_channel()
+        if (
+            self._channel_max_age_seconds is not None
+            and time.monotonic() - pooled_channel.created_at
+            > self._channel_max_age_seconds
+        ):
+            pooled_channel = await self._renew_channel(index)
+        gauge = GRPC_CLIENT_INFLIGHT_REQUESTS.labels(self._url, str(index))
+        pooled_channel.in_flight += 1
+        gauge.inc()
+        try:
+            yield pooled_channel.stub
+        finally:
+            pooled_channel.in_flight -= 1
+            gauge.dec()
+            if (
+                pooled_channel.in_flight == 0
+                and pooled_channel in self._retired_channels
+            ):
+                self._retired_channels.remove(pooled_channel)
+                await pooled_channel.channel.close()
+
+    def channel_stats(self) -> List[int]:
+        """
+        Get the number of calls in flight on each channel of the client.
+        :return: a list of the calls in flight by channel.
+        """
+        return [pooled_channel.in_flight for pooled_channel in self._channels]
 
     async def __aenter__(self):
         return self
@@ -190,7 +370,9 @@ class InferenceGRPCClient:
         Close the client. Any future calls to server
         will result in an Error.
         """
-        await self._channel.close()
+        for pooled_channel in self._channels + self._retired_channels:
+            await pooled_channel.channel.close()
+        self._retired_channels.clear()
 
     async def infer(
         self,
@@ -211,7 +393,7 @@ class InferenceGRPCClient:
         metadata = headers if headers is not None else tuple()
 
         if isinstance(infer_request, InferRequest):
-            infer_request = infer_request.to_grpc()
+            infer_request = infer_request.to_grpc(use_raw_inputs=self._use_raw_inputs)
         else:
             raise InvalidInput("Invalid input format")
         if self._verbose:
@@ -219,14 +401,22 @@ class InferenceGRPCClient:
                 "metadata: {}\n infer_request: {}".format(metadata, infer_request)
             )
 
+        timeout = deadline_timeout(
+            self._timeout if isinstance(timeout, _UseClientDefault) else timeout
+        )
+
+        async def model_infer(attempt: int):
+            # Each attempt picks its channel, so a hedged request is sent to another channel.
+            async with self._stub() as stub:
+                return await stub.ModelInfer(
+                    request=infer_request, metadata=metadata, timeout=timeout
+                )
+
         try:
-            response = await self._client_stub.ModelInfer(
-                request=infer_request,
-                metadata=metadata,
-                timeout=(
-                    self._timeout if isinstance(timeout, _UseClientDefault) else timeout
-                ),
-            )
+            if self._hedging is not None:
+                response = await self._hedging.run(model_infer)
+            else:
+                response = await model_infer(0)
             response = InferResponse.from_grpc(response)
             if self._verbose:
                 logger.info("infer response: %s", response)
@@ -235,6 +425,117 @@ class InferenceGRPCClient:
             logger.error("Failed to infer: %s", rpc_error, exc_info=True)
             raise rpc_error
 
+    async def stream_infer(
+        self,
+        infer_requests: Union[AsyncIterable[InferRequest], Iterable[InferRequest]],
+        timeout: Optional[float] = None,
+        headers: Union[grpc.aio.Metadata, Sequence[Tuple[str, str]], None] = None,
+    ) -> AsyncIterator[Tuple[InferResponse, Optional[InferenceError]]]:
+        """
+        Run asynchronous inference on a stream of requests over a single ModelStreamInfer call. The server runs the
+        requests concurrently and the responses are yielded as they complete, not necessarily in the order of the
+        requests. A request without id is assigned a unique id, so its response can be matched by the id.
+        :param infer_requests: An iterable or async iterable of InferRequest objects. It is consumed as the server
+                               reads the requests, so it can be larger than the memory.
+        :param timeout: (optional) The maximum end-to-end time, in seconds, the whole stream is allowed to take.
+                        Defaults to None, no timeout, as a stream can be long-lived.
+        :param headers: (optional) Additional headers to be transmitted with the call.
+        :return: An async iterator of (response, error) tuples. The error is None if the inference succeeded,
+                 otherwise it is an InferenceError and only the id and the model name of the response are set.
+        :raises RPCError for non-OK-status of the call.
+        """
+        metadata = headers if headers is not None else tuple()
+
+        def to_grpc(infer_request: InferRequest):
+            if not isinstance(infer_request, InferRequest):
+                raise InvalidInput("Invalid input format")
+            if not infer_request.id:
+                infer_request.id = str(uuid.uuid4())
+            return infer_request.to_grpc(use_raw_inputs=self._use_raw_inputs)
+
+        async def request_iterator():
+            if isinstance(infer_requests, AsyncIterable):
+                async for infer_request in infer_requests:
+                    yield to_grpc(infer_request)
+            else:
+                for infer_request in infer_requests:
+                    yield to_grpc(infer_request)
+
+        async with self._stub() as stub:
+            call = stub.ModelStreamInfer(
+                request_iterator(), metadata=metadata, timeout=timeout
+            )
+            try:
+                async for response in call:
+                    infer_response = InferResponse.from_grpc(response.infer_response)
+                    if self._verbose:
+                        logger.info("stream infer response: %s", response)
+                    if response.error_message:
+                        yield infer_response, InferenceError(response.error_message)
+                    else:
+                        yield infer_response, None
+            except grpc.RpcError as rpc_error:
+                logger.error("Failed to stream infer: %s", rpc_error, exc_info=True)
+                raise rpc_error
+            finally:
+                call.cancel()
+
+    async def infer_stream(
+        self,
+        items: Items,
+        model_name: Optional[str] = None,
+        input_name: str = "input-0",
+        batch_size: int = 1,
+        max_in_flight: int = 8,
+        retries: int = 3,
+        retry_backoff_seconds: float = 0.1,
+        stats: Optional[BulkInferStats] = None,
+        timeout: Union[Optional[float], _UseClientDefault] = USE_CLIENT_DEFAULT,
+        headers: Union[grpc.aio.Metadata, Sequence[Tuple[str, str]], None] = None,
+    ) -> AsyncIterator[InferResponse]:
+        """
+        Run asynchronous inference on a stream of items with unary ModelInfer calls. The items are packed into
+        requests of up to batch_size rows, up to max_in_flight requests are sent concurrently, the requests failing
+        with UNAVAILABLE or RESOURCE_EXHAUSTED are retried and the responses are yielded in the order of the items.
+        See stream_infer to send the requests over a single ModelStreamInfer call instead.
+        :param items: An iterable or async iterable of InferRequest objects or rows. A row is the data of the input
+                      named input_name, or a dict of the data of the inputs by name, and is sent with a batch
+                      dimension of 1. The InferRequest objects are merged along their first dimension.
+        :param model_name: (optional) Name of the model of the rows. Required if the items are rows.
+        :param input_name: (optional) The name of the input of the rows which are not a dict. Defaults to "input-0".
+        :param batch_size: (optional) The maximum number of rows of a request. Defaults to 1, no packing.
+        :param max_in_flight: (optional) The maximum number of requests in flight. Defaults to 8.
+        :param retries: (optional) The maximum number of retries of a request failing with a transient error.
+                        Defaults to 3.
+        :param retry_backoff_seconds: (optional) The delay before the first retry, doubled on each retry.
+                                      Defaults to 0.1.
+        :param stats: (optional) A BulkInferStats object updated with the throughput and latency of the requests.
+        :param timeout: (optional) The maximum end-to-end time, in seconds, each request is allowed to take.
+        :param headers: (optional) Additional headers to be transmitted with each request.
+        :return: An async iterator of one InferResponse per item.
+        :raises RPCError for non-OK-status response, once the retries of a transient error are exhausted.
+        """
+        async for response in bulk_infer(
+            lambda request: self.infer(request, timeout=timeout, headers=headers),
+            items,
+            is_transient=_is_transient_grpc_error,
+            model_name=model_name,
+            input_name=input_name,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            retries=retries,
+            retry_backoff_seconds=retry_backoff_seconds,
+            stats=stats,
+        ):
+            yield response
+
+    async def infer_many(self, items: Items, **kwargs) -> List[InferResponse]:
+        """
+        Run asynchronous inference on the items and collect the responses. See infer_stream for the arguments.
+        :return: The list of the InferResponse objects in the order of the items.
+        """
+        return [response async for response in self.infer_stream(items, **kwargs)]
+
     async def is_server_ready(
         self,
         timeout: Union[Optional[float], _UseClientDefault] = USE_CLIENT_DEFAULT,
@@ -250,13 +551,16 @@ class InferenceGRPCClient:
         :raises RPCError for non-OK-status response.
         """
         try:
-            response: ServerReadyResponse = await self._client_stub.ServerReady(
-                ServerReadyRequest(),
-                timeout=(
-                    self._timeout if isinstance(timeout, _UseClientDefault) else timeout
-                ),
-                metadata=headers,
-            )
+            async with self._stub() as stub:
+                response: ServerReadyResponse = await stub.ServerReady(
+                    ServerReadyRequest(),
+                    timeout=(
+                        self._timeout
+                        if isinstance(timeout, _UseClientDefault)
+                        else timeout
+                    ),
+                    metadata=headers,
+                )
             if self._verbose:
                 logger.info("Server ready response: %s", response)
             return response.ready
@@ -279,13 +583,16 @@ class InferenceGRPCClient:
         :raises RPCError for non-OK-status response.
         """
         try:
-            response: ServerLiveResponse = await self._client_stub.ServerLive(
-                ServerLiveRequest(),
-                timeout=(
-                    self._timeout if isinstance(timeout, _UseClientDefault) else timeout
-                ),
-                metadata=headers,
-            )
+            async with self._stub() as stub:
+                response: ServerLiveResponse = await stub.ServerLive(
+                    ServerLiveRequest(),
+                    timeout=(
+                        self._timeout
+                        if isinstance(timeout, _UseClientDefault)
+                        else timeout
+                    ),
+                    metadata=headers,
+                )
             if self._verbose:
                 logger.info("Server live response: %s", response)
             return response.live
@@ -310,13 +617,16 @@ class InferenceGRPCClient:
         :raises RPCError for non-OK-status response or specified model not found.
         """
         try:
-            response: ModelReadyResponse = await self._client_stub.ModelReady(
-                ModelReadyRequest(name=model_name),
-                timeout=(
-                    self._timeout if isinstance(timeout, _UseClientDefault) else timeout
-                ),
-                metadata=headers,
-            )
+            async with self._stub() as stub:
+                response: ModelReadyResponse = await stub.ModelReady(
+                    ModelReadyRequest(name=model_name),
+                    timeout=(
+                        self._timeout
+                        if isinstance(timeout, _UseClientDefault)
+                        else timeout
+                    ),
+                    metadata=headers,
+                )
             if self._verbose:
                 logger.info("Model %s ready response: %s", model_name, response)
             return response.ready
@@ -329,6 +639,128 @@ class InferenceGRPCClient:
             )
             raise rpc_error
 
+    async def register_system_shared_memory(
+        self,
+        name: str,
+        key: str,
+        byte_size: int,
+        offset: int = 0,
+        timeout: Union[Optional[float], _UseClientDefault] = USE_CLIENT_DEFAULT,
+        headers: Union[grpc.aio.Metadata, Sequence[Tuple[str, str]], None] = None,
+    ):
+        """
+        Register a system shared memory region with the inference server.
+        :param name: The name of the region.
+        :param key: The key of the underlying POSIX shared memory object, e.g. /input_data.
+        :param byte_size: The size of the region in bytes.
+        :param offset: (optional) The offset of the region in the shared memory object. Defaults to 0.
+        :param timeout: (optional) The maximum end-to-end time, in seconds, the request is allowed to take.
+                        The default value is 60 seconds. To disable timeout explicitly set it to 'None'.
+                        This will override the client's timeout.
+        :param headers: (optional) Additional headers to be transmitted with the request.
+        :raises RPCError for non-OK-status response.
+        """
+        try:
+            async with self._stub() as stub:
+                await stub.SystemSharedMemoryRegister(
+                    SystemSharedMemoryRegisterRequest(
+                        name=name, key=key, offset=offset, byte_size=byte_size
+                    ),
+                    timeout=(
+                        self._timeout
+                        if isinstance(timeout, _UseClientDefault)
+                        else timeout
+                    ),
+                    metadata=headers,
+                )
+            if self._verbose:
+                logger.info("Registered system shared memory region %s", name)
+        except grpc.RpcError as rpc_error:
+            logger.error(
+                "Failed to register system shared memory region %s: %s",
+                name,
+                rpc_error,
+                exc_info=True,
+            )
+            raise rpc_error
+
+    async def unregister_system_shared_memory(
+        self,
+        name: str = "",
+        timeout: Union[Optional[float], _UseClientDefault] = USE_CLIENT_DEFAULT,
+        headers: Union[grpc.aio.Metadata, Sequence[Tuple[str, str]], None] = None,
+    ):
+        """
+        Unregister a system shared memory region from the inference server.
+        :param name: (optional) The name of the region. All the regions are unregistered if not set.
+        :param timeout: (optional) The maximum end-to-end time, in seconds, the request is allowed to take.
+                        The default value is 60 seconds. To disable timeout explicitly set it to 'None'.
+                        This will override the client's timeout.
+        :param headers: (optional) Additional headers to be transmitted with the request.
+        :raises RPCError for non-OK-status response.
+        """
+        try:
+            async with self._stub() as stub:
+                await stub.SystemSharedMemoryUnregister(
+                    SystemSharedMemoryUnregisterRequest(name=name),
+                    timeout=(
+                        self._timeout
+                        if isinstance(timeout, _UseClientDefault)
+                        else timeout
+                    ),
+                    metadata=headers,
+                )
+            if self._verbose:
+                logger.info("Unregistered system shared memory region %s", name)
+        except grpc.RpcError as rpc_error:
+            logger.error(
+                "Failed to unregister system shared memory region %s: %s",
+                name,
+                rpc_error,
+                exc_info=True,
+            )
+            raise rpc_error
+
+    async def get_system_shared_memory_status(
+        self,
+        name: str = "",
+        timeout: Union[Optional[float], _UseClientDefault] = USE_CLIENT_DEFAULT,
+        headers: Union[grpc.aio.Metadata, Sequence[Tuple[str, str]], None] = None,
+    ) -> SystemSharedMemoryStatusResponse:
+        """
+        Get the status of the system shared memory regions registered with the inference server.
+        :param name: (optional) The name of the region. The status of all the regions is returned if not set.
+        :param timeout: (optional) The maximum end-to-end time, in seconds, the request is allowed to take.
+                        The default value is 60 seconds. To disable timeout explicitly set it to 'None'.
+                        This will override the client's timeout.
+        :param headers: (optional) Additional headers to be transmitted with the request.
+        :return: SystemSharedMemoryStatusResponse with the status of the regions by name.
+        :raises RPCError for non-OK-status response or specified region not found.
+        """
+        try:
+            async with self._stub() as stub:
+                response: SystemSharedMemoryStatusResponse = (
+                    await stub.SystemSharedMemoryStatus(
+                        SystemSharedMemoryStatusRequest(name=name),
+                        timeout=(
+                            self._timeout
+                            if isinstance(timeout, _UseClientDefault)
+                            else timeout
+                        ),
+                        metadata=headers,
+                    )
+                )
+            if self._verbose:
+                logger.info("System shared memory status response: %s", response)
+            return response
+        except grpc.RpcError as rpc_error:
+            logger.error(
+                "Failed to get system shared memory status: %s",
+                rpc_error,
+                exc_info=True,
+            )
+            raise rpc_error
+
 
 class RESTConfig:
     """
@@ -349,6 +781,18 @@ class RESTConfig:
                   (which will disable verification).
     :param auth (optional) An authentication class to use when sending inference requests. Refer httpx
     :param verbose (optional) A boolean to enable verbose logging. Defaults to False.
+    :param compression (optional) The content encoding of the request bodies, "gzip" or "zstd" (requires zstandard).
+                       The compressed responses are always accepted. Defaults to None, the requests are not
+                       compressed.
+    :param max_connections (optional) The maximum number of pooled connections. With HTTP/2, each connection
+                           multiplexes the concurrent requests to a host. Defaults to 100. None means no limit.
+    :param max_keepalive_connections (optional) The maximum number of idle connections kept alive. Defaults to 20.
+                                     None means no limit.
+    :param keepalive_expiry (optional) The seconds an idle connection is kept alive. Defaults to 5.
+    :param pool_timeout (optional) The maximum seconds a request waits for a connection of the pool, before
+                        raising httpx.PoolTimeout. Defaults to None, the timeout of the request applies.
+    :param hedging (optional) A HedgingPolicy to duplicate the slow inference requests, the first response is used
+                   and the other requests are cancelled. Defaults to None, the requests are not hedged.
     """
 
     def __init__(
@@ -362,6 +806,12 @@ class RESTConfig:
         verify: Union[str, bool, ssl.SSLContext] = True,
         auth=None,
         verbose: bool = False,
+        compression: Optional[str] = None,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        pool_timeout: Optional[float] = None,
+        hedging: Optional[HedgingPolicy] = None,
     ):
         self.transport = transport
         self.protocol = (
@@ -376,13 +826,75 @@ class RESTConfig:
         self.auth = auth
         self.transport = transport
         self.verbose = verbose
-        if self.transport is None:
-            httpx.AsyncHTTPTransport(
-                retries=self.retries,
-                http2=self.http2,
-                cert=self.cert,
-                verify=self.verify,
-            )
+        self.compression = compression
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.pool_timeout = pool_timeout
+        self.hedging = hedging
+
+
+class ConnectionPoolStats(NamedTuple):
+    """Snapshot of the requests of a REST inference client."""
+
+    active_requests: int
+    waiting_requests: int
+
+
+class _CountedByteStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class _RequestCountingTransport(httpx.AsyncBaseTransport):
+    """Counts the requests in flight, from when they are sent until their response is closed."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+        self.requests = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self.requests -= 1
+            raise
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self.requests -= 1
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_CountedByteStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    async def __aenter__(self):
+        await self._transport.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type=None, exc_value=None, traceback=None):
+        await self._transport.__aexit__(exc_type, exc_value, traceback)
+
+    async def aclose(self):
+        await self._transport.aclose()
 
 
 class InferenceRESTClient:
@@ -393,10 +905,32 @@ class InferenceRESTClient:
 
     def __init__(self, config: RESTConfig = None):
         self._config = RESTConfig() if config is None else config
+        transport = self._config.transport
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(
+                retries=self._config.retries,
+                http2=self._config.http2,
+                cert=self._config.cert,
+                verify=self._config.verify,
+                limits=httpx.Limits(
+                    max_connections=self._config.max_connections,
+                    max_keepalive_connections=self._config.max_keepalive_connections,
+                    keepalive_expiry=self._config.keepalive_expiry,
+                ),
+            )
+        timeout = httpx.Timeout(self._config.timeout)
+        if self._config.pool_timeout is not None:
+            timeout = httpx.Timeout(
+                connect=timeout.connect,
+                read=timeout.read,
+                write=timeout.write,
+                pool=self._config.pool_timeout,
+            )
+        self._transport = _RequestCountingTransport(transport)
         self._client = httpx.AsyncClient(
-            transport=self._config.transport,
+            transport=self._transport,
             http2=self._config.http2,
-            timeout=self._config.timeout,
+            timeout=timeout,
             auth=self._config.auth,
             verify=self._config.verify,
         )
@@ -419,6 +953,26 @@ class InferenceRESTClient:
             relative_url = "/" + relative_url
         return base_url.join(base_url.path + relative_url)
 
+    def _infer_url(
+        self,
+        base_url: Union[httpx.URL, str],
+        model_name: Optional[str],
+        is_graph_endpoint: bool,
+    ) -> Union[httpx.URL, str]:
+        if is_graph_endpoint:
+            return base_url
+        elif model_name is None:
+            raise ValueError("model_name should not be 'None'")
+        elif is_v1(self._config.protocol):
+            return self._construct_url(
+                base_url, f"{self._config.protocol}/models/{model_name}:predict"
+            )
+        elif is_v2(self._config.protocol):
+            return self._construct_url(
+                base_url, f"{self._config.protocol}/models/{model_name}/infer"
+            )
+        raise UnsupportedProtocol(self._config.protocol)
+
     def _consturct_http_status_error(
         self, response: httpx.Response
     ) -> httpx.HTTPStatusError:
@@ -447,6 +1001,7 @@ class InferenceRESTClient:
         response_headers: Dict[str, str] = None,
         is_graph_endpoint: bool = False,
         timeout: Union[float, None, tuple, httpx.Timeout] = httpx.USE_CLIENT_DEFAULT,
+        hedge_base_urls: Optional[Sequence[Union[httpx.URL, str]]] = None,
     ) -> Union[InferResponse, Dict]:
         """
         Run asynchronous inference using the supplied data.
@@ -461,27 +1016,23 @@ class InferenceRESTClient:
                                   Defaults to False.
         :param timeout: (optional) The maximum end-to-end time, in seconds, the request is allowed to take. This will
                         override the timeout in the RESTConfig. The default value is 60 seconds.
-                        To disable timeout explicitly set it to 'None'.
+                        To disable timeout explicitly set it to 'None'. While a request is served by the model
+                        server, the remaining time budget of the request also applies and is propagated in the
+                        x-request-timeout-ms header.
+        :param hedge_base_urls: (optional) Base urls of other replicas of the inference server the hedged requests
+                                are sent to, if hedging is enabled in the RESTConfig. Defaults to None, the hedged
+                                requests are sent to base_url over other connections.
         :return: Inference result as InferResponse object or python dict.
         :raises HTTPStatusError for response codes other than 2xx.
         :raises UnsupportedProtocol if the specified protocol version is not supported.
+        :raises InferenceError if the deadline of the request being served is exceeded.
         """
-        if is_graph_endpoint:
-            url = base_url
-        elif model_name is None:
-            raise ValueError("model_name should not be 'None'")
-        elif is_v1(self._config.protocol):
-            url = self._construct_url(
-                base_url, f"{self._config.protocol}/models/{model_name}:predict"
-            )
-        elif is_v2(self._config.protocol):
-            url = self._construct_url(
-                base_url, f"{self._config.protocol}/models/{model_name}/infer"
-            )
-        else:
-            raise UnsupportedProtocol(self._config.protocol)
+        urls = [
+            self._infer_url(url, model_name, is_graph_endpoint)
+            for url in [base_url, *(hedge_base_urls or [])]
+        ]
         if self._config.verbose:
-            logger.info("url: %s", url)
+            logger.info("url: %s", urls[0])
             logger.info("request data: %s", data)
         if isinstance(data, InferRequest):
             data, json_length = data.to_rest()
@@ -491,15 +1042,50 @@ class InferenceRESTClient:
                 headers["content-type"] = "application/octet-stream"
         if isinstance(data, dict):
             data = orjson.dumps(data)
-        response = await self._client.post(
-            url, content=data, headers=headers, timeout=timeout
-        )
-        if self._config.verbose:
-            logger.info(
-                "response code: %s, content: %s", response.status_code, response.text
+        if self._config.compression:
+            data = compress(data, self._config.compression)
+            headers = dict(headers or {})
+            headers["content-encoding"] = self._config.compression
+        # The remaining time budget of the request being served is propagated to the server.
+        remaining = deadline_timeout(None)
+        if remaining is not None:
+            headers = dict(headers or {})
+            headers[REQUEST_TIMEOUT_HEADER] = str(int(remaining * 1000))
+
+        async def post(attempt: int) -> httpx.Response:
+            # The hedged requests are sent to the hedge urls in turn, if any.
+            response = await self._client.post(
+                urls[attempt % len(urls)],
+                content=data,
+                headers=headers,
+                timeout=timeout,
             )
-        if not response.is_success:
-            raise self._consturct_http_status_error(response)
+            if self._config.verbose:
+                logger.info(
+                    "response code: %s, content: %s",
+                    response.status_code,
+                    response.text,
+                )
+            # An error response fails the attempt, so it does not win over a hedged request and its
+            # latency is not recorded.
+            if not response.is_success:
+                raise self._consturct_http_status_error(response)
+            return response
+
+        if self._config.hedging is not None:
+            request = self._config.hedging.run(post)
+        else:
+            request = post(0)
+        if remaining is None:
+            response = await request
+        else:
+            try:
+                response = await asyncio.wait_for(request, remaining)
+            except asyncio.TimeoutError:
+                raise InferenceError(
+                    "The deadline of the request is exceeded",
+                    status="DEADLINE_EXCEEDED",
+                )
         if response_headers is not None:
             response_headers.update(response.headers)
         # If inference graph result, return it as dict
@@ -515,6 +1101,83 @@ class InferenceRESTClient:
             output = orjson.loads(response.content)
         return output
 
+    async def infer_stream(
+        self,
+        base_url: Union[httpx.URL, str],
+        items: Items,
+        model_name: Optional[str] = None,
+        input_name: str = "input-0",
+        batch_size: int = 1,
+        max_in_flight: int = 8,
+        retries: int = 3,
+        retry_backoff_seconds: float = 0.1,
+        stats: Optional[BulkInferStats] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Union[float, None, tuple, httpx.Timeout] = httpx.USE_CLIENT_DEFAULT,
+    ) -> AsyncIterator[InferResponse]:
+        """
+        Run asynchronous inference on a stream of items with the v2 protocol. The items are packed into requests
+        of up to batch_size rows, up to max_in_flight requests are sent concurrently, the requests failing with
+        a transport error or a 429, 502, 503 or 504 status are retried and the responses are yielded in the order
+        of the items.
+        :param base_url: Base url of the inference server. E.g. https://example.com:443
+        :param items: An iterable or async iterable of InferRequest objects or rows. A row is the data of the input
+                      named input_name, or a dict of the data of the inputs by name, and is sent with a batch
+                      dimension of 1. The InferRequest objects are merged along their first dimension.
+        :param model_name: (optional) Name of the model of the rows. Required if the items are rows.
+        :param input_name: (optional) The name of the input of the rows which are not a dict. Defaults to "input-0".
+        :param batch_size: (optional) The maximum number of rows of a request. Defaults to 1, no packing.
+        :param max_in_flight: (optional) The maximum number of requests in flight. Defaults to 8.
+        :param retries: (optional) The maximum number of retries of a request failing with a transient error.
+                        Defaults to 3.
+        :param retry_backoff_seconds: (optional) The delay before the first retry, doubled on each retry.
+                                      Defaults to 0.1.
+        :param stats: (optional) A BulkInferStats object updated with the throughput and latency of the requests.
+        :param headers: (optional) HTTP headers to include when sending each request.
+        :param timeout: (optional) The maximum end-to-end time, in seconds, each request is allowed to take.
+        :return: An async iterator of one InferResponse per item.
+        :raises HTTPStatusError for response codes other than 2xx, once the retries of a transient error are
+                exhausted.
+        :raises UnsupportedProtocol if the protocol of the client is not v2.
+        """
+        if not is_v2(self._config.protocol):
+            raise UnsupportedProtocol(self._config.protocol)
+
+        async def infer(request: InferRequest) -> InferResponse:
+            # The headers are copied, infer sets the length of the binary request in them.
+            return await self.infer(
+                base_url,
+                request,
+                model_name=request.model_name,
+                headers=dict(headers) if headers else None,
+                timeout=timeout,
+            )
+
+        async for response in bulk_infer(
+            infer,
+            items,
+            is_transient=_is_transient_http_error,
+            model_name=model_name,
+            input_name=input_name,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            retries=retries,
+            retry_backoff_seconds=retry_backoff_seconds,
+            stats=stats,
+        ):
+            yield response
+
+    async def infer_many(
+        self, base_url: Union[httpx.URL, str], items: Items, **kwargs
+    ) -> List[InferResponse]:
+        """
+        Run asynchronous inference on the items and collect the responses. See infer_stream for the arguments.
+        :return: The list of the InferResponse objects in the order of the items.
+        """
+        return [
+            response async for response in self.infer_stream(base_url, items, **kwargs)
+        ]
+
     async def explain(
         self,
         base_url: Union[httpx.URL, str],
@@ -674,6 +1337,147 @@ class InferenceRESTClient:
             raise self._consturct_http_status_error(response)
         return response.json().get("ready")
 
+    async def register_system_shared_memory(
+        self,
+        base_url: Union[httpx.URL, str],
+        name: str,
+        key: str,
+        byte_size: int,
+        offset: int = 0,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Union[float, None, tuple, httpx.Timeout] = httpx.USE_CLIENT_DEFAULT,
+    ):
+        """
+        Register a system shared memory region with the inference server.
+        :param base_url: Base url of the inference server. E.g. https://example.com:443, https://example.com:443/serving
+        :param name: The name of the region.
+        :param key: The key of the underlying POSIX shared memory object, e.g. /input_data.
+        :param byte_size: The size of the region in bytes.
+        :param offset: (optional) The offset of the region in the shared memory object. Defaults to 0.
+        :param headers: (optional) HTTP headers to include when sending request.
+        :param timeout: (optional) The maximum end-to-end time, in seconds, the request is allowed to take. This will
+                        override the timeout in the RESTConfig. The default value is 60 seconds.
+                        To disable timeout explicitly set it to 'None'.
+        :raises HTTPStatusError for response codes other than 2xx.
+        :raises UnsupportedProtocol if the specified protocol version is not supported.
+        """
+        if not is_v2(self._config.protocol):
+            raise UnsupportedProtocol(protocol_version=self._config.protocol)
+        url = self._construct_url(
+            base_url,
+            f"{self._config.protocol}/systemsharedmemory/region/{name}/register",
+        )
+        if self._config.verbose:
+            logger.info("url: %s, protocol_version: %s", url, self._config.protocol)
+        response = await self._client.post(
+            url,
+            json={"key": key, "offset": offset, "byte_size": byte_size},
+            headers=headers,
+            timeout=timeout,
+        )
+        if self._config.verbose:
+            logger.info(
+                "response code: %s, content: %s", response.status_code, response.text
+            )
+        if not response.is_success:
+            raise self._consturct_http_status_error(response)
+
+    async def unregister_system_shared_memory(
+        self,
+        base_url: Union[httpx.URL, str],
+        name: str = "",
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Union[float, None, tuple, httpx.Timeout] = httpx.USE_CLIENT_DEFAULT,
+    ):
+        """
+        Unregister a system shared memory region from the inference server.
+        :param base_url: Base url of the inference server. E.g. https://example.com:443, https://example.com:443/serving
+        :param name: (optional) The name of the region. All the regions are unregistered if not set.
+        :param headers: (optional) HTTP headers to include when sending request.
+        :param timeout: (optional) The maximum end-to-end time, in seconds, the request is allowed to take. This will
+                        override the timeout in the RESTConfig. The default value is 60 seconds.
+                        To disable timeout explicitly set it to 'None'.
+        :raises HTTPStatusError for response codes other than 2xx.
+        :raises UnsupportedProtocol if the specified protocol version is not supported.
+        """
+        if not is_v2(self._config.protocol):
+            raise UnsupportedProtocol(protocol_version=self._config.protocol)
+        if name:
+            relative_url = (
+                f"{self._config.protocol}/systemsharedmemory/region/{name}/unregister"
+            )
+        else:
+            relative_url = f"{self._config.protocol}/systemsharedmemory/unregister"
+        url = self._construct_url(base_url, relative_url)
+        if self._config.verbose:
+            logger.info("url: %s, protocol_version: %s", url, self._config.protocol)
+        response = await self._client.post(url, headers=headers, timeout=timeout)
+        if self._config.verbose:
+            logger.info(
+                "response code: %s, content: %s", response.status_code, response.text
+            )
+        if not response.is_success:
+            raise self._consturct_http_status_error(response)
+
+    async def get_system_shared_memory_status(
+        self,
+        base_url: Union[httpx.URL, str],
+        name: str = "",
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Union[float, None, tuple, httpx.Timeout] = httpx.USE_CLIENT_DEFAULT,
+    ) -> List[Dict]:
+        """
+        Get the status of the system shared memory regions registered with the inference server.
+        :param base_url: Base url of the inference server. E.g. https://example.com:443, https://example.com:443/serving
+        :param name: (optional) The name of the region. The status of all the regions is returned if not set.
+        :param headers: (optional) HTTP headers to include when sending request.
+        :param timeout: (optional) The maximum end-to-end time, in seconds, the request is allowed to take. This will
+                        override the timeout in the RESTConfig. The default value is 60 seconds.
+                        To disable timeout explicitly set it to 'None'.
+        :return: List of the name, key, offset and byte size of the regions.
+        :raises HTTPStatusError for response codes other than 2xx.
+        :raises UnsupportedProtocol if the specified protocol version is not supported.
+        """
+        if not is_v2(self._config.protocol):
+            raise UnsupportedProtocol(protocol_version=self._config.protocol)
+        if name:
+            relative_url = (
+                f"{self._config.protocol}/systemsharedmemory/region/{name}/status"
+            )
+        else:
+            relative_url = f"{self._config.protocol}/systemsharedmemory/status"
+        url = self._construct_url(base_url, relative_url)
+        if self._config.verbose:
+            logger.info("url: %s, protocol_version: %s", url, self._config.protocol)
+        response = await self._client.get(url, headers=headers, timeout=timeout)
+        if self._config.verbose:
+            logger.info(
+                "response code: %s, content: %s", response.status_code, response.text
+            )
+        if not response.is_success:
+            raise self._consturct_http_status_error(response)
+        return response.json()
+
+    def pool_stats(self) -> ConnectionPoolStats:
+        """
+        Get the current usage of the connection pool of the client. The requests waiting for a connection
+        show the pool is saturated. With HTTP/1.1, a connection serves one request at a time, so the requests
+        beyond max_connections wait. With HTTP/2 or a custom transport, the requests are not known to wait.
+        :return: a ConnectionPoolStats object
+        """
+        requests = self._transport.requests
+        max_connections = self._config.max_connections
+        if (
+            self._config.transport is not None
+            or self._config.http2
+            or max_connections is None
+        ):
+            return ConnectionPoolStats(active_requests=requests, waiting_requests=0)
+        return ConnectionPoolStats(
+            active_requests=min(requests, max_connections),
+            waiting_requests=max(0, requests - max_connections),
+        )
+
     async def close(self):
         """
         Close the client, transport and proxies.
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from prometheus_client import Histogram
+from prometheus_client import Counter, Gauge, Histogram
 from pydantic import BaseModel
 
 PROM_LABELS = ["model_name"]
@@ -28,6 +28,48 @@ PREDICT_HIST_TIME = Histogram(
 EXPLAIN_HIST_TIME = Histogram(
     "request_explain_seconds", "explain request latency", PROM_LABELS
 )
+BATCH_SIZE_HIST = Histogram(
+    "request_predict_batch_size",
+    "number of rows per dynamically batched predict call",
+    PROM_LABELS,
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024),
+)
+COMPRESSION_LABELS = ["direction", "encoding"]
+COMPRESSION_RAW_BYTES = Counter(
+    "http_compression_raw_bytes",
+    "uncompressed size of the compressed request and response bodies",
+    COMPRESSION_LABELS,
+)
+COMPRESSION_COMPRESSED_BYTES = Counter(
+    "http_compression_compressed_bytes",
+    "compressed size of the compressed request and response bodies",
+    COMPRESSION_LABELS,
+)
+PREDICTOR_ACTIVE_REQUESTS = Gauge(
+    "predictor_client_active_requests",
+    "requests of the transformer to the predictor served on a pooled connection",
+    PROM_LABELS,
+    multiprocess_mode="livesum",
+)
+PREDICTOR_WAITING_REQUESTS = Gauge(
+    "predictor_client_waiting_requests",
+    "requests of the transformer to the predictor waiting for a pooled connection",
+    PROM_LABELS,
+    multiprocess_mode="livesum",
+)
+GRPC_CLIENT_INFLIGHT_REQUESTS = Gauge(
+    "grpc_client_channel_inflight_requests",
+    "calls in flight on each channel of the gRPC inference client",
+    ["target", "channel"],
+)
+HEDGED_REQUESTS = Counter(
+    "inference_client_hedged_requests",
+    "duplicate requests sent by the inference clients to hedge slow requests",
+)
+HEDGED_REQUESTS_WON = Counter(
+    "inference_client_hedged_requests_won",
+    "hedged requests completed by a duplicate before the original request",
+)
 
 
 class LLMStats(BaseModel):
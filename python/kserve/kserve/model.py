@@ -12,20 +12,28 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import functools
 import inspect
 import time
 from abc import ABC, abstractmethod
 from enum import Enum
 from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Union
 
+import numpy as np
+import pandas as pd
 from cloudevents.http import CloudEvent
 
 from .constants.constants import (
     PredictorProtocol,
     PREDICTOR_BASE_URL_FORMAT,
     EXPLAINER_BASE_URL_FORMAT,
+    LOCAL_PREDICTOR_SCHEME,
 )
-from .errors import InvalidInput
+from .batcher import DynamicBatcher
+from .errors import InferenceError, InvalidInput
+from .executor import ExecutionPolicy, ProcessPoolPredictor
+from .hedging import HedgingPolicy
 from .inference_client import RESTConfig, InferenceRESTClient, InferenceGRPCClient
 from .logging import trace_logger
 from .metrics import (
@@ -33,6 +41,8 @@ from .metrics import (
     POST_HIST_TIME,
     PRE_HIST_TIME,
     PREDICT_HIST_TIME,
+    PREDICTOR_ACTIVE_REQUESTS,
+    PREDICTOR_WAITING_REQUESTS,
     get_labels,
 )
 from .protocol.grpc.grpc_predict_v2_pb2 import ModelInferRequest
@@ -139,19 +149,66 @@ class PredictorConfig:
         predictor_protocol: str = PredictorProtocol.REST_V1.value,
         predictor_use_ssl: bool = False,
         predictor_request_timeout_seconds: int = 600,
+        predictor_grpc_raw_inputs: bool = False,
+        predictor_http2: bool = False,
+        predictor_max_connections: Optional[int] = 100,
+        predictor_max_keepalive_connections: Optional[int] = 20,
+        predictor_keepalive_expiry_seconds: Optional[float] = 5.0,
+        predictor_pool_timeout_seconds: Optional[float] = None,
+        predictor_grpc_channels: int = 1,
+        predictor_grpc_channel_selection: str = "round_robin",
+        predictor_grpc_dns_load_balancing: bool = False,
+        predictor_grpc_channel_max_age_seconds: Optional[float] = None,
+        predictor_hedging_percentile: Optional[float] = None,
     ):
         """The configuration for the http call to the predictor
 
         Args:
-            predictor_host: The host name of the predictor
+            predictor_host: The host name of the predictor, or local://<model name> to call a predictor model
+                registered in the same model server in-process, without serializing the requests
             predictor_protocol: The inference protocol used for predictor http call
             predictor_use_ssl: Enable using ssl for http connection to the predictor
             predictor_request_timeout_seconds: The request timeout seconds for the predictor http call
+            predictor_grpc_raw_inputs: Send all the inputs of the gRPC requests to the predictor as raw contents
+            predictor_http2: Multiplex the http calls to the predictor over HTTP/2 connections (requires h2)
+            predictor_max_connections: The maximum number of connections to the predictor, None for no limit
+            predictor_max_keepalive_connections: The maximum number of idle connections kept alive to the predictor
+            predictor_keepalive_expiry_seconds: The seconds an idle connection to the predictor is kept alive
+            predictor_pool_timeout_seconds: The maximum seconds a predictor http call waits for a pooled
+                connection, None to only apply the request timeout
+            predictor_grpc_channels: The number of gRPC channels to the predictor, each with its own connections
+            predictor_grpc_channel_selection: How a gRPC call picks its channel, round_robin or least_outstanding
+            predictor_grpc_dns_load_balancing: Balance the gRPC calls across all the resolved addresses of the
+                predictor host, e.g. the endpoints of a headless service
+            predictor_grpc_channel_max_age_seconds: The seconds after which a gRPC channel is replaced, so the
+                predictor host is resolved again, None to never replace the channels
+            predictor_hedging_percentile: Hedge the calls to the predictor still running after this percentile
+                of the recent latencies with a duplicate call, None to disable hedging
         """
+        if predictor_http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "predictor_http2 requires the h2 package. Install it with: pip install httpx[http2]"
+                )
         self.predictor_host = predictor_host
         self.predictor_protocol = predictor_protocol
         self.predictor_use_ssl = predictor_use_ssl
         self.predictor_request_timeout_seconds = predictor_request_timeout_seconds
+        self.predictor_grpc_raw_inputs = predictor_grpc_raw_inputs
+        self.predictor_http2 = predictor_http2
+        self.predictor_max_connections = predictor_max_connections
+        self.predictor_max_keepalive_connections = predictor_max_keepalive_connections
+        self.predictor_keepalive_expiry_seconds = predictor_keepalive_expiry_seconds
+        self.predictor_pool_timeout_seconds = predictor_pool_timeout_seconds
+        self.predictor_grpc_channels = predictor_grpc_channels
+        self.predictor_grpc_channel_selection = predictor_grpc_channel_selection
+        self.predictor_grpc_dns_load_balancing = predictor_grpc_dns_load_balancing
+        self.predictor_grpc_channel_max_age_seconds = (
+            predictor_grpc_channel_max_age_seconds
+        )
+        self.predictor_hedging_percentile = predictor_hedging_percentile
 
 
 class Model(InferenceModel):
@@ -189,11 +246,20 @@ class Model(InferenceModel):
             else 600
         )
         self.use_ssl = predictor_config.predictor_use_ssl if predictor_config else False
+        self.grpc_raw_inputs = (
+            predictor_config.predictor_grpc_raw_inputs if predictor_config else False
+        )
+        self.predictor_config = predictor_config or PredictorConfig(None)
+        # Set when the model is registered in a model server, to call a local predictor.
+        self.dataplane = None
         self.explainer_host = None
         self._http_client_instance = None
         self._grpc_client_stub = None
         self.enable_latency_logging = False
         self.required_response_headers = return_response_headers
+        self._batcher: Optional[DynamicBatcher] = None
+        self.execution_policy = ExecutionPolicy.INLINE
+        self._process_predictor: Optional[ProcessPoolPredictor] = None
 
     async def __call__(
         self,
@@ -242,18 +308,14 @@ class Model(InferenceModel):
         elif verb == InferenceVerb.PREDICT:
             with PREDICT_HIST_TIME.labels(**prom_labels).time():
                 start = time.time()
-                if self.required_response_headers:
-                    response = (
-                        (await self.predict(payload, headers, response_headers))
-                        if inspect.iscoroutinefunction(self.predict)
-                        else self.predict(payload, headers, response_headers)
+                if self._batcher is not None and not self.required_response_headers:
+                    response = await self._batcher.submit(payload, headers)
+                elif self.required_response_headers:
+                    response = await self._call_predict(
+                        payload, headers, response_headers
                     )
                 else:
-                    response = (
-                        (await self.predict(payload, headers))
-                        if inspect.iscoroutinefunction(self.predict)
-                        else self.predict(payload, headers)
-                    )
+                    response = await self._call_predict(payload, headers)
                 predict_ms = get_latency_ms(start, time.time())
         else:
             raise NotImplementedError
@@ -283,18 +345,133 @@ class Model(InferenceModel):
 
         return response, response_headers
 
+    def enable_dynamic_batching(
+        self, max_batch_size: int = 32, max_latency_ms: float = 5.0
+    ):
+        """Enable server side dynamic batching for the predict handler.
+
+        Concurrent requests are merged along the batch axis into a single predict call of up to
+        ``max_batch_size`` rows. A request waits at most ``max_latency_ms`` for the batch to fill up.
+        Dynamic batching is not applied when the model returns response headers. A request predicted
+        alone is passed its own headers, a merged batch the headers with the same value in all its requests.
+
+        Args:
+            max_batch_size: The maximum number of rows (v1 instances or v2 first dimension) in a batch.
+            max_latency_ms: The maximum time in milliseconds a request waits for other requests.
+        """
+        self._batcher = DynamicBatcher(
+            self.name,
+            self._predict_batch,
+            max_batch_size=max_batch_size,
+            max_latency_ms=max_latency_ms,
+        )
+
+    def disable_dynamic_batching(self):
+        """Disable server side dynamic batching for the predict handler."""
+        self._batcher = None
+
+    async def _predict_batch(
+        self,
+        payload: Union[Dict, InferRequest],
+        headers: Dict[str, str],
+    ) -> Union[Dict, InferResponse]:
+        return await self._call_predict(payload, headers)
+
+    def set_execution_policy(
+        self,
+        policy: Union[ExecutionPolicy, str],
+        workers: Optional[int] = None,
+    ):
+        """Set where a synchronous predict handler is executed.
+
+        Args:
+            policy: ``inline`` runs predict on the event loop thread, ``thread`` in the default executor
+                    of the event loop and ``process`` in a pool of worker processes forked with the loaded
+                    model. Asynchronous predict handlers always run on the event loop.
+            workers: The number of worker processes of the ``process`` policy. Defaults to the number of CPUs.
+        """
+        policy = ExecutionPolicy(policy)
+        if self._process_predictor is not None:
+            self._process_predictor.shutdown()
+            self._process_predictor = None
+        if policy == ExecutionPolicy.PROCESS:
+            self._process_predictor = ProcessPoolPredictor(self, workers)
+        self.execution_policy = policy
+
+    def start_execution_workers(self):
+        """Fork the worker processes of the ``process`` execution policy. It must be called in the
+        process serving the model, before the servers are started."""
+        if self._process_predictor is not None:
+            self._process_predictor.start()
+
+    async def _call_predict(
+        self,
+        payload: Union[Dict, InferRequest],
+        headers: Dict[str, str],
+        response_headers: Optional[Dict[str, str]] = None,
+    ) -> Union[Dict, InferResponse]:
+        args = (payload, headers)
+        if response_headers is not None:
+            args += (response_headers,)
+        if inspect.iscoroutinefunction(self.predict):
+            return await self.predict(*args)
+        if self.execution_policy == ExecutionPolicy.THREAD:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(self.predict, *args)
+            )
+        if self.execution_policy == ExecutionPolicy.PROCESS:
+            return await self._process_predictor.predict(
+                payload, headers, response_headers
+            )
+        return self.predict(*args)
+
+    def stop(self):
+        if self._process_predictor is not None:
+            self._process_predictor.shutdown()
+        super().stop()
+
+    def _hedging_policy(self) -> Optional[HedgingPolicy]:
+        percentile = self.predictor_config.predictor_hedging_percentile
+        return HedgingPolicy(percentile) if percentile is not None else None
+
     @property
     def _http_client(self) -> InferenceRESTClient:
         if self._http_client_instance is None and self.predictor_host:
-            config = RESTConfig(protocol=self.protocol, timeout=self.timeout, retries=3)
+            config = RESTConfig(
+                protocol=self.protocol,
+                timeout=self.timeout,
+                retries=3,
+                http2=self.predictor_config.predictor_http2,
+                max_connections=self.predictor_config.predictor_max_connections,
+                max_keepalive_connections=self.predictor_config.predictor_max_keepalive_connections,
+                keepalive_expiry=self.predictor_config.predictor_keepalive_expiry_seconds,
+                pool_timeout=self.predictor_config.predictor_pool_timeout_seconds,
+                hedging=self._hedging_policy(),
+            )
             self._http_client_instance = InferenceRESTClient(config=config)
         return self._http_client_instance
 
+    def _record_pool_stats(self):
+        # The pool is sampled when a predictor call starts and ends, rather than read by a callback at
+        # scrape time, so the gauges are also collected from the pre-forked worker processes.
+        stats = self._http_client.pool_stats()
+        labels = get_labels(self.name)
+        PREDICTOR_ACTIVE_REQUESTS.labels(**labels).set(stats.active_requests)
+        PREDICTOR_WAITING_REQUESTS.labels(**labels).set(stats.waiting_requests)
+
     @property
     def _grpc_client(self) -> InferenceGRPCClient:
         if self._grpc_client_stub is None and self.predictor_host:
             self._grpc_client_stub = InferenceGRPCClient(
-                url=self.predictor_host, use_ssl=self.use_ssl, timeout=self.timeout
+                url=self.predictor_host,
+                use_ssl=self.use_ssl,
+                timeout=self.timeout,
+                use_raw_inputs=self.grpc_raw_inputs,
+                num_channels=self.predictor_config.predictor_grpc_channels,
+                channel_selection=self.predictor_config.predictor_grpc_channel_selection,
+                dns_load_balancing=self.predictor_config.predictor_grpc_dns_load_balancing,
+                channel_max_age_seconds=self.predictor_config.predictor_grpc_channel_max_age_seconds,
+                hedging=self._hedging_policy(),
             )
         return self._grpc_client_stub
 
@@ -311,7 +488,9 @@ class Model(InferenceModel):
             if (
                 isinstance(payload, Dict)
                 and "instances" in payload
-                and not isinstance(payload["instances"], list)
+                and not isinstance(
+                    payload["instances"], (list, pd.DataFrame, np.ndarray)
+                )
             ):
                 raise InvalidInput('Expected "instances" to be a list')
         return payload
@@ -380,16 +559,52 @@ class Model(InferenceModel):
         predict_base_url = PREDICTOR_BASE_URL_FORMAT.format(
             protocol, self.predictor_host
         )
-        response = await self._http_client.infer(
-            predict_base_url,
-            model_name=self.name,
-            data=payload,
-            headers=predict_headers,
-            response_headers=response_headers,
-        )
+        self._record_pool_stats()
+        try:
+            response = await self._http_client.infer(
+                predict_base_url,
+                model_name=self.name,
+                data=payload,
+                headers=predict_headers,
+                response_headers=response_headers,
+            )
+        finally:
+            self._record_pool_stats()
 
         return response
 
+    async def _local_predict(
+        self,
+        payload: Union[Dict, InferRequest, ModelInferRequest],
+        headers: Dict[str, str] = None,
+        response_headers: Dict[str, str] = None,
+    ) -> Union[Dict, InferResponse]:
+        # The payload is passed as is to the predictor, the latency metrics are recorded by its own handlers.
+        predictor_name = self.predictor_host[len(LOCAL_PREDICTOR_SCHEME) :]
+        if predictor_name == self.name:
+            raise InferenceError(
+                f"The local predictor of model {self.name} can not be the model itself"
+            )
+        if self.dataplane is None:
+            raise InferenceError(
+                f"Model {self.name} must be registered in a model server to call the local predictor "
+                f"{predictor_name}"
+            )
+        if isinstance(payload, ModelInferRequest):
+            payload = InferRequest.from_grpc(payload)
+        predict_headers = {}
+        if headers is not None:
+            if "x-request-id" in headers:
+                predict_headers["x-request-id"] = headers["x-request-id"]
+            if "x-b3-traceid" in headers:
+                predict_headers["x-b3-traceid"] = headers["x-b3-traceid"]
+        response, res_headers = await self.dataplane.infer(
+            predictor_name, payload, headers=predict_headers
+        )
+        if response_headers is not None:
+            response_headers.update(res_headers)
+        return response
+
     async def _grpc_predict(
         self,
         payload: Union[ModelInferRequest, InferRequest],
@@ -428,6 +643,8 @@ class Model(InferenceModel):
         """
         if not self.predictor_host:
             raise NotImplementedError("Could not find predictor_host.")
+        if self.predictor_host.startswith(LOCAL_PREDICTOR_SCHEME):
+            return await self._local_predict(payload, headers, response_headers)
         if self.protocol == PredictorProtocol.GRPC_V2.value:
             return await self._grpc_predict(payload, headers)
         else:
@@ -464,10 +681,14 @@ class Model(InferenceModel):
         explain_base_url = EXPLAINER_BASE_URL_FORMAT.format(
             protocol, self.explainer_host
         )
-        response = await self._http_client.explain(
-            explain_base_url,
-            model_name=self.name,
-            data=payload,
-            headers=explain_headers,
-        )
+        self._record_pool_stats()
+        try:
+            response = await self._http_client.explain(
+                explain_base_url,
+                model_name=self.name,
+                data=payload,
+                headers=explain_headers,
+            )
+        finally:
+            self._record_pool_stats()
         return response
@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import os
-from typing import Dict, Optional
+import time
+from typing import Dict, Optional, Tuple
 
+from .logging import logger
 from .model import BaseKServeModel
 
 MODEL_MOUNT_DIRS = "/mnt/models"
@@ -29,9 +32,24 @@ class ModelRepository:
         https://github.com/triton-inference-server/server/blob/main/docs/protocol/extension_model_repository.md
     """
 
-    def __init__(self, models_dir: str = MODEL_MOUNT_DIRS):
+    def __init__(
+        self,
+        models_dir: str = MODEL_MOUNT_DIRS,
+        readiness_cache_ttl_seconds: float = 0,
+    ):
+        """
+        Args:
+            models_dir: The directory of the models to load.
+            readiness_cache_ttl_seconds: The time in seconds the result of the model health check is cached
+                                         for ``is_model_ready``. The cache is disabled if not positive.
+        """
         self.models: Dict[str, BaseKServeModel] = {}
         self.models_dir = models_dir
+        self.readiness_cache_ttl_seconds = readiness_cache_ttl_seconds
+        # model name -> (ready, monotonic time of the health check)
+        self._readiness_cache: Dict[str, Tuple[bool, float]] = {}
+        # Incremented on invalidation, so a health check running concurrently does not cache a stale result.
+        self._readiness_epoch = 0
 
     def load_models(self):
         for name in os.listdir(self.models_dir):
@@ -52,10 +70,57 @@ class ModelRepository:
         model = self.get_model(name)
         if not model:
             return False
-        return await model.healthy()
+        if self.readiness_cache_ttl_seconds > 0:
+            cached = self._readiness_cache.get(name)
+            if (
+                cached is not None
+                and time.monotonic() - cached[1] < self.readiness_cache_ttl_seconds
+            ):
+                return cached[0]
+        return await self._check_model_ready(name, model)
+
+    async def _check_model_ready(self, name: str, model: BaseKServeModel) -> bool:
+        epoch = self._readiness_epoch
+        checked_at = time.monotonic()
+        ready = await model.healthy()
+        if self.readiness_cache_ttl_seconds > 0 and epoch == self._readiness_epoch:
+            self._readiness_cache[name] = (ready, checked_at)
+        return ready
+
+    def invalidate_readiness(self, name: Optional[str] = None):
+        """Drop the cached readiness of the model, or of all models if name is not given."""
+        self._readiness_epoch += 1
+        if name is None:
+            self._readiness_cache.clear()
+        else:
+            self._readiness_cache.pop(name, None)
+
+    async def refresh_readiness(self):
+        """Run the health check of all models and update the readiness cache."""
+        for name, model in list(self.models.items()):
+            try:
+                await self._check_model_ready(name, model)
+            except Exception as e:
+                logger.warning(f"Failed to check the readiness of model {name}: {e}")
+                self.invalidate_readiness(name)
+
+    async def run_readiness_refresher(self, interval_seconds: Optional[float] = None):
+        """Refresh the readiness cache periodically, so the health checks run off the request path.
+
+        Args:
+            interval_seconds: The refresh interval. Default: half of the readiness cache TTL.
+        """
+        if self.readiness_cache_ttl_seconds <= 0:
+            return
+        if interval_seconds is None:
+            interval_seconds = self.readiness_cache_ttl_seconds / 2
+        while True:
+            await self.refresh_readiness()
+            await asyncio.sleep(interval_seconds)
 
     def update(self, model: BaseKServeModel):
         self.models[model.name] = model
+        self.invalidate_readiness(model.name)
 
     def load(self, name: str) -> bool:
         pass
@@ -69,5 +134,6 @@ class ModelRepository:
             if callable(getattr(model, "stop", None)):
                 model.stop()
             del self.models[name]
+            self.invalidate_readiness(name)
         else:
             raise KeyError(f"model with name {name} does not exist")
@@ -16,6 +16,7 @@ import argparse
 import asyncio
 import concurrent.futures
 import signal
+import socket
 import sys
 from importlib import metadata
 from typing import Any, Callable, Dict, List, Optional
@@ -26,17 +27,26 @@ from fastapi.responses import ORJSONResponse
 from . import logging
 from .constants.constants import (
     DEFAULT_HTTP_PORT,
+    DEFAULT_FLIGHT_PORT,
     DEFAULT_GRPC_PORT,
     MAX_GRPC_MESSAGE_LENGTH,
 )
 from .logging import logger
-from .model import BaseKServeModel
+from .model import BaseKServeModel, Model
 from .model_repository import ModelRepository
 from .protocol.dataplane import DataPlane
 from .protocol.grpc.server import GRPCServer
 from .protocol.model_repository_extension import ModelRepositoryExtension
 from .protocol.rest.server import UvicornServer
+from .supervisor import (
+    WorkerSupervisor,
+    check_no_running_threads,
+    create_reuseport_socket,
+    PROMETHEUS_MULTIPROC_DIR_ENV,
+    is_prometheus_multiprocess,
+)
 from .utils import utils
+from .utils.compression import DEFAULT_MAX_DECOMPRESSED_SIZE
 from kserve.errors import NoModelReady
 
 parser = argparse.ArgumentParser(
@@ -55,11 +65,45 @@ parser.add_argument(
     type=int,
     help="The GRPC Port listened to by the model server.",
 )
+parser.add_argument(
+    "--enable_flight",
+    default=False,
+    type=lambda x: utils.strtobool(x),
+    help="Enable the Arrow Flight server for batch scoring. Requires pyarrow.",
+)
+parser.add_argument(
+    "--flight_port",
+    default=DEFAULT_FLIGHT_PORT,
+    type=int,
+    help="The Arrow Flight port listened to by the model server.",
+)
+parser.add_argument(
+    "--flight_batch_size",
+    default=None,
+    type=int,
+    help="The number of rows of each predict call of the Arrow Flight server. "
+    "By default the record batches are passed to predict as received.",
+)
+parser.add_argument(
+    "--flight_max_inflight_batches",
+    default=2,
+    type=int,
+    help="The max number of predict calls pending per Arrow Flight exchange.",
+)
 parser.add_argument(
     "--workers",
     default=1,
     type=int,
-    help="The number of uvicorn workers for multi-processing.",
+    help="The number of model server worker processes. Only used with --enable_prefork.",
+)
+parser.add_argument(
+    "--enable_prefork",
+    default=False,
+    type=lambda x: utils.strtobool(x),
+    help="Fork --workers worker processes after the models are loaded, each serving REST and gRPC on the "
+    "shared ports. The models must not start threads in load(), Model.start() is called in every worker. "
+    "The system shared memory extension is not available, and the model repository and readiness state "
+    "are per worker.",
 )
 parser.add_argument(
     "--max_threads",
@@ -91,6 +135,40 @@ parser.add_argument(
     type=lambda x: utils.strtobool(x),
     help="Enable a log line per request with preprocess/predict/postprocess latency metrics.",
 )
+parser.add_argument(
+    "--max_batch_size",
+    default=None,
+    type=int,
+    help="Enable server side dynamic batching of concurrent predict requests with the given max batch size.",
+)
+parser.add_argument(
+    "--max_batch_latency_ms",
+    default=5.0,
+    type=float,
+    help="The max time in milliseconds a request waits for a dynamic batch to fill up.",
+)
+parser.add_argument(
+    "--readiness_cache_ttl_seconds",
+    default=0,
+    type=float,
+    help="The time in seconds the model readiness is cached and refreshed in the background, "
+    "instead of running the model health check on every request. Disabled if 0.",
+)
+parser.add_argument(
+    "--execution_policy",
+    default="inline",
+    type=str,
+    choices=["inline", "thread", "process"],
+    help="Where synchronous predict handlers are executed: on the event loop thread (inline), "
+    "in the asyncio thread pool (thread) or in a pool of processes forked with the loaded model (process).",
+)
+parser.add_argument(
+    "--execution_workers",
+    default=None,
+    type=int,
+    help="The number of predict worker processes per model of the process execution policy. "
+    "Defaults to the number of CPUs.",
+)
 parser.add_argument(
     "--configure_logging",
     default=True,
@@ -152,6 +230,77 @@ parser.add_argument(
     type=int,
     help="The timeout seconds for the request sent to the predictor.",
 )
+parser.add_argument(
+    "--predictor_grpc_raw_inputs",
+    default=False,
+    type=lambda x: utils.strtobool(x),
+    help="Send all the inputs of the gRPC requests to the predictor as raw input contents.",
+)
+parser.add_argument(
+    "--predictor_http2",
+    default=False,
+    type=lambda x: utils.strtobool(x),
+    help="Multiplex the http calls to the predictor over HTTP/2 connections. Requires the h2 package.",
+)
+parser.add_argument(
+    "--predictor_max_connections",
+    default=100,
+    type=int,
+    help="The maximum number of http connections to the predictor.",
+)
+parser.add_argument(
+    "--predictor_max_keepalive_connections",
+    default=20,
+    type=int,
+    help="The maximum number of idle http connections to the predictor kept alive.",
+)
+parser.add_argument(
+    "--predictor_keepalive_expiry_seconds",
+    default=5.0,
+    type=float,
+    help="The seconds an idle http connection to the predictor is kept alive.",
+)
+parser.add_argument(
+    "--predictor_pool_timeout_seconds",
+    default=None,
+    type=float,
+    help="The maximum seconds a http call to the predictor waits for a pooled connection. "
+    "By default, only the request timeout applies.",
+)
+parser.add_argument(
+    "--predictor_grpc_channels",
+    default=1,
+    type=int,
+    help="The number of gRPC channels to the predictor, each with its own connections.",
+)
+parser.add_argument(
+    "--predictor_grpc_channel_selection",
+    default="round_robin",
+    type=str,
+    choices=["round_robin", "least_outstanding"],
+    help="How a gRPC call to the predictor picks its channel.",
+)
+parser.add_argument(
+    "--predictor_grpc_dns_load_balancing",
+    default=False,
+    type=lambda x: utils.strtobool(x),
+    help="Balance the gRPC calls across all the resolved addresses of the predictor host, "
+    "e.g. the endpoints of a headless service.",
+)
+parser.add_argument(
+    "--predictor_grpc_channel_max_age_seconds",
+    default=None,
+    type=float,
+    help="The seconds after which a gRPC channel to the predictor is replaced, so the predictor host "
+    "is resolved again. By default, the channels are never replaced.",
+)
+parser.add_argument(
+    "--predictor_hedging_percentile",
+    default=None,
+    type=float,
+    help="Hedge the calls to the predictor still running after this percentile of the recent latencies, "
+    "e.g. 95, with a duplicate call. By default, the calls are not hedged.",
+)
 parser.add_argument(
     "--grpc_max_send_message_length",
     default=MAX_GRPC_MESSAGE_LENGTH,
@@ -164,6 +313,47 @@ parser.add_argument(
     type=int,
     help="The max message length for gRPC receive message.",
 )
+parser.add_argument(
+    "--grpc_raw_outputs",
+    default=False,
+    type=lambda x: utils.strtobool(x),
+    help="Return all the outputs of the gRPC responses as raw output contents. "
+    "Can be enabled per request with the 'binary_data_output' request parameter.",
+)
+parser.add_argument(
+    "--grpc_max_stream_inflight_requests",
+    default=128,
+    type=int,
+    help="The max number of requests of a ModelStreamInfer call run concurrently or waiting for "
+    "their response to be sent.",
+)
+parser.add_argument(
+    "--grpc_compression",
+    default="none",
+    choices=["none", "gzip", "deflate"],
+    help="The compression of the gRPC responses, if the client accepts it. The compressed requests "
+    "are always accepted.",
+)
+parser.add_argument(
+    "--enable_http_compression",
+    default=False,
+    type=lambda x: utils.strtobool(x),
+    help="Compress the REST responses with the gzip or zstd encoding accepted by the client. "
+    "The compressed requests are always accepted.",
+)
+parser.add_argument(
+    "--http_compression_min_size",
+    default=1024,
+    type=int,
+    help="The minimum size in bytes of the compressed REST responses.",
+)
+parser.add_argument(
+    "--http_max_decompressed_size",
+    default=DEFAULT_MAX_DECOMPRESSED_SIZE,
+    type=int,
+    help="The maximum size in bytes of the decompressed gzip or zstd REST request bodies. The larger "
+    "requests are rejected with HTTP 413.",
+)
 args, _ = parser.parse_known_args()
 
 app = FastAPI(
@@ -188,13 +378,26 @@ class ModelServer:
         enable_docs_url: bool = args.enable_docs_url,
         enable_latency_logging: bool = args.enable_latency_logging,
         access_log_format: str = args.access_log_format,
+        max_batch_size: Optional[int] = args.max_batch_size,
+        max_batch_latency_ms: float = args.max_batch_latency_ms,
+        readiness_cache_ttl_seconds: float = args.readiness_cache_ttl_seconds,
+        execution_policy: str = args.execution_policy,
+        execution_workers: Optional[int] = args.execution_workers,
+        enable_flight: bool = args.enable_flight,
+        flight_port: int = args.flight_port,
+        flight_batch_size: Optional[int] = args.flight_batch_size,
+        flight_max_inflight_batches: int = args.flight_max_inflight_batches,
+        enable_http_compression: bool = args.enable_http_compression,
+        http_compression_min_size: int = args.http_compression_min_size,
+        enable_prefork: bool = args.enable_prefork,
+        http_max_decompressed_size: int = args.http_max_decompressed_size,
     ):
         """KServe ModelServer Constructor
 
         Args:
             http_port: HTTP port. Default: ``8080``.
             grpc_port: GRPC port. Default: ``8081``.
-            workers: Number of uvicorn workers. Default: ``1``.
+            workers: Number of worker processes forked if ``enable_prefork`` is set. Default: ``1``.
             max_threads: Max number of gRPC processing threads. Default: ``4``
             max_asyncio_workers: Max number of AsyncIO threads. Default: ``None``
             registered_models: A optional Model repository with registered models.
@@ -207,6 +410,41 @@ class ModelServer:
                                ASGI specs that don't describe how access logging should be implemented in detail
                                (please refer to this Uvicorn
                                [github issue](https://github.com/encode/uvicorn/issues/527) for more info).
+            max_batch_size: Max number of rows merged into a single predict call by the dynamic batcher.
+                            Dynamic batching is disabled if not set. Default: ``None``.
+            max_batch_latency_ms: Max time in milliseconds a request waits for a dynamic batch to fill up.
+                                  Default: ``5.0``.
+            readiness_cache_ttl_seconds: Time in seconds the model readiness is cached by the model repository
+                                         and refreshed in the background. Disabled if ``0``. Default: ``0``.
+            execution_policy: Where the synchronous predict handlers of the models are executed, ``inline`` on
+                              the event loop thread, ``thread`` in the asyncio thread pool or ``process`` in a
+                              pool of processes forked with the loaded model. Default: ``inline``.
+            execution_workers: Number of worker processes per model of the ``process`` execution policy.
+                               Default: ``None``, the number of CPUs.
+            enable_flight: Whether to turn on the Arrow Flight server for batch scoring, it streams the record
+                           batches of ``DoExchange`` calls to the models. Requires pyarrow. With multiple workers
+                           it is served by the first worker only. Default: ``False``.
+            flight_port: Arrow Flight port. Default: ``8815``.
+            flight_batch_size: Number of rows of each predict call of the Arrow Flight server. Default: ``None``,
+                               the record batches are passed to predict as received.
+            flight_max_inflight_batches: Max number of predict calls pending per Arrow Flight exchange.
+                                         Default: ``2``.
+            enable_http_compression: Whether to compress the REST responses with the gzip or zstd encoding
+                                     accepted by the client. zstd requires zstandard. The gzip and zstd encoded
+                                     requests are always accepted. Default: ``False``.
+            http_compression_min_size: Minimum size in bytes of the compressed REST responses.
+                                       Default: ``1024``.
+            enable_prefork: Whether to fork ``workers`` worker processes after the models are loaded, each running
+                            its own event loop, REST and gRPC server on the shared ports (SO_REUSEPORT). The
+                            models must not start threads in ``load()``, ``Model.start()`` is called in every
+                            worker after the fork. The workers are restarted if they exit. The Prometheus
+                            metrics are aggregated across them if the multiprocess mode is enabled when kserve
+                            is imported, with the command line arguments or ``PROMETHEUS_MULTIPROC_DIR``. The
+                            system shared memory extension is disabled, and the model repository and readiness
+                            state are per worker. Default: ``False``.
+            http_max_decompressed_size: Maximum size in bytes of the decompressed gzip or zstd REST request
+                                        bodies, the larger requests are rejected with HTTP 413.
+                                        Default: ``268435456`` (256 MiB).
         """
         self.registered_models = (
             ModelRepository() if registered_models is None else registered_models
@@ -214,17 +452,29 @@ class ModelServer:
         self.http_port = http_port
         self.grpc_port = grpc_port
         self.workers = workers
+        self.enable_prefork = enable_prefork
         self.max_threads = max_threads
         self.max_asyncio_workers = max_asyncio_workers
         self.enable_grpc = enable_grpc
         self.enable_docs_url = enable_docs_url
         self.enable_latency_logging = enable_latency_logging
+        self.max_batch_size = max_batch_size
+        self.max_batch_latency_ms = max_batch_latency_ms
+        self.execution_policy = execution_policy
+        self.execution_workers = execution_workers
+        if readiness_cache_ttl_seconds:
+            self.registered_models.readiness_cache_ttl_seconds = (
+                readiness_cache_ttl_seconds
+            )
         self.dataplane = DataPlane(model_registry=self.registered_models)
         self.model_repository_extension = ModelRepositoryExtension(
             model_registry=self.registered_models
         )
         self._grpc_server = None
         self._rest_server = None
+        self._flight_server = None
+        self._readiness_refresher: Optional[asyncio.Task] = None
+        self._prefork_models: List[BaseKServeModel] = []
         if self.enable_grpc:
             self._grpc_server = GRPCServer(
                 grpc_port,
@@ -232,16 +482,29 @@ class ModelServer:
                 self.model_repository_extension,
                 kwargs=vars(args),
             )
+        self.enable_flight = enable_flight
+        if self.enable_flight:
+            from .protocol.flight import FlightServer
+
+            self._flight_server = FlightServer(
+                flight_port,
+                self.dataplane,
+                batch_size=flight_batch_size,
+                max_inflight_batches=flight_max_inflight_batches,
+            )
         if args.configure_logging:
             # If the logger does not have any handlers, then the logger is not configured.
             # For backward compatibility, we configure the logger here.
             if len(logger.handlers) == 0:
                 logging.configure_logging(args.log_config_file)
         self.access_log_format = access_log_format
+        self.enable_http_compression = enable_http_compression
+        self.http_compression_min_size = http_compression_min_size
+        self.http_max_decompressed_size = http_max_decompressed_size
         self._custom_exception_handler = None
 
-    async def _serve_rest(self):
-        logger.info(f"Starting uvicorn with {self.workers} workers")
+    async def _serve_rest(self, sockets: Optional[List[socket.socket]] = None):
+        logger.info("Starting uvicorn")
         loop = asyncio.get_event_loop()
         if sys.platform not in ["win32", "win64"]:
             sig_list = [signal.SIGINT, signal.SIGTERM, signal.SIGQUIT]
@@ -266,8 +529,11 @@ class ModelServer:
             log_config=None,
             access_log_format=self.access_log_format,
             workers=self.workers,
+            enable_compression=self.enable_http_compression,
+            compression_min_size=self.http_compression_min_size,
+            max_decompressed_size=self.http_max_decompressed_size,
         )
-        await self._rest_server.run()
+        await self._rest_server.run(sockets)
 
     def start(self, models: List[BaseKServeModel]) -> None:
         """Start the model server with a set of registered models.
@@ -275,6 +541,16 @@ class ModelServer:
         Args:
             models: a list of models to register to the model server.
         """
+        prefork = self.enable_prefork and self.workers > 1
+        if prefork and not hasattr(socket, "SO_REUSEPORT"):
+            logger.warning(
+                "Multiple workers are not supported on this platform, starting a single worker"
+            )
+            prefork = False
+        elif self.workers > 1 and not self.enable_prefork:
+            logger.warning(
+                f"Starting a single worker, set --enable_prefork to fork {self.workers} worker processes"
+            )
         if isinstance(models, list):
             at_least_one_model_ready = False
             for model in models:
@@ -284,7 +560,21 @@ class ModelServer:
                         self.register_model(model)
                         # pass whether to log request latency into the model
                         model.enable_latency_logging = self.enable_latency_logging
-                    model.start()
+                        if self.max_batch_size and isinstance(model, Model):
+                            model.enable_dynamic_batching(
+                                self.max_batch_size, self.max_batch_latency_ms
+                            )
+                        if isinstance(model, Model):
+                            model.set_execution_policy(
+                                self.execution_policy, self.execution_workers
+                            )
+                    if prefork:
+                        # Started in every worker, after the fork.
+                        self._prefork_models.append(model)
+                    else:
+                        model.start()
+                        if isinstance(model, Model):
+                            model.start_execution_workers()
                 else:
                     raise RuntimeError("Model type should be 'BaseKServeModel'")
             if not at_least_one_model_ready and models:
@@ -295,32 +585,72 @@ class ModelServer:
         if self.max_asyncio_workers is None:
             # formula as suggest in https://bugs.python.org/issue35279
             self.max_asyncio_workers = min(32, utils.cpu_count() + 4)
+
+        if prefork:
+            check_no_running_threads()
+            # The regions would only be registered in the worker serving the registration request.
+            self.dataplane.shared_memory_registry.disable(
+                "The system shared memory extension is not supported with pre-forked workers"
+            )
+            if not is_prometheus_multiprocess():
+                logger.warning(
+                    f"The Prometheus metrics are reported per worker process. Start the model server with "
+                    f"--enable_prefork and --workers, or set {PROMETHEUS_MULTIPROC_DIR_ENV} before importing "
+                    f"kserve, to aggregate them across the workers."
+                )
+            WorkerSupervisor(self._run_worker, self.workers).run()
+        else:
+            asyncio.run(self._serve())
+
+    async def _serve(
+        self, sockets: Optional[List[socket.socket]] = None, serve_flight: bool = True
+    ):
         logger.info(f"Setting max asyncio worker threads as {self.max_asyncio_workers}")
-        asyncio.get_event_loop().set_default_executor(
+        # The executor must be set on the running loop, the one returned by asyncio.get_event_loop()
+        # before asyncio.run is not used to serve.
+        asyncio.get_running_loop().set_default_executor(
             concurrent.futures.ThreadPoolExecutor(max_workers=self.max_asyncio_workers)
         )
+        if self.registered_models.readiness_cache_ttl_seconds > 0:
+            self._readiness_refresher = asyncio.create_task(
+                self.registered_models.run_readiness_refresher()
+            )
+        servers = [self._serve_rest(sockets)]
+        if self.enable_grpc:
+            servers.append(self._grpc_server.start(self.max_threads))
+        if self.enable_flight and serve_flight:
+            servers.append(self._flight_server.start())
+        await asyncio.gather(*servers)
 
-        async def servers_task():
-            servers = [self._serve_rest()]
-            if self.enable_grpc:
-                servers.append(self._grpc_server.start(self.max_threads))
-            await asyncio.gather(*servers)
-
-        asyncio.run(servers_task())
+    def _run_worker(self, worker_id: int):
+        logger.info(f"Worker {worker_id} serving on port {self.http_port}")
+        for model in self._prefork_models:
+            model.start()
+            if isinstance(model, Model):
+                model.start_execution_workers()
+        sock = create_reuseport_socket(self.http_port)
+        # The Arrow Flight port can not be shared, it is served by the first worker.
+        asyncio.run(self._serve(sockets=[sock], serve_flight=worker_id == 0))
 
     async def stop(self, sig: Optional[int] = None):
-        """Stop the instances of REST and gRPC model servers.
+        """Stop the instances of REST, gRPC and Arrow Flight model servers.
 
         Args:
             sig: The signal to stop the server. Default: ``None``.
         """
         logger.info("Stopping the model server")
+        if self._readiness_refresher:
+            self._readiness_refresher.cancel()
         if self._rest_server:
             logger.info("Stopping the rest server")
-            await self._rest_server.stop()
+            await self._rest_server.stop(sig)
         if self._grpc_server:
             logger.info("Stopping the grpc server")
             await self._grpc_server.stop(sig)
+        if self._flight_server:
+            logger.info("Stopping the Arrow Flight server")
+            await self._flight_server.stop(sig)
+        self.dataplane.shared_memory_registry.unregister()
         for model_name in list(self.registered_models.get_models().keys()):
             self.registered_models.unload(model_name)
 
@@ -359,5 +689,8 @@ class ModelServer:
         """
         if not model.name:
             raise Exception("Failed to register model, model.name must be provided.")
+        if isinstance(model, Model):
+            # A transformer calls a predictor registered in the same model server through the data plane.
+            model.dataplane = self.dataplane
         self.registered_models.update(model)
         logger.info("Registering model: %s", model.name)
@@ -30,8 +30,11 @@ from ..errors import InvalidInput, ModelNotFound
 from ..logging import logger
 from ..model import InferenceVerb, BaseKServeModel, InferenceModel
 from ..model_repository import ModelRepository
+from ..utils import arrow_codec
+from ..utils.deadline import request_deadline, timeout_from_headers
 from ..utils.utils import create_response_cloudevent, is_structured_cloudevent
 from .infer_type import InferRequest, InferResponse
+from .shared_memory import SharedMemoryRegistry
 from .rest.openai import OpenAIModel
 
 JSON_HEADERS = [
@@ -48,6 +51,7 @@ class DataPlane:
     def __init__(self, model_registry: ModelRepository):
         self._model_registry = model_registry
         self._server_name = constants.KSERVE_MODEL_SERVER_NAME
+        self._shared_memory_registry = SharedMemoryRegistry()
 
         # Dynamically fetching version of the installed 'kserve' distribution. The assumption is
         # that 'kserve' will already be installed by the time this class is instantiated.
@@ -57,6 +61,10 @@ class DataPlane:
     def model_registry(self):
         return self._model_registry
 
+    @property
+    def shared_memory_registry(self) -> SharedMemoryRegistry:
+        return self._shared_memory_registry
+
     def get_model_from_registry(self, name: str) -> BaseKServeModel:
         model = self._model_registry.get_model(name)
         if model is None:
@@ -79,6 +87,7 @@ class DataPlane:
         is_ready = await self._model_registry.is_model_ready(name)
         if not is_ready:
             model.load()
+            self._model_registry.invalidate_readiness(name)
         return model
 
     @staticmethod
@@ -131,7 +140,8 @@ class DataPlane:
         """Server metadata.
 
         Note:
-            Supports ``model_repository_extension`` as defined at Triton Server `Model Repository Extension`_.
+            Supports ``model_repository_extension`` and ``system_shared_memory`` as defined at Triton
+            Server `Model Repository Extension`_ and `Shared-Memory Extension`_.
 
         Returns:
             Returns a dict object with following fields:
@@ -141,11 +151,13 @@ class DataPlane:
 
         .. _Model Repository Extension:
             https://github.com/triton-inference-server/server/blob/main/docs/protocol/extension_model_repository.md
+        .. _Shared-Memory Extension:
+            https://github.com/triton-inference-server/server/blob/main/docs/protocol/extension_shared_memory.md
         """
         return {
             "name": self._server_name,
             "version": self._server_version,
-            "extensions": ["model_repository_extension"],
+            "extensions": ["model_repository_extension", "system_shared_memory"],
         }
 
     async def model_metadata(self, model_name: str) -> Dict:
@@ -239,6 +251,14 @@ class DataPlane:
         attributes = {}
         if isinstance(body, InferRequest):
             return body, attributes
+        if (
+            headers
+            and isinstance(body, bytes)
+            and arrow_codec.is_arrow_content_type(headers.get("content-type"))
+        ):
+            if protocol_version.lower() == PredictorProtocol.REST_V2.value:
+                return arrow_codec.decode_v2_request(body, model_name), attributes
+            return arrow_codec.decode_v1_request(body), attributes
         elif isinstance(body, InferenceRequest) or (
             protocol_version.lower() == PredictorProtocol.REST_V2.value
             and isinstance(body, bytes)
@@ -293,12 +313,8 @@ class DataPlane:
         self, body: Union[bytes, InferenceRequest], headers: Dict, model_name: str
     ) -> InferRequest:
         if isinstance(body, bytes):
-            json_length = headers.get(INFERENCE_CONTENT_LENGTH_HEADER, None)
-            if json_length is None:
-                raise InvalidInput(
-                    f"received byte inputs, but the"
-                    f"'{INFERENCE_CONTENT_LENGTH_HEADER}' header is missing."
-                )
+            # Without the header the request body is the JSON object only.
+            json_length = headers.get(INFERENCE_CONTENT_LENGTH_HEADER, len(body))
             return InferRequest.from_bytes(body, int(json_length), model_name)
         else:
             return InferRequest.from_inference_request(body, model_name)
@@ -314,6 +330,13 @@ class DataPlane:
         # if we received a cloudevent, then also return a cloudevent
         is_cloudevent = False
         is_binary_cloudevent = False
+        if arrow_codec.accepts_arrow(headers):
+            if isinstance(response, InferResponse):
+                response = arrow_codec.encode_v2_response(response)
+            else:
+                response = arrow_codec.encode_v1_response(response)
+            response_headers["content-type"] = constants.ARROW_STREAM_CONTENT_TYPE
+            return response, response_headers
         if isinstance(response, InferResponse):
             response, json_size = response.to_rest()
             if json_size is not None:
@@ -372,7 +395,13 @@ class DataPlane:
                 f"Model of type {type(model).__name__} does not support inference"
             )
         model = cast(InferenceModel, model)
-        response, res_headers = await model(request, headers=headers)
+        if isinstance(request, InferRequest):
+            self._shared_memory_registry.read_inputs(request)
+        # The calls to the predictor made by the model are bounded by the budget of the request.
+        with request_deadline(timeout_from_headers(headers)):
+            response, res_headers = await model(request, headers=headers)
+        if isinstance(request, InferRequest) and isinstance(response, InferResponse):
+            self._shared_memory_registry.write_outputs(request, response)
         response_headers.update(res_headers)
         return response, response_headers
 
@@ -407,8 +436,9 @@ class DataPlane:
             raise ValueError(
                 f"Model of type {type(model).__name__} does not support inference"
             )
-        response, res_headers = await model(
-            request, verb=InferenceVerb.EXPLAIN, headers=headers
-        )
+        with request_deadline(timeout_from_headers(headers)):
+            response, res_headers = await model(
+                request, verb=InferenceVerb.EXPLAIN, headers=headers
+            )
         response_headers.update(res_headers)
         return response, response_headers
@@ -0,0 +1,234 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import collections
+from concurrent import futures
+from typing import Dict, Iterator, Optional
+
+import orjson
+
+from ..constants.constants import PredictorProtocol
+from ..errors import InvalidInput, ModelNotFound, ModelNotReady
+from ..logging import logger
+from ..utils import arrow_codec
+from .dataplane import DataPlane
+from .infer_type import InferResponse
+
+try:
+    import pyarrow as pa
+    from pyarrow import flight
+except ImportError:
+    logger.error(
+        "pyarrow dependency is missing. Install Arrow Flight with: pip install pyarrow"
+    )
+    raise
+
+
+def _parse_descriptor(descriptor: flight.FlightDescriptor) -> Dict:
+    """The descriptor of an exchange is either the path ``[model_name]`` or a JSON command, e.g.
+    ``{"model_name": "model", "batch_size": 10000, "protocol": "v2"}``."""
+    if descriptor.descriptor_type == flight.DescriptorType.PATH:
+        if len(descriptor.path) != 1:
+            raise pa.ArrowInvalid("Expected the descriptor path [model_name]")
+        return {"model_name": descriptor.path[0].decode("utf-8")}
+    try:
+        command = orjson.loads(descriptor.command)
+    except orjson.JSONDecodeError as e:
+        raise pa.ArrowInvalid(f"Unrecognized descriptor command: {e}")
+    if not isinstance(command, dict) or "model_name" not in command:
+        raise pa.ArrowInvalid('Expected "model_name" in the descriptor command')
+    return command
+
+
+def _read_tables(reader: flight.MetadataRecordBatchReader) -> Iterator[pa.Table]:
+    while True:
+        try:
+            chunk = reader.read_chunk()
+        except StopIteration:
+            return
+        if chunk.data is not None:
+            yield pa.Table.from_batches([chunk.data])
+
+
+def rebatch(
+    tables: Iterator[pa.Table], batch_size: Optional[int]
+) -> Iterator[pa.Table]:
+    """Slice and merge the incoming tables into tables of ``batch_size`` rows, the last one may be
+    smaller. The tables are passed through as received if ``batch_size`` is not set."""
+    if not batch_size:
+        yield from tables
+        return
+    pending = []
+    pending_rows = 0
+    for table in tables:
+        pending.append(table)
+        pending_rows += table.num_rows
+        if pending_rows < batch_size:
+            continue
+        merged = pa.concat_tables(pending)
+        offset = 0
+        while pending_rows - offset >= batch_size:
+            yield merged.slice(offset, batch_size)
+            offset += batch_size
+        pending = [merged.slice(offset)]
+        pending_rows -= offset
+    if pending_rows:
+        yield pa.concat_tables(pending)
+
+
+class _FlightService(flight.FlightServerBase):
+    def __init__(
+        self,
+        location: str,
+        data_plane: DataPlane,
+        loop: asyncio.AbstractEventLoop,
+        batch_size: Optional[int],
+        max_inflight_batches: int,
+    ):
+        super().__init__(location)
+        self._data_plane = data_plane
+        self._loop = loop
+        self._batch_size = batch_size
+        self._max_inflight_batches = max_inflight_batches
+
+    def do_exchange(self, context, descriptor, reader, writer):
+        command = _parse_descriptor(descriptor)
+        model_name = command["model_name"]
+        protocol = command.get("protocol", PredictorProtocol.REST_V1.value)
+        batch_size = command.get("batch_size", self._batch_size)
+        try:
+            model_ready = self._run(self._data_plane.model_ready(model_name))
+        except ModelNotFound as e:
+            raise pa.ArrowInvalid(e.reason)
+        if not model_ready:
+            raise flight.FlightUnavailableError(str(ModelNotReady(model_name)))
+        # At most max_inflight_batches predictions are pending. The next batch is not read until
+        # the oldest prediction is written back, so gRPC flow control pushes back on the client.
+        pending = collections.deque()
+        schema = None
+        try:
+            for table in rebatch(_read_tables(reader), batch_size):
+                request = self._to_request(table, model_name, protocol)
+                pending.append(
+                    asyncio.run_coroutine_threadsafe(
+                        self._data_plane.infer(model_name, request, headers={}),
+                        self._loop,
+                    )
+                )
+                if len(pending) >= self._max_inflight_batches:
+                    schema = self._write(writer, pending.popleft(), schema)
+            while pending:
+                schema = self._write(writer, pending.popleft(), schema)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    @staticmethod
+    def _to_request(table: pa.Table, model_name: str, protocol: str):
+        try:
+            if protocol == PredictorProtocol.REST_V2.value:
+                return arrow_codec.table_to_v2_request(table, model_name)
+            return arrow_codec.table_to_v1_request(table)
+        except InvalidInput as e:
+            raise pa.ArrowInvalid(e.reason)
+
+    @staticmethod
+    def _write(
+        writer, future: futures.Future, schema: Optional[pa.Schema]
+    ) -> pa.Schema:
+        try:
+            response, _ = future.result()
+        except InvalidInput as e:
+            raise pa.ArrowInvalid(e.reason)
+        if isinstance(response, InferResponse):
+            table = arrow_codec.v2_response_to_table(response)
+        else:
+            table = arrow_codec.v1_response_to_table(response)
+        # The schema metadata, e.g. the response id, differs between the batches.
+        table = table.replace_schema_metadata(None)
+        if schema is None:
+            schema = table.schema
+            writer.begin(schema)
+        elif table.schema != schema:
+            table = table.cast(schema)
+        writer.write_table(table)
+        return schema
+
+
+class FlightServer:
+    """Arrow Flight server for batch scoring.
+
+    A ``DoExchange`` call streams record batches to the ``predict`` of a registered model and
+    streams the predictions back, one record batch per predict call. The model is selected by the
+    flight descriptor, either the path ``[model_name]`` or a JSON command with the
+    ``model_name`` and optionally the ``batch_size`` and the ``protocol`` (``v1`` or ``v2``) of the
+    requests. The server reads the next batch only once the pending predictions are written back,
+    so clients streaming large inputs must read the results while they write the batches.
+
+    Args:
+        port: Flight port.
+        data_plane: The data plane the predictions are sent to.
+        batch_size: Number of rows of each predict call, the incoming record batches are sliced
+                    and merged to this size. Default: ``None``, the batches are passed as received.
+        max_inflight_batches: Max number of predict calls pending per exchange. Default: ``2``.
+    """
+
+    def __init__(
+        self,
+        port: int,
+        data_plane: DataPlane,
+        batch_size: Optional[int] = None,
+        max_inflight_batches: int = 2,
+    ):
+        self._port = port
+        self._data_plane = data_plane
+        self._batch_size = batch_size
+        self._max_inflight_batches = max(1, max_inflight_batches)
+        self._server: Optional[_FlightService] = None
+        self._stopped: Optional[asyncio.Event] = None
+
+    @property
+    def port(self) -> int:
+        """The port the server is listening on, e.g. the one picked by the system for port ``0``."""
+        return self._server.port if self._server else self._port
+
+    async def start(self):
+        self._stopped = asyncio.Event()
+        location = f"grpc://0.0.0.0:{self._port}"
+        # The server is listening as soon as it is created, the calls are served by its own threads.
+        self._server = _FlightService(
+            location,
+            self._data_plane,
+            asyncio.get_running_loop(),
+            self._batch_size,
+            self._max_inflight_batches,
+        )
+        logger.info("Starting Arrow Flight server on %s", location)
+        await self._stopped.wait()
+
+    async def stop(self, sig: int = None):
+        if self._server:
+            logger.info("Waiting for Arrow Flight server shutdown")
+            # Shutdown waits for the pending calls, which need the event loop to complete.
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._server.shutdown
+            )
+            self._server = None
+            logger.info("Arrow Flight server shutdown complete")
+        if self._stopped:
+            self._stopped.set()
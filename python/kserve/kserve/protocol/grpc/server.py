@@ -16,6 +16,7 @@ import asyncio
 import multiprocessing
 from concurrent import futures
 
+import grpc
 from grpc import aio
 
 from kserve.logging import logger
@@ -26,6 +27,12 @@ from . import grpc_predict_v2_pb2_grpc
 from .interceptors import LoggingInterceptor
 from .servicer import InferenceServicer
 
+_COMPRESSION = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
 
 class GRPCServer:
     def __init__(
@@ -43,11 +50,17 @@ class GRPCServer:
 
     async def start(self, max_workers):
         inference_servicer = InferenceServicer(
-            self._data_plane, self._model_repository_extension
+            self._data_plane,
+            self._model_repository_extension,
+            use_raw_outputs=self._kwargs.get("grpc_raw_outputs", False),
+            max_stream_inflight_requests=self._kwargs.get(
+                "grpc_max_stream_inflight_requests", 128
+            ),
         )
         self._server = aio.server(
             futures.ThreadPoolExecutor(max_workers=max_workers),
             interceptors=(LoggingInterceptor(),),
+            compression=_COMPRESSION.get(self._kwargs.get("grpc_compression")),
             options=[
                 (
                     "grpc.max_send_message_length",
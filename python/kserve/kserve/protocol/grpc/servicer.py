@@ -12,17 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+from typing import AsyncIterator, Dict
 
 from . import grpc_predict_v2_pb2 as pb
 from . import grpc_predict_v2_pb2_grpc
 from kserve.protocol.infer_type import InferRequest, InferResponse
 from kserve.protocol.dataplane import DataPlane
 from kserve.protocol.model_repository_extension import ModelRepositoryExtension
+from kserve.utils.deadline import timeout_from_headers
 from kserve.utils.utils import to_headers
 
 from grpc import ServicerContext
 
+from ...constants.constants import REQUEST_TIMEOUT_HEADER
 from ...errors import InvalidInput
+from ...logging import logger
 
 
 class InferenceServicer(grpc_predict_v2_pb2_grpc.GRPCInferenceServiceServicer):
@@ -31,10 +36,14 @@ class InferenceServicer(grpc_predict_v2_pb2_grpc.GRPCInferenceServiceServicer):
         self,
         data_plane: DataPlane,
         model_repository_extension: ModelRepositoryExtension,
+        use_raw_outputs: bool = False,
+        max_stream_inflight_requests: int = 128,
     ):
         super().__init__()
         self._data_plane = data_plane
         self._mode_repository_extension = model_repository_extension
+        self._use_raw_outputs = use_raw_outputs
+        self._max_stream_inflight_requests = max(1, max_stream_inflight_requests)
 
     @classmethod
     def validate_grpc_request(cls, request: pb.ModelInferRequest):
@@ -113,6 +122,74 @@ class InferenceServicer(grpc_predict_v2_pb2_grpc.GRPCInferenceServiceServicer):
         self, request: pb.ModelInferRequest, context: ServicerContext
     ) -> pb.ModelInferResponse:
         headers = to_headers(context)
+        return await self._infer(request, headers)
+
+    async def ModelStreamInfer(
+        self, request_iterator: AsyncIterator[pb.ModelInferRequest], context
+    ) -> AsyncIterator[pb.ModelStreamInferResponse]:
+        """Runs the streamed requests concurrently through the data plane, so they are merged by
+        the dynamic batcher of the model if enabled, and streams back the responses as they
+        complete. At most ``max_stream_inflight_requests`` requests are running or waiting for
+        their response to be sent, the next requests are not read until then.
+        """
+        headers = to_headers(context)
+        responses = asyncio.Queue()
+        inflight = asyncio.Semaphore(self._max_stream_inflight_requests)
+        tasks = set()
+
+        async def infer(request: pb.ModelInferRequest):
+            try:
+                response = pb.ModelStreamInferResponse(
+                    infer_response=await self._infer(
+                        request, _stream_request_headers(headers, context)
+                    )
+                )
+            except Exception as e:
+                logger.error(
+                    "Failed to infer request %s of model %s: %s",
+                    request.id,
+                    request.model_name,
+                    e,
+                )
+                response = pb.ModelStreamInferResponse(
+                    error_message=str(e),
+                    infer_response=pb.ModelInferResponse(
+                        model_name=request.model_name,
+                        model_version=request.model_version,
+                        id=request.id,
+                    ),
+                )
+            responses.put_nowait(response)
+
+        async def read_requests():
+            try:
+                async for request in request_iterator:
+                    await inflight.acquire()
+                    task = asyncio.create_task(infer(request))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                await asyncio.gather(*tasks)
+            finally:
+                responses.put_nowait(None)
+
+        reader = asyncio.create_task(read_requests())
+        try:
+            while True:
+                response = await responses.get()
+                if response is None:
+                    break
+                yield response
+                inflight.release()
+            # Raises the error of the request stream, if any.
+            await reader
+        finally:
+            reader.cancel()
+            for task in list(tasks):
+                task.cancel()
+
+    async def _infer(
+        self, request: pb.ModelInferRequest, headers: Dict[str, str]
+    ) -> pb.ModelInferResponse:
         self.validate_grpc_request(request)
         infer_request = InferRequest.from_grpc(request)
         response_body, _ = await self._data_plane.infer(
@@ -121,10 +198,56 @@ class InferenceServicer(grpc_predict_v2_pb2_grpc.GRPCInferenceServiceServicer):
         if isinstance(response_body, pb.ModelInferResponse):
             return response_body
         elif isinstance(response_body, InferResponse):
-            return response_body.to_grpc()
+            return response_body.to_grpc(
+                use_raw_outputs=self._use_raw_outputs
+                or infer_request.use_binary_outputs
+            )
         else:
             return pb.ModelInferResponse(
                 id=response_body["id"],
                 model_name=response_body["model_name"],
                 outputs=response_body["outputs"],
             )
+
+    async def SystemSharedMemoryStatus(
+        self, request: pb.SystemSharedMemoryStatusRequest, context
+    ) -> pb.SystemSharedMemoryStatusResponse:
+        regions = self._data_plane.shared_memory_registry.status(request.name)
+        return pb.SystemSharedMemoryStatusResponse(
+            regions={
+                region["name"]: pb.SystemSharedMemoryStatusResponse.RegionStatus(
+                    **region
+                )
+                for region in regions
+            }
+        )
+
+    async def SystemSharedMemoryRegister(
+        self, request: pb.SystemSharedMemoryRegisterRequest, context
+    ) -> pb.SystemSharedMemoryRegisterResponse:
+        self._data_plane.shared_memory_registry.register(
+            request.name, request.key, request.byte_size, request.offset
+        )
+        return pb.SystemSharedMemoryRegisterResponse()
+
+    async def SystemSharedMemoryUnregister(
+        self, request: pb.SystemSharedMemoryUnregisterRequest, context
+    ) -> pb.SystemSharedMemoryUnregisterResponse:
+        self._data_plane.shared_memory_registry.unregister(request.name)
+        return pb.SystemSharedMemoryUnregisterResponse()
+
+
+def _stream_request_headers(
+    headers: Dict[str, str], context: ServicerContext
+) -> Dict[str, str]:
+    """The headers of a request of a stream. Its time budget is capped by the time remaining
+    before the deadline of the call when the request is read, not when the stream started.
+    """
+    request_headers = dict(headers)
+    time_remaining = context.time_remaining()
+    if time_remaining is not None:
+        timeout = timeout_from_headers(headers)
+        if timeout is not None:
+            time_remaining = min(time_remaining, timeout)
+        request_headers[REQUEST_TIMEOUT_HEADER] = str(int(time_remaining * 1000))
+    return request_headers
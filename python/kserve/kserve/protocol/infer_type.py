@@ -13,7 +13,7 @@
 # limitations under the License.
 
 import struct
-from typing import Optional, List, Dict, Union, Tuple
+from typing import Any, Optional, List, Dict, Union, Tuple
 
 import numpy as np
 import orjson
@@ -22,7 +22,12 @@ import uuid
 from google.protobuf.internal.containers import MessageMap
 
 from .rest.v2_datamodels import InferenceRequest
-from ..constants.constants import GRPC_CONTENT_DATATYPE_MAPPINGS
+from ..constants.constants import (
+    GRPC_CONTENT_DATATYPE_MAPPINGS,
+    SHARED_MEMORY_BYTE_SIZE_PARAMETER,
+    SHARED_MEMORY_OFFSET_PARAMETER,
+    SHARED_MEMORY_REGION_PARAMETER,
+)
 from ..errors import InvalidInput, InferenceError
 from ..protocol.grpc.grpc_predict_v2_pb2 import (
     ModelInferRequest,
@@ -61,28 +66,37 @@ def serialize_byte_tensor(input_tensor: np.ndarray) -> np.ndarray:
     if (input_tensor.dtype != np.object_) and (input_tensor.dtype.type != np.bytes_):
         raise InferenceError("cannot serialize bytes tensor: invalid datatype")
 
-    flattened_ls = []
     # 'C' order is row-major.
-    for obj in np.nditer(input_tensor, flags=["refs_ok"], order="C"):
+    if input_tensor.dtype == np.object_:
         # If directly passing bytes to BYTES type,
         # don't convert it to str as Python will encode the
         # bytes which may distort the meaning
-        if input_tensor.dtype == np.object_:
-            if type(obj.item()) == bytes:
-                s = obj.item()
-            else:
-                s = str(obj.item()).encode("utf-8")
-        else:
-            s = obj.item()
-        flattened_ls.append(struct.pack("<I", len(s)))
-        flattened_ls.append(s)
-    flattened = b"".join(flattened_ls)
-    flattened_array = np.asarray(flattened, dtype=np.object_)
+        elements = [
+            obj if type(obj) is bytes else str(obj).encode("utf-8")
+            for obj in input_tensor.ravel(order="C")
+        ]
+    else:
+        elements = input_tensor.ravel(order="C").tolist()
+    lengths = np.fromiter(map(len, elements), dtype=np.int64, count=len(elements))
+    # Each element is written at its offset in the output buffer, right after its 4-byte length prefix.
+    data_offsets = np.cumsum(lengths + 4)
+    data_offsets -= lengths
+    prefix_offsets = data_offsets - 4
+    serialized = np.empty(int(data_offsets[-1] + lengths[-1]), dtype=np.uint8)
+    is_data = np.ones(serialized.size, dtype=np.bool_)
+    prefix_index = (prefix_offsets[:, np.newaxis] + np.arange(4)).ravel()
+    is_data[prefix_index] = False
+    serialized[prefix_index] = lengths.astype("<u4").view(np.uint8)
+    serialized[is_data] = np.frombuffer(b"".join(elements), dtype=np.uint8)
+    flattened_array = np.asarray(serialized.tobytes(), dtype=np.object_)
     if not flattened_array.flags["C_CONTIGUOUS"]:
         flattened_array = np.ascontiguousarray(flattened_array, dtype=np.object_)
     return flattened_array
 
 
+_BYTES_LENGTH_PREFIX = struct.Struct("<I")
+
+
 def deserialize_bytes_tensor(encoded_tensor: bytes) -> np.ndarray:
     """
     Deserializes an encoded bytes tensor into a
@@ -98,16 +112,30 @@ def deserialize_bytes_tensor(encoded_tensor: bytes) -> np.ndarray:
             The 1-D numpy array of type object containing the
             deserialized bytes in row-major form.
     """
-    strs = list()
+    val_buf = bytes(encoded_tensor)
+    # Build the offset index of the elements first, the elements are then sliced out in one pass.
+    unpack_from = _BYTES_LENGTH_PREFIX.unpack_from
+    starts = []
+    ends = []
     offset = 0
-    val_buf = encoded_tensor
-    while offset < len(val_buf):
-        length = struct.unpack_from("<I", val_buf, offset)[0]
+    buf_len = len(val_buf)
+    while offset < buf_len:
+        if offset + 4 > buf_len:
+            raise InvalidInput(
+                "unexpected end of the encoded bytes tensor, truncated element length"
+            )
+        length = unpack_from(val_buf, offset)[0]
         offset += 4
-        sb = struct.unpack_from("<{}s".format(length), val_buf, offset)[0]
+        if offset + length > buf_len:
+            raise InvalidInput(
+                "unexpected end of the encoded bytes tensor, element length exceeds the buffer"
+            )
+        starts.append(offset)
         offset += length
-        strs.append(sb)
-    return np.array(strs, dtype=np.object_)
+        ends.append(offset)
+    string_tensor = np.empty(len(starts), dtype=np.object_)
+    string_tensor[:] = [val_buf[start:end] for start, end in zip(starts, ends)]
+    return string_tensor
 
 
 class InferInput:
@@ -142,6 +170,10 @@ class InferInput:
         self._parameters = parameters
         self._data = data
         self._raw_data = None
+        # Indicates that the data is only available as the binary view in _raw_data, it is decoded on first access.
+        self._lazy_data = False
+        # Flat numpy array decoded from the typed gRPC contents, the data list is built from it on first access.
+        self._np_data = None
 
     @property
     def name(self) -> str:
@@ -168,6 +200,7 @@ class InferInput:
         Returns:
             The data of the inference input.
         """
+        self._materialize_data()
         return self._data
 
     @data.setter
@@ -177,6 +210,10 @@ class InferInput:
         Args:
              data: data of the inference input.
         """
+        if self._lazy_data:
+            self._raw_data = None
+            self._lazy_data = False
+        self._np_data = None
         self._data = data
 
     @property
@@ -228,7 +265,7 @@ class InferInput:
             InvalidInput: If the datatype of the inference input is not 'BYTES'.
         """
         if self.datatype == "BYTES":
-            return [s.decode("utf-8") for li in self._data for s in li]
+            return [s.decode("utf-8") for li in self.data for s in li]
         else:
             raise InvalidInput(f"invalid datatype {self.datatype} in the input")
 
@@ -253,6 +290,8 @@ class InferInput:
             else:
                 np_array = np.frombuffer(self._raw_data, dtype=dtype)
             return np_array.reshape(self._shape)
+        elif self._np_data is not None:
+            return self._np_data.reshape(self._shape)
         else:
             np_array = np.array(self._data, dtype=dtype)
             return np_array.reshape(self._shape)
@@ -272,6 +311,8 @@ class InferInput:
         """
         if not isinstance(input_tensor, (np.ndarray,)):
             raise InferenceError("input_tensor must be a numpy array")
+        self._lazy_data = False
+        self._np_data = None
 
         dtype = from_np_dtype(input_tensor.dtype)
         if self._datatype != dtype:
@@ -321,7 +362,7 @@ class InferInput:
                         " you want to pass a byte array."
                     )
             else:
-                self._data = [val.item() for val in input_tensor.flatten()]
+                self._data = input_tensor.flatten().tolist()
         else:
             self._data = None
             if self._datatype == "BYTES":
@@ -337,6 +378,56 @@ class InferInput:
             else:
                 self._parameters["binary_data_size"] = len(self._raw_data)
 
+    def set_lazy_raw_data(self, raw_data: Union[bytes, memoryview]):
+        """Set the binary data of the tensor without decoding it.
+
+        The data is kept as a reference to the given buffer, e.g. a slice of the request body, and
+        :meth:`as_numpy` returns a read-only view over it without copying. The JSON compatible list
+        representation is only built when :attr:`data` is accessed.
+
+        Args:
+            raw_data: The binary data in the format of the binary tensor data extension.
+        """
+        self._data = None
+        self._np_data = None
+        self._raw_data = raw_data
+        self._lazy_data = True
+        if self._parameters is None:
+            self._parameters = {"binary_data_size": len(raw_data)}
+        else:
+            self._parameters["binary_data_size"] = len(raw_data)
+
+    def set_shared_memory(self, region_name: str, byte_size: int, offset: int = 0):
+        """Set the tensor data to be read from a system shared memory region registered with the
+        server, instead of sending it in the request.
+
+        Args:
+            region_name: The name of the registered shared memory region.
+            byte_size: The size of the tensor data in bytes.
+            offset: The offset of the tensor data in the region. Default: ``0``.
+        """
+        _set_shared_memory(self, region_name, byte_size, offset)
+
+    def _set_numpy_contents(self, np_data: np.ndarray):
+        """Set the data from the flat numpy array decoded from the typed gRPC tensor contents.
+        :meth:`as_numpy` returns it reshaped and the list of :attr:`data` is only built on first access.
+        """
+        self._data = None
+        self._np_data = np_data
+
+    def _materialize_data(self):
+        if self._lazy_data:
+            self.set_data_from_numpy(self.as_numpy(), binary_data=False)
+        elif self._data is None and self._np_data is not None:
+            self._data = self._np_data.tolist()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # memoryview can not be pickled or deep copied.
+        if isinstance(self._raw_data, memoryview):
+            state["_raw_data"] = self._raw_data.tobytes()
+        return state
+
     def __eq__(self, other):
         if not isinstance(other, InferInput):
             return False
@@ -404,6 +495,50 @@ def get_content(datatype: str, data: InferTensorContents):
         raise InvalidInput("invalid content type")
 
 
+_CONTENTS_FIELDS = {
+    "BOOL": "bool_contents",
+    "UINT8": "uint_contents",
+    "UINT16": "uint_contents",
+    "UINT32": "uint_contents",
+    "UINT64": "uint64_contents",
+    "INT8": "int_contents",
+    "INT16": "int_contents",
+    "INT32": "int_contents",
+    "INT64": "int64_contents",
+    "FP32": "fp32_contents",
+    "FP64": "fp64_contents",
+    "BYTES": "bytes_contents",
+}
+
+
+def get_content_numpy(datatype: str, data: InferTensorContents) -> np.ndarray:
+    """Decode the typed contents of a gRPC tensor directly into a flat numpy array, without building
+    an intermediate Python list.
+
+    Args:
+        datatype: The tensor datatype.
+        data: The typed tensor contents.
+
+    Returns:
+        The flat numpy array with the dtype of the tensor datatype.
+
+    Raises:
+        InvalidInput: If the datatype is not recognized.
+    """
+    if datatype == "FP16":
+        # FP16 data should be present in raw_input_content, so return an empty array.
+        return np.empty(0, dtype=np.float16)
+    field = _CONTENTS_FIELDS.get(datatype)
+    if field is None:
+        raise InvalidInput("invalid content type")
+    contents = getattr(data, field)
+    if datatype == "BYTES":
+        np_array = np.empty(len(contents), dtype=np.object_)
+        np_array[:] = list(contents)
+        return np_array
+    return np.fromiter(contents, dtype=to_np_dtype(datatype), count=len(contents))
+
+
 class RequestedOutput:
     def __init__(self, name: str, parameters: Optional[Dict] = None):
         """
@@ -461,6 +596,22 @@ class RequestedOutput:
         else:
             return None
 
+    def set_shared_memory(self, region_name: str, byte_size: int, offset: int = 0):
+        """Request the output data to be written to a system shared memory region registered with
+        the server, instead of returning it in the response.
+
+        Args:
+            region_name: The name of the registered shared memory region.
+            byte_size: The size of the output in the region in bytes.
+            offset: The offset of the output data in the region. Default: ``0``.
+        """
+        parameters = to_http_parameters(self._parameters) if self._parameters else {}
+        parameters[SHARED_MEMORY_REGION_PARAMETER] = region_name
+        parameters[SHARED_MEMORY_BYTE_SIZE_PARAMETER] = byte_size
+        if offset:
+            parameters[SHARED_MEMORY_OFFSET_PARAMETER] = offset
+        self._parameters = parameters
+
     def __eq__(self, other):
         if not isinstance(other, RequestedOutput):
             return False
@@ -514,8 +665,14 @@ class InferRequest:
         self._use_raw_outputs = False
         if raw_inputs:
             self._use_raw_outputs = True
-            for i, raw_input in enumerate(raw_inputs):
-                self.inputs[i]._raw_data = raw_input
+            # The inputs held in shared memory have no raw contents.
+            inputs = [
+                infer_input
+                for infer_input in self.inputs
+                if get_shared_memory_parameters(infer_input) is None
+            ]
+            for infer_input, raw_input in zip(inputs, raw_inputs):
+                infer_input._raw_data = raw_input
         self.request_outputs = request_outputs
 
     @property
@@ -524,8 +681,8 @@ class InferRequest:
         For REST,
             Get the binary_data_output attribute from the parameters. This will be ovverided by the individual output's 'binary_data' parameter.
         For GRPC,
-            It is True, if the received inputs are raw_inputs, otherwise False. For GRPC, if the inputs are raw_inputs,
-            then the outputs should be returned as raw_outputs.
+            It is True, if the received inputs are raw_inputs or the 'binary_data_output' parameter is set to True,
+            otherwise False. For GRPC, if the inputs are raw_inputs, then the outputs should be returned as raw_outputs.
 
         Returns:
             a boolean indicating whether to use binary raw outputs
@@ -533,6 +690,10 @@ class InferRequest:
         # If the request is from gRPC and we receive the inputs as raw inputs, then the outputs should be returned as raw binary format.
         if self._use_raw_outputs and self.from_grpc:
             return True
+        elif self.parameters and self.from_grpc:
+            return bool(
+                to_http_parameters(self.parameters).get("binary_data_output", False)
+            )
         # If the request is from REST and the 'use_binary_outputs' parameter is set to True, then the outputs should be returned as raw binary format.
         elif self.parameters and not self.from_grpc:
             # If it is a grpc request, then this configuration has no effect on the output.
@@ -551,20 +712,22 @@ class InferRequest:
         Returns:
             InferRequest: The resulting InferRequest object.
         """
-        infer_inputs = [
-            InferInput(
+        infer_inputs = []
+        for input_tensor in request.inputs:
+            infer_input = InferInput(
                 name=input_tensor.name,
                 shape=list(input_tensor.shape),
                 datatype=input_tensor.datatype,
-                data=get_content(input_tensor.datatype, input_tensor.contents),
                 parameters=(
                     to_http_parameters(input_tensor.parameters)
                     if input_tensor.parameters
                     else None
                 ),
             )
-            for input_tensor in request.inputs
-        ]
+            infer_input._set_numpy_contents(
+                get_content_numpy(input_tensor.datatype, input_tensor.contents)
+            )
+            infer_inputs.append(infer_input)
         request_outputs = [
             RequestedOutput(
                 name=output.name,
@@ -602,10 +765,12 @@ class InferRequest:
             InvalidInput: If the request format is unrecognized or if necessary fields are missing.
         """
         json_bytes = req_bytes[:json_length]
+        req_buffer = memoryview(req_bytes)
         try:
             infer_req_dict = orjson.loads(json_bytes)
         except orjson.JSONDecodeError as e:
             raise InvalidInput(f"Unrecognized request format: {e}")
+        _validate_inference_request_dict(infer_req_dict)
         infer_inputs = []
         # Read the raw binary inputs appended after json
         start_index = json_length
@@ -632,12 +797,10 @@ class InferRequest:
                         f"'binary_data_size' is not specified for input '{infer_input.name}' for model '{model_name}'"
                     )
                 end_index = start_index + binary_data_size
-                infer_input._raw_data = req_bytes[start_index:end_index]
-                infer_input.set_data_from_numpy(
-                    infer_input.as_numpy(), binary_data=False
-                )
+                infer_input.set_lazy_raw_data(req_buffer[start_index:end_index])
                 start_index = end_index
-            else:
+            elif get_shared_memory_parameters(infer_input) is None:
+                # The data of the inputs held in shared memory is read by the data plane.
                 raise InvalidInput(
                     f"'data' field is missing for input '{infer_input.name}' for model '{model_name}'"
                 )
@@ -724,18 +887,32 @@ class InferRequest:
         infer_inputs = []
         raw_inputs = []
         for infer_input in self.inputs:
-            if infer_input.data is None and infer_input._raw_data is None:
+            if get_shared_memory_parameters(infer_input) is not None:
+                infer_inputs.append(
+                    {
+                        "name": infer_input.name,
+                        "shape": infer_input.shape,
+                        "datatype": infer_input.datatype,
+                        "parameters": to_http_parameters(infer_input.parameters),
+                    }
+                )
+                continue
+            # Access the private data, so the binary data received with from_bytes is forwarded as is.
+            if not _has_data(infer_input):
                 raise InvalidInput(
                     f"'data' field is missing for output '{infer_input.name}' for model '{self.model_name}'"
                 )
-            if isinstance(infer_input.data, np.ndarray):
-                infer_input.set_data_from_numpy(infer_input.data, binary_data=False)
-            if infer_input.data and infer_input._raw_data:
+            if isinstance(infer_input._data, np.ndarray):
+                infer_input.set_data_from_numpy(infer_input._data, binary_data=False)
+            elif infer_input._raw_data is None:
+                # The typed contents of a gRPC request are sent as JSON data.
+                infer_input._materialize_data()
+            if infer_input._data and infer_input._raw_data:
                 raise InvalidInput(
                     f"Both 'data' and 'raw_data' fields are set for input '{infer_input.name}' for model '{self.model_name}'"
                 )
 
-            if infer_input.datatype == "FP16" and infer_input.data:
+            if infer_input.datatype == "FP16" and infer_input._data:
                 raise InvalidInput(
                     f"Sending FP16 data via JSON is not supported. Please use the binary data format for input {infer_input.name}"
                 )
@@ -783,17 +960,38 @@ class InferRequest:
 
         return res, None
 
-    def to_grpc(self) -> ModelInferRequest:
+    def to_grpc(self, use_raw_inputs: bool = False) -> ModelInferRequest:
         """Converts the InferRequest object to gRPC ModelInferRequest type.
 
+        The inputs backed by numpy arrays or binary data are sent in ``raw_input_contents``, which
+        copies the whole tensor at once instead of appending its elements to the typed contents.
+        As gRPC does not allow mixing raw and typed contents, all the other inputs are then sent
+        as raw contents too.
+
+        Args:
+            use_raw_inputs: Whether to send all the inputs in ``raw_input_contents``.
+
         Returns:
             ModelInferRequest gRPC type converted from InferRequest object.
         """
         infer_inputs = []
         raw_input_contents = []
+        use_raw_inputs = use_raw_inputs or any(
+            _has_binary_data(infer_input) for infer_input in self.inputs
+        )
         for infer_input in self.inputs:
-            if isinstance(infer_input.data, np.ndarray):
-                infer_input.set_data_from_numpy(infer_input.data, binary_data=True)
+            if get_shared_memory_parameters(infer_input) is not None:
+                infer_inputs.append(
+                    {
+                        "name": infer_input.name,
+                        "shape": infer_input.shape,
+                        "datatype": infer_input.datatype,
+                        "parameters": to_grpc_parameters(infer_input.parameters),
+                    }
+                )
+                continue
+            if use_raw_inputs:
+                raw_contents = _get_raw_contents(infer_input)
             infer_input_dict = {
                 "name": infer_input.name,
                 "shape": infer_input.shape,
@@ -803,8 +1001,8 @@ class InferRequest:
                 infer_input_dict["parameters"] = to_grpc_parameters(
                     infer_input.parameters
                 )
-            if infer_input._raw_data is not None:
-                raw_input_contents.append(infer_input._raw_data)
+            if use_raw_inputs:
+                raw_input_contents.append(raw_contents)
             else:
                 if not isinstance(infer_input.data, List):
                     raise InvalidInput("input data is not a List")
@@ -846,16 +1044,20 @@ class InferRequest:
         Returns:
             The inference input data as pandas dataframe
         """
-        dfs = []
+        columns = {}
         for input in self.inputs:
-            input_data = input.data
             if input.datatype == "BYTES":
                 input_data = [
                     str(val, "utf-8") if isinstance(val, bytes) else val
                     for val in input.data
                 ]
-            dfs.append(pd.DataFrame(input_data, columns=[input.name]))
-        return pd.concat(dfs, axis=1)
+            else:
+                input_data = input.as_numpy().reshape(-1)
+            columns[input.name] = input_data
+        if len({len(input_data) for input_data in columns.values()}) > 1:
+            # Inputs of different lengths are aligned on the row index and padded with NaN.
+            columns = {name: pd.Series(data) for name, data in columns.items()}
+        return pd.DataFrame(columns)
 
     def get_input_by_name(self, name: str) -> Optional[InferInput]:
         """Find an input Tensor in the InferenceRequest that has the given name
@@ -937,6 +1139,12 @@ class InferOutput:
         self._parameters = parameters
         self._data = data
         self._raw_data = None
+        # Indicates that the data is only available as the binary view in _raw_data, it is decoded on first access.
+        self._lazy_data = False
+        # Flat numpy array decoded from the typed gRPC contents, the data list is built from it on first access.
+        self._np_data = None
+        # Whether _np_data holds the data set from numpy for a JSON response rather than gRPC contents.
+        self._np_data_json = False
 
     @property
     def name(self) -> str:
@@ -963,6 +1171,7 @@ class InferOutput:
         Returns:
             The data of inference output.
         """
+        self._materialize_data()
         return self._data
 
     @data.setter
@@ -972,6 +1181,11 @@ class InferOutput:
         Args:
             data: inference output data.
         """
+        if self._lazy_data:
+            self._raw_data = None
+            self._lazy_data = False
+        self._np_data = None
+        self._np_data_json = False
         self._data = data
 
     @property
@@ -1028,6 +1242,8 @@ class InferOutput:
             else:
                 np_array = np.frombuffer(self._raw_data, dtype=dtype)
             return np_array.reshape(self._shape)
+        elif self._np_data is not None:
+            return self._np_data.reshape(self._shape)
         else:
             np_array = np.array(self._data, dtype=dtype)
             return np_array.reshape(self._shape)
@@ -1047,6 +1263,9 @@ class InferOutput:
         """
         if not isinstance(output_tensor, (np.ndarray,)):
             raise InferenceError("input_tensor must be a numpy array")
+        self._lazy_data = False
+        self._np_data = None
+        self._np_data_json = False
 
         dtype = from_np_dtype(output_tensor.dtype)
         if self._datatype != dtype:
@@ -1096,7 +1315,11 @@ class InferOutput:
                         " you want to pass a byte array."
                     )
             else:
-                self._data = [val.item() for val in output_tensor.flatten()]
+                # Kept as a flat array, so the REST response serializes it natively with orjson.
+                # The list of data is only built on first access.
+                self._data = None
+                self._np_data = output_tensor.ravel()
+                self._np_data_json = True
         else:
             self._data = None
             if self._datatype == "BYTES":
@@ -1112,6 +1335,58 @@ class InferOutput:
             else:
                 self._parameters["binary_data_size"] = len(self._raw_data)
 
+    def set_lazy_raw_data(self, raw_data: Union[bytes, memoryview]):
+        """Set the binary data of the tensor without decoding it.
+
+        The data is kept as a reference to the given buffer, e.g. a slice of the request body, and
+        :meth:`as_numpy` returns a read-only view over it without copying. The JSON compatible list
+        representation is only built when :attr:`data` is accessed.
+
+        Args:
+            raw_data: The binary data in the format of the binary tensor data extension.
+        """
+        self._data = None
+        self._np_data = None
+        self._np_data_json = False
+        self._raw_data = raw_data
+        self._lazy_data = True
+        if self._parameters is None:
+            self._parameters = {"binary_data_size": len(raw_data)}
+        else:
+            self._parameters["binary_data_size"] = len(raw_data)
+
+    def set_shared_memory(self, region_name: str, byte_size: int, offset: int = 0):
+        """Set the output data as held in a system shared memory region, it is not sent in the
+        response.
+
+        Args:
+            region_name: The name of the registered shared memory region.
+            byte_size: The size of the output data in bytes.
+            offset: The offset of the output data in the region. Default: ``0``.
+        """
+        _set_shared_memory(self, region_name, byte_size, offset)
+
+    def _set_numpy_contents(self, np_data: np.ndarray):
+        """Set the data from the flat numpy array decoded from the typed gRPC tensor contents.
+        :meth:`as_numpy` returns it reshaped and the list of :attr:`data` is only built on first access.
+        """
+        self._data = None
+        self._np_data = np_data
+        self._np_data_json = False
+
+    def _materialize_data(self):
+        if self._lazy_data:
+            self.set_data_from_numpy(self.as_numpy(), binary_data=False)
+        if self._data is None and self._np_data is not None:
+            self._data = self._np_data.tolist()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # memoryview can not be pickled or deep copied.
+        if isinstance(self._raw_data, memoryview):
+            state["_raw_data"] = self._raw_data.tobytes()
+        return state
+
     def __eq__(self, other):
         if not isinstance(other, InferOutput):
             return False
@@ -1195,8 +1470,14 @@ class InferResponse:
         self._requested_outputs = requested_outputs
         self._use_binary_outputs: bool = use_binary_outputs
         if raw_outputs:
-            for i, raw_output in enumerate(raw_outputs):
-                self.outputs[i]._raw_data = raw_output
+            # The outputs held in shared memory have no raw contents.
+            outputs = [
+                infer_output
+                for infer_output in self.outputs
+                if get_shared_memory_parameters(infer_output) is None
+            ]
+            for infer_output, raw_output in zip(outputs, raw_outputs):
+                infer_output._raw_data = raw_output
 
     @classmethod
     def from_grpc(cls, response: ModelInferResponse) -> "InferResponse":
@@ -1207,16 +1488,18 @@ class InferResponse:
         Returns:
             InferResponse object.
         """
-        infer_outputs = [
-            InferOutput(
+        infer_outputs = []
+        for output in response.outputs:
+            infer_output = InferOutput(
                 name=output.name,
                 shape=list(output.shape),
                 datatype=output.datatype,
-                data=get_content(output.datatype, output.contents),
                 parameters=output.parameters,
             )
-            for output in response.outputs
-        ]
+            infer_output._set_numpy_contents(
+                get_content_numpy(output.datatype, output.contents)
+            )
+            infer_outputs.append(infer_output)
         return cls(
             model_name=response.model_name,
             model_version=response.model_version,
@@ -1241,7 +1524,7 @@ class InferResponse:
                 name=output["name"],
                 shape=list(output["shape"]),
                 datatype=output["datatype"],
-                data=output["data"],
+                data=output.get("data", None),
                 parameters=output.get("parameters", None),
             )
             for output in response["outputs"]
@@ -1278,6 +1561,7 @@ class InferResponse:
         # If json_length is equal to the length of the response bytes, then the response does not have
         # any appended binary data after the json.
         json_bytes = res_bytes[:json_length]
+        res_buffer = memoryview(res_bytes)
         try:
             infer_res_dict = orjson.loads(json_bytes)
         except orjson.JSONDecodeError as e:
@@ -1297,12 +1581,9 @@ class InferResponse:
             if parameters and "binary_data_size" in parameters:
                 binary_data_size = parameters.get("binary_data_size")
                 end_index = start_index + binary_data_size
-                infer_output._raw_data = res_bytes[start_index:end_index]
-                infer_output.set_data_from_numpy(
-                    infer_output.as_numpy(), binary_data=False
-                )
+                infer_output.set_lazy_raw_data(res_buffer[start_index:end_index])
                 start_index = end_index
-            else:
+            elif get_shared_memory_parameters(infer_output) is None:
                 infer_output_data = output.get("data", None)
                 if infer_output_data is None:
                     raise InvalidInput(
@@ -1346,19 +1627,38 @@ class InferResponse:
                 raise InvalidInput(
                     f"Unexpected inference output '{output.name}' for model '{self.model_name}'"
                 )
-            if infer_output.data is None and infer_output._raw_data is None:
+            if get_shared_memory_parameters(infer_output) is not None:
+                infer_outputs.append(
+                    {
+                        "name": infer_output.name,
+                        "shape": infer_output.shape,
+                        "datatype": infer_output.datatype,
+                        "parameters": to_http_parameters(infer_output.parameters),
+                    }
+                )
+                continue
+            if not _has_data(infer_output):
                 raise InvalidInput(
                     f"'data' field is missing for output '{infer_output.name}' for model '{self.model_name}'"
                 )
-            if isinstance(infer_output.data, np.ndarray):
+            if isinstance(infer_output._data, np.ndarray):
                 infer_output.set_data_from_numpy(
-                    infer_output.data, binary_data=use_binary_data
+                    infer_output._data, binary_data=use_binary_data
                 )
-            elif infer_output.data or infer_output._raw_data:
+            elif (
+                infer_output._data
+                or infer_output._raw_data
+                or infer_output._np_data is not None
+            ):
                 infer_output.set_data_from_numpy(
                     infer_output.as_numpy(), binary_data=use_binary_data
                 )
-            if infer_output.datatype == "FP16" and infer_output.data:
+            json_data = None if use_binary_data else _json_data(infer_output)
+            if (
+                infer_output.datatype == "FP16"
+                and json_data is not None
+                and len(json_data)
+            ):
                 raise InvalidInput(
                     f"Sending FP16 data via JSON is not supported. Please use the binary data format for output {infer_output.name}"
                 )
@@ -1375,7 +1675,7 @@ class InferResponse:
             if use_binary_data:
                 raw_outputs.append(infer_output._raw_data)
             else:
-                infer_output_dict["data"] = infer_output.data
+                infer_output_dict["data"] = json_data
             infer_outputs.append(infer_output_dict)
 
         res = {
@@ -1388,16 +1688,26 @@ class InferResponse:
             res["parameters"] = to_http_parameters(self.parameters)
 
         if len(raw_outputs) != 0:
-            infer_response_bytes = orjson.dumps(res)
+            infer_response_bytes = orjson.dumps(
+                res, default=orjson_numpy_default, option=orjson.OPT_SERIALIZE_NUMPY
+            )
             json_length = len(infer_response_bytes)
             infer_response_bytes = b"".join([infer_response_bytes] + raw_outputs)
             return infer_response_bytes, json_length
 
         return res, None
 
-    def to_grpc(self) -> ModelInferResponse:
+    def to_grpc(self, use_raw_outputs: bool = False) -> ModelInferResponse:
         """Converts the InferResponse object to gRPC ModelInferResponse type.
 
+        The outputs backed by numpy arrays or binary data are sent in ``raw_output_contents``, which
+        copies the whole tensor at once instead of appending its elements to the typed contents.
+        As gRPC does not allow mixing raw and typed contents, all the other outputs are then sent
+        as raw contents too.
+
+        Args:
+            use_raw_outputs: Whether to send all the outputs in ``raw_output_contents``.
+
         Returns:
             The ModelInferResponse gRPC message.
         Raises:
@@ -1405,20 +1715,26 @@ class InferResponse:
         """
         infer_outputs = []
         raw_output_contents = []
-        use_raw_outputs = self._use_binary_outputs
-        if not self._use_binary_outputs:
-            # If FP16 datatype is present in the outputs use raw outputs.
-            if _contains_fp16_datatype(self):
-                use_raw_outputs = True
+        use_raw_outputs = (
+            use_raw_outputs
+            or self._use_binary_outputs
+            # FP16 data can only be sent as raw outputs.
+            or _contains_fp16_datatype(self)
+            or any(_has_binary_data(infer_output) for infer_output in self.outputs)
+        )
         for infer_output in self.outputs:
-            if (
-                use_raw_outputs
-                and infer_output.data
-                and isinstance(infer_output.data, list)
-            ):
-                infer_output.data = infer_output.as_numpy()
-            if isinstance(infer_output.data, np.ndarray):
-                infer_output.set_data_from_numpy(infer_output.data, binary_data=True)
+            if get_shared_memory_parameters(infer_output) is not None:
+                infer_outputs.append(
+                    {
+                        "name": infer_output.name,
+                        "shape": infer_output.shape,
+                        "datatype": infer_output.datatype,
+                        "parameters": to_grpc_parameters(infer_output.parameters),
+                    }
+                )
+                continue
+            if use_raw_outputs:
+                raw_contents = _get_raw_contents(infer_output)
             infer_output_dict = {
                 "name": infer_output.name,
                 "shape": infer_output.shape,
@@ -1428,8 +1744,8 @@ class InferResponse:
                 infer_output_dict["parameters"] = to_grpc_parameters(
                     infer_output.parameters
                 )
-            if infer_output._raw_data is not None:
-                raw_output_contents.append(infer_output._raw_data)
+            if use_raw_outputs:
+                raw_output_contents.append(raw_contents)
             else:
                 if not isinstance(infer_output.data, List):
                     raise InvalidInput("output data is not a List")
@@ -1559,6 +1875,144 @@ def to_http_parameters(
     return http_params
 
 
+def get_shared_memory_parameters(
+    tensor: Union[InferInput, InferOutput, RequestedOutput]
+) -> Optional[Tuple[str, int, int]]:
+    """Returns the region name, the byte size and the offset of the tensor data held in a system
+    shared memory region, or ``None`` if the tensor data is not held in shared memory.
+
+    Raises:
+        InvalidInput: If the byte size of the tensor data is not specified.
+    """
+    parameters = tensor.parameters
+    if not parameters or SHARED_MEMORY_REGION_PARAMETER not in parameters:
+        return None
+    parameters = to_http_parameters(parameters)
+    byte_size = parameters.get(SHARED_MEMORY_BYTE_SIZE_PARAMETER, None)
+    if not isinstance(byte_size, int):
+        raise InvalidInput(
+            f"'{SHARED_MEMORY_BYTE_SIZE_PARAMETER}' is not specified for tensor '{tensor.name}'"
+        )
+    return (
+        parameters[SHARED_MEMORY_REGION_PARAMETER],
+        byte_size,
+        parameters.get(SHARED_MEMORY_OFFSET_PARAMETER, 0),
+    )
+
+
+def _set_shared_memory(
+    tensor: Union[InferInput, InferOutput],
+    region_name: str,
+    byte_size: int,
+    offset: int,
+):
+    tensor._data = None
+    tensor._raw_data = None
+    tensor._np_data = None
+    tensor._lazy_data = False
+    parameters = to_http_parameters(tensor.parameters) if tensor.parameters else {}
+    parameters.pop("binary_data_size", None)
+    parameters[SHARED_MEMORY_REGION_PARAMETER] = region_name
+    parameters[SHARED_MEMORY_BYTE_SIZE_PARAMETER] = byte_size
+    if offset:
+        parameters[SHARED_MEMORY_OFFSET_PARAMETER] = offset
+    tensor._parameters = parameters
+
+
+def _validate_inference_request_dict(infer_req_dict: Any):
+    """Checks the structure of a v2 REST inference request parsed from JSON. Unlike the
+    InferenceRequest model, the tensor data is not validated element by element.
+
+    Raises:
+        InvalidInput: If a required field is missing or has the wrong type.
+    """
+    if not isinstance(infer_req_dict, dict):
+        raise InvalidInput("Unrecognized request format: expected a JSON object")
+    inputs = infer_req_dict.get("inputs", None)
+    if not isinstance(inputs, list):
+        raise InvalidInput("Unrecognized request format: 'inputs' must be a list")
+    for input_ in inputs:
+        if not isinstance(input_, dict):
+            raise InvalidInput("Unrecognized request format: 'inputs' must be objects")
+        for field, field_type in (("name", str), ("shape", list), ("datatype", str)):
+            if not isinstance(input_.get(field, None), field_type):
+                raise InvalidInput(
+                    f"Unrecognized request format: invalid or missing '{field}' field for input"
+                )
+        if not all(isinstance(dim, int) for dim in input_["shape"]):
+            raise InvalidInput(
+                f"Unrecognized request format: invalid shape for input '{input_['name']}'"
+            )
+        data = input_.get("data", None)
+        if data is not None and not isinstance(data, list):
+            raise InvalidInput(
+                f"Unrecognized request format: 'data' must be a list for input '{input_['name']}'"
+            )
+    outputs = infer_req_dict.get("outputs", None)
+    if outputs is not None and not (
+        isinstance(outputs, list)
+        and all(isinstance(output, dict) and "name" in output for output in outputs)
+    ):
+        raise InvalidInput(
+            "Unrecognized request format: 'outputs' must be a list of objects with a 'name'"
+        )
+
+
+def orjson_numpy_default(obj: Any) -> Any:
+    """Serialize the numpy arrays orjson does not serialize natively, e.g. non native byte order."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_data(tensor: Union[InferInput, InferOutput]) -> Union[List, np.ndarray]:
+    """The data of a tensor in a REST response, the flat numpy array if the data is held as one, so
+    it is serialized without building the list of data."""
+    if tensor._lazy_data:
+        tensor.set_data_from_numpy(tensor.as_numpy(), binary_data=False)
+    if tensor._data is None and tensor._np_data is not None:
+        return tensor._np_data
+    return tensor.data
+
+
+def _has_data(tensor: Union[InferInput, InferOutput]) -> bool:
+    """Whether the tensor holds data in any of its representations."""
+    return (
+        tensor._data is not None
+        or tensor._raw_data is not None
+        or tensor._np_data is not None
+    )
+
+
+def _has_binary_data(tensor: Union[InferInput, InferOutput]) -> bool:
+    """Whether the tensor data is held as binary data or a numpy array rather than a list."""
+    return tensor._raw_data is not None or isinstance(tensor._data, np.ndarray)
+
+
+def _get_raw_contents(tensor: Union[InferInput, InferOutput]) -> bytes:
+    """Returns the tensor data in the format of the gRPC raw contents. The numpy data is encoded
+    with a single copy, without converting it to a list first.
+    """
+    if tensor._raw_data is not None:
+        # The lazy binary data may be a view over the REST request body.
+        if isinstance(tensor._raw_data, bytes):
+            return tensor._raw_data
+        return bytes(tensor._raw_data)
+    if tensor._np_data is not None and not getattr(tensor, "_np_data_json", False):
+        # Decoded from the typed contents of a gRPC message, its parameters are left as received.
+        if tensor.datatype == "BYTES":
+            serialized = serialize_byte_tensor(tensor._np_data)
+            return serialized.item() if serialized.size > 0 else b""
+        return tensor._np_data.tobytes()
+    np_data = tensor._data if isinstance(tensor._data, np.ndarray) else None
+    tensor.set_data_from_numpy(
+        np_data if np_data is not None else tensor.as_numpy(), binary_data=True
+    )
+    return tensor._raw_data
+
+
 def _contains_fp16_datatype(infer_response: InferResponse) -> bool:
     """
     Checks whether the InferResponse outputs contains FP16 datatype.
@@ -85,6 +85,7 @@ class ModelRepositoryExtension:
             raise ModelNotReady(
                 model_name, f"Error type: {ex_type} error msg: {ex_value}"
             )
+        self._model_registry.invalidate_readiness(model_name)
         is_ready = await self._model_registry.is_model_ready(model_name)
         if not is_ready:
             raise ModelNotReady(model_name)
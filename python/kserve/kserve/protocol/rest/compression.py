@@ -0,0 +1,173 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional
+
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ...errors import InvalidInput
+from ...metrics import COMPRESSION_COMPRESSED_BYTES, COMPRESSION_RAW_BYTES
+from ...utils.compression import (
+    DEFAULT_MAX_DECOMPRESSED_SIZE,
+    IDENTITY,
+    Compressor,
+    Decompressor,
+    negotiate_encoding,
+)
+
+
+class CompressionMiddleware:
+    """Content-Encoding negotiation of the REST endpoints.
+
+    The request bodies compressed with gzip or zstd are decompressed as they are received, so the
+    endpoints and the data plane only see the raw body. A request whose decompressed body exceeds
+    ``max_decompressed_size`` is rejected with a ``PayloadTooLarge`` error. If enabled, the responses are compressed
+    with the coding preferred by the ``Accept-Encoding`` of the request, unless the body is
+    smaller than ``minimum_size``. Streamed responses are compressed chunk by chunk and each chunk
+    is flushed, so it is delivered as soon as it is produced.
+
+    Args:
+        app: The ASGI application.
+        compress_responses: Whether to compress the responses. Default: ``True``.
+        minimum_size: The minimum size in bytes of the compressed response bodies. Default: ``1024``.
+        compression_level: The compression level. Default: ``None``, the default of the coding.
+        max_decompressed_size: The maximum size in bytes of the decompressed request bodies, or
+            ``None`` for no limit. Default: 256 MiB.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        compress_responses: bool = True,
+        minimum_size: int = 1024,
+        compression_level: Optional[int] = None,
+        max_decompressed_size: Optional[int] = DEFAULT_MAX_DECOMPRESSED_SIZE,
+    ):
+        self.app = app
+        self.compress_responses = compress_responses
+        self.minimum_size = minimum_size
+        self.compression_level = compression_level
+        self.max_decompressed_size = max_decompressed_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        content_encoding = headers.get("content-encoding", IDENTITY).strip().lower()
+        if content_encoding != IDENTITY:
+            try:
+                decompressor = Decompressor(
+                    content_encoding, self.max_decompressed_size
+                )
+            except InvalidInput as e:
+                response = ORJSONResponse(status_code=415, content={"error": str(e)})
+                await response(scope, receive, send)
+                return
+            scope = dict(scope)
+            scope["headers"] = [
+                (key, value)
+                for key, value in scope["headers"]
+                if key not in (b"content-encoding", b"content-length")
+            ]
+            receive = _DecompressingReceive(receive, decompressor)
+        if self.compress_responses:
+            encoding = negotiate_encoding(headers.get("accept-encoding"))
+            if encoding is not None:
+                send = _CompressingSend(
+                    send, encoding, self.minimum_size, self.compression_level
+                )
+        await self.app(scope, receive, send)
+
+
+class _DecompressingReceive:
+    def __init__(self, receive: Receive, decompressor: Decompressor):
+        self._receive = receive
+        self._decompressor = decompressor
+
+    async def __call__(self) -> Message:
+        message = await self._receive()
+        if message["type"] != "http.request":
+            return message
+        compressed = message.get("body", b"")
+        # Raised while the endpoint reads the body, so it is handled as a bad request, or as a
+        # payload too large if the decompressed body exceeds the limit.
+        body = self._decompressor.decompress(compressed)
+        if not message.get("more_body", False):
+            self._decompressor.finish()
+        labels = ("request", self._decompressor.encoding)
+        COMPRESSION_COMPRESSED_BYTES.labels(*labels).inc(len(compressed))
+        COMPRESSION_RAW_BYTES.labels(*labels).inc(len(body))
+        return {**message, "body": body}
+
+
+class _CompressingSend:
+    def __init__(
+        self,
+        send: Send,
+        encoding: str,
+        minimum_size: int,
+        compression_level: Optional[int],
+    ):
+        self._send = send
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._compression_level = compression_level
+        self._start_message: Optional[Message] = None
+        self._compressor: Optional[Compressor] = None
+        self._passthrough = False
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk tells whether to compress the response.
+            self._start_message = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._start_message is not None:
+            start_message, self._start_message = self._start_message, None
+            headers = MutableHeaders(raw=list(start_message["headers"]))
+            if "content-encoding" in headers or (
+                not more_body and len(body) < self._minimum_size
+            ):
+                self._passthrough = True
+                await self._send(start_message)
+                await self._send(message)
+                return
+            self._compressor = Compressor(self._encoding, self._compression_level)
+            headers["content-encoding"] = self._encoding
+            headers.add_vary_header("accept-encoding")
+            compressed = self._compress(body, more_body)
+            if more_body:
+                del headers["content-length"]
+            else:
+                headers["content-length"] = str(len(compressed))
+            await self._send({**start_message, "headers": headers.raw})
+        else:
+            compressed = self._compress(body, more_body)
+        await self._send(
+            {"type": "http.response.body", "body": compressed, "more_body": more_body}
+        )
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        compressed = self._compressor.compress(body, final=not more_body)
+        labels = ("response", self._encoding)
+        COMPRESSION_RAW_BYTES.labels(*labels).inc(len(body))
+        COMPRESSION_COMPRESSED_BYTES.labels(*labels).inc(len(compressed))
+        return compressed
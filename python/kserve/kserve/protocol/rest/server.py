@@ -13,12 +13,13 @@
 # limitations under the License.
 
 import logging
-from typing import Dict, Optional, Union
+import socket
+from typing import Dict, List, Optional, Union
 
 import uvicorn
 from fastapi import FastAPI, Request, Response
 from fastapi.routing import APIRouter
-from prometheus_client import REGISTRY, exposition
+from prometheus_client import REGISTRY, CollectorRegistry, exposition, multiprocess
 from timing_asgi import TimingClient, TimingMiddleware
 from timing_asgi.integrations import StarletteScopeToName
 
@@ -33,12 +34,17 @@ from kserve.errors import (
     model_not_found_handler,
     model_not_ready_handler,
     not_implemented_error_handler,
+    PayloadTooLarge,
+    payload_too_large_handler,
     UnsupportedProtocol,
     unsupported_protocol_error_handler,
 )
 from kserve.logging import trace_logger
 from kserve.protocol.dataplane import DataPlane
+from kserve.supervisor import is_prometheus_multiprocess
+from kserve.utils.compression import DEFAULT_MAX_DECOMPRESSED_SIZE
 
+from .compression import CompressionMiddleware
 from .openai.config import maybe_register_openai_endpoints
 from .v1_endpoints import register_v1_endpoints
 from .v2_endpoints import register_v2_endpoints
@@ -47,7 +53,12 @@ from ..model_repository_extension import ModelRepositoryExtension
 
 async def metrics_handler(request: Request) -> Response:
     encoder, content_type = exposition.choose_encoder(request.headers.get("accept"))
-    return Response(content=encoder(REGISTRY), headers={"content-type": content_type})
+    registry = REGISTRY
+    if is_prometheus_multiprocess():
+        # Collect the metrics of all the worker processes.
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(content=encoder(registry), headers={"content-type": content_type})
 
 
 class PrintTimings(TimingClient):
@@ -86,6 +97,7 @@ class RESTServer:
 
         # Add exception handlers
         self.app.add_exception_handler(InvalidInput, invalid_input_handler)
+        self.app.add_exception_handler(PayloadTooLarge, payload_too_large_handler)
         self.app.add_exception_handler(InferenceError, inference_error_handler)
         self.app.add_exception_handler(ModelNotFound, model_not_found_handler)
         self.app.add_exception_handler(ModelNotReady, model_not_ready_handler)
@@ -108,6 +120,9 @@ class UvicornServer:
         log_config: Optional[Union[str, Dict]] = None,
         access_log_format: Optional[str] = None,
         workers: int = 1,
+        enable_compression: bool = False,
+        compression_min_size: int = 1024,
+        max_decompressed_size: Optional[int] = DEFAULT_MAX_DECOMPRESSED_SIZE,
     ):
         super().__init__()
         rest_server = RESTServer(app, data_plane, model_repository_extension)
@@ -117,6 +132,12 @@ class UvicornServer:
             client=PrintTimings(),
             metric_namer=StarletteScopeToName(prefix="kserve.io", starlette_app=app),
         )
+        app.add_middleware(
+            CompressionMiddleware,
+            compress_responses=enable_compression,
+            minimum_size=compression_min_size,
+            max_decompressed_size=max_decompressed_size,
+        )
         self.cfg = uvicorn.Config(
             app="kserve.model_server:app",
             host="0.0.0.0",
@@ -143,8 +164,8 @@ class UvicornServer:
 
         self.server = _NoSignalUvicornServer(config=self.cfg)
 
-    async def run(self):
-        await self.server.serve()
+    async def run(self, sockets: Optional[List[socket.socket]] = None):
+        await self.server.serve(sockets=sockets)
 
     async def stop(self, sig: Optional[int] = None):
         if self.server:
@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Optional, Union, Dict, List, AsyncIterator
+from typing import Any, Optional, Union, Dict, List, AsyncIterator
 
+import numpy as np
+import orjson
+import pandas as pd
 from fastapi import Request, Response, FastAPI, APIRouter
 from starlette.responses import StreamingResponse
 from fastapi.responses import JSONResponse
@@ -24,6 +27,31 @@ from ..model_repository_extension import ModelRepositoryExtension
 from ...constants.constants import V1_ROUTE_PREFIX
 
 
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient="records")
+    # Arrays orjson does not serialize natively, e.g. non contiguous, FP16 or object arrays.
+    if isinstance(obj, (np.ndarray, pd.Series)):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class NumpyJSONResponse(JSONResponse):
+    """JSON response encoded with orjson. The numpy arrays and scalars in the content are
+    serialized natively, without converting them to lists first, and pandas DataFrames are
+    serialized as a list of records.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+
+
 class V1Endpoints:
     """KServe V1 Endpoints"""
 
@@ -97,7 +125,7 @@ class V1Endpoints:
             return Response(content=response, headers=response_headers)
         if isinstance(response, AsyncIterator):
             return StreamingResponse(content=response)
-        return JSONResponse(content=response, headers=response_headers)
+        return NumpyJSONResponse(content=response, headers=response_headers)
 
     async def explain(self, model_name: str, request: Request) -> Union[Response, Dict]:
         """Explain handler.
@@ -134,7 +162,7 @@ class V1Endpoints:
 
         if not isinstance(response, dict):
             return Response(content=response, headers=response_headers)
-        return response
+        return NumpyJSONResponse(content=response, headers=response_headers)
 
 
 def register_v1_endpoints(
@@ -282,3 +282,37 @@ class InferenceResponse(BaseModel):
 
         class Config:
             schema_extra = inference_response_schema_extra
+
+
+class SystemSharedMemoryRegisterRequest(BaseModel):
+    """SystemSharedMemoryRegisterRequest
+
+    $system_shared_memory_register_request =
+    {
+      "key" : $string,
+      "offset" : $number #optional,
+      "byte_size" : $number
+    }
+    """
+
+    key: str
+    offset: int = 0
+    byte_size: int
+
+
+class SystemSharedMemoryRegionStatus(BaseModel):
+    """SystemSharedMemoryRegionStatus
+
+    $system_shared_memory_region_status =
+    {
+      "name" : $string,
+      "key" : $string,
+      "offset" : $number,
+      "byte_size" : $number
+    }
+    """
+
+    name: str
+    key: str
+    offset: int
+    byte_size: int
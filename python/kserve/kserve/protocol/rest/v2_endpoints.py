@@ -12,26 +12,35 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Optional, Dict, Union
+from typing import Optional, Dict, List
 
+import orjson
 from fastapi import FastAPI, APIRouter
 from fastapi.requests import Request
 from fastapi.responses import Response
 
 from .v2_datamodels import (
     InferenceRequest,
+    is_pydantic_2,
     ServerMetadataResponse,
     ServerLiveResponse,
     ServerReadyResponse,
     ModelMetadataResponse,
-    InferenceResponse,
     ModelReadyResponse,
     ListModelsResponse,
+    SystemSharedMemoryRegisterRequest,
+    SystemSharedMemoryRegionStatus,
 )
 from ..dataplane import DataPlane
+from ..infer_type import orjson_numpy_default
 from ..model_repository_extension import ModelRepositoryExtension
-from ...constants.constants import V2_ROUTE_PREFIX, PredictorProtocol
-from ...errors import ModelNotReady
+from ...constants.constants import (
+    SHARED_MEMORY_REGION_PARAMETER,
+    V2_ROUTE_PREFIX,
+    PredictorProtocol,
+)
+from ...errors import InferenceError, ModelNotReady
+from ...utils import arrow_codec
 
 
 class V2Endpoints:
@@ -127,20 +136,23 @@ class V2Endpoints:
         raw_request: Request,
         raw_response: Response,
         model_name: str,
-        request_body: Union[InferenceRequest, bytes],
         model_version: Optional[str] = None,
-    ) -> Union[InferenceResponse, Response]:
+    ) -> Response:
         """Infer handler.
 
+        The request body is parsed with orjson and the JSON response is serialized with orjson,
+        without validating the tensor data with the InferenceRequest and InferenceResponse models.
+        Requests and responses can also be encoded as Arrow IPC streams, with the
+        ``application/vnd.apache.arrow.stream`` content type.
+
         Args:
             raw_request (Request): fastapi request object,
             raw_response (Response): fastapi response object,
             model_name (str): Model name.
-            request_body (InferenceRequest): Inference request body.
             model_version (Optional[str]): Model version (optional).
 
         Returns:
-            InferenceResponse: Inference response object.
+            Response: Inference response.
         """
         # TODO: support model_version
         if model_version:
@@ -152,6 +164,7 @@ class V2Endpoints:
             raise ModelNotReady(model_name)
 
         request_headers = dict(raw_request.headers)
+        request_body = await raw_request.body()
 
         infer_request, _ = self.dataplane.decode(
             request_body,
@@ -173,17 +186,18 @@ class V2Endpoints:
 
         response_headers.update(res_headers)
         response_headers.pop("content-length", None)
-        response_headers.pop("content-type", None)
+        content_type = response_headers.pop("content-type", None)
 
         if response_headers:
             raw_response.headers.update(response_headers)
-        if isinstance(response, bytes):
-            raw_response.status_code = 200
-            raw_response.body = response
-            res = raw_response
-        else:
-            res = InferenceResponse.parse_obj(response)
-        return res
+        if not isinstance(response, bytes):
+            response = _serialize_inference_response(response)
+            raw_response.headers["content-type"] = "application/json"
+        elif arrow_codec.is_arrow_content_type(content_type):
+            raw_response.headers["content-type"] = content_type
+        raw_response.status_code = 200
+        raw_response.body = response
+        return raw_response
 
     async def load(self, model_name: str) -> Dict:
         """Model load handler.
@@ -209,6 +223,124 @@ class V2Endpoints:
         await self.model_repository_extension.unload(model_name)
         return {"name": model_name, "unload": True}
 
+    async def system_shared_memory_status(
+        self, region_name: Optional[str] = None
+    ) -> List[SystemSharedMemoryRegionStatus]:
+        """System shared memory status handler.
+
+        Args:
+            region_name (Optional[str]): Region name, the status of all the regions if not set.
+
+        Returns:
+            List[SystemSharedMemoryRegionStatus]: Status of the registered regions.
+        """
+        return self.dataplane.shared_memory_registry.status(region_name)
+
+    async def system_shared_memory_register(
+        self, region_name: str, register_request: SystemSharedMemoryRegisterRequest
+    ) -> Dict:
+        """System shared memory register handler.
+
+        Args:
+            region_name (str): Region name.
+            register_request (SystemSharedMemoryRegisterRequest): Shared memory object key,
+                offset and byte size of the region.
+
+        Returns:
+            Dict: {}
+        """
+        self.dataplane.shared_memory_registry.register(
+            region_name,
+            register_request.key,
+            register_request.byte_size,
+            register_request.offset,
+        )
+        return {}
+
+    async def system_shared_memory_unregister(
+        self, region_name: Optional[str] = None
+    ) -> Dict:
+        """System shared memory unregister handler.
+
+        Args:
+            region_name (Optional[str]): Region name, all the regions are unregistered if not set.
+
+        Returns:
+            Dict: {}
+        """
+        self.dataplane.shared_memory_registry.unregister(region_name)
+        return {}
+
+
+def _serialize_inference_response(response: Dict) -> bytes:
+    """Serializes the inference response with the fields of the InferenceResponse model. The numpy
+    arrays and scalars in the response are serialized by orjson natively.
+
+    Raises:
+        InferenceError: If a required field of the inference response is missing.
+    """
+    try:
+        outputs = [_serialize_output(output) for output in response["outputs"]]
+        body = {
+            "model_name": response["model_name"],
+            "model_version": response.get("model_version", None),
+            "id": response["id"],
+            "parameters": response.get("parameters", None),
+            "outputs": outputs,
+        }
+    except (KeyError, TypeError, AttributeError) as e:
+        raise InferenceError(f"Invalid inference response, missing field {e}")
+    return orjson.dumps(
+        body, default=orjson_numpy_default, option=orjson.OPT_SERIALIZE_NUMPY
+    )
+
+
+def _serialize_output(output: Dict) -> Dict:
+    serialized = {
+        "name": output["name"],
+        "shape": output["shape"],
+        "datatype": output["datatype"],
+        "parameters": output.get("parameters", None),
+    }
+    # The data of the outputs written to shared memory is not returned.
+    if SHARED_MEMORY_REGION_PARAMETER not in (serialized["parameters"] or {}):
+        serialized["data"] = output["data"]
+    return serialized
+
+
+def _infer_openapi_extra() -> Dict:
+    """The OpenAPI request body of the infer endpoint. It is documented with the InferenceRequest
+    model, although the body is parsed without it.
+    """
+    if is_pydantic_2:
+        schema = InferenceRequest.model_json_schema()
+    else:
+        schema = InferenceRequest.schema()
+    definitions = {**schema.pop("$defs", {}), **schema.pop("definitions", {})}
+
+    def resolve(value):
+        # The referenced models are inlined, as they are not part of the OpenAPI components.
+        if isinstance(value, dict):
+            ref = value.get("$ref")
+            if ref is not None:
+                return resolve(definitions[ref.rsplit("/", 1)[-1]])
+            return {key: resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [resolve(item) for item in value]
+        return value
+
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": resolve(schema)},
+                "application/octet-stream": {
+                    "schema": {"type": "string", "format": "binary"}
+                },
+            },
+        }
+    }
+
 
 def register_v2_endpoints(
     app: FastAPI,
@@ -280,6 +412,7 @@ def register_v2_endpoints(
         v2_endpoints.infer,
         response_model=None,
         methods=["POST"],
+        openapi_extra=_infer_openapi_extra(),
     )
     v2_router.add_api_route(
         r"/models/{model_name}/versions/{model_version}/infer",
@@ -294,4 +427,31 @@ def register_v2_endpoints(
     v2_router.add_api_route(
         r"/repository/models/{model_name}/unload", v2_endpoints.unload, methods=["POST"]
     )
+    v2_router.add_api_route(
+        r"/systemsharedmemory/status",
+        v2_endpoints.system_shared_memory_status,
+        response_model=List[SystemSharedMemoryRegionStatus],
+        methods=["GET"],
+    )
+    v2_router.add_api_route(
+        r"/systemsharedmemory/region/{region_name}/status",
+        v2_endpoints.system_shared_memory_status,
+        response_model=List[SystemSharedMemoryRegionStatus],
+        methods=["GET"],
+    )
+    v2_router.add_api_route(
+        r"/systemsharedmemory/region/{region_name}/register",
+        v2_endpoints.system_shared_memory_register,
+        methods=["POST"],
+    )
+    v2_router.add_api_route(
+        r"/systemsharedmemory/region/{region_name}/unregister",
+        v2_endpoints.system_shared_memory_unregister,
+        methods=["POST"],
+    )
+    v2_router.add_api_route(
+        r"/systemsharedmemory/unregister",
+        v2_endpoints.system_shared_memory_unregister,
+        methods=["POST"],
+    )
     app.include_router(v2_router)
@@ -0,0 +1,255 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""System shared memory extension of the v2 inference protocol.
+
+A client, e.g. a transformer collocated with its predictor, writes the tensor data into a POSIX
+shared memory object and registers a region of it with the server. The inputs of the inference
+requests then reference the region, an offset and a byte size instead of carrying the data, and
+the requested outputs can be written by the server into a region instead of being returned.
+"""
+
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..constants.constants import (
+    SHARED_MEMORY_BYTE_SIZE_PARAMETER,
+    SHARED_MEMORY_OFFSET_PARAMETER,
+    SHARED_MEMORY_REGION_PARAMETER,
+)
+from ..errors import InvalidInput
+from ..utils.numpy_codec import to_np_dtype
+from .infer_type import (
+    InferRequest,
+    InferResponse,
+    deserialize_bytes_tensor,
+    get_shared_memory_parameters,
+    serialize_byte_tensor,
+    to_http_parameters,
+)
+
+_SHARED_MEMORY_PARAMETERS = (
+    SHARED_MEMORY_REGION_PARAMETER,
+    SHARED_MEMORY_BYTE_SIZE_PARAMETER,
+    SHARED_MEMORY_OFFSET_PARAMETER,
+)
+
+
+def _serialize_bytes(array: np.ndarray) -> bytes:
+    serialized = serialize_byte_tensor(array)
+    # An empty tensor is serialized to an empty array.
+    return serialized.item() if serialized.size > 0 else b""
+
+
+class SharedMemoryRegion:
+    """A region of a POSIX shared memory object holding tensor data.
+
+    Args:
+        name: The name the region is registered with.
+        key: The name of the shared memory object, e.g. ``/input_data``.
+        byte_size: The size of the region in bytes.
+        offset: The offset of the region in the shared memory object. Default: ``0``.
+        create: Whether to create the shared memory object. The object is then unlinked when the
+                region is closed. Default: ``False``, the object is opened.
+
+    Raises:
+        InvalidInput: If the shared memory object does not exist or is smaller than the region.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        key: str,
+        byte_size: int,
+        offset: int = 0,
+        create: bool = False,
+    ):
+        self.name = name
+        self.key = key
+        self.byte_size = byte_size
+        self.offset = offset
+        self._owner = create
+        if byte_size <= 0 or offset < 0:
+            raise InvalidInput(
+                f"Invalid byte size {byte_size} or offset {offset} of shared memory region {name}"
+            )
+        try:
+            self._shm = shared_memory.SharedMemory(
+                name=key.lstrip("/"), create=create, size=offset + byte_size
+            )
+        except FileNotFoundError:
+            raise InvalidInput(
+                f"Unable to open shared memory region {name}: shared memory object {key} does not exist"
+            )
+        if not create:
+            # Opening the object registers it with the resource tracker, which would unlink it when
+            # this process exits, while it is owned by the process that created it.
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        if offset + byte_size > self._shm.size:
+            self.close()
+            raise InvalidInput(
+                f"Shared memory region {name} of {byte_size} bytes at offset {offset} exceeds "
+                f"the {self._shm.size} bytes of shared memory object {key}"
+            )
+
+    def buffer(self, offset: int = 0, byte_size: Optional[int] = None) -> memoryview:
+        """Returns a view of ``byte_size`` bytes at ``offset`` in the region, without copying."""
+        if byte_size is None:
+            byte_size = self.byte_size - offset
+        if offset < 0 or byte_size < 0 or offset + byte_size > self.byte_size:
+            raise InvalidInput(
+                f"Tensor data of {byte_size} bytes at offset {offset} exceeds shared memory "
+                f"region {self.name} of {self.byte_size} bytes"
+            )
+        start = self.offset + offset
+        return self._shm.buf[start : start + byte_size]
+
+    def set_numpy(self, array: np.ndarray, offset: int = 0) -> int:
+        """Copy the array into the region at ``offset``, in the format of the binary tensor data
+        extension. Returns the number of bytes written."""
+        if array.dtype == np.object_ or array.dtype.type == np.bytes_:
+            data = _serialize_bytes(array)
+            self.buffer(offset, len(data))[:] = data
+            return len(data)
+        view = self.buffer(offset, array.nbytes)
+        np.copyto(np.frombuffer(view, dtype=array.dtype).reshape(array.shape), array)
+        return array.nbytes
+
+    def as_numpy(
+        self, datatype: str, shape: List[int], offset: int = 0, byte_size: int = None
+    ) -> np.ndarray:
+        """Returns the tensor at ``offset`` in the region as a numpy array. The array is a view of
+        the region, except for the ``BYTES`` tensors."""
+        dtype = to_np_dtype(datatype)
+        if dtype is None:
+            raise InvalidInput(f"invalid datatype {datatype}")
+        if datatype == "BYTES":
+            return deserialize_bytes_tensor(self.buffer(offset, byte_size)).reshape(
+                shape
+            )
+        byte_size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        return np.frombuffer(self.buffer(offset, byte_size), dtype=dtype).reshape(shape)
+
+    def status(self) -> Dict:
+        return {
+            "name": self.name,
+            "key": self.key,
+            "offset": self.offset,
+            "byte_size": self.byte_size,
+        }
+
+    def close(self):
+        """Close the region, and unlink the shared memory object if it was created by it."""
+        try:
+            self._shm.close()
+        except BufferError:
+            # Views of the region are still in use, it is unmapped once they are released.
+            pass
+        if self._owner:
+            self._shm.unlink()
+            self._owner = False
+
+
+class SharedMemoryRegistry:
+    """The system shared memory regions registered with the model server."""
+
+    def __init__(self):
+        self._regions: Dict[str, SharedMemoryRegion] = {}
+        self._disabled_reason: Optional[str] = None
+
+    def disable(self, reason: str):
+        """Reject the registration of regions with the given reason."""
+        self._disabled_reason = reason
+
+    def register(self, name: str, key: str, byte_size: int, offset: int = 0):
+        """Register a region of the shared memory object ``key``.
+
+        Raises:
+            InvalidInput: If the registry is disabled, a region with the same name is already
+                          registered, or the shared memory object does not exist or is too small.
+        """
+        if self._disabled_reason is not None:
+            raise InvalidInput(self._disabled_reason)
+        if name in self._regions:
+            raise InvalidInput(f"Shared memory region {name} is already registered")
+        self._regions[name] = SharedMemoryRegion(name, key, byte_size, offset)
+
+    def unregister(self, name: Optional[str] = None):
+        """Unregister the region with the given name, or all the regions if not set."""
+        names = [name] if name else list(self._regions.keys())
+        for region_name in names:
+            region = self._regions.pop(region_name, None)
+            if region is not None:
+                region.close()
+
+    def get(self, name: str) -> SharedMemoryRegion:
+        region = self._regions.get(name, None)
+        if region is None:
+            raise InvalidInput(f"Unable to find system shared memory region: {name}")
+        return region
+
+    def status(self, name: Optional[str] = None) -> List[Dict]:
+        """Returns the status of the region with the given name, or of all the regions if not set."""
+        if name:
+            return [self.get(name).status()]
+        return [region.status() for region in self._regions.values()]
+
+    def read_inputs(self, request: InferRequest):
+        """Set the data of the request inputs held in shared memory to views of their regions.
+
+        The shared memory parameters are removed from the inputs, so their data is sent as is if
+        the request is forwarded, e.g. by a transformer to its predictor.
+        """
+        for infer_input in request.inputs:
+            shared_memory_parameters = get_shared_memory_parameters(infer_input)
+            if shared_memory_parameters is None:
+                continue
+            region_name, byte_size, offset = shared_memory_parameters
+            view = self.get(region_name).buffer(offset, byte_size)
+            infer_input.parameters = {
+                key: value
+                for key, value in to_http_parameters(infer_input.parameters).items()
+                if key not in _SHARED_MEMORY_PARAMETERS
+            }
+            infer_input.set_lazy_raw_data(view)
+
+    def write_outputs(self, request: InferRequest, response: InferResponse):
+        """Write the response outputs requested in shared memory to their regions."""
+        if not request.request_outputs:
+            return
+        for requested_output in request.request_outputs:
+            shared_memory_parameters = get_shared_memory_parameters(requested_output)
+            if shared_memory_parameters is None:
+                continue
+            region_name, byte_size, offset = shared_memory_parameters
+            infer_output = response.get_output_by_name(requested_output.name)
+            if infer_output is None:
+                raise InvalidInput(
+                    f"Unexpected inference output '{requested_output.name}' for model '{response.model_name}'"
+                )
+            region = self.get(region_name)
+            data = infer_output.as_numpy()
+            if data.dtype == np.object_:
+                output_byte_size = len(_serialize_bytes(data))
+            else:
+                output_byte_size = data.nbytes
+            if output_byte_size > byte_size:
+                raise InvalidInput(
+                    f"Output '{infer_output.name}' of {output_byte_size} bytes exceeds the "
+                    f"{byte_size} bytes requested in shared memory region {region_name}"
+                )
+            written = region.set_numpy(data, offset)
+            infer_output.set_shared_memory(region_name, written, offset)
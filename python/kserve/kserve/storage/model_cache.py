@@ -0,0 +1,212 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+from typing import Callable, Optional
+
+from ..logging import logger
+
+MODEL_CACHE_DIR_ENV = "KSERVE_MODEL_CACHE_DIR"
+MODEL_CACHE_MAX_BYTES_ENV = "KSERVE_MODEL_CACHE_MAX_BYTES"
+
+_STAGING_DIR = ".staging"
+_LOCKS_DIR = ".locks"
+_METADATA_SUFFIX = ".json"
+
+
+class ModelCache(object):
+    """Content addressed on-disk cache of downloaded models shared by the model servers of a node.
+
+    Entries are keyed by the model URI and the version of the remote objects (ETag, generation,
+    modification time), so a changed model is downloaded again. A model is downloaded to a staging
+    directory and published with an atomic rename, and an exclusive file lock per entry makes
+    concurrent processes wait for a single download. Cached files are hard linked (or copied when
+    the cache is on another file system) into the requested output directory. When ``max_bytes`` is
+    set, the least recently used entries are evicted once the cache grows beyond it.
+
+    Layout of the cache directory::
+
+        <cache_dir>/<key>/           published model files
+        <cache_dir>/<key>.json       metadata, its modification time is the last access time
+        <cache_dir>/.staging/<key>/  download in progress
+        <cache_dir>/.locks/<key>     lock file
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 0):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(cache_dir, _STAGING_DIR), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, _LOCKS_DIR), exist_ok=True)
+
+    @staticmethod
+    def from_env() -> Optional["ModelCache"]:
+        """Returns the model cache configured with the KSERVE_MODEL_CACHE_DIR and
+        KSERVE_MODEL_CACHE_MAX_BYTES environment variables, or None if it is not enabled.
+        """
+        cache_dir = os.getenv(MODEL_CACHE_DIR_ENV)
+        if not cache_dir:
+            return None
+        max_bytes = int(os.getenv(MODEL_CACHE_MAX_BYTES_ENV, "0"))
+        return ModelCache(cache_dir, max_bytes)
+
+    @staticmethod
+    def key(uri: str, version: str) -> str:
+        return hashlib.sha256(f"{uri}\n{version}".encode("utf-8")).hexdigest()
+
+    def fetch(
+        self,
+        uri: str,
+        version: str,
+        download: Callable[[str], str],
+        out_dir: str,
+    ) -> str:
+        """Copies the cached model to ``out_dir``, downloading it first if it is not cached.
+
+        Args:
+            uri: The model URI.
+            version: The version of the remote model objects.
+            download: Downloads the model to the given directory and returns the model directory.
+            out_dir: The output directory.
+
+        Returns:
+            The model directory in ``out_dir``.
+        """
+        key = self.key(uri, version)
+        with self._lock(key):
+            metadata = self._read_metadata(key)
+            if metadata is None:
+                metadata = self._publish(key, uri, version, download)
+            else:
+                logger.info("Using cached model %s from %s", uri, self._entry(key))
+                os.utime(self._metadata_path(key))
+            entry = self._entry(key)
+            shutil.copytree(
+                entry,
+                out_dir,
+                symlinks=True,
+                copy_function=_link_or_copy,
+                dirs_exist_ok=True,
+            )
+        self.evict(keep=key)
+        return os.path.normpath(os.path.join(out_dir, metadata["model_dir"]))
+
+    def evict(self, keep: Optional[str] = None):
+        """Removes the least recently used entries until the cache size is within max_bytes.
+        Entries locked by another process are skipped."""
+        if self.max_bytes <= 0:
+            return
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(_METADATA_SUFFIX):
+                continue
+            key = name[: -len(_METADATA_SUFFIX)]
+            metadata = self._read_metadata(key)
+            if metadata is not None:
+                mtime = os.path.getmtime(self._metadata_path(key))
+                entries.append((mtime, key, metadata["size"]))
+        total_bytes = sum(size for _, _, size in entries)
+        for _, key, size in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            with self._lock(key, blocking=False) as locked:
+                if not locked:
+                    continue
+                logger.info("Evicting model cache entry %s", self._entry(key))
+                os.remove(self._metadata_path(key))
+                shutil.rmtree(self._entry(key), ignore_errors=True)
+                total_bytes -= size
+
+    def _publish(
+        self, key: str, uri: str, version: str, download: Callable[[str], str]
+    ) -> dict:
+        entry = self._entry(key)
+        # An entry without metadata was left by an interrupted publish.
+        shutil.rmtree(entry, ignore_errors=True)
+        # The staging directory of an interrupted download is kept, so the S3 download can resume.
+        staging_dir = os.path.join(self.cache_dir, _STAGING_DIR, key)
+        os.makedirs(staging_dir, exist_ok=True)
+        model_dir = download(staging_dir)
+        model_subdir = os.path.relpath(model_dir, staging_dir)
+        if model_subdir.startswith(os.pardir):
+            raise RuntimeError(
+                f"Model directory {model_dir} is not in the staging directory {staging_dir}"
+            )
+        metadata = {
+            "uri": uri,
+            "version": version,
+            "model_dir": model_subdir,
+            "size": _directory_size(staging_dir),
+        }
+        os.rename(staging_dir, entry)
+        tmp_path = f"{self._metadata_path(key)}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(metadata, f)
+        os.replace(tmp_path, self._metadata_path(key))
+        logger.info("Added model %s to the model cache at %s", uri, entry)
+        return metadata
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def _metadata_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _METADATA_SUFFIX)
+
+    def _read_metadata(self, key: str) -> Optional[dict]:
+        if not os.path.isdir(self._entry(key)):
+            return None
+        try:
+            with open(self._metadata_path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @contextlib.contextmanager
+    def _lock(self, key: str, blocking: bool = True):
+        with open(os.path.join(self.cache_dir, _LOCKS_DIR, key), "a") as lock_file:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(lock_file, flags)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _link_or_copy(src: str, dst: str):
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _directory_size(path: str) -> int:
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            if not os.path.islink(file_path):
+                size += os.path.getsize(file_path)
+    return size
@@ -15,6 +15,8 @@
 import base64
 import glob
 import gzip
+import hashlib
+import io
 import json
 import mimetypes
 import os
@@ -22,14 +24,17 @@ import re
 import shutil
 import tarfile
 import tempfile
+import threading
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
 import requests
 
 from ..logging import logger
+from .model_cache import ModelCache
 
 MODEL_MOUNT_DIRS = "/mnt/models"
 
@@ -55,6 +60,155 @@ _HF_PREFIX = "hf://"
 _HDFS_SECRET_DIRECTORY = "/var/secrets/kserve-hdfscreds"
 _HDFS_FILE_SECRETS = ["KERBEROS_KEYTAB", "TLS_CERT", "TLS_KEY", "TLS_CA"]
 
+_MB = 1024 * 1024
+_RANGE_READ_SIZE = 8 * _MB
+_DOWNLOAD_MANIFEST = ".kserve-download-manifest.json"
+_PROGRESS_LOG_INTERVAL_SECONDS = 5
+
+
+class _DownloadManifest(object):
+    """Records the objects completely downloaded to a directory with their size and ETag, so an
+    interrupted download can skip them when it is restarted. The manifest is removed once the
+    download is complete."""
+
+    def __init__(self, out_dir: str):
+        self.path = os.path.join(out_dir, _DOWNLOAD_MANIFEST)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(
+                    "Ignoring invalid download manifest %s: %s", self.path, e
+                )
+
+    def is_downloaded(self, key: str, size: int, etag: str, target: str) -> bool:
+        entry = self._entries.get(key)
+        return (
+            entry is not None
+            and entry["size"] == size
+            and entry["etag"] == etag
+            and os.path.isfile(target)
+            and os.path.getsize(target) == size
+        )
+
+    def add(self, key: str, size: int, etag: str):
+        with self._lock:
+            self._entries[key] = {"size": size, "etag": etag}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _DownloadProgress(object):
+    """Thread safe byte counter logging the download progress and throughput."""
+
+    def __init__(self, total_bytes: int):
+        self.total_bytes = total_bytes
+        self.downloaded_bytes = 0
+        self.skipped_bytes = 0
+        self._start = time.monotonic()
+        self._last_log = self._start
+        self._lock = threading.Lock()
+
+    def __call__(self, num_bytes: int):
+        with self._lock:
+            self.downloaded_bytes += num_bytes
+            now = time.monotonic()
+            if now - self._last_log < _PROGRESS_LOG_INTERVAL_SECONDS:
+                return
+            self._last_log = now
+            done = self.downloaded_bytes + self.skipped_bytes
+        logger.info(
+            "Downloaded %.1f/%.1f MB (%.0f%%) at %.1f MB/s",
+            done / _MB,
+            self.total_bytes / _MB,
+            100 * done / self.total_bytes if self.total_bytes else 100,
+            self.throughput() / _MB,
+        )
+
+    def skip(self, num_bytes: int):
+        with self._lock:
+            self.skipped_bytes += num_bytes
+
+    def throughput(self) -> float:
+        elapsed = time.monotonic() - self._start
+        return self.downloaded_bytes / elapsed if elapsed > 0 else 0.0
+
+    def log_summary(self, file_count: int):
+        logger.info(
+            "Downloaded %d objects, %.1f MB in %.1f seconds (%.1f MB/s), %.1f MB already present",
+            file_count,
+            self.downloaded_bytes / _MB,
+            time.monotonic() - self._start,
+            self.throughput() / _MB,
+            self.skipped_bytes / _MB,
+        )
+
+
+class _HttpRangeReader(io.RawIOBase):
+    """Seekable read only file of an HTTP resource, read with range requests."""
+
+    def __init__(self, uri: str, size: int, headers: Dict):
+        self.uri = uri
+        self.size = size
+        # Ranges refer to the encoded content, so the content must not be compressed.
+        self.headers = {**headers, "Accept-Encoding": "identity"}
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        elif whence == io.SEEK_END:
+            self._position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence {whence}")
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        if self._position >= self.size or len(buffer) == 0:
+            return 0
+        end = min(self._position + len(buffer), self.size) - 1
+        response = requests.get(
+            self.uri,
+            headers={**self.headers, "Range": f"bytes={self._position}-{end}"},
+        )
+        if response.status_code != 206:
+            raise RuntimeError(
+                "URI: %s returned a %s response code to a range request."
+                % (self.uri, response.status_code)
+            )
+        data = response.content
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+def _supports_range_requests(response) -> bool:
+    return (
+        response.headers.get("Accept-Ranges") == "bytes"
+        and response.headers.get("Content-Length") is not None
+        and response.headers.get("Content-Encoding") is None
+    )
+
 
 class Storage(object):
     @staticmethod
@@ -81,35 +235,77 @@ class Storage(object):
             elif not os.path.exists(out_dir):
                 os.mkdir(out_dir)
 
+            model_cache = ModelCache.from_env()
+            version = None
+            if model_cache is not None:
+                version = Storage._get_model_version(uri)
+            if version is not None:
+                model_dir = model_cache.fetch(
+                    uri,
+                    version,
+                    lambda staging_dir: Storage._download_remote(uri, staging_dir),
+                    out_dir,
+                )
+            else:
+                model_dir = Storage._download_remote(uri, out_dir)
+
+        logger.info("Successfully copied %s to %s", uri, out_dir)
+        logger.info(f"Model downloaded in {time.monotonic() - start} seconds.")
+        return model_dir
+
+    @staticmethod
+    def _download_remote(uri: str, out_dir: str) -> str:
+        if uri.startswith(MODEL_MOUNT_DIRS):
+            # Don't need to download models if this InferenceService is running in the multi-model
+            # serving mode. The model agent will download models.
+            return out_dir
+        elif uri.startswith(_GCS_PREFIX):
+            return Storage._download_gcs(uri, out_dir)
+        elif uri.startswith(_S3_PREFIX):
+            return Storage._download_s3(uri, out_dir)
+        elif uri.startswith(_HDFS_PREFIX) or uri.startswith(_WEBHDFS_PREFIX):
+            return Storage._download_hdfs(uri, out_dir)
+        elif any(re.search(pattern, uri) for pattern in _AZURE_BLOB_RE):
+            return Storage._download_azure_blob(uri, out_dir)
+        elif any(re.search(pattern, uri) for pattern in _AZURE_FILE_RE):
+            return Storage._download_azure_file_share(uri, out_dir)
+        elif re.search(_URI_RE, uri):
+            return Storage._download_from_uri(uri, out_dir)
+        elif uri.startswith(_HF_PREFIX):
+            return Storage._download_hf(uri, out_dir)
+        else:
+            raise Exception(
+                "Cannot recognize storage type for "
+                + uri
+                + "\n'%s', '%s', '%s', and '%s' are the current available storage type."
+                % (_GCS_PREFIX, _S3_PREFIX, _LOCAL_PREFIX, _HTTP_PREFIX)
+            )
+
+    @staticmethod
+    def _get_model_version(uri: str) -> Optional[str]:
+        """Returns a digest of the versions (ETag, generation or modification time) of the remote
+        model objects, used as the model cache key. Returns None if the version can not be
+        determined, in which case the model is downloaded without the cache."""
+        try:
             if uri.startswith(MODEL_MOUNT_DIRS):
-                # Don't need to download models if this InferenceService is running in the multi-model
-                # serving mode. The model agent will download models.
-                model_dir = out_dir
+                return None
             elif uri.startswith(_GCS_PREFIX):
-                model_dir = Storage._download_gcs(uri, out_dir)
+                return Storage._get_gcs_version(uri)
             elif uri.startswith(_S3_PREFIX):
-                model_dir = Storage._download_s3(uri, out_dir)
+                return Storage._get_s3_version(uri)
             elif uri.startswith(_HDFS_PREFIX) or uri.startswith(_WEBHDFS_PREFIX):
-                model_dir = Storage._download_hdfs(uri, out_dir)
+                return Storage._get_hdfs_version(uri)
             elif any(re.search(pattern, uri) for pattern in _AZURE_BLOB_RE):
-                model_dir = Storage._download_azure_blob(uri, out_dir)
+                return Storage._get_azure_blob_version(uri)
             elif any(re.search(pattern, uri) for pattern in _AZURE_FILE_RE):
-                model_dir = Storage._download_azure_file_share(uri, out_dir)
+                return None
             elif re.search(_URI_RE, uri):
-                model_dir = Storage._download_from_uri(uri, out_dir)
-            elif uri.startswith(_HF_PREFIX):
-                model_dir = Storage._download_hf(uri, out_dir)
-            else:
-                raise Exception(
-                    "Cannot recognize storage type for "
-                    + uri
-                    + "\n'%s', '%s', '%s', and '%s' are the current available storage type."
-                    % (_GCS_PREFIX, _S3_PREFIX, _LOCAL_PREFIX, _HTTP_PREFIX)
-                )
-
-        logger.info("Successfully copied %s to %s", uri, out_dir)
-        logger.info(f"Model downloaded in {time.monotonic() - start} seconds.")
-        return model_dir
+                return Storage._get_uri_version(uri)
+        except Exception as e:
+            logger.warning(
+                "Failed to get the version of %s, skipping the model cache: %s", uri, e
+            )
+        return None
 
     @staticmethod
     def _update_with_storage_spec():
@@ -179,7 +375,7 @@ class Storage(object):
         return c
 
     @staticmethod
-    def _download_s3(uri, temp_dir: str) -> str:
+    def _get_s3_resource():
         import boto3
 
         # Boto3 looks at various configuration locations until it finds configuration values.
@@ -220,7 +416,18 @@ class Storage(object):
                     raise RuntimeError(
                         "Failed to find ca bundle file(%s)." % ca_bundle_full_path
                     )
-        s3 = boto3.resource("s3", **kwargs)
+        return boto3.resource("s3", **kwargs)
+
+    @staticmethod
+    def _get_s3_version(uri) -> Optional[str]:
+        parsed = urlparse(uri, scheme="s3")
+        bucket = Storage._get_s3_resource().Bucket(parsed.netloc)
+        objects = bucket.objects.filter(Prefix=parsed.path.lstrip("/"))
+        return _digest_versions((obj.key, obj.e_tag) for obj in objects)
+
+    @staticmethod
+    def _download_s3(uri, temp_dir: str) -> str:
+        s3 = Storage._get_s3_resource()
         parsed = urlparse(uri, scheme="s3")
         bucket_name = parsed.netloc
         bucket_path = parsed.path.lstrip("/")
@@ -228,6 +435,7 @@ class Storage(object):
         file_count = 0
         exact_obj_found = False
         bucket = s3.Bucket(bucket_name)
+        downloads = []
         for obj in bucket.objects.filter(Prefix=bucket_path):
             # Skip where boto3 lists the directory as an object
             if obj.key.endswith("/"):
@@ -262,10 +470,7 @@ class Storage(object):
                 target_key = obj.key.replace(bucket_path, "").lstrip("/")
 
             target = f"{temp_dir}/{target_key}"
-            if not os.path.exists(os.path.dirname(target)):
-                os.makedirs(os.path.dirname(target), exist_ok=True)
-            bucket.download_file(obj.key, target)
-            logger.info("Downloaded object %s to %s" % (obj.key, target))
+            downloads.append((obj, target))
             file_count += 1
 
             # If the exact object is found, then it is sufficient to download that and break the loop
@@ -275,6 +480,7 @@ class Storage(object):
             raise RuntimeError(
                 "Failed to fetch model. No model found in %s." % bucket_path
             )
+        Storage._download_s3_objects(bucket, downloads, temp_dir)
 
         # Unpack compressed file, supports .tgz, tar.gz and zip file formats.
         if file_count == 1:
@@ -283,6 +489,60 @@ class Storage(object):
                 temp_dir = Storage._unpack_archive_file(target, mimetype, temp_dir)
         return temp_dir
 
+    @staticmethod
+    def _download_s3_objects(bucket, downloads: List[Tuple], out_dir: str):
+        """Download the S3 objects concurrently. Objects larger than the multipart threshold are
+        downloaded with concurrent ranged GETs. Objects recorded in the download manifest of an
+        interrupted download are skipped if the local file is still complete.
+
+        The concurrency can be configured with the environment variables S3_DOWNLOAD_CONCURRENCY
+        (number of objects downloaded in parallel), S3_MULTIPART_CONCURRENCY (number of ranged GETs per
+        object), S3_MULTIPART_THRESHOLD_MB and S3_MULTIPART_CHUNKSIZE_MB.
+        """
+        from boto3.s3.transfer import TransferConfig
+
+        transfer_config = TransferConfig(
+            multipart_threshold=int(os.getenv("S3_MULTIPART_THRESHOLD_MB", "64")) * _MB,
+            multipart_chunksize=int(os.getenv("S3_MULTIPART_CHUNKSIZE_MB", "64")) * _MB,
+            max_concurrency=int(os.getenv("S3_MULTIPART_CONCURRENCY", "8")),
+        )
+        concurrency = max(1, int(os.getenv("S3_DOWNLOAD_CONCURRENCY", "4")))
+        manifest = _DownloadManifest(out_dir)
+        progress = _DownloadProgress(sum(obj.size for obj, _ in downloads))
+
+        def download(obj, target: str):
+            if manifest.is_downloaded(obj.key, obj.size, obj.e_tag, target):
+                logger.info("Object %s is already downloaded to %s", obj.key, target)
+                progress.skip(obj.size)
+                return
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            start = time.monotonic()
+            bucket.download_file(
+                obj.key, target, Config=transfer_config, Callback=progress
+            )
+            manifest.add(obj.key, obj.size, obj.e_tag)
+            elapsed = time.monotonic() - start
+            logger.info(
+                "Downloaded object %s to %s (%.1f MB in %.1f seconds)",
+                obj.key,
+                target,
+                obj.size / _MB,
+                elapsed,
+            )
+
+        executor = ThreadPoolExecutor(max_workers=min(concurrency, len(downloads)))
+        try:
+            futures = [
+                executor.submit(download, obj, target) for obj, target in downloads
+            ]
+            for future in futures:
+                future.result()
+        finally:
+            # Do not start the pending downloads if one of them failed.
+            executor.shutdown(wait=True, cancel_futures=True)
+        manifest.remove()
+        progress.log_summary(len(downloads))
+
     @staticmethod
     def _download_hf(uri, temp_dir: str) -> str:
         from huggingface_hub import snapshot_download
@@ -316,14 +576,27 @@ class Storage(object):
         return temp_dir
 
     @staticmethod
-    def _download_gcs(uri, temp_dir: str) -> str:
+    def _get_gcs_client():
         from google.auth import exceptions
         from google.cloud import storage
 
         try:
-            storage_client = storage.Client()
+            return storage.Client()
         except exceptions.DefaultCredentialsError:
-            storage_client = storage.Client.create_anonymous_client()
+            return storage.Client.create_anonymous_client()
+
+    @staticmethod
+    def _get_gcs_version(uri) -> Optional[str]:
+        bucket_name, _, prefix = uri.replace(_GCS_PREFIX, "", 1).partition("/")
+        if not prefix.endswith("/"):
+            prefix = prefix + "/"
+        bucket = Storage._get_gcs_client().bucket(bucket_name)
+        blobs = bucket.list_blobs(prefix=prefix)
+        return _digest_versions((blob.name, blob.generation) for blob in blobs)
+
+    @staticmethod
+    def _download_gcs(uri, temp_dir: str) -> str:
+        storage_client = Storage._get_gcs_client()
         bucket_args = uri.replace(_GCS_PREFIX, "", 1).split("/", 1)
         bucket_name = bucket_args[0]
         bucket_path = bucket_args[1] if len(bucket_args) > 1 else ""
@@ -395,14 +668,10 @@ class Storage(object):
         return config
 
     @staticmethod
-    def _download_hdfs(uri, out_dir: str) -> str:
+    def _get_hdfs_client(uri, config: Dict):
         from krbcontext.context import krbContext
         from hdfs.ext.kerberos import Client, KerberosClient
 
-        config = Storage._load_hdfs_configuration()
-
-        logger.info(f"Using the following hdfs config\n{config}")
-
         # Remove hdfs:// or webhdfs:// from the uri to get just the path
         # e.g. hdfs://user/me/model -> user/me/model
         if uri.startswith(_HDFS_PREFIX):
@@ -447,6 +716,29 @@ class Storage(object):
                 root=config["HDFS_ROOTPATH"],
                 session=s,
             )
+        return client, path
+
+    @staticmethod
+    def _get_hdfs_version(uri) -> Optional[str]:
+        config = Storage._load_hdfs_configuration()
+        client, path = Storage._get_hdfs_client(uri, config)
+        status = client.status(path)
+        if status["type"] == "FILE":
+            statuses = [(path, status)]
+        else:
+            statuses = client.list(path, status=True)
+        return _digest_versions(
+            (name, status["modificationTime"], status["length"])
+            for name, status in statuses
+        )
+
+    @staticmethod
+    def _download_hdfs(uri, out_dir: str) -> str:
+        config = Storage._load_hdfs_configuration()
+
+        logger.info(f"Using the following hdfs config\n{config}")
+
+        client, path = Storage._get_hdfs_client(uri, config)
         file_count = 0
         dest_file_path = ""
 
@@ -477,11 +769,8 @@ class Storage(object):
         return out_dir
 
     @staticmethod
-    def _download_azure_blob(
-        uri, out_dir: str
-    ) -> str:  # pylint: disable=too-many-locals
+    def _get_azure_blob_container_client(uri):
         from azure.storage.blob import BlobServiceClient
-        from azure.storage.blob._list_blobs_helper import BlobPrefix
 
         account_name, account_url, container_name, prefix = Storage._parse_azure_uri(
             uri
@@ -502,7 +791,21 @@ class Storage(object):
             )
 
         blob_service_client = BlobServiceClient(account_url, credential=token)
-        container_client = blob_service_client.get_container_client(container_name)
+        return blob_service_client.get_container_client(container_name), prefix
+
+    @staticmethod
+    def _get_azure_blob_version(uri) -> Optional[str]:
+        container_client, prefix = Storage._get_azure_blob_container_client(uri)
+        blobs = container_client.list_blobs(name_starts_with=prefix)
+        return _digest_versions((blob.name, blob.etag) for blob in blobs)
+
+    @staticmethod
+    def _download_azure_blob(
+        uri, out_dir: str
+    ) -> str:  # pylint: disable=too-many-locals
+        from azure.storage.blob._list_blobs_helper import BlobPrefix
+
+        container_client, prefix = Storage._get_azure_blob_container_client(uri)
         file_count = 0
         blobs = []
         max_depth = 5
@@ -674,6 +977,20 @@ class Storage(object):
                 out_dir = Storage._unpack_archive_file(dest_path, mimetype, out_dir)
         return out_dir
 
+    @staticmethod
+    def _get_uri_version(uri) -> Optional[str]:
+        url = urlparse(uri)
+        headers = json.loads(os.getenv(url.hostname + _HEADERS_SUFFIX, "{}"))
+        response = requests.head(uri, headers=headers, allow_redirects=True)
+        if response.status_code != 200:
+            return None
+        version = response.headers.get("ETag") or response.headers.get("Last-Modified")
+        if not version:
+            return None
+        return _digest_versions(
+            [(uri, version, response.headers.get("Content-Length"))]
+        )
+
     @staticmethod
     def _download_from_uri(uri, out_dir=None) -> str:
         url = urlparse(uri)
@@ -737,6 +1054,15 @@ class Storage(object):
                     % uri
                 )
 
+            if mimetype == "application/x-tar":
+                # Extract the tar(.gz) archive while it is downloaded, without writing it to disk.
+                return Storage._unpack_archive_stream(response.raw, out_dir)
+            if mimetype == "application/zip" and _supports_range_requests(response):
+                # Zip archives need random access to the central directory at the end of the file,
+                # read the archive with range requests instead of downloading it first.
+                return Storage._unpack_remote_zip_file(
+                    uri, int(response.headers["Content-Length"]), headers, out_dir
+                )
             if encoding == "gzip":
                 stream = gzip.GzipFile(fileobj=response.raw)
                 local_path = os.path.join(out_dir, f"{filename}.tar")
@@ -749,6 +1075,36 @@ class Storage(object):
             out_dir = Storage._unpack_archive_file(local_path, mimetype, out_dir)
         return out_dir
 
+    @staticmethod
+    def _unpack_archive_stream(stream, target_dir: str) -> str:
+        try:
+            logger.info("Unpacking tar archive stream to %s", target_dir)
+            # The "r|*" mode reads the (optionally compressed) archive sequentially.
+            with tarfile.open(fileobj=stream, mode="r|*", encoding="utf-8") as archive:
+                archive.extractall(target_dir)
+        except tarfile.TarError:
+            raise RuntimeError(
+                "Failed to unpack archive file. \
+The file format is not valid."
+            )
+        return target_dir
+
+    @staticmethod
+    def _unpack_remote_zip_file(uri, size: int, headers: Dict, target_dir: str) -> str:
+        try:
+            logger.info("Unpacking zip archive %s with range requests", uri)
+            fileobj = io.BufferedReader(
+                _HttpRangeReader(uri, size, headers), buffer_size=_RANGE_READ_SIZE
+            )
+            with zipfile.ZipFile(fileobj, "r") as archive:
+                archive.extractall(target_dir)
+        except zipfile.BadZipfile:
+            raise RuntimeError(
+                "Failed to unpack archive file. \
+The file format is not valid."
+            )
+        return target_dir
+
     @staticmethod
     def _unpack_archive_file(file_path, mimetype, target_dir=None) -> str:
         if not target_dir:
@@ -769,3 +1125,12 @@ The file format is not valid."
             )
         os.remove(file_path)
         return target_dir
+
+
+def _digest_versions(versions: Iterable[Tuple]) -> Optional[str]:
+    """Returns a digest of the (name, version, ...) tuples of the remote model objects, or None if
+    there are no objects."""
+    lines = sorted("\t".join(str(field) for field in version) for version in versions)
+    if not lines:
+        return None
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
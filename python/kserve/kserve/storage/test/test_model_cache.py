@@ -0,0 +1,139 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from kserve.storage.model_cache import ModelCache
+
+
+class FakeDownloader:
+    def __init__(self, size=10, subdir=None, delay=0.0):
+        self.size = size
+        self.subdir = subdir
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, out_dir):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        model_dir = os.path.join(out_dir, self.subdir) if self.subdir else out_dir
+        os.makedirs(os.path.join(model_dir, "variables"), exist_ok=True)
+        with open(os.path.join(model_dir, "model.bin"), "wb") as f:
+            f.write(b"m" * self.size)
+        with open(os.path.join(model_dir, "variables", "vars.bin"), "wb") as f:
+            f.write(b"v")
+        return model_dir
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_fetch_downloads_once(tmp_path):
+    cache = ModelCache(str(tmp_path / "cache"))
+    download = FakeDownloader()
+
+    first = cache.fetch("s3://bucket/model", "v1", download, str(tmp_path / "out1"))
+    second = cache.fetch("s3://bucket/model", "v1", download, str(tmp_path / "out2"))
+
+    assert download.calls == 1
+    assert first == str(tmp_path / "out1")
+    assert second == str(tmp_path / "out2")
+    assert read(os.path.join(second, "model.bin")) == b"m" * 10
+    assert read(os.path.join(second, "variables", "vars.bin")) == b"v"
+    assert not os.listdir(tmp_path / "cache" / ".staging")
+
+
+def test_fetch_new_version(tmp_path):
+    cache = ModelCache(str(tmp_path / "cache"))
+    download = FakeDownloader()
+
+    cache.fetch("s3://bucket/model", "v1", download, str(tmp_path / "out1"))
+    cache.fetch("s3://bucket/model", "v2", download, str(tmp_path / "out2"))
+
+    assert download.calls == 2
+
+
+def test_fetch_model_subdir(tmp_path):
+    cache = ModelCache(str(tmp_path / "cache"))
+    download = FakeDownloader(subdir="unpacked")
+
+    cache.fetch("http://host/model.tar", "v1", download, str(tmp_path / "out1"))
+    model_dir = cache.fetch(
+        "http://host/model.tar", "v1", download, str(tmp_path / "out2")
+    )
+
+    assert model_dir == str(tmp_path / "out2" / "unpacked")
+    assert read(os.path.join(model_dir, "model.bin")) == b"m" * 10
+
+
+def test_failed_download_is_not_published(tmp_path):
+    cache = ModelCache(str(tmp_path / "cache"))
+
+    def failing_download(out_dir):
+        raise RuntimeError("connection reset")
+
+    with pytest.raises(RuntimeError):
+        cache.fetch("s3://bucket/model", "v1", failing_download, str(tmp_path / "out"))
+
+    download = FakeDownloader()
+    cache.fetch("s3://bucket/model", "v1", download, str(tmp_path / "out"))
+    assert download.calls == 1
+
+
+def test_concurrent_fetches_share_download(tmp_path):
+    cache = ModelCache(str(tmp_path / "cache"))
+    download = FakeDownloader(delay=0.2)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        model_dirs = list(
+            executor.map(
+                lambda i: cache.fetch(
+                    "gs://bucket/model", "v1", download, str(tmp_path / f"out{i}")
+                ),
+                range(4),
+            )
+        )
+
+    assert download.calls == 1
+    for model_dir in model_dirs:
+        assert read(os.path.join(model_dir, "model.bin")) == b"m" * 10
+
+
+def test_lru_eviction(tmp_path):
+    cache = ModelCache(str(tmp_path / "cache"), max_bytes=250)
+    download = FakeDownloader(size=100)
+
+    for name in ["a", "b"]:
+        cache.fetch(f"s3://bucket/{name}", "v1", download, str(tmp_path / name))
+    # Access "a" so "b" is the least recently used entry
+    time.sleep(0.01)
+    cache.fetch("s3://bucket/a", "v1", download, str(tmp_path / "a2"))
+    assert download.calls == 2
+
+    cache.fetch("s3://bucket/c", "v1", download, str(tmp_path / "c"))
+
+    assert os.path.isdir(cache._entry(cache.key("s3://bucket/a", "v1")))
+    assert not os.path.exists(cache._entry(cache.key("s3://bucket/b", "v1")))
+    assert os.path.isdir(cache._entry(cache.key("s3://bucket/c", "v1")))
+    # The output directory of an evicted entry is not affected
+    assert read(tmp_path / "b" / "model.bin") == b"m" * 100
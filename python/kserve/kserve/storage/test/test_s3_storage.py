@@ -27,6 +27,8 @@ def create_mock_obj(path):
     mock_obj = mock.MagicMock()
     mock_obj.key = path
     mock_obj.is_dir = False
+    mock_obj.size = 1024
+    mock_obj.e_tag = '"etag"'
     return mock_obj
 
 
@@ -73,7 +75,10 @@ def test_parent_key(mock_storage):
 
     # then
     arg_list = get_call_args(mock_boto3_bucket.download_file.call_args_list)
-    assert arg_list == expected_call_args_list("bar", "dest_path", paths)
+    # The objects are downloaded concurrently
+    assert sorted(arg_list) == sorted(
+        expected_call_args_list("bar", "dest_path", paths)
+    )
 
     mock_boto3_bucket.objects.filter.assert_called_with(Prefix="bar")
 
@@ -90,7 +95,9 @@ def test_no_key(mock_storage):
 
     # then
     arg_list = get_call_args(mock_boto3_bucket.download_file.call_args_list)
-    assert arg_list == expected_call_args_list("", "dest_path", object_paths)
+    assert sorted(arg_list) == sorted(
+        expected_call_args_list("", "dest_path", object_paths)
+    )
 
     mock_boto3_bucket.objects.filter.assert_called_with(Prefix="")
 
@@ -314,7 +321,89 @@ def test_target_startswith_parent_folder_name(mock_storage):
     # then
     arg_list = get_call_args(mock_boto3_bucket.download_file.call_args_list)
     assert (
-        arg_list[0]
-        == expected_call_args_list("test/artifacts/model", "dest_path", paths)[0]
+        expected_call_args_list("test/artifacts/model", "dest_path", paths)[0]
+        in arg_list
     )
     mock_boto3_bucket.objects.filter.assert_called_with(Prefix="test/artifacts/model")
+
+
+@pytest.fixture
+def moto_s3_bucket(monkeypatch):
+    moto = pytest.importorskip("moto")
+    import boto3
+
+    for key, value in AWS_TEST_CREDENTIALS.items():
+        monkeypatch.setenv(key, value)
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    for key in ("AWS_ENDPOINT_URL", "AWS_CA_BUNDLE", "CA_BUNDLE_CONFIGMAP_NAME"):
+        monkeypatch.delenv(key, raising=False)
+    with moto.mock_aws():
+        bucket = boto3.resource("s3").Bucket("models")
+        bucket.create()
+        yield bucket
+
+
+def test_download_s3_concurrent_multipart(moto_s3_bucket, tmp_path, monkeypatch):
+    monkeypatch.setenv("S3_MULTIPART_THRESHOLD_MB", "1")
+    monkeypatch.setenv("S3_MULTIPART_CHUNKSIZE_MB", "1")
+    objects = {
+        "llm/model-00001.safetensors": os.urandom(3 * 1024 * 1024 + 7),
+        "llm/model-00002.safetensors": os.urandom(1024),
+        "llm/config/config.json": b'{"a": 1}',
+    }
+    for key, body in objects.items():
+        moto_s3_bucket.put_object(Key=key, Body=body)
+
+    model_dir = Storage._download_s3("s3://models/llm", str(tmp_path))
+
+    for key, body in objects.items():
+        local_path = os.path.join(model_dir, key[len("llm/") :])
+        with open(local_path, "rb") as f:
+            assert f.read() == body
+    # The manifest is removed after the download is complete
+    assert not os.path.exists(os.path.join(model_dir, ".kserve-download-manifest.json"))
+
+
+def test_download_s3_resume(moto_s3_bucket, tmp_path):
+    moto_s3_bucket.put_object(Key="llm/shard-1.bin", Body=b"a" * 100)
+    moto_s3_bucket.put_object(Key="llm/shard-2.bin", Body=b"b" * 100)
+    shard_1 = moto_s3_bucket.Object("llm/shard-1.bin")
+    # Simulate a download interrupted after the first shard
+    with open(tmp_path / "shard-1.bin", "wb") as f:
+        f.write(b"x" * 100)
+    with open(tmp_path / "shard-2.bin", "wb") as f:
+        f.write(b"partial")
+    with open(tmp_path / ".kserve-download-manifest.json", "w") as f:
+        json.dump(
+            {"llm/shard-1.bin": {"size": 100, "etag": shard_1.e_tag}},
+            f,
+        )
+
+    Storage._download_s3("s3://models/llm", str(tmp_path))
+
+    # The shard recorded in the manifest is not downloaded again
+    assert (tmp_path / "shard-1.bin").read_bytes() == b"x" * 100
+    assert (tmp_path / "shard-2.bin").read_bytes() == b"b" * 100
+    assert not (tmp_path / ".kserve-download-manifest.json").exists()
+
+
+def test_download_s3_model_cache(moto_s3_bucket, tmp_path, monkeypatch):
+    monkeypatch.setenv("KSERVE_MODEL_CACHE_DIR", str(tmp_path / "cache"))
+    moto_s3_bucket.put_object(Key="llm/model.bin", Body=b"v1")
+
+    with mock.patch.object(
+        Storage, "_download_s3", wraps=Storage._download_s3
+    ) as download_s3:
+        first = Storage.download("s3://models/llm", str(tmp_path / "out1"))
+        second = Storage.download("s3://models/llm", str(tmp_path / "out2"))
+        assert download_s3.call_count == 1
+        assert (tmp_path / "out2" / "model.bin").read_bytes() == b"v1"
+
+        # A changed object has a new ETag and is downloaded again
+        moto_s3_bucket.put_object(Key="llm/model.bin", Body=b"v2")
+        Storage.download("s3://models/llm", str(tmp_path / "out3"))
+        assert download_s3.call_count == 2
+        assert (tmp_path / "out3" / "model.bin").read_bytes() == b"v2"
+
+    assert first == str(tmp_path / "out1")
+    assert second == str(tmp_path / "out2")
@@ -234,6 +234,53 @@ def test_http_uri_paths(uri, response, expected_error):
     mock.patch("requests.get", return_value=response)(test)()
 
 
+class NonSeekableStream(io.RawIOBase):
+    def __init__(self, raw):
+        self._raw = io.BytesIO(raw)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._raw.readinto(buffer)
+
+
+def test_http_tar_archive_is_extracted_while_streaming():
+    response = MockHttpResponse(200, b"", "application/x-tar")
+    response.raw = NonSeekableStream(FILE_TAR_GZ_RAW)
+    with mock.patch("requests.get", return_value=response):
+        with tempfile.TemporaryDirectory() as out_dir:
+            assert Storage.download(HTTPS_URI_TARGZ, out_dir=out_dir) == out_dir
+            # The archive itself is never written to disk
+            assert os.listdir(out_dir) == ["model.pth"]
+
+
+def test_http_zip_archive_is_extracted_with_range_requests():
+    uri = "https://foo.bar/model.zip"
+    response = MockHttpResponse(200, b"", "application/zip")
+    response.headers.update(
+        {"Accept-Ranges": "bytes", "Content-Length": str(len(FILE_ZIP_RAW))}
+    )
+    ranges = []
+
+    def get(url, stream=False, headers=None):
+        if "Range" not in headers:
+            return response
+        start, end = headers["Range"][len("bytes=") :].split("-")
+        ranges.append((int(start), int(end)))
+        range_response = mock.MagicMock(status_code=206)
+        range_response.content = FILE_ZIP_RAW[int(start) : int(end) + 1]
+        return range_response
+
+    with mock.patch("requests.get", side_effect=get):
+        with tempfile.TemporaryDirectory() as out_dir:
+            assert Storage.download(uri, out_dir=out_dir) == out_dir
+            assert os.listdir(out_dir) == ["model.pth"]
+    assert ranges
+    # The body of the initial response is not read
+    assert response.raw.tell() == 0
+
+
 def test_storage_blob_exception():
     blob_path = "https://accountname.blob.core.windows.net/container/some/blob/"
     with pytest.raises(Exception):
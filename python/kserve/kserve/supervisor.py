@@ -0,0 +1,227 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import atexit
+import multiprocessing
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing.connection import wait
+from typing import Callable, Dict, List, Optional
+
+from .logging import logger
+
+PROMETHEUS_MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+_HANDLED_SIGNALS = (signal.SIGINT, signal.SIGTERM, signal.SIGQUIT)
+
+
+def create_reuseport_socket(port: int, host: str = "0.0.0.0") -> socket.socket:
+    """Create a listening socket with SO_REUSEPORT, so every worker process binds its own socket
+    on the same port and the kernel balances the incoming connections between them."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _prefork_requested(argv: List[str]) -> bool:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--workers", default="1")
+    parser.add_argument("--enable_prefork", default="false")
+    args, _ = parser.parse_known_args(argv)
+    enabled = args.enable_prefork.lower() in ("y", "yes", "t", "true", "on", "1")
+    return enabled and args.workers.isdigit() and int(args.workers) > 1
+
+
+def _remove_dir(path: str, pid: int):
+    # The forked workers inherit the exit handlers, only the process that created the directory removes it.
+    if os.getpid() == pid:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def configure_prometheus_multiprocess(argv: List[str]) -> Optional[str]:
+    """Enable the Prometheus multiprocess mode if the model server is started with pre-forked workers,
+    so the metrics endpoint of any worker reports the metrics aggregated across all workers.
+
+    ``prometheus_client`` selects how the metric values are stored when it is imported, so this is
+    called when the kserve package is imported, before ``prometheus_client``. If
+    ``PROMETHEUS_MULTIPROC_DIR`` is not set, the values are stored in a temporary directory removed
+    on exit.
+
+    Metrics read by a callback, e.g. with ``Gauge.set_function``, are not collected in this mode.
+
+    Args:
+        argv: The command line arguments of the model server.
+
+    Returns:
+        The directory of the metric values, or ``None`` if the multiprocess mode is not enabled.
+    """
+    if is_prometheus_multiprocess():
+        return os.environ[PROMETHEUS_MULTIPROC_DIR_ENV]
+    if not _prefork_requested(argv):
+        return None
+    if "prometheus_client" in sys.modules:
+        logger.warning(
+            f"prometheus_client was imported before kserve, the metrics of the worker processes are not "
+            f"aggregated. Set {PROMETHEUS_MULTIPROC_DIR_ENV} to enable the Prometheus multiprocess mode."
+        )
+        return None
+    metrics_dir = tempfile.mkdtemp(prefix="kserve-prometheus-")
+    os.environ[PROMETHEUS_MULTIPROC_DIR_ENV] = metrics_dir
+    atexit.register(_remove_dir, metrics_dir, os.getpid())
+    logger.info("Prometheus multiprocess mode enabled in %s", metrics_dir)
+    return metrics_dir
+
+
+def is_prometheus_multiprocess() -> bool:
+    return bool(os.environ.get(PROMETHEUS_MULTIPROC_DIR_ENV))
+
+
+def mark_process_dead(pid: int):
+    """Remove the live gauge values of an exited worker process from the multiprocess metrics."""
+    if is_prometheus_multiprocess():
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
+
+
+def check_no_running_threads():
+    """Raise if threads other than the daemon threads are running, they would not run in the forked
+    worker processes.
+
+    Raises:
+        RuntimeError: If a non daemon thread is running.
+    """
+    threads = [
+        thread.name
+        for thread in threading.enumerate()
+        if thread is not threading.main_thread() and not thread.daemon
+    ]
+    if threads:
+        raise RuntimeError(
+            f"Can not fork the worker processes while the threads {threads} are running, they would not "
+            f"run in the workers. Start the threads of the models in Model.start(), which is called in "
+            f"every worker, or disable pre-forking."
+        )
+
+
+class WorkerSupervisor:
+    """Pre-forks the worker processes of the model server and supervises them.
+
+    The models are loaded in the parent process before the workers are forked, so the workers
+    share their memory copy-on-write. The models are started in the workers. A worker that exits unexpectedly is restarted. On SIGINT,
+    SIGTERM or SIGQUIT the signal is forwarded to the workers and the supervisor waits for them to
+    shut down gracefully.
+
+    Args:
+        target: Function run by the worker process, called with the worker id.
+        workers: Number of worker processes.
+        restart_delay_seconds: Time to wait before restarting a worker that exited.
+        shutdown_timeout_seconds: Time to wait for the workers to shut down before they are killed.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[int], None],
+        workers: int,
+        restart_delay_seconds: float = 1.0,
+        shutdown_timeout_seconds: float = 30.0,
+    ):
+        self.target = target
+        self.workers = workers
+        self.restart_delay_seconds = restart_delay_seconds
+        self.shutdown_timeout_seconds = shutdown_timeout_seconds
+        self.processes: Dict[int, multiprocessing.Process] = {}
+        self._context = multiprocessing.get_context("fork")
+        self._should_exit = threading.Event()
+        self._exit_signal: Optional[int] = None
+
+    def run(self):
+        for sig in _HANDLED_SIGNALS:
+            signal.signal(sig, self._handle_exit)
+        logger.info(f"Starting {self.workers} model server worker processes")
+        for worker_id in range(self.workers):
+            self._spawn(worker_id)
+        try:
+            self._supervise()
+        finally:
+            self.shutdown()
+
+    def stop(self, sig: int = signal.SIGTERM):
+        self._exit_signal = sig
+        self._should_exit.set()
+
+    def shutdown(self):
+        sig = self._exit_signal or signal.SIGTERM
+        for process in self.processes.values():
+            if process.is_alive():
+                os.kill(process.pid, sig)
+        deadline = time.monotonic() + self.shutdown_timeout_seconds
+        for worker_id, process in self.processes.items():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(
+                    f"Worker {worker_id} (pid {process.pid}) did not shut down, killing it"
+                )
+                process.kill()
+                process.join()
+            mark_process_dead(process.pid)
+        logger.info("All model server worker processes stopped")
+
+    def _handle_exit(self, sig, frame):
+        self.stop(sig)
+
+    def _spawn(self, worker_id: int):
+        process = self._context.Process(
+            target=self._run_worker,
+            args=(worker_id,),
+            name=f"kserve-worker-{worker_id}",
+        )
+        process.start()
+        self.processes[worker_id] = process
+        logger.info(f"Started worker {worker_id} (pid {process.pid})")
+
+    def _run_worker(self, worker_id: int):
+        # The worker installs its own handlers for a graceful shutdown.
+        for sig in _HANDLED_SIGNALS:
+            signal.signal(sig, signal.SIG_DFL)
+        self.target(worker_id)
+
+    def _supervise(self):
+        while not self._should_exit.is_set():
+            sentinels = [process.sentinel for process in self.processes.values()]
+            wait(sentinels, timeout=0.5)
+            if self._should_exit.is_set():
+                break
+            for worker_id, process in list(self.processes.items()):
+                if process.is_alive():
+                    continue
+                logger.error(
+                    f"Worker {worker_id} (pid {process.pid}) exited with code {process.exitcode}, "
+                    f"restarting it"
+                )
+                mark_process_dead(process.pid)
+                if self._should_exit.wait(self.restart_delay_seconds):
+                    break
+                self._spawn(worker_id)
@@ -0,0 +1,195 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Encoding of inference requests and responses as Apache Arrow IPC streams.
+
+A request table is decoded into the v1 ``instances`` or the v2 inputs without copying the column
+buffers of primitive types, the decoded arrays are read-only views of the request body. Columns
+of fixed size lists carry the tensors with more than one dimension, e.g. a column of
+``fixed_size_list<float, 4>`` is decoded as a ``(rows, 4)`` array.
+pyarrow is an optional dependency, it is only imported when an Arrow request is received.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ..constants.constants import ARROW_STREAM_CONTENT_TYPE
+from ..errors import InferenceError, InvalidInput
+from ..protocol.infer_type import InferInput, InferRequest, InferResponse
+from .numpy_codec import from_np_dtype
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise InvalidInput(
+            f"{ARROW_STREAM_CONTENT_TYPE} requests require pyarrow. Install it with: pip install pyarrow"
+        )
+    return pyarrow
+
+
+def is_arrow_content_type(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";", 1)[0].strip().lower() == ARROW_STREAM_CONTENT_TYPE
+
+
+def accepts_arrow(headers: Optional[Mapping[str, str]]) -> bool:
+    """Whether the response should be encoded as an Arrow IPC stream, i.e. the request was sent as
+    one and does not accept JSON only, or it explicitly accepts one."""
+    if not headers:
+        return False
+    accept = headers.get("accept", "")
+    if any(is_arrow_content_type(value) for value in accept.split(",")):
+        return True
+    return is_arrow_content_type(headers.get("content-type")) and (
+        "application/json" not in accept
+    )
+
+
+def read_table(body: bytes):
+    pa = _import_pyarrow()
+    try:
+        with pa.ipc.open_stream(pa.py_buffer(body)) as reader:
+            return reader.read_all()
+    except pa.ArrowException as e:
+        raise InvalidInput(f"Failed to decode Arrow IPC stream: {e}")
+
+
+def _column_to_numpy(column) -> np.ndarray:
+    pa = _import_pyarrow()
+    array = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    shape = [len(array)]
+    while pa.types.is_fixed_size_list(array.type):
+        shape.append(array.type.list_size)
+        array = array.flatten()
+    # Zero copy for the primitive types without nulls, nulls are converted to NaN.
+    data = array.to_numpy(zero_copy_only=False)
+    return data.reshape(shape)
+
+
+def decode_v1_request(body: bytes) -> Dict[str, Union[pd.DataFrame, np.ndarray]]:
+    """Decode the Arrow IPC stream as the ``instances`` of a v1 request."""
+    return table_to_v1_request(read_table(body))
+
+
+def table_to_v1_request(table) -> Dict[str, Union[pd.DataFrame, np.ndarray]]:
+    """Convert the table to the ``instances`` of a v1 request, a DataFrame or, for a table with a
+    single column of fixed size lists, a numpy array."""
+    pa = _import_pyarrow()
+    if table.num_columns == 1 and pa.types.is_fixed_size_list(table.schema[0].type):
+        return {"instances": _column_to_numpy(table.column(0))}
+    return {"instances": table.to_pandas(split_blocks=True)}
+
+
+def decode_v2_request(body: bytes, model_name: Optional[str] = None) -> InferRequest:
+    """Decode the Arrow IPC stream as a v2 request."""
+    return table_to_v2_request(read_table(body), model_name)
+
+
+def table_to_v2_request(table, model_name: Optional[str] = None) -> InferRequest:
+    """Convert the table to a v2 request with one input per column. A table of scalar columns is
+    marked with the ``pd`` content type, so it is decoded as a DataFrame by
+    :func:`kserve.utils.utils.get_predict_input`."""
+    infer_inputs = []
+    for name, column in zip(table.column_names, table.columns):
+        data = _column_to_numpy(column)
+        datatype = from_np_dtype(data.dtype)
+        if datatype is None:
+            raise InvalidInput(f"Unsupported Arrow type {column.type} of column {name}")
+        infer_input = InferInput(name=name, shape=list(data.shape), datatype=datatype)
+        infer_input._set_numpy_contents(data.reshape(-1))
+        infer_inputs.append(infer_input)
+    parameters = None
+    if all(len(infer_input.shape) == 1 for infer_input in infer_inputs):
+        parameters = {"content_type": "pd"}
+    return InferRequest(
+        model_name=model_name,
+        infer_inputs=infer_inputs,
+        parameters=parameters,
+        from_grpc=False,
+    )
+
+
+def _to_arrow_array(value: Any):
+    pa = _import_pyarrow()
+    if isinstance(value, pd.DataFrame):
+        return pa.StructArray.from_arrays(
+            [_to_arrow_array(value[column]) for column in value.columns],
+            names=[str(column) for column in value.columns],
+        )
+    if isinstance(value, pd.Series):
+        return pa.Array.from_pandas(value)
+    data = np.asarray(value)
+    if data.ndim <= 1:
+        return pa.array(data)
+    array = pa.array(np.ascontiguousarray(data).reshape(-1))
+    for list_size in reversed(data.shape[1:]):
+        array = pa.FixedSizeListArray.from_arrays(array, list_size)
+    return array
+
+
+def _to_table(columns: Dict[str, Any], metadata: Optional[Dict] = None):
+    pa = _import_pyarrow()
+    try:
+        return pa.Table.from_arrays(
+            [_to_arrow_array(value) for value in columns.values()],
+            names=[str(name) for name in columns.keys()],
+            metadata=metadata,
+        )
+    except (pa.ArrowException, ValueError, TypeError) as e:
+        raise InferenceError(f"Failed to encode the response as Arrow table: {e}")
+
+
+def write_stream(table) -> bytes:
+    pa = _import_pyarrow()
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def v1_response_to_table(response: Dict):
+    """Convert a v1 response to a table with one column per key, e.g. ``predictions``."""
+    if not isinstance(response, dict):
+        raise InferenceError(
+            f"Failed to encode the response as Arrow table: unsupported type {type(response).__name__}"
+        )
+    return _to_table(response)
+
+
+def v2_response_to_table(response: InferResponse):
+    """Convert a v2 response to a table with one column per output."""
+    metadata = {"model_name": response.model_name}
+    if response.id:
+        metadata["id"] = response.id
+    if response.model_version:
+        metadata["model_version"] = response.model_version
+    return _to_table(
+        {output.name: output.as_numpy() for output in response.outputs},
+        metadata=metadata,
+    )
+
+
+def encode_v1_response(response: Dict) -> bytes:
+    """Encode a v1 response as an Arrow IPC stream."""
+    return write_stream(v1_response_to_table(response))
+
+
+def encode_v2_response(response: InferResponse) -> bytes:
+    """Encode a v2 response as an Arrow IPC stream."""
+    return write_stream(v2_response_to_table(response))
@@ -0,0 +1,221 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Content codings of the REST request and response bodies.
+
+gzip is always supported. zstd is supported when the optional zstandard package is installed and
+is preferred over gzip, as it compresses faster at a similar ratio.
+"""
+
+import zlib
+from typing import List, Optional
+
+from ..errors import InvalidInput, PayloadTooLarge
+
+GZIP = "gzip"
+ZSTD = "zstd"
+IDENTITY = "identity"
+
+# Default maximum size of a decompressed request body.
+DEFAULT_MAX_DECOMPRESSED_SIZE = 256 * 1024 * 1024
+
+# Window bits of the gzip container of zlib.
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+# The zstd decompression objects have no output limit, so the compressed data is fed in slices of
+# this size. A zstd block of at most 128 KiB takes at least 4 bytes, which bounds the overshoot of
+# the limit to 32 MiB.
+_ZSTD_INPUT_SLICE = 1024
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def supported_encodings() -> List[str]:
+    """The supported content codings, by order of preference."""
+    if _import_zstandard() is not None:
+        return [ZSTD, GZIP]
+    return [GZIP]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Select the preferred supported coding of an ``Accept-Encoding`` header, or ``None`` if the
+    body should not be compressed. Codings are ranked by their quality value, then by preference.
+    """
+    if not accept_encoding:
+        return None
+    encodings = supported_encodings()
+    qualities = {}
+    for value in accept_encoding.split(","):
+        coding, _, params = value.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        if coding == "*":
+            for encoding in encodings:
+                qualities.setdefault(encoding, quality)
+        elif coding in encodings:
+            qualities[coding] = quality
+    candidates = [encoding for encoding in encodings if qualities.get(encoding, 0) > 0]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda encoding: qualities[encoding])
+
+
+class Compressor:
+    """Incremental compressor of a body, compressed chunk by chunk.
+
+    Args:
+        encoding: The content coding, ``gzip`` or ``zstd``.
+        level: The compression level. Default: ``None``, the default level of the coding.
+    """
+
+    def __init__(self, encoding: str, level: Optional[int] = None):
+        self.encoding = encoding
+        if encoding == GZIP:
+            self._compressobj = zlib.compressobj(
+                zlib.Z_DEFAULT_COMPRESSION if level is None else level,
+                zlib.DEFLATED,
+                _GZIP_WBITS,
+            )
+            self._sync_flush = zlib.Z_SYNC_FLUSH
+        elif encoding == ZSTD and _import_zstandard() is not None:
+            zstandard = _import_zstandard()
+            compressor = (
+                zstandard.ZstdCompressor()
+                if level is None
+                else zstandard.ZstdCompressor(level=level)
+            )
+            self._compressobj = compressor.compressobj()
+            self._sync_flush = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            raise ValueError(f"Unsupported content encoding {encoding}")
+
+    def compress(self, data: bytes, final: bool = False) -> bytes:
+        """Compress the next chunk of the body. The compressed data of a chunk is flushed, so it
+        can be decompressed as soon as it is received, and the stream is ended with the last one.
+        """
+        compressed = self._compressobj.compress(data)
+        if final:
+            return compressed + self._compressobj.flush()
+        return compressed + self._compressobj.flush(self._sync_flush)
+
+
+class Decompressor:
+    """Incremental decompressor of a body received chunk by chunk.
+
+    Args:
+        encoding: The content coding, ``gzip`` or ``zstd``.
+        max_size: The maximum size in bytes of the decompressed body. Default: ``None``, no limit.
+
+    Raises:
+        InvalidInput: If the content coding is not supported.
+    """
+
+    def __init__(self, encoding: str, max_size: Optional[int] = None):
+        self.encoding = encoding
+        self.max_size = max_size
+        self._size = 0
+        if encoding == GZIP:
+            self._decompressobj = zlib.decompressobj(_GZIP_WBITS)
+            self._errors = (zlib.error,)
+        elif encoding == ZSTD and _import_zstandard() is not None:
+            zstandard = _import_zstandard()
+            self._decompressobj = zstandard.ZstdDecompressor().decompressobj()
+            self._errors = (zstandard.ZstdError,)
+        else:
+            raise InvalidInput(
+                f"Unsupported Content-Encoding {encoding}, supported encodings are "
+                f"{', '.join(supported_encodings())}"
+            )
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress the next chunk of the body.
+
+        Raises:
+            InvalidInput: If the data is not valid for the content coding.
+            PayloadTooLarge: If the decompressed body exceeds ``max_size``.
+        """
+        if not data:
+            return b""
+        try:
+            if self.max_size is None:
+                decompressed = self._decompressobj.decompress(data)
+            elif self.encoding == GZIP:
+                # Decompressing one byte past the limit is enough to tell it is exceeded.
+                decompressed = self._decompressobj.decompress(
+                    data, self.max_size - self._size + 1
+                )
+            else:
+                decompressed = self._decompress_slices(data)
+        except self._errors as e:
+            raise InvalidInput(
+                f"Failed to decompress the {self.encoding} request body: {e}"
+            )
+        self._check_size(len(decompressed))
+        self._size += len(decompressed)
+        return decompressed
+
+    def _decompress_slices(self, data: bytes) -> bytes:
+        chunks = []
+        size = 0
+        with memoryview(data) as view:
+            for start in range(0, len(view), _ZSTD_INPUT_SLICE):
+                chunk = self._decompressobj.decompress(
+                    view[start : start + _ZSTD_INPUT_SLICE]
+                )
+                size += len(chunk)
+                self._check_size(size)
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    def _check_size(self, size: int):
+        if self.max_size is not None and self._size + size > self.max_size:
+            raise PayloadTooLarge(
+                f"The decompressed {self.encoding} request body exceeds the maximum size "
+                f"of {self.max_size} bytes"
+            )
+
+    def finish(self):
+        """Check the body is complete once its last chunk is decompressed.
+
+        Raises:
+            InvalidInput: If the compressed body is truncated.
+        """
+        if not self._decompressobj.eof:
+            raise InvalidInput(
+                f"Failed to decompress the {self.encoding} request body: truncated data"
+            )
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress a whole body."""
+    return Compressor(encoding, level).compress(data, final=True)
+
+
+def decompress(data: bytes, encoding: str, max_size: Optional[int] = None) -> bytes:
+    """Decompress a whole body."""
+    decompressor = Decompressor(encoding, max_size)
+    data = decompressor.decompress(data)
+    decompressor.finish()
+    return data
@@ -0,0 +1,105 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Deadline of the request being served.
+
+The data plane sets the deadline of a request from the time budget it is received with, the
+``x-request-timeout-ms`` header or the gRPC deadline. The inference clients called while the
+request is served, e.g. by a transformer calling its predictor, shorten their timeout to the
+remaining budget and propagate it, so the predictor does not keep working on a request whose
+caller already gave up.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Mapping, Optional
+
+from ..constants.constants import REQUEST_TIMEOUT_HEADER
+from ..errors import InferenceError
+
+_request_deadline: ContextVar[Optional[float]] = ContextVar(
+    "kserve_request_deadline", default=None
+)
+
+
+def timeout_from_headers(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """The time budget in seconds of a request, or ``None`` if it has none or it is invalid."""
+    if not headers or REQUEST_TIMEOUT_HEADER not in headers:
+        return None
+    try:
+        timeout_ms = float(headers[REQUEST_TIMEOUT_HEADER])
+    except ValueError:
+        return None
+    return max(timeout_ms, 0.0) / 1000
+
+
+@contextmanager
+def request_deadline(timeout: Optional[float]) -> Iterator[None]:
+    """Set the deadline of the request served in the current context to ``timeout`` seconds from
+    now. An earlier deadline already set in the context is kept.
+    """
+    if timeout is None:
+        yield
+        return
+    deadline = time.monotonic() + timeout
+    current = _request_deadline.get()
+    if current is not None and current < deadline:
+        deadline = current
+    token = _request_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    """The deadline, in ``time.monotonic()`` seconds, of the request served in the current context."""
+    return _request_deadline.get()
+
+
+@contextmanager
+def override_deadline(deadline: Optional[float]) -> Iterator[None]:
+    """Replace the deadline of the current context with ``deadline``, e.g. to serve the work shared
+    by several requests under a deadline of their own. ``None`` removes the deadline.
+    """
+    token = _request_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+def remaining_seconds() -> Optional[float]:
+    """The remaining time budget of the request served in the current context, if it has a deadline."""
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def deadline_timeout(timeout: Optional[float]) -> Optional[float]:
+    """Shorten the timeout of a call to the remaining time budget of the request being served.
+
+    Raises:
+        InferenceError: If the deadline of the request is exceeded.
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise InferenceError(
+            "The deadline of the request is exceeded", status="DEADLINE_EXCEEDED"
+        )
+    return remaining if timeout is None else min(timeout, remaining)
@@ -17,7 +17,7 @@ import sys
 import uuid
 
 from kserve.protocol.grpc.grpc_predict_v2_pb2 import InferParameter
-from typing import Dict, Union, List
+from typing import Any, Dict, Union, List, Optional, Tuple
 
 from kserve.utils.numpy_codec import from_np_dtype
 import pandas as pd
@@ -27,7 +27,7 @@ from cloudevents.conversion import to_binary, to_structured
 from cloudevents.http import CloudEvent
 from grpc import ServicerContext
 from kserve.protocol.infer_type import InferOutput, InferRequest, InferResponse
-from ..constants.constants import PredictorProtocol
+from ..constants.constants import PredictorProtocol, REQUEST_TIMEOUT_HEADER
 from ..errors import InvalidInput
 
 
@@ -121,7 +121,7 @@ def create_response_cloudevent(
         "CE_SOURCE", f"io.kserve.inference.{model_name}"
     )
 
-    event = CloudEvent(ce_attributes, response)
+    event = CloudEvent(ce_attributes, _to_json_compatible(response))
 
     if binary_event:
         event_headers, event_body = to_binary(event)
@@ -131,6 +131,20 @@ def create_response_cloudevent(
     return event_headers, event_body
 
 
+def _to_json_compatible(data: Any) -> Any:
+    """Convert the numpy arrays and pandas DataFrames of a v1 response to lists, the cloud event
+    data is encoded with the json module."""
+    if isinstance(data, dict):
+        return {key: _to_json_compatible(value) for key, value in data.items()}
+    if isinstance(data, pd.DataFrame):
+        return data.to_dict(orient="records")
+    if isinstance(data, (np.ndarray, pd.Series)):
+        return data.tolist()
+    if isinstance(data, np.generic):
+        return data.item()
+    return data
+
+
 def generate_uuid() -> str:
     return str(uuid.uuid4())
 
@@ -142,15 +156,104 @@ def to_headers(context: ServicerContext) -> Dict[str, str]:
     headers = {}
     for metadatum in metadata:
         headers[metadatum.key] = metadatum.value
+    # The deadline of the call is not part of the metadata, it is passed on as the time budget of the request.
+    time_remaining = (
+        context.time_remaining() if hasattr(context, "time_remaining") else None
+    )
+    if time_remaining is not None and REQUEST_TIMEOUT_HEADER not in headers:
+        headers[REQUEST_TIMEOUT_HEADER] = str(int(time_remaining * 1000))
 
     return headers
 
 
+def _instance_columns(
+    instance: Any, columns: Optional[List] = None
+) -> Optional[Tuple[Dict[str, List], List]]:
+    """Reads a v1 instance into columns. The instance is either a list of records or a dict of
+    equally long lists, or of dicts with the same index keys.
+
+    Returns:
+        The values of each column, with NaN for the values missing from a record, and the row
+        index, or None if the instance has another layout or, for a dict, misses one of the
+        requested columns, as pandas gives that column the object dtype.
+    """
+    if isinstance(instance, dict):
+        values = list(instance.values())
+        if len(values) == 0:
+            return None
+        if columns is not None and any(column not in instance for column in columns):
+            return None
+        if all(isinstance(value, list) for value in values):
+            num_rows = len(values[0])
+            if any(len(value) != num_rows for value in values):
+                return None
+            return dict(instance), list(range(num_rows))
+        if all(isinstance(value, dict) for value in values):
+            index = list(values[0].keys())
+            if any(list(value.keys()) != index for value in values):
+                return None
+            return {
+                column: list(value.values()) for column, value in instance.items()
+            }, index
+        return None
+    if isinstance(instance, list) and all(isinstance(row, dict) for row in instance):
+        num_rows = len(instance)
+        columns = {}
+        for i, record in enumerate(instance):
+            for column, value in record.items():
+                column_values = columns.get(column)
+                if column_values is None:
+                    column_values = columns[column] = [np.nan] * num_rows
+                column_values[i] = value
+        return columns, list(range(num_rows))
+    return None
+
+
+def _instances_to_dataframe(
+    instances: List, columns: Optional[List] = None
+) -> Optional[pd.DataFrame]:
+    """Builds a single DataFrame from the columns of all the v1 instances. It is equivalent to
+    concatenating a DataFrame per instance, without constructing them.
+
+    Returns:
+        The DataFrame, or None if an instance is not in a supported layout.
+    """
+    data: Dict[str, List] = {}
+    index = []
+    for instance in instances:
+        instance_columns = _instance_columns(instance, columns)
+        if instance_columns is None:
+            return None
+        instance_data, instance_index = instance_columns
+        num_rows = len(instance_index)
+        for column, values in instance_data.items():
+            column_values = data.get(column)
+            if column_values is None:
+                column_values = data[column] = [np.nan] * len(index)
+            column_values.extend(values)
+        if len(data) != len(instance_data):
+            for column, column_values in data.items():
+                if column not in instance_data:
+                    column_values.extend([np.nan] * num_rows)
+        index.extend(instance_index)
+    for column in columns or []:
+        if column not in data:
+            data[column] = [np.nan] * len(index)
+    return pd.DataFrame(data, columns=columns, index=index)
+
+
 def get_predict_input(
     payload: Union[Dict, InferRequest], columns: List = None
 ) -> Union[np.ndarray, pd.DataFrame, List[str]]:
     if isinstance(payload, Dict):
         instances = payload["inputs"] if "inputs" in payload else payload["instances"]
+        if isinstance(instances, pd.DataFrame):
+            # Columnar instances, e.g. decoded from an Arrow IPC stream.
+            if columns is not None and list(instances.columns) != list(columns):
+                return instances.reindex(columns=columns)
+            return instances
+        if isinstance(instances, np.ndarray):
+            return instances
         if len(instances) == 0:
             return np.array(instances)
         if isinstance(instances[0], Dict) or (
@@ -158,6 +261,9 @@ def get_predict_input(
             and len(instances[0]) != 0
             and isinstance(instances[0][0], Dict)
         ):
+            inputs = _instances_to_dataframe(instances, columns)
+            if inputs is not None:
+                return inputs
             dfs = []
             for instance in instances:
                 dfs.append(pd.DataFrame(instance, columns=columns))
@@ -191,6 +297,11 @@ def get_predict_input(
             return input.as_numpy()
 
 
+def _has_columnar_instances(payload: Dict) -> bool:
+    instances = payload.get("inputs", payload.get("instances"))
+    return isinstance(instances, (pd.DataFrame, np.ndarray))
+
+
 def get_predict_response(
     payload: Union[Dict, InferRequest],
     result: Union[np.ndarray, List, pd.DataFrame],
@@ -198,10 +309,12 @@ def get_predict_response(
 ) -> Union[Dict, InferResponse]:
     if isinstance(payload, Dict):
         infer_outputs = result
+        # The result of columnar instances, e.g. decoded from an Arrow IPC stream, is returned
+        # as is and encoded without converting it to lists first.
+        if _has_columnar_instances(payload):
+            return {"predictions": result}
         if isinstance(result, pd.DataFrame):
-            infer_outputs = []
-            for label, row in result.iterrows():
-                infer_outputs.append(row.to_dict())
+            infer_outputs = result.to_dict(orient="records")
         elif isinstance(result, np.ndarray):
             infer_outputs = result.tolist()
         return {"predictions": infer_outputs}
@@ -0,0 +1,216 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from kserve import Model
+from kserve.batcher import DynamicBatcher, merge_payloads, split_response
+from kserve.errors import InferenceError
+from kserve.protocol.infer_type import InferInput, InferRequest, InferResponse
+from kserve.utils.deadline import remaining_seconds, request_deadline
+from kserve.utils.utils import get_predict_input, get_predict_response
+
+
+class DummyBatchModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.batch_sizes = []
+        self.ready = True
+
+    def predict(self, payload, headers=None):
+        inputs = get_predict_input(payload)
+        self.batch_sizes.append(len(inputs))
+        return get_predict_response(payload, np.asarray(inputs) * 2, self.name)
+
+
+class HeadersModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.headers = []
+        self.ready = True
+
+    async def predict(self, payload, headers=None):
+        self.headers.append(headers)
+        return {"predictions": payload["instances"]}
+
+
+class DeadlineModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.remaining = []
+        self.ready = True
+
+    async def predict(self, payload, headers=None):
+        self.remaining.append(remaining_seconds())
+        return {"predictions": payload["instances"]}
+
+
+class FailingModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+
+    async def predict(self, payload, headers=None):
+        raise InferenceError("predict failed")
+
+
+def make_infer_request(rows, request_id=None):
+    data = np.array(rows, dtype=np.float32)
+    infer_input = InferInput(name="input-0", shape=list(data.shape), datatype="FP32")
+    infer_input.set_data_from_numpy(data, binary_data=False)
+    return InferRequest(
+        model_name="test", infer_inputs=[infer_input], request_id=request_id
+    )
+
+
+@pytest.mark.asyncio
+async def test_v1_requests_are_batched():
+    model = DummyBatchModel("test")
+    model.enable_dynamic_batching(max_batch_size=8, max_latency_ms=50)
+    responses = await asyncio.gather(
+        model({"instances": [[1, 2]]}),
+        model({"instances": [[3, 4], [5, 6]]}),
+        model({"instances": [[7, 8]]}),
+    )
+    assert model.batch_sizes == [4]
+    assert responses[0][0] == {"predictions": [[2, 4]]}
+    assert responses[1][0] == {"predictions": [[6, 8], [10, 12]]}
+    assert responses[2][0] == {"predictions": [[14, 16]]}
+
+
+@pytest.mark.asyncio
+async def test_batch_is_flushed_at_max_batch_size():
+    model = DummyBatchModel("test")
+    model.enable_dynamic_batching(max_batch_size=2, max_latency_ms=10000)
+    responses = await asyncio.wait_for(
+        asyncio.gather(
+            model({"instances": [[1]]}),
+            model({"instances": [[2]]}),
+            model({"instances": [[3]]}),
+            model({"instances": [[4]]}),
+        ),
+        timeout=5,
+    )
+    assert model.batch_sizes == [2, 2]
+    assert [res[0]["predictions"] for res in responses] == [[[2]], [[4]], [[6]], [[8]]]
+
+
+@pytest.mark.asyncio
+async def test_v2_requests_are_batched():
+    model = DummyBatchModel("test")
+    model.enable_dynamic_batching(max_batch_size=8, max_latency_ms=50)
+    responses = await asyncio.gather(
+        model(make_infer_request([[1, 2]], request_id="1")),
+        model(make_infer_request([[3, 4], [5, 6]], request_id="2")),
+    )
+    assert model.batch_sizes == [3]
+    first, second = responses[0][0], responses[1][0]
+    assert isinstance(first, InferResponse)
+    assert first.id == "1"
+    assert first.outputs[0].shape == [1, 2]
+    assert first.outputs[0].data == [2, 4]
+    assert second.id == "2"
+    assert second.outputs[0].shape == [2, 2]
+    np.testing.assert_array_equal(
+        second.outputs[0].as_numpy(), np.array([[6, 8], [10, 12]])
+    )
+
+
+@pytest.mark.asyncio
+async def test_unmergeable_requests_are_predicted_separately():
+    model = DummyBatchModel("test")
+    model.enable_dynamic_batching(max_batch_size=8, max_latency_ms=50)
+    responses = await asyncio.gather(
+        model(make_infer_request([[1, 2]])),
+        model(make_infer_request([[1, 2, 3]])),
+        model({"instances": [[1]], "parameters": {"threshold": 1}}),
+    )
+    assert sorted(model.batch_sizes) == [1, 1, 1]
+    assert responses[1][0].outputs[0].data == [2, 4, 6]
+    assert responses[2][0] == {"predictions": [[2]]}
+
+
+@pytest.mark.asyncio
+async def test_batch_error_is_propagated_to_all_requests():
+    model = FailingModel("test")
+    model.enable_dynamic_batching(max_batch_size=8, max_latency_ms=10)
+    results = await asyncio.gather(
+        model({"instances": [[1]]}),
+        model({"instances": [[2]]}),
+        return_exceptions=True,
+    )
+    assert all(isinstance(res, InferenceError) for res in results)
+
+
+@pytest.mark.asyncio
+async def test_headers_are_passed_to_batched_predict():
+    model = HeadersModel("test")
+    model.enable_dynamic_batching(max_batch_size=8, max_latency_ms=10)
+    await model({"instances": [[1]]}, headers={"x-request-id": "1"})
+    assert model.headers == [{"x-request-id": "1"}]
+
+    model.headers = []
+    await asyncio.gather(
+        model(
+            {"instances": [[1]]},
+            headers={"x-request-id": "1", "x-b3-traceid": "trace"},
+        ),
+        model(
+            {"instances": [[2]]},
+            headers={"x-request-id": "2", "x-b3-traceid": "trace"},
+        ),
+    )
+    # A merged batch only gets the headers shared by all its requests.
+    assert model.headers == [{"x-b3-traceid": "trace"}]
+
+
+@pytest.mark.asyncio
+async def test_batched_predict_deadline():
+    model = DeadlineModel("test")
+    model.enable_dynamic_batching(max_batch_size=8, max_latency_ms=10)
+
+    async def infer(timeout):
+        with request_deadline(timeout):
+            return await model({"instances": [[1]]})
+
+    await infer(5)
+    assert 4 < model.remaining[0] <= 5
+
+    # A merged batch runs under the latest deadline of its requests, not the one of the request
+    # that happened to flush it.
+    model.remaining = []
+    await asyncio.gather(infer(1), infer(10))
+    assert len(model.remaining) == 1 and model.remaining[0] > 9
+
+    model.remaining = []
+    await asyncio.gather(infer(10), infer(None))
+    assert model.remaining == [None]
+
+
+def test_merge_payloads_v1():
+    merged = merge_payloads([{"inputs": [1, 2]}, {"inputs": [3]}])
+    assert merged == {"inputs": [1, 2, 3]}
+
+
+def test_split_response_size_mismatch():
+    with pytest.raises(InferenceError):
+        split_response({"predictions": [1, 2]}, [{"instances": [1]}] * 3, [1, 1, 1])
+
+
+def test_invalid_batcher_config():
+    with pytest.raises(ValueError):
+        DynamicBatcher("test", None, max_batch_size=0)
@@ -0,0 +1,229 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import grpc
+import httpx
+import numpy as np
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from kserve import (
+    BulkInferStats,
+    InferenceGRPCClient,
+    InferenceRESTClient,
+    InferInput,
+    InferRequest,
+    InferResponse,
+    Model,
+    ModelServer,
+)
+from kserve.bulk_infer import bulk_infer
+from kserve.errors import InvalidInput, UnsupportedProtocol
+from kserve.inference_client import RESTConfig
+from kserve.protocol.grpc import grpc_predict_v2_pb2_grpc, servicer
+from kserve.protocol.rest.server import RESTServer
+
+
+class IdentityModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+        self.batch_sizes = []
+
+    async def predict(self, request, headers=None):
+        self.batch_sizes.append(request.inputs[0].shape[0])
+        return InferResponse(
+            response_id=request.id,
+            model_name=self.name,
+            infer_outputs=request.inputs,
+        )
+
+
+@pytest.fixture
+def model_server():
+    model_server = ModelServer()
+    model = IdentityModel("TestModel")
+    model_server.register_model(model)
+    return model_server, model
+
+
+@pytest_asyncio.fixture
+async def rest_client(model_server):
+    server, model = model_server
+    app = FastAPI()
+    RESTServer(
+        app, server.dataplane, server.model_repository_extension
+    ).create_application()
+    config = RESTConfig(transport=httpx.ASGITransport(app=app), protocol="v2")
+    async with InferenceRESTClient(config) as client:
+        yield client, model
+
+
+@pytest_asyncio.fixture
+async def grpc_client(model_server):
+    server, model = model_server
+    grpc_server = grpc.aio.server()
+    grpc_predict_v2_pb2_grpc.add_GRPCInferenceServiceServicer_to_server(
+        servicer.InferenceServicer(server.dataplane, server.model_repository_extension),
+        grpc_server,
+    )
+    port = grpc_server.add_insecure_port("localhost:0")
+    await grpc_server.start()
+    async with InferenceGRPCClient(f"localhost:{port}") as client:
+        yield client, model
+    await grpc_server.stop(grace=None)
+
+
+def make_request(request_id: str, rows: int, value: float) -> InferRequest:
+    infer_input = InferInput("input-0", [rows, 2], "FP32")
+    infer_input.set_data_from_numpy(np.full((rows, 2), value, dtype=np.float32))
+    return InferRequest(
+        model_name="TestModel", infer_inputs=[infer_input], request_id=request_id
+    )
+
+
+@pytest.mark.asyncio
+async def test_rest_infer_stream_rows(rest_client):
+    client, model = rest_client
+    stats = BulkInferStats()
+
+    async def rows():
+        for i in range(10):
+            yield np.array([i, i], dtype=np.float32)
+
+    responses = [
+        response
+        async for response in client.infer_stream(
+            "http://test-server",
+            rows(),
+            model_name="TestModel",
+            batch_size=4,
+            max_in_flight=2,
+            stats=stats,
+        )
+    ]
+    assert [response.id for response in responses] == [str(i) for i in range(10)]
+    for i, response in enumerate(responses):
+        np.testing.assert_array_equal(
+            response.outputs[0].as_numpy(), np.array([[i, i]], dtype=np.float32)
+        )
+    assert model.batch_sizes == [4, 4, 2]
+    assert (stats.requests, stats.rows, stats.retries) == (3, 10, 0)
+    assert stats.rows_per_second > 0
+    assert stats.latency_percentile_ms(99) >= stats.latency_percentile_ms(50) > 0
+
+
+@pytest.mark.asyncio
+async def test_grpc_infer_many_requests(grpc_client):
+    client, model = grpc_client
+    requests = [make_request(str(i), rows=i % 3 + 1, value=i) for i in range(8)]
+    # A request with other dimensions can not be merged and is sent in a request of its own.
+    requests.insert(4, make_request("other", rows=1, value=-1))
+    requests[4].inputs[0] = InferInput("input-0", [1, 3], "FP32")
+    requests[4].inputs[0].set_data_from_numpy(np.full((1, 3), -1, dtype=np.float32))
+
+    responses = await client.infer_many(requests, batch_size=4, max_in_flight=3)
+    assert [response.id for response in responses] == [
+        request.id for request in requests
+    ]
+    for request, response in zip(requests, responses):
+        np.testing.assert_array_equal(
+            response.outputs[0].as_numpy(), request.inputs[0].as_numpy()
+        )
+    assert sum(model.batch_sizes) == 1 + sum(i % 3 + 1 for i in range(8))
+    assert max(model.batch_sizes) <= 4
+    assert len(model.batch_sizes) < len(requests)
+
+
+@pytest.mark.asyncio
+async def test_bulk_infer_retries():
+    stats = BulkInferStats()
+    attempts = []
+
+    async def infer(request):
+        attempts.append(request.id)
+        if len(attempts) <= 2:
+            raise ConnectionError("unavailable")
+        return InferResponse(request.id, request.model_name, request.inputs)
+
+    responses = [
+        response
+        async for response in bulk_infer(
+            infer,
+            [np.zeros(2)],
+            is_transient=lambda e: isinstance(e, ConnectionError),
+            model_name="TestModel",
+            retry_backoff_seconds=0,
+            stats=stats,
+        )
+    ]
+    assert len(responses) == 1
+    assert attempts == ["0", "0", "0"]
+    assert stats.retries == 2
+
+    async def failing_infer(request):
+        raise ConnectionError("unavailable")
+
+    with pytest.raises(ConnectionError):
+        async for _ in bulk_infer(
+            failing_infer,
+            [np.zeros(2)] * 4,
+            is_transient=lambda e: isinstance(e, ConnectionError),
+            model_name="TestModel",
+            retries=1,
+            retry_backoff_seconds=0,
+        ):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_bulk_infer_max_in_flight():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def infer(request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return InferResponse(request.id, request.model_name, request.inputs)
+
+    responses = [
+        response
+        async for response in bulk_infer(
+            infer,
+            ({"a": [i], "b": [i, i]} for i in range(20)),
+            is_transient=lambda e: False,
+            model_name="TestModel",
+            max_in_flight=3,
+        )
+    ]
+    assert [response.id for response in responses] == [str(i) for i in range(20)]
+    assert [output.name for output in responses[0].outputs] == ["a", "b"]
+    assert max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_infer_invalid_arguments(rest_client):
+    client, _ = rest_client
+    with pytest.raises(InvalidInput, match="model_name is required"):
+        await client.infer_many("http://test-server", [np.zeros(2)])
+    v1_client = InferenceRESTClient(RESTConfig(protocol="v1"))
+    with pytest.raises(UnsupportedProtocol):
+        await v1_client.infer_many("http://test-server", [np.zeros(2)])
+    await v1_client.close()
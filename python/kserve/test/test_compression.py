@@ -0,0 +1,279 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+from unittest import mock
+
+import grpc
+import httpx
+import numpy as np
+import orjson
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from kserve import (
+    InferenceGRPCClient,
+    InferenceRESTClient,
+    InferInput,
+    InferRequest,
+    ModelServer,
+)
+from kserve.errors import InvalidInput, PayloadTooLarge, payload_too_large_handler
+from kserve.inference_client import RESTConfig
+from kserve.metrics import COMPRESSION_COMPRESSED_BYTES, COMPRESSION_RAW_BYTES
+from kserve.protocol.grpc import grpc_predict_v2_pb2_grpc, servicer
+from kserve.protocol.rest.compression import CompressionMiddleware
+from kserve.protocol.rest.server import RESTServer
+from kserve.utils import compression
+from test.test_server import DummyModel
+
+requires_zstandard = pytest.mark.skipif(
+    compression._import_zstandard() is None, reason="zstandard is not installed"
+)
+ENCODINGS = ["gzip", pytest.param("zstd", marks=requires_zstandard)]
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0", None),
+        ("br, gzip;q=0.5", "gzip"),
+        pytest.param("gzip, zstd", "zstd", marks=requires_zstandard),
+        ("zstd;q=0.5, gzip", "gzip"),
+        pytest.param("*", "zstd", marks=requires_zstandard),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert compression.negotiate_encoding(accept_encoding) == expected
+
+
+def test_negotiate_encoding_without_zstandard():
+    with mock.patch.object(compression, "_import_zstandard", return_value=None):
+        assert compression.negotiate_encoding("zstd, gzip;q=0.5") == "gzip"
+        assert compression.negotiate_encoding("zstd") is None
+        with pytest.raises(InvalidInput, match="Unsupported Content-Encoding zstd"):
+            compression.Decompressor("zstd")
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_streaming_round_trip(encoding):
+    compressor = compression.Compressor(encoding)
+    decompressor = compression.Decompressor(encoding)
+    # Every flushed chunk is decompressed as soon as it is received.
+    for chunk in [b"a" * 100, b"b" * 1000]:
+        assert decompressor.decompress(compressor.compress(chunk)) == chunk
+    assert decompressor.decompress(compressor.compress(b"c", final=True)) == b"c"
+    decompressor.finish()
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_decompress_invalid_data(encoding):
+    with pytest.raises(InvalidInput, match=f"Failed to decompress the {encoding}"):
+        compression.decompress(b"not compressed", encoding)
+    data = compression.compress(b"a" * 1000, encoding)
+    with pytest.raises(InvalidInput, match="truncated data"):
+        compression.decompress(data[:-4], encoding)
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_decompress_max_size(encoding):
+    data = compression.compress(b"\0" * 10_000_000, encoding)
+    assert compression.decompress(data, encoding, max_size=10_000_000) == (
+        b"\0" * 10_000_000
+    )
+    with pytest.raises(PayloadTooLarge, match="exceeds the maximum size of 1000000"):
+        compression.decompress(data, encoding, max_size=1_000_000)
+    # The limit applies to the whole body, not to each chunk.
+    decompressor = compression.Decompressor(encoding, max_size=1500)
+    compressor = compression.Compressor(encoding)
+    assert decompressor.decompress(compressor.compress(b"a" * 1000)) == b"a" * 1000
+    with pytest.raises(PayloadTooLarge):
+        decompressor.decompress(compressor.compress(b"b" * 1000))
+
+
+def sample_value(counter, direction, encoding) -> float:
+    return counter.labels(direction, encoding)._value.get()
+
+
+class TestCompressionMiddleware:
+    @pytest.fixture(scope="class")
+    def app(self):
+        app = FastAPI()
+
+        @app.post("/echo")
+        async def echo(request: Request):
+            return {"body": (await request.body()).decode()}
+
+        @app.get("/stream")
+        async def stream():
+            async def chunks():
+                for i in range(3):
+                    yield f"data: {i}\n\n" * 100
+
+            return StreamingResponse(chunks(), media_type="text/event-stream")
+
+        app.add_exception_handler(
+            InvalidInput,
+            lambda request, e: JSONResponse(status_code=400, content={"error": str(e)}),
+        )
+        app.add_exception_handler(PayloadTooLarge, payload_too_large_handler)
+        app.add_middleware(
+            CompressionMiddleware, minimum_size=100, max_decompressed_size=100_000
+        )
+        return app
+
+    @pytest.fixture(scope="class")
+    def client(self, app):
+        return TestClient(app)
+
+    @pytest.mark.parametrize("encoding", ENCODINGS)
+    def test_compressed_request_and_response(self, client, encoding):
+        raw_bytes = sample_value(COMPRESSION_RAW_BYTES, "request", encoding)
+        body = b"x" * 1000
+        resp = client.post(
+            "/echo",
+            content=compression.compress(body, encoding),
+            headers={"content-encoding": encoding, "accept-encoding": encoding},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-encoding"] == encoding
+        assert resp.headers["vary"] == "accept-encoding"
+        assert resp.json() == {"body": body.decode()}
+        assert (
+            sample_value(COMPRESSION_RAW_BYTES, "request", encoding) - raw_bytes == 1000
+        )
+        assert sample_value(
+            COMPRESSION_COMPRESSED_BYTES, "response", encoding
+        ) < sample_value(COMPRESSION_RAW_BYTES, "response", encoding)
+
+    def test_small_response_not_compressed(self, client):
+        resp = client.post("/echo", content=b"x", headers={"accept-encoding": "gzip"})
+        assert resp.status_code == 200
+        assert "content-encoding" not in resp.headers
+        assert resp.json() == {"body": "x"}
+
+    def test_unsupported_request_encoding(self, client):
+        resp = client.post("/echo", content=b"x", headers={"content-encoding": "br"})
+        assert resp.status_code == 415
+        assert "Unsupported Content-Encoding br" in resp.json()["error"]
+
+    def test_invalid_compressed_request(self, client):
+        resp = client.post(
+            "/echo", content=b"x" * 10, headers={"content-encoding": "gzip"}
+        )
+        assert resp.status_code == 400
+        assert "Failed to decompress the gzip request body" in resp.json()["error"]
+
+    @pytest.mark.parametrize("encoding", ENCODINGS)
+    def test_decompressed_request_too_large(self, client, encoding):
+        resp = client.post(
+            "/echo",
+            content=compression.compress(b"x" * 1_000_000, encoding),
+            headers={"content-encoding": encoding},
+        )
+        assert resp.status_code == 413
+        assert "exceeds the maximum size of 100000 bytes" in resp.json()["error"]
+
+    @requires_zstandard
+    def test_streamed_response(self, client):
+        with client.stream(
+            "GET", "/stream", headers={"accept-encoding": "zstd"}
+        ) as resp:
+            assert resp.headers["content-encoding"] == "zstd"
+            assert "content-length" not in resp.headers
+            text = "".join(resp.iter_text())
+        assert text == "".join(f"data: {i}\n\n" * 100 for i in range(3))
+
+
+class TestCompressedInference:
+    @pytest.fixture(scope="class")
+    def app(self):
+        server = ModelServer()
+        model = DummyModel("TestModel")
+        model.load()
+        server.register_model(model)
+        app = FastAPI()
+        RESTServer(
+            app, server.dataplane, server.model_repository_extension
+        ).create_application()
+        app.add_middleware(CompressionMiddleware, minimum_size=0)
+        return app
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("encoding", ENCODINGS)
+    async def test_rest_client_compression(self, app, encoding):
+        config = RESTConfig(
+            transport=httpx.ASGITransport(app=app),
+            protocol="v2",
+            compression=encoding,
+        )
+        async with InferenceRESTClient(config) as client:
+            infer_input = InferInput("input-0", [1, 4], "INT32")
+            infer_input.set_data_from_numpy(np.arange(4, dtype=np.int32).reshape(1, 4))
+            response_headers = {}
+            response = await client.infer(
+                "http://test-server",
+                InferRequest(model_name="TestModel", infer_inputs=[infer_input]),
+                model_name="TestModel",
+                response_headers=response_headers,
+            )
+        assert response_headers["content-encoding"] in ("gzip", "zstd")
+        np.testing.assert_array_equal(response.outputs[0].data, [0, 1, 2, 3])
+
+    def test_v1_gzip_request(self, app):
+        body = orjson.dumps({"instances": [[1, 2]]})
+        resp = TestClient(app).post(
+            "/v1/models/TestModel:predict",
+            content=gzip.compress(body),
+            headers={"content-encoding": "gzip", "accept-encoding": "gzip"},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.json() == {"predictions": [[1, 2]]}
+
+
+@pytest.mark.asyncio
+async def test_grpc_compression():
+    model_server = ModelServer()
+    model = DummyModel("TestModel")
+    model.load()
+    model_server.register_model(model)
+    grpc_server = grpc.aio.server(compression=grpc.Compression.Gzip)
+    grpc_predict_v2_pb2_grpc.add_GRPCInferenceServiceServicer_to_server(
+        servicer.InferenceServicer(
+            model_server.dataplane, model_server.model_repository_extension
+        ),
+        grpc_server,
+    )
+    port = grpc_server.add_insecure_port("localhost:0")
+    await grpc_server.start()
+    try:
+        async with InferenceGRPCClient(
+            f"localhost:{port}", compression=grpc.Compression.Gzip
+        ) as client:
+            infer_input = InferInput("input-0", [1, 256], "FP32")
+            infer_input.set_data_from_numpy(np.zeros((1, 256), dtype=np.float32))
+            response = await client.infer(
+                InferRequest(model_name="TestModel", infer_inputs=[infer_input])
+            )
+        np.testing.assert_array_equal(
+            response.outputs[0].as_numpy(), np.zeros((1, 256), dtype=np.float32)
+        )
+    finally:
+        await grpc_server.stop(grace=None)
@@ -124,7 +124,7 @@ class TestDataPlane:
         expected_metadata = {
             "name": "kserve",
             "version": version,
-            "extensions": ["model_repository_extension"],
+            "extensions": ["model_repository_extension", "system_shared_memory"],
         }
         assert dataplane.metadata() == expected_metadata
 
@@ -0,0 +1,194 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import grpc
+import httpx
+import numpy as np
+import pytest
+from fastapi import FastAPI, Request
+
+from kserve import (
+    InferenceGRPCClient,
+    InferenceRESTClient,
+    InferInput,
+    InferRequest,
+    InferResponse,
+    Model,
+    ModelServer,
+)
+from kserve.errors import InferenceError
+from kserve.inference_client import RESTConfig
+from kserve.protocol.grpc import grpc_predict_v2_pb2_grpc, servicer
+from kserve.utils.deadline import (
+    deadline_timeout,
+    remaining_seconds,
+    request_deadline,
+    timeout_from_headers,
+)
+
+
+class BudgetModel(Model):
+    """Records the remaining time budget of the requests it predicts."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+        self.budgets = []
+
+    async def predict(self, request, headers=None):
+        self.budgets.append(remaining_seconds())
+        return InferResponse(
+            response_id=request.id, model_name=self.name, infer_outputs=request.inputs
+        )
+
+
+def make_request() -> InferRequest:
+    infer_input = InferInput("input-0", [1, 2], "FP32")
+    infer_input.set_data_from_numpy(np.zeros((1, 2), dtype=np.float32))
+    return InferRequest(model_name="TestModel", infer_inputs=[infer_input])
+
+
+@pytest.mark.parametrize(
+    "headers,expected",
+    [
+        (None, None),
+        ({"x-request-timeout-ms": "1500"}, 1.5),
+        ({"x-request-timeout-ms": "-1"}, 0.0),
+        ({"x-request-timeout-ms": "soon"}, None),
+    ],
+)
+def test_timeout_from_headers(headers, expected):
+    assert timeout_from_headers(headers) == expected
+
+
+def test_request_deadline():
+    assert remaining_seconds() is None
+    assert deadline_timeout(60) == 60
+    with request_deadline(1):
+        assert deadline_timeout(60) <= 1
+        assert deadline_timeout(None) <= 1
+        assert deadline_timeout(0.5) == 0.5
+        # An earlier deadline is kept.
+        with request_deadline(10):
+            assert remaining_seconds() <= 1
+        with request_deadline(0):
+            with pytest.raises(InferenceError, match="DEADLINE_EXCEEDED"):
+                deadline_timeout(60)
+    assert remaining_seconds() is None
+
+
+@pytest.mark.asyncio
+async def test_rest_client_deadline():
+    app = FastAPI()
+
+    @app.post("/v1/models/TestModel:predict")
+    async def predict(request: Request):
+        if request.headers.get("x-slow"):
+            await asyncio.sleep(10)
+        return {"predictions": [request.headers.get("x-request-timeout-ms")]}
+
+    config = RESTConfig(transport=httpx.ASGITransport(app=app))
+    async with InferenceRESTClient(config) as client:
+        response = await client.infer(
+            "http://test-server", {"instances": [1]}, model_name="TestModel"
+        )
+        assert response == {"predictions": [None]}
+        with request_deadline(2):
+            response = await client.infer(
+                "http://test-server", {"instances": [1]}, model_name="TestModel"
+            )
+            assert 1000 < int(response["predictions"][0]) <= 2000
+        with request_deadline(0.1):
+            with pytest.raises(InferenceError, match="deadline of the request"):
+                await client.infer(
+                    "http://test-server",
+                    {"instances": [1]},
+                    model_name="TestModel",
+                    headers={"x-slow": "1"},
+                )
+
+
+@pytest.mark.asyncio
+async def test_dataplane_request_deadline():
+    model_server = ModelServer()
+    model = BudgetModel("TestModel")
+    model_server.register_model(model)
+    await model_server.dataplane.infer(
+        "TestModel", make_request(), headers={"x-request-timeout-ms": "500"}
+    )
+    await model_server.dataplane.infer("TestModel", make_request(), headers={})
+    assert 0 < model.budgets[0] <= 0.5
+    assert model.budgets[1] is None
+
+
+@pytest.mark.asyncio
+async def test_grpc_deadline_propagation():
+    model_server = ModelServer()
+    model = BudgetModel("TestModel")
+    model_server.register_model(model)
+    grpc_server = grpc.aio.server()
+    grpc_predict_v2_pb2_grpc.add_GRPCInferenceServiceServicer_to_server(
+        servicer.InferenceServicer(
+            model_server.dataplane, model_server.model_repository_extension
+        ),
+        grpc_server,
+    )
+    port = grpc_server.add_insecure_port("localhost:0")
+    await grpc_server.start()
+    try:
+        async with InferenceGRPCClient(f"localhost:{port}") as client:
+            await client.infer(make_request(), timeout=None)
+            await client.infer(make_request(), timeout=2)
+            # The client timeout is shortened to the budget of the request being served.
+            with request_deadline(0.5):
+                await client.infer(make_request())
+    finally:
+        await grpc_server.stop(grace=None)
+    # The deadline of the gRPC server is rounded up by a few milliseconds.
+    assert model.budgets[0] is None
+    assert 1 < model.budgets[1] <= 2.1
+    assert 0 < model.budgets[2] <= 0.6
+
+
+@pytest.mark.asyncio
+async def test_grpc_stream_request_deadline():
+    model_server = ModelServer()
+    model = BudgetModel("TestModel")
+    model_server.register_model(model)
+    grpc_server = grpc.aio.server()
+    grpc_predict_v2_pb2_grpc.add_GRPCInferenceServiceServicer_to_server(
+        servicer.InferenceServicer(
+            model_server.dataplane, model_server.model_repository_extension
+        ),
+        grpc_server,
+    )
+    port = grpc_server.add_insecure_port("localhost:0")
+    await grpc_server.start()
+
+    async def requests():
+        yield make_request()
+        await asyncio.sleep(0.5)
+        yield make_request()
+
+    try:
+        async with InferenceGRPCClient(f"localhost:{port}") as client:
+            async for _, error in client.stream_infer(requests(), timeout=2):
+                assert error is None
+    finally:
+        await grpc_server.stop(grace=None)
+    # The budget of each request is the time remaining before the deadline of the call.
+    assert 1.5 < model.budgets[0] <= 2.1
+    assert model.budgets[1] <= model.budgets[0] - 0.4
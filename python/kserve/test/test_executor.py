@@ -0,0 +1,171 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+
+import numpy as np
+import pytest
+
+from kserve import Model
+from kserve.errors import InvalidInput
+from kserve.executor import ExecutionPolicy, dumps, loads
+from kserve.protocol.infer_type import InferInput, InferRequest, InferResponse
+from kserve.utils.utils import get_predict_input, get_predict_response
+
+
+class SyncModel(Model):
+    def __init__(self, name, return_response_headers=False):
+        super().__init__(name, return_response_headers=return_response_headers)
+        self.weights = np.float32(2)
+        self.ready = True
+
+    def predict(self, payload, headers=None, response_headers=None):
+        if response_headers is not None:
+            response_headers["x-worker-pid"] = str(os.getpid())
+        inputs = get_predict_input(payload)
+        if isinstance(payload, dict) and payload.get("fail"):
+            raise InvalidInput("bad input")
+        if isinstance(payload, dict) and payload.get("report_worker"):
+            return {"predictions": [os.getpid(), threading.get_ident()]}
+        return get_predict_response(
+            payload, np.asarray(inputs) * self.weights, self.name
+        )
+
+
+def make_infer_request(data):
+    infer_input = InferInput(name="input-0", shape=list(data.shape), datatype="FP32")
+    infer_input.set_data_from_numpy(data, binary_data=True)
+    return InferRequest(model_name="test", infer_inputs=[infer_input], request_id="1")
+
+
+def test_dumps_uses_shared_memory_for_large_buffers():
+    small = np.arange(10, dtype=np.float32)
+    large = np.arange(1024 * 1024, dtype=np.float32)
+    data, shared_buffers = dumps({"small": small, "large": large})
+    assert len(shared_buffers) == 1
+    result = loads(data, shared_buffers)
+    np.testing.assert_array_equal(result["small"], small)
+    np.testing.assert_array_equal(result["large"], large)
+    # The block is unlinked once it is loaded
+    if sys.platform == "linux":
+        assert not os.path.exists(f"/dev/shm/{shared_buffers[0].name}")
+
+
+@pytest.mark.asyncio
+async def test_thread_execution_policy():
+    model = SyncModel("test")
+    model.set_execution_policy("thread")
+    response, _ = await model({"instances": [[1]], "report_worker": True})
+    assert response["predictions"] == [os.getpid(), response["predictions"][1]]
+    assert response["predictions"][1] != threading.get_ident()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="requires fork")
+@pytest.mark.asyncio
+async def test_process_execution_policy():
+    model = SyncModel("test")
+    model.set_execution_policy(ExecutionPolicy.PROCESS, workers=2)
+    model.start_execution_workers()
+    try:
+        response, _ = await model({"instances": [[1]], "report_worker": True})
+        assert response["predictions"][0] != os.getpid()
+
+        response, _ = await model({"instances": [[1, 2]]})
+        assert response == {"predictions": [[2, 4]]}
+
+        data = np.random.rand(256, 1024).astype(np.float32)
+        response, _ = await model(make_infer_request(data))
+        assert isinstance(response, InferResponse)
+        np.testing.assert_array_equal(response.outputs[0].as_numpy(), data * 2)
+
+        with pytest.raises(InvalidInput):
+            await model({"instances": [[1]], "fail": True})
+    finally:
+        model.stop()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="requires fork")
+@pytest.mark.asyncio
+async def test_process_execution_policy_response_headers():
+    model = SyncModel("test", return_response_headers=True)
+    model.set_execution_policy("process", workers=1)
+    model.start_execution_workers()
+    try:
+        _, response_headers = await model({"instances": [[1]]})
+        assert int(response_headers["x-worker-pid"]) != os.getpid()
+    finally:
+        model.stop()
+
+
+def test_invalid_execution_policy():
+    with pytest.raises(ValueError):
+        SyncModel("test").set_execution_policy("gpu")
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="requires fork")
+@pytest.mark.asyncio
+async def test_process_execution_policy_not_started():
+    model = SyncModel("test")
+    model.set_execution_policy("process", workers=1)
+    with pytest.raises(RuntimeError):
+        await model({"instances": [[1]]})
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="requires fork")
+def test_process_execution_policy_shared_memory_cleanup():
+    # Run in a fresh interpreter, the resource tracker reports the blocks left registered (leaked)
+    # or unregistered twice (unlinked twice) on stderr when it exits.
+    script = textwrap.dedent(
+        """
+        import asyncio
+        import glob
+
+        import numpy as np
+
+        from kserve import Model
+
+
+        class SyncModel(Model):
+            def predict(self, payload, headers=None):
+                return {"predictions": payload["instances"] * 2}
+
+
+        async def main():
+            model = SyncModel("test")
+            model.ready = True
+            model.set_execution_policy("process", workers=2)
+            model.start_execution_workers()
+            blocks = set(glob.glob("/dev/shm/psm_*"))
+            data = np.random.rand(256, 1024).astype(np.float32)
+            for _ in range(4):
+                # The request and the response arrays are shipped through shared memory
+                response, _ = await model({"instances": data})
+                np.testing.assert_array_equal(response["predictions"], data * 2)
+            model.stop()
+            assert set(glob.glob("/dev/shm/psm_*")) <= blocks
+
+
+        asyncio.run(main())
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    assert "resource_tracker" not in result.stderr
+    assert "leaked shared_memory" not in result.stderr
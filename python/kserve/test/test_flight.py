@@ -0,0 +1,122 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import numpy as np
+import orjson
+import pytest
+import pytest_asyncio
+
+pa = pytest.importorskip("pyarrow")
+flight = pytest.importorskip("pyarrow.flight")
+
+from kserve import Model, ModelRepository  # noqa: E402
+from kserve.protocol.dataplane import DataPlane  # noqa: E402
+from kserve.protocol.flight import FlightServer, rebatch  # noqa: E402
+from kserve.utils.utils import get_predict_input, get_predict_response  # noqa: E402
+
+
+class DummyTabularModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+        self.batch_rows = []
+
+    def predict(self, payload, headers=None):
+        inputs = get_predict_input(payload)
+        self.batch_rows.append(len(inputs))
+        return get_predict_response(payload, np.asarray(inputs).sum(axis=1), self.name)
+
+
+@pytest_asyncio.fixture
+async def model():
+    return DummyTabularModel("TabularModel")
+
+
+@pytest_asyncio.fixture
+async def flight_server(model):
+    model_repository = ModelRepository()
+    model_repository.update(model)
+    server = FlightServer(0, DataPlane(model_registry=model_repository), batch_size=3)
+    task = asyncio.create_task(server.start())
+    while server._server is None:
+        await asyncio.sleep(0.01)
+    yield server
+    await server.stop()
+    await task
+
+
+def exchange(port: int, descriptor, tables) -> pa.Table:
+    client = flight.connect(f"grpc://localhost:{port}")
+    writer, reader = client.do_exchange(descriptor)
+    writer.begin(tables[0].schema)
+    for table in tables:
+        writer.write_table(table)
+    writer.done_writing()
+    result = reader.read_all()
+    writer.close()
+    client.close()
+    return result
+
+
+def feature_table(start: int, rows: int) -> pa.Table:
+    a = np.arange(start, start + rows, dtype=np.float64)
+    return pa.table({"a": a, "b": a * 10})
+
+
+def test_rebatch():
+    tables = [feature_table(0, 2), feature_table(2, 5), feature_table(7, 1)]
+    batches = list(rebatch(iter(tables), 3))
+    assert [batch.num_rows for batch in batches] == [3, 3, 2]
+    assert pa.concat_tables(batches)["a"].to_pylist() == list(range(8))
+    assert list(rebatch(iter(tables), None)) == tables
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "descriptor",
+    [
+        flight.FlightDescriptor.for_path("TabularModel"),
+        flight.FlightDescriptor.for_command(
+            orjson.dumps({"model_name": "TabularModel", "protocol": "v2"})
+        ),
+    ],
+)
+async def test_do_exchange(flight_server, model, descriptor):
+    tables = [feature_table(0, 4), feature_table(4, 4)]
+    result = await asyncio.to_thread(exchange, flight_server.port, descriptor, tables)
+    assert model.batch_rows == [3, 3, 2]
+    expected = [i * 11.0 for i in range(8)]
+    assert result.column(0).to_pylist() == expected
+
+
+@pytest.mark.asyncio
+async def test_do_exchange_batch_size(flight_server, model):
+    descriptor = flight.FlightDescriptor.for_command(
+        orjson.dumps({"model_name": "TabularModel", "batch_size": 8})
+    )
+    tables = [feature_table(0, 4), feature_table(4, 4)]
+    result = await asyncio.to_thread(exchange, flight_server.port, descriptor, tables)
+    assert model.batch_rows == [8]
+    assert result["predictions"].to_pylist() == [i * 11.0 for i in range(8)]
+
+
+@pytest.mark.asyncio
+async def test_do_exchange_unknown_model(flight_server):
+    descriptor = flight.FlightDescriptor.for_path("UnknownModel")
+    with pytest.raises(pa.ArrowInvalid, match="UnknownModel does not exist"):
+        await asyncio.to_thread(
+            exchange, flight_server.port, descriptor, [feature_table(0, 1)]
+        )
@@ -12,18 +12,29 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+
 import grpc
 import grpc_testing
 import numpy as np
 import pandas as pd
 import pytest
+import pytest_asyncio
 from google.protobuf.json_format import MessageToDict
+from prometheus_client import REGISTRY
 from unittest.mock import patch
 
-from kserve import Model, ModelServer
-from kserve.errors import InvalidInput
-from kserve.protocol.grpc import grpc_predict_v2_pb2, servicer
-from kserve.protocol.infer_type import serialize_byte_tensor, InferResponse
+from kserve import InferenceGRPCClient, Model, ModelServer
+from kserve.model import PredictorConfig
+from kserve.errors import InferenceError, InvalidInput
+from kserve.protocol.grpc import grpc_predict_v2_pb2, grpc_predict_v2_pb2_grpc, servicer
+from kserve.protocol.infer_type import (
+    serialize_byte_tensor,
+    InferInput,
+    InferOutput,
+    InferRequest,
+    InferResponse,
+)
 from kserve.utils.utils import get_predict_response
 
 
@@ -678,3 +689,279 @@ async def test_grpc_raw_inputs_with_contents_specified(mock_to_headers, server):
     with pytest.raises(InvalidInput):
         response, _, _, _ = model_infer_method.termination()
         _ = await response
+
+
+@pytest.mark.asyncio
+@patch(
+    "kserve.protocol.grpc.servicer.to_headers", return_value=[]
+)  # To avoid NotImplementedError from trailing_metadata function
+async def test_grpc_binary_data_output_parameter(mock_to_headers, server):
+    request = grpc_predict_v2_pb2.ModelInferRequest(
+        model_name="TestModel",
+        id="123",
+        inputs=[
+            {
+                "name": "fp32_input",
+                "shape": [2],
+                "datatype": "FP32",
+                "contents": {"fp32_contents": [6.8, 2.8]},
+            },
+            {
+                "name": "int32_input",
+                "shape": [2],
+                "datatype": "INT32",
+                "contents": {"int_contents": [6, 2]},
+            },
+            {
+                "name": "string_input",
+                "shape": [2],
+                "datatype": "BYTES",
+                "contents": {"bytes_contents": [b"Cat", b"Dog"]},
+            },
+            {
+                "name": "uint8_input",
+                "shape": [2],
+                "datatype": "UINT8",
+                "contents": {"uint_contents": [6, 2]},
+            },
+            {
+                "name": "bool_input",
+                "shape": [2],
+                "datatype": "BOOL",
+                "contents": {"bool_contents": [True, False]},
+            },
+        ],
+        parameters={
+            "binary_data_output": grpc_predict_v2_pb2.InferParameter(bool_param=True)
+        },
+    )
+
+    model_infer_method = server.invoke_unary_unary(
+        method_descriptor=(
+            grpc_predict_v2_pb2.DESCRIPTOR.services_by_name[
+                "GRPCInferenceService"
+            ].methods_by_name["ModelInfer"]
+        ),
+        invocation_metadata={},
+        request=request,
+        timeout=20,
+    )
+
+    response, _, code, _ = model_infer_method.termination()
+    response = await response
+    assert code == grpc.StatusCode.OK
+    assert len(response.raw_output_contents) == 5
+    for output in response.outputs:
+        assert not output.HasField("contents")
+    infer_response = InferResponse.from_grpc(response)
+    np.testing.assert_array_equal(
+        infer_response.outputs[0].as_numpy(), np.array([6.8, 2.8], dtype=np.float32)
+    )
+    np.testing.assert_array_equal(
+        infer_response.outputs[2].as_numpy(), np.array([b"Cat", b"Dog"])
+    )
+
+
+class DummyBatchModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+        self.batch_sizes = []
+
+    async def predict(self, request, headers=None):
+        data = request.inputs[0].as_numpy()
+        self.batch_sizes.append(data.shape[0])
+        return InferResponse(
+            response_id=request.id,
+            model_name=self.name,
+            infer_outputs=[
+                InferOutput(
+                    name="output-0", shape=list(data.shape), datatype="FP32", data=data
+                )
+            ],
+        )
+
+
+@pytest_asyncio.fixture
+async def grpc_stream_server():
+    model_server = ModelServer()
+    model = DummyBatchModel("TestModel")
+    model.enable_dynamic_batching(max_batch_size=8, max_latency_ms=50)
+    model_server.register_model(model)
+    grpc_server = grpc.aio.server()
+    grpc_predict_v2_pb2_grpc.add_GRPCInferenceServiceServicer_to_server(
+        servicer.InferenceServicer(
+            model_server.dataplane,
+            model_server.model_repository_extension,
+            max_stream_inflight_requests=8,
+        ),
+        grpc_server,
+    )
+    port = grpc_server.add_insecure_port("localhost:0")
+    await grpc_server.start()
+    yield model, port
+    await grpc_server.stop(grace=None)
+
+
+@pytest.mark.asyncio
+async def test_grpc_stream_infer(grpc_stream_server):
+    model, port = grpc_stream_server
+
+    def requests():
+        for i in range(32):
+            infer_input = InferInput("input-0", [1, 2], "FP32")
+            infer_input.set_data_from_numpy(np.array([[i, i]], dtype=np.float32))
+            yield InferRequest(
+                model_name="MissingModel" if i == 5 else "TestModel",
+                infer_inputs=[infer_input],
+                request_id=str(i),
+            )
+
+    async with InferenceGRPCClient(f"localhost:{port}") as client:
+        results = {}
+        async for response, error in client.stream_infer(requests()):
+            results[response.id] = (response, error)
+
+    assert len(results) == 32
+    response, error = results["5"]
+    assert isinstance(error, InferenceError)
+    assert "MissingModel does not exist" in str(error)
+    assert response.model_name == "MissingModel"
+    for i in range(32):
+        if i == 5:
+            continue
+        response, error = results[str(i)]
+        assert error is None
+        np.testing.assert_array_equal(
+            response.outputs[0].as_numpy(), np.array([[i, i]], dtype=np.float32)
+        )
+    # The concurrent requests of the stream are merged by the dynamic batcher.
+    assert max(model.batch_sizes) > 1
+
+
+class BlockingModel(Model):
+    """Holds the requests with an id starting with "block" until released."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+        self.release = asyncio.Event()
+
+    async def predict(self, request, headers=None):
+        if request.id.startswith("block"):
+            await self.release.wait()
+        return InferResponse(
+            response_id=request.id,
+            model_name=self.name,
+            infer_outputs=request.inputs,
+        )
+
+
+@pytest_asyncio.fixture
+async def grpc_blocking_server():
+    model_server = ModelServer()
+    model = BlockingModel("TestModel")
+    model_server.register_model(model)
+    grpc_server = grpc.aio.server()
+    grpc_predict_v2_pb2_grpc.add_GRPCInferenceServiceServicer_to_server(
+        servicer.InferenceServicer(
+            model_server.dataplane, model_server.model_repository_extension
+        ),
+        grpc_server,
+    )
+    port = grpc_server.add_insecure_port("localhost:0")
+    await grpc_server.start()
+    yield model, port
+    model.release.set()
+    await grpc_server.stop(grace=None)
+
+
+def make_infer_request(request_id: str) -> InferRequest:
+    infer_input = InferInput("input-0", [1, 2], "FP32")
+    infer_input.set_data_from_numpy(np.array([[1, 2]], dtype=np.float32))
+    return InferRequest(
+        model_name="TestModel", infer_inputs=[infer_input], request_id=request_id
+    )
+
+
+async def wait_in_flight(client: InferenceGRPCClient, expected: int):
+    for _ in range(100):
+        if sum(client.channel_stats()) == expected:
+            return
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "channel_selection,expected",
+    [("round_robin", [2, 0]), ("least_outstanding", [1, 1])],
+)
+async def test_grpc_client_channel_selection(
+    grpc_blocking_server, channel_selection, expected
+):
+    model, port = grpc_blocking_server
+    target = f"localhost:{port}"
+    async with InferenceGRPCClient(
+        target, num_channels=2, channel_selection=channel_selection
+    ) as client:
+        first = asyncio.create_task(client.infer(make_infer_request("block-1")))
+        await wait_in_flight(client, 1)
+        assert client.channel_stats() == [1, 0]
+        await client.infer(make_infer_request("quick"))
+        second = asyncio.create_task(client.infer(make_infer_request("block-2")))
+        await wait_in_flight(client, 2)
+        assert client.channel_stats() == expected
+        for channel, in_flight in enumerate(expected):
+            assert (
+                REGISTRY.get_sample_value(
+                    "grpc_client_channel_inflight_requests",
+                    {"target": target, "channel": str(channel)},
+                )
+                == in_flight
+            )
+        model.release.set()
+        responses = await asyncio.gather(first, second)
+        assert [response.id for response in responses] == ["block-1", "block-2"]
+        assert client.channel_stats() == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_grpc_client_channel_max_age(grpc_blocking_server):
+    model, port = grpc_blocking_server
+    async with InferenceGRPCClient(
+        f"localhost:{port}", dns_load_balancing=True, channel_max_age_seconds=0.2
+    ) as client:
+        channel = client._channels[0].channel
+        pending = asyncio.create_task(client.infer(make_infer_request("block")))
+        await wait_in_flight(client, 1)
+        await asyncio.sleep(0.2)
+        # The expired channel is replaced, but kept open until its call completes.
+        response = await client.infer(make_infer_request("quick"))
+        assert response.id == "quick"
+        assert client._channels[0].channel is not channel
+        assert [c.channel for c in client._retired_channels] == [channel]
+        model.release.set()
+        assert (await pending).id == "block"
+        assert client._retired_channels == []
+
+
+def test_grpc_client_invalid_channel_selection():
+    with pytest.raises(ValueError, match="Unsupported channel selection random"):
+        InferenceGRPCClient("localhost:8081", channel_selection="random")
+    with pytest.raises(ValueError, match="num_channels must be at least 1"):
+        InferenceGRPCClient("localhost:8081", num_channels=0)
+
+
+@pytest.mark.asyncio
+async def test_predictor_grpc_channels():
+    model = Model(
+        "TestModel",
+        PredictorConfig(
+            "localhost:8081",
+            predictor_protocol="grpc-v2",
+            predictor_grpc_channels=3,
+            predictor_grpc_channel_selection="least_outstanding",
+        ),
+    )
+    assert model._grpc_client.channel_stats() == [0, 0, 0]
+    await model._grpc_client.close()
@@ -0,0 +1,168 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from kserve import InferenceRESTClient
+from kserve.hedging import HedgingPolicy
+from kserve.inference_client import RESTConfig
+from kserve.metrics import HEDGED_REQUESTS, HEDGED_REQUESTS_WON
+
+
+def warmed_up_policy(latency: float = 0.01, **kwargs) -> HedgingPolicy:
+    policy = HedgingPolicy(**kwargs)
+    for _ in range(policy.min_samples):
+        policy.record(latency)
+    return policy
+
+
+def test_delay_percentile():
+    policy = HedgingPolicy(percentile=90, min_samples=10, min_delay_seconds=0.002)
+    for i in range(9):
+        policy.record(i / 1000)
+    assert policy.delay_seconds() is None
+    policy.record(0.1)
+    assert policy.delay_seconds() == pytest.approx(0.0172)
+    policy = HedgingPolicy(min_samples=1, min_delay_seconds=0.05)
+    policy.record(0.001)
+    assert policy.delay_seconds() == 0.05
+    with pytest.raises(ValueError, match="percentile must be in"):
+        HedgingPolicy(percentile=0)
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged():
+    policy = warmed_up_policy()
+    hedged, won = HEDGED_REQUESTS._value.get(), HEDGED_REQUESTS_WON._value.get()
+    cancelled = asyncio.Event()
+
+    async def attempt(number: int):
+        if number == 0:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return number
+
+    assert await asyncio.wait_for(policy.run(attempt), 1) == 1
+    await asyncio.sleep(0)
+    assert cancelled.is_set()
+    assert HEDGED_REQUESTS._value.get() - hedged == 1
+    assert HEDGED_REQUESTS_WON._value.get() - won == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_request_is_not_hedged():
+    policy = warmed_up_policy(latency=1)
+    attempts = []
+
+    async def attempt(number: int):
+        attempts.append(number)
+        return number
+
+    assert await policy.run(attempt) == 0
+    assert attempts == [0]
+    # Requests are not hedged before enough latencies are recorded.
+    policy = HedgingPolicy()
+
+    async def slow_attempt(number: int):
+        attempts.append(number)
+        await asyncio.sleep(0.05)
+        return number
+
+    attempts.clear()
+    assert await policy.run(slow_attempt) == 0
+    assert attempts == [0]
+
+
+@pytest.mark.asyncio
+async def test_failed_attempts():
+    policy = warmed_up_policy(max_hedges=2)
+
+    async def attempt(number: int):
+        await asyncio.sleep(0.02 * (2 - number))
+        if number < 2:
+            raise RuntimeError(f"attempt {number} failed")
+        return number
+
+    # The first successful attempt is used, even if others failed before.
+    assert await policy.run(attempt) == 2
+
+    async def failing_attempt(number: int):
+        await asyncio.sleep(0.015)
+        raise RuntimeError(f"attempt {number} failed")
+
+    with pytest.raises(RuntimeError, match="attempt 0 failed"):
+        await policy.run(failing_attempt)
+
+
+@pytest.mark.asyncio
+async def test_rest_client_hedge_base_urls():
+    app = FastAPI()
+
+    @app.post("/v1/models/TestModel:predict")
+    async def predict(request: Request):
+        if request.url.hostname == "slow-replica":
+            await asyncio.sleep(10)
+        return {"predictions": [request.url.hostname]}
+
+    config = RESTConfig(
+        transport=httpx.ASGITransport(app=app), hedging=warmed_up_policy()
+    )
+    async with InferenceRESTClient(config) as client:
+        response = await asyncio.wait_for(
+            client.infer(
+                "http://slow-replica",
+                {"instances": [1]},
+                model_name="TestModel",
+                hedge_base_urls=["http://fast-replica"],
+            ),
+            1,
+        )
+    assert response == {"predictions": ["fast-replica"]}
+
+
+@pytest.mark.asyncio
+async def test_rest_client_hedged_error_response():
+    app = FastAPI()
+
+    @app.post("/v1/models/TestModel:predict")
+    async def predict(request: Request):
+        if request.url.hostname == "failing-replica":
+            return JSONResponse(status_code=503, content={"error": "unavailable"})
+        await asyncio.sleep(0.1)
+        return {"predictions": [request.url.hostname]}
+
+    policy = warmed_up_policy()
+    config = RESTConfig(transport=httpx.ASGITransport(app=app), hedging=policy)
+    async with InferenceRESTClient(config) as client:
+        # The fast error response of the hedged request does not win over the original request.
+        response = await asyncio.wait_for(
+            client.infer(
+                "http://slow-replica",
+                {"instances": [1]},
+                model_name="TestModel",
+                hedge_base_urls=["http://failing-replica"],
+            ),
+            1,
+        )
+    assert response == {"predictions": ["slow-replica"]}
+    assert len(policy._latencies) == policy.min_samples + 1
+    assert policy._latencies[-1] >= 0.1
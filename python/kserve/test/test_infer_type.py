@@ -15,6 +15,7 @@ import copy
 import json
 
 import numpy as np
+import pandas as pd
 import pytest
 from orjson import orjson
 
@@ -23,12 +24,17 @@ from kserve.errors import InvalidInput
 from kserve.protocol.grpc.grpc_predict_v2_pb2 import (
     ModelInferRequest,
     InferParameter,
+    InferTensorContents,
     ModelInferResponse,
 )
+from kserve.protocol.grpc.servicer import InferenceServicer
 from kserve.protocol.infer_type import (
     serialize_byte_tensor,
+    deserialize_bytes_tensor,
     _contains_fp16_datatype,
+    get_content_numpy,
     RequestedOutput,
+    to_np_dtype,
 )
 from kserve.protocol.rest.v2_datamodels import (
     InferenceRequest,
@@ -37,6 +43,11 @@ from kserve.protocol.rest.v2_datamodels import (
 )
 
 
+def rest_json(response: dict) -> dict:
+    """The JSON content of a REST response dict, with the numpy data serialized by orjson."""
+    return orjson.loads(orjson.dumps(response, option=orjson.OPT_SERIALIZE_NUMPY))
+
+
 class TestInferRequest:
     def test_to_grpc(self):
         infer_req = InferRequest(
@@ -118,6 +129,81 @@ class TestInferRequest:
         res = infer_req.to_grpc()
         assert res == expected
 
+    def test_to_grpc_with_raw_inputs(self):
+        data = np.array([[1, 2], [3, 4]], dtype=np.int64)
+        infer_input = InferInput(name="input1", shape=[2, 2], datatype="INT64")
+        infer_input.set_data_from_numpy(data, binary_data=True)
+        rest_request, json_length = InferRequest(
+            model_name="test_model", infer_inputs=[infer_input]
+        ).to_rest()
+        lazy_request = InferRequest.from_bytes(rest_request, json_length, "test_model")
+        list_input = InferInput(
+            name="input2", shape=[2], datatype="FP32", data=[1.5, 2.5]
+        )
+        infer_request = InferRequest(
+            model_name="test_model",
+            infer_inputs=[lazy_request.inputs[0], list_input],
+        )
+
+        grpc_request = infer_request.to_grpc()
+        assert grpc_request.raw_input_contents == [
+            data.tobytes(),
+            np.array([1.5, 2.5], dtype=np.float32).tobytes(),
+        ]
+        InferenceServicer.validate_grpc_request(grpc_request)
+        # The binary data received with the REST request is not decoded.
+        assert lazy_request.inputs[0]._lazy_data
+
+        list_input = InferInput(
+            name="input2", shape=[2], datatype="FP32", data=[1.5, 2.5]
+        )
+        infer_request = InferRequest(model_name="test_model", infer_inputs=[list_input])
+        assert infer_request.to_grpc().raw_input_contents == []
+        assert infer_request.to_grpc(use_raw_inputs=True).raw_input_contents == [
+            np.array([1.5, 2.5], dtype=np.float32).tobytes()
+        ]
+
+    def test_as_dataframe(self):
+        fp32_input = InferInput(name="fp32_input", shape=[3, 1], datatype="FP32")
+        fp32_input.set_data_from_numpy(
+            np.array([[1.5], [2.5], [3.5]], dtype=np.float32), binary_data=True
+        )
+        infer_request = InferRequest(
+            model_name="test_model",
+            infer_inputs=[
+                fp32_input,
+                InferInput(
+                    name="str_input", shape=[3], datatype="BYTES", data=[b"a", "b", "c"]
+                ),
+                InferInput(name="int_input", shape=[2], datatype="INT64", data=[1, 2]),
+            ],
+        )
+        expected = pd.DataFrame(
+            {
+                "fp32_input": np.array([1.5, 2.5, 3.5], dtype=np.float32),
+                "str_input": ["a", "b", "c"],
+                "int_input": [1.0, 2.0, np.nan],
+            }
+        )
+        pd.testing.assert_frame_equal(infer_request.as_dataframe(), expected)
+
+    def test_use_binary_outputs_grpc_parameter(self):
+        grpc_request = ModelInferRequest(
+            model_name="test_model",
+            inputs=[
+                {
+                    "name": "input1",
+                    "shape": [1],
+                    "datatype": "INT32",
+                    "contents": {"int_contents": [1]},
+                }
+            ],
+            parameters={"binary_data_output": InferParameter(bool_param=True)},
+        )
+        assert InferRequest.from_grpc(grpc_request).use_binary_outputs
+        grpc_request.parameters["binary_data_output"].bool_param = False
+        assert not InferRequest.from_grpc(grpc_request).use_binary_outputs
+
     def test_from_grpc(self):
         infer_req = ModelInferRequest(
             model_name="TestModel",
@@ -507,6 +593,36 @@ class TestInferRequest:
         )
         assert expected == infer_request_from_bytes
 
+    def test_infer_request_from_bytes_zero_copy(self):
+        data = np.arange(6, dtype=np.float32).reshape(2, 3)
+        infer_input = InferInput(name="input1", shape=[2, 3], datatype="FP32")
+        infer_input.set_data_from_numpy(data, binary_data=True)
+        infer_request = InferRequest(
+            request_id="abc", model_name="test_model", infer_inputs=[infer_input]
+        )
+        infer_request_bytes, json_length = infer_request.to_rest()
+        infer_request_from_bytes = InferRequest.from_bytes(
+            infer_request_bytes, json_length, "test_model"
+        )
+        infer_input = infer_request_from_bytes.inputs[0]
+        np_array = infer_input.as_numpy()
+        np.testing.assert_array_equal(np_array, data)
+        # The numpy array is a read-only view over the request bytes
+        assert not np_array.flags.owndata
+        assert not np_array.flags.writeable
+        assert infer_input._data is None
+
+        # Forwarding the request keeps the binary data
+        forwarded_bytes, forwarded_json_length = infer_request_from_bytes.to_rest()
+        assert forwarded_bytes[forwarded_json_length:] == data.tobytes()
+        copied = copy.deepcopy(infer_request_from_bytes)
+        np.testing.assert_array_equal(copied.inputs[0].as_numpy(), data)
+
+        # The data is decoded to the JSON compatible list on access
+        assert infer_input.data == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+        assert infer_input._raw_data is None
+        assert "binary_data_size" not in infer_input.parameters
+
     def test_infer_request_from_bytes_invalid_json(self):
         with pytest.raises(InvalidInput):
             InferRequest.from_bytes(
@@ -787,7 +903,9 @@ class TestInferResponse:
 
         result, json_length = infer_response.to_rest()
         assert isinstance(result, dict)
-        assert result == {
+        # The numpy data is kept as an array and serialized natively by orjson.
+        assert isinstance(result["outputs"][2]["data"], np.ndarray)
+        assert rest_json(result) == {
             "id": "1",
             "model_name": "test_model",
             "model_version": None,
@@ -964,7 +1082,7 @@ class TestInferResponse:
             infer_outputs=[infer_output],
         )
         infer_response, json_length = infer_request.to_rest()
-        assert infer_response == {
+        assert rest_json(infer_response) == {
             "id": "4be4e82f-5500-420a-a5c5-ac86841e271b",
             "model_name": "test_model",
             "model_version": None,
@@ -1046,6 +1164,80 @@ class TestInferResponse:
         assert infer_response.outputs[0].datatype == "BYTES"
         assert infer_response.outputs[0].data == ["cat", "dog", "bird", "fish"]
 
+    def test_infer_response_from_bytes_zero_copy(self):
+        data = np.array([[1, 2], [3, 4]], dtype=np.int64)
+        infer_output = InferOutput(name="output1", shape=[2, 2], datatype="INT64")
+        infer_output.set_data_from_numpy(data, binary_data=True)
+        infer_response = InferResponse(
+            response_id="1",
+            model_name="test_model",
+            infer_outputs=[infer_output],
+            use_binary_outputs=True,
+        )
+        response_bytes, json_length = infer_response.to_rest()
+        infer_response = InferResponse.from_bytes(response_bytes, json_length)
+        np_array = infer_response.outputs[0].as_numpy()
+        np.testing.assert_array_equal(np_array, data)
+        assert not np_array.flags.owndata
+
+        grpc_response = infer_response.to_grpc()
+        assert grpc_response.raw_output_contents[0] == data.tobytes()
+        assert not grpc_response.outputs[0].HasField("contents")
+        assert infer_response.outputs[0].data == [1, 2, 3, 4]
+
+    def test_to_grpc_with_raw_outputs(self):
+        data = np.array([[1.5, 2.5], [3.5, 4.5]], dtype=np.float32)
+        list_output = InferOutput(name="output1", shape=[2, 2], datatype="FP32")
+        list_output.set_data_from_numpy(data, binary_data=False)
+        typed_response = ModelInferResponse(
+            model_name="test_model",
+            outputs=[
+                {
+                    "name": "output2",
+                    "shape": [2],
+                    "datatype": "INT32",
+                    "contents": {"int_contents": [1, 2]},
+                }
+            ],
+        )
+        numpy_output = InferResponse.from_grpc(typed_response).outputs[0]
+        infer_response = InferResponse(
+            response_id="1",
+            model_name="test_model",
+            infer_outputs=[list_output, numpy_output],
+        )
+
+        grpc_response = infer_response.to_grpc(use_raw_outputs=True)
+        assert grpc_response.raw_output_contents == [
+            data.tobytes(),
+            np.array([1, 2], dtype=np.int32).tobytes(),
+        ]
+        for output in grpc_response.outputs:
+            assert not output.HasField("contents")
+        np.testing.assert_array_equal(
+            InferResponse.from_grpc(grpc_response).outputs[0].as_numpy(), data
+        )
+
+    def test_to_grpc_with_mixed_binary_data(self):
+        data = np.array([1, 2], dtype=np.int64)
+        binary_output = InferOutput(name="output1", shape=[2], datatype="INT64")
+        binary_output.set_data_from_numpy(data, binary_data=True)
+        list_output = InferOutput(
+            name="output2", shape=[1], datatype="BYTES", data=["foo"]
+        )
+        infer_response = InferResponse(
+            response_id="1",
+            model_name="test_model",
+            infer_outputs=[binary_output, list_output],
+        )
+
+        # gRPC does not allow mixing raw and typed contents.
+        grpc_response = infer_response.to_grpc()
+        assert grpc_response.raw_output_contents == [
+            data.tobytes(),
+            serialize_byte_tensor(np.array([b"foo"], dtype=np.object_)).item(),
+        ]
+
     def test_infer_response_from_bytes_with_missing_data(self):
         response_bytes = b'{"id": "1", "model_name": "test_model", "outputs": [{"name": "output1", "shape": [1], "datatype": "INT32"}]}'
         json_length = len(response_bytes)
@@ -1117,3 +1309,180 @@ def test_contains_fp16_datatype_with_no_outputs():
     )
 
     assert _contains_fp16_datatype(infer_response) is False
+
+
+@pytest.mark.parametrize(
+    "input_tensor",
+    [
+        np.array([b"cat", b"", "dog", 12, b"\x00\xff"], dtype=np.object_),
+        np.array([[b"a", b"bc"], [b"def", b"ghij"]], dtype=np.bytes_),
+        np.array([["été", "x"]], dtype=np.object_),
+    ],
+)
+def test_serialize_byte_tensor_roundtrip(input_tensor):
+    expected = b""
+    for obj in input_tensor.flatten():
+        if not isinstance(obj, bytes):
+            obj = str(obj).encode("utf-8")
+        expected += len(obj).to_bytes(4, "little") + obj
+    serialized = serialize_byte_tensor(input_tensor).item()
+    assert serialized == expected
+    deserialized = deserialize_bytes_tensor(memoryview(serialized))
+    assert deserialized.dtype == np.object_
+    assert deserialized.tolist() == [
+        obj if isinstance(obj, bytes) else str(obj).encode("utf-8")
+        for obj in input_tensor.flatten()
+    ]
+
+
+def test_serialize_byte_tensor_empty():
+    assert serialize_byte_tensor(np.array([], dtype=np.object_)).size == 0
+    assert deserialize_bytes_tensor(b"").shape == (0,)
+
+
+@pytest.mark.parametrize(
+    "encoded,match",
+    [
+        (b"\x05\x00\x00\x00abc", "element length exceeds the buffer"),
+        (b"\x01\x00\x00\x00a\x02\x00", "truncated element length"),
+        (b"\xff\xff\xff\xffabc", "element length exceeds the buffer"),
+    ],
+)
+def test_deserialize_bytes_tensor_truncated(encoded, match):
+    with pytest.raises(InvalidInput, match=match):
+        deserialize_bytes_tensor(encoded)
+
+
+@pytest.mark.parametrize(
+    "datatype,field,values",
+    [
+        ("BOOL", "bool_contents", [True, False, True, True]),
+        ("UINT8", "uint_contents", [0, 1, 254, 255]),
+        ("INT32", "int_contents", [-3, 0, 2, 2**31 - 1]),
+        ("INT64", "int64_contents", [-(2**40), 0, 1, 2**40]),
+        ("FP32", "fp32_contents", [0.5, -1.25, 3.0, 8.5]),
+        ("FP64", "fp64_contents", [0.1, -1.5, 1e300, 2.0]),
+        ("BYTES", "bytes_contents", [b"a", b"", b"ccc", b"dd"]),
+    ],
+)
+def test_from_grpc_decodes_contents_to_numpy(datatype, field, values):
+    infer_req = ModelInferRequest(
+        model_name="TestModel",
+        inputs=[
+            {
+                "name": "input-0",
+                "shape": [2, 2],
+                "datatype": datatype,
+                "contents": {field: values},
+            }
+        ],
+    )
+    infer_input = InferRequest.from_grpc(infer_req).inputs[0]
+
+    np_array = infer_input.as_numpy()
+    assert np_array.dtype == to_np_dtype(datatype)
+    assert np_array.shape == (2, 2)
+    expected = np.empty(len(values), dtype=to_np_dtype(datatype))
+    expected[:] = values
+    np.testing.assert_array_equal(np_array, expected.reshape(2, 2))
+    # The list representation is only built on demand
+    assert infer_input._data is None
+    assert infer_input.data == list(expected)
+
+    infer_res = ModelInferResponse(
+        model_name="TestModel",
+        outputs=[
+            {
+                "name": "output-0",
+                "shape": [4],
+                "datatype": datatype,
+                "contents": {field: values},
+            }
+        ],
+    )
+    infer_output = InferResponse.from_grpc(infer_res).outputs[0]
+    np.testing.assert_array_equal(infer_output.as_numpy(), expected)
+    assert infer_output.data == list(expected)
+
+
+def test_get_content_numpy_invalid_datatype():
+    with pytest.raises(InvalidInput):
+        get_content_numpy("FOO", InferTensorContents())
+
+
+def test_grpc_request_to_rest():
+    # A gRPC request forwarded by a transformer to a REST predictor.
+    grpc_request = ModelInferRequest(
+        model_name="test_model",
+        id="1",
+        inputs=[
+            {
+                "name": "input-0",
+                "shape": [2, 2],
+                "datatype": "FP32",
+                "contents": {"fp32_contents": [1.5, 2.5, 3.5, 4.5]},
+            },
+            {
+                "name": "input-1",
+                "shape": [2],
+                "datatype": "INT64",
+                "contents": {"int64_contents": [1, 2]},
+            },
+        ],
+    )
+    rest_request, json_length = InferRequest.from_grpc(grpc_request).to_rest()
+    assert json_length is None
+    assert rest_request["inputs"] == [
+        {
+            "name": "input-0",
+            "shape": [2, 2],
+            "datatype": "FP32",
+            "data": [1.5, 2.5, 3.5, 4.5],
+        },
+        {"name": "input-1", "shape": [2], "datatype": "INT64", "data": [1, 2]},
+    ]
+    infer_request = InferRequest.from_bytes(
+        orjson.dumps(rest_request), len(orjson.dumps(rest_request)), "test_model"
+    )
+    np.testing.assert_array_equal(
+        infer_request.inputs[0].as_numpy(),
+        np.array([[1.5, 2.5], [3.5, 4.5]], dtype=np.float32),
+    )
+
+
+def test_grpc_response_to_rest():
+    # A gRPC predictor response returned by a transformer to a REST client.
+    grpc_response = ModelInferResponse(
+        model_name="test_model",
+        id="1",
+        outputs=[
+            {
+                "name": "output-0",
+                "shape": [2, 2],
+                "datatype": "INT32",
+                "contents": {"int_contents": [1, 2, 3, 4]},
+            },
+            {
+                "name": "output-1",
+                "shape": [1],
+                "datatype": "BYTES",
+                "contents": {"bytes_contents": [b"foo"]},
+            },
+        ],
+    )
+    rest_response, json_length = InferResponse.from_grpc(grpc_response).to_rest()
+    assert json_length is None
+    assert rest_json(rest_response)["outputs"] == [
+        {
+            "name": "output-0",
+            "shape": [2, 2],
+            "datatype": "INT32",
+            "data": [1, 2, 3, 4],
+        },
+        {"name": "output-1", "shape": [1], "datatype": "BYTES", "data": ["foo"]},
+    ]
+    body = orjson.dumps(rest_response, option=orjson.OPT_SERIALIZE_NUMPY)
+    np.testing.assert_array_equal(
+        InferResponse.from_bytes(body, len(body)).outputs[0].as_numpy(),
+        np.array([[1, 2], [3, 4]]),
+    )
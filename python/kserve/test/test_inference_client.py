@@ -12,17 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import re
+from unittest import mock
 
 import httpx
 import numpy as np
 import pytest
 import pytest_asyncio
 
-from kserve import ModelServer, InferenceRESTClient, InferRequest, InferInput
+from prometheus_client import REGISTRY
+
+from kserve import ModelServer, InferenceRESTClient, InferRequest, InferInput, Model
 from kserve.model_server import app as kserve_app
 from kserve.errors import UnsupportedProtocol
-from kserve.inference_client import RESTConfig
+from kserve.inference_client import ConnectionPoolStats, RESTConfig
+from kserve.model import PredictorConfig
 from kserve.protocol.infer_type import RequestedOutput
 from kserve.protocol.rest.server import RESTServer
 from test.test_server import DummyModel
@@ -557,3 +562,133 @@ class TestInferenceRESTClient:
                     headers={"Host": "test-server.com"},
                     timeout=2,
                 )
+
+
+@pytest_asyncio.fixture
+async def slow_server():
+    release = asyncio.Event()
+
+    async def handle(reader, writer):
+        # Answers the requests of a connection once released.
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                await release.wait()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+                    b"content-length: 2\r\n\r\n{}"
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(handle, "localhost", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f"http://localhost:{port}", release
+    release.set()
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_rest_client_connection_pool(slow_server):
+    url, release = slow_server
+    config = RESTConfig(max_connections=1, max_keepalive_connections=1)
+    async with InferenceRESTClient(config) as client:
+        assert client.pool_stats() == ConnectionPoolStats(0, 0)
+        requests = [
+            asyncio.create_task(client._client.get(f"{url}/v2/health/live"))
+            for _ in range(4)
+        ]
+        await asyncio.sleep(0.1)
+        assert client.pool_stats() == ConnectionPoolStats(
+            active_requests=1, waiting_requests=3
+        )
+        # A cancelled request no longer waits.
+        requests.pop().cancel()
+        await asyncio.sleep(0.05)
+        assert client.pool_stats() == ConnectionPoolStats(
+            active_requests=1, waiting_requests=2
+        )
+        release.set()
+        await asyncio.gather(*requests)
+        assert client.pool_stats() == ConnectionPoolStats(0, 0)
+        # A streamed response holds its connection until it is closed.
+        async with client._client.stream("GET", f"{url}/v2/health/live"):
+            assert client.pool_stats() == ConnectionPoolStats(
+                active_requests=1, waiting_requests=0
+            )
+        assert client.pool_stats() == ConnectionPoolStats(0, 0)
+
+
+@pytest.mark.asyncio
+async def test_rest_client_custom_transport_pool_stats():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+    async with InferenceRESTClient(
+        RESTConfig(transport=transport, max_connections=1)
+    ) as client:
+        response = await client._client.get("http://localhost/v2/health/live")
+        assert response.status_code == 200
+        assert client.pool_stats() == ConnectionPoolStats(0, 0)
+
+
+@pytest.mark.asyncio
+async def test_rest_client_pool_timeout(slow_server):
+    url, release = slow_server
+    config = RESTConfig(max_connections=1, pool_timeout=0.1)
+    async with InferenceRESTClient(config) as client:
+        pending = asyncio.create_task(client._client.get(f"{url}/v2/health/live"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(httpx.PoolTimeout):
+            await client._client.get(f"{url}/v2/health/live")
+        release.set()
+        assert (await pending).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_predictor_connection_pool_metrics(slow_server):
+    url, release = slow_server
+    model = Model(
+        "PoolModel",
+        PredictorConfig(
+            url.removeprefix("http://"),
+            predictor_protocol="v1",
+            predictor_max_connections=1,
+            predictor_keepalive_expiry_seconds=30,
+        ),
+    )
+    config = model._http_client._config
+    assert config.max_connections == 1
+    assert config.keepalive_expiry == 30
+
+    def sample(name: str) -> float:
+        return REGISTRY.get_sample_value(name, {"model_name": "PoolModel"})
+
+    requests = [
+        asyncio.create_task(model._http_predict({"instances": [1]})) for _ in range(2)
+    ]
+    await asyncio.sleep(0.1)
+    # The gauges are set when a call starts, so the third call records the first one in flight and
+    # the second one waiting for the connection.
+    requests.append(asyncio.create_task(model._http_predict({"instances": [1]})))
+    await asyncio.sleep(0.1)
+    assert sample("predictor_client_active_requests") == 1
+    assert sample("predictor_client_waiting_requests") == 1
+    release.set()
+    await asyncio.gather(*requests)
+    assert sample("predictor_client_active_requests") == 0
+    assert sample("predictor_client_waiting_requests") == 0
+    await model._http_client.close()
+
+
+def test_rest_client_http2():
+    pytest.importorskip("h2")
+    client = InferenceRESTClient(RESTConfig(http2=True))
+    assert client._client._transport._transport._pool._http2
+
+
+def test_predictor_http2_requires_h2():
+    with mock.patch.dict("sys.modules", {"h2": None}):
+        with pytest.raises(
+            ImportError, match="predictor_http2 requires the h2 package"
+        ):
+            PredictorConfig("localhost", predictor_http2=True)
@@ -88,3 +88,79 @@ async def test_is_model_ready_openai_model():
 
     actual = await repo.is_model_ready("openai-model")
     assert actual is True
+
+
+@pytest.mark.asyncio
+async def test_is_model_ready_cached():
+    repo = ModelRepository(readiness_cache_ttl_seconds=60)
+    model = Model(name="kserve-model")
+    repo.update(model)
+    with patch.object(model, "healthy"):
+        model.healthy.side_effect = lambda: model.ready
+        assert await repo.is_model_ready("kserve-model") is False
+        model.load()
+        # The cached result is returned until it is invalidated
+        assert await repo.is_model_ready("kserve-model") is False
+        assert model.healthy.call_count == 1
+        repo.invalidate_readiness("kserve-model")
+        assert await repo.is_model_ready("kserve-model") is True
+        assert await repo.is_model_ready("kserve-model") is True
+        assert model.healthy.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_is_model_ready_cache_expired():
+    repo = ModelRepository(readiness_cache_ttl_seconds=60)
+    model = Model(name="kserve-model")
+    repo.update(model)
+    with patch.object(model, "healthy"):
+        model.healthy.side_effect = lambda: model.ready
+        with patch("kserve.model_repository.time.monotonic", return_value=100):
+            assert await repo.is_model_ready("kserve-model") is False
+        model.load()
+        with patch("kserve.model_repository.time.monotonic", return_value=130):
+            assert await repo.is_model_ready("kserve-model") is False
+        with patch("kserve.model_repository.time.monotonic", return_value=161):
+            assert await repo.is_model_ready("kserve-model") is True
+        assert model.healthy.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_readiness_cache_invalidated_on_update_and_unload():
+    repo = ModelRepository(readiness_cache_ttl_seconds=60)
+    model = Model(name="kserve-model")
+    model.load()
+    repo.update(model)
+    assert await repo.is_model_ready("kserve-model") is True
+    repo.unload("kserve-model")
+    assert await repo.is_model_ready("kserve-model") is False
+    new_model = Model(name="kserve-model")
+    repo.update(model)
+    repo.update(new_model)
+    assert await repo.is_model_ready("kserve-model") is False
+
+
+@pytest.mark.asyncio
+async def test_refresh_readiness():
+    repo = ModelRepository(readiness_cache_ttl_seconds=60)
+    model = Model(name="kserve-model")
+    repo.update(model)
+    assert await repo.is_model_ready("kserve-model") is False
+    model.load()
+    await repo.refresh_readiness()
+    with patch.object(model, "healthy") as healthy:
+        assert await repo.is_model_ready("kserve-model") is True
+        healthy.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_refresh_readiness_health_check_error():
+    repo = ModelRepository(readiness_cache_ttl_seconds=60)
+    model = Model(name="kserve-model")
+    model.load()
+    repo.update(model)
+    await repo.refresh_readiness()
+    with patch.object(model, "healthy", side_effect=RuntimeError("unhealthy")):
+        await repo.refresh_readiness()
+        with pytest.raises(RuntimeError):
+            await repo.is_model_ready("kserve-model")
@@ -12,8 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+from unittest import mock
+
+import numpy as np
 import pytest
-from kserve import ModelServer
+from prometheus_client import REGISTRY
+
+from kserve import InferInput, InferRequest, InferResponse, Model, ModelServer
+from kserve.errors import InferenceError, InvalidInput, ModelNotFound
+from kserve.model import PredictorConfig
+from kserve.supervisor import PROMETHEUS_MULTIPROC_DIR_ENV
 
 UNKNOWN_MODEL_TYPE_ERR_MESSAGE = "Unknown model collection type"
 
@@ -25,3 +34,139 @@ def test_model_server_start_no_models():
         server.start(models=None)
 
     assert exc.value.args[0] == UNKNOWN_MODEL_TYPE_ERR_MESSAGE
+
+
+class StartCountingModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+        self.starts = 0
+
+    def start(self):
+        self.starts += 1
+
+
+def test_workers_without_prefork_serve_in_single_process():
+    server = ModelServer(workers=2, enable_prefork=False)
+    model = StartCountingModel("model")
+    with mock.patch.object(
+        ModelServer, "_serve", new=mock.AsyncMock()
+    ) as serve, mock.patch("kserve.model_server.WorkerSupervisor") as supervisor:
+        server.start([model])
+    supervisor.assert_not_called()
+    serve.assert_awaited_once()
+    assert model.starts == 1
+
+
+def test_prefork_starts_models_in_workers():
+    server = ModelServer(workers=2, enable_prefork=True)
+    model = StartCountingModel("model")
+
+    def run_first_worker(target, workers):
+        def run():
+            assert model.starts == 0
+            target(0)
+
+        return mock.Mock(run=run)
+
+    with mock.patch.dict(os.environ), mock.patch.object(
+        ModelServer, "_serve", new=mock.AsyncMock()
+    ), mock.patch(
+        "kserve.model_server.WorkerSupervisor", side_effect=run_first_worker
+    ), mock.patch(
+        "kserve.model_server.check_no_running_threads"
+    ) as check_threads, mock.patch(
+        "kserve.model_server.logger"
+    ) as logger:
+        os.environ.pop(PROMETHEUS_MULTIPROC_DIR_ENV, None)
+        server.start([model])
+    check_threads.assert_called_once()
+    assert model.starts == 1
+    # The multiprocess mode was not enabled when kserve was imported.
+    assert any(
+        PROMETHEUS_MULTIPROC_DIR_ENV in call.args[0]
+        for call in logger.warning.call_args_list
+    )
+    with pytest.raises(InvalidInput, match="not supported with pre-forked workers"):
+        server.dataplane.shared_memory_registry.register("region", "/key", 8)
+
+
+class IdentityPredictor(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+        self.payloads = []
+
+    async def predict(self, payload, headers=None):
+        self.payloads.append(payload)
+        if isinstance(payload, dict):
+            return {"predictions": payload["instances"]}
+        return InferResponse(
+            response_id=payload.id, model_name=self.name, infer_outputs=payload.inputs
+        )
+
+
+class IncrementTransformer(Model):
+    def __init__(self, name, predictor_host):
+        super().__init__(name, PredictorConfig(predictor_host, "v2"))
+        self.ready = True
+        self.payloads = []
+
+    def preprocess(self, payload, headers=None):
+        if isinstance(payload, InferRequest):
+            data = payload.inputs[0].as_numpy() + 1
+            payload.inputs[0].set_data_from_numpy(data)
+        self.payloads.append(payload)
+        return payload
+
+
+def predict_count(model_name: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "request_predict_seconds_count", {"model_name": model_name}
+        )
+        or 0
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_predictor():
+    server = ModelServer()
+    predictor = IdentityPredictor("predictor")
+    transformer = IncrementTransformer("transformer", "local://predictor")
+    server.register_model(transformer)
+    server.register_model(predictor)
+    counts = predict_count("transformer"), predict_count("predictor")
+
+    infer_input = InferInput("input-0", [1, 2], "INT32")
+    infer_input.set_data_from_numpy(np.array([[1, 2]], dtype=np.int32))
+    request = InferRequest(
+        model_name="transformer", infer_inputs=[infer_input], request_id="1"
+    )
+    response, _ = await server.dataplane.infer("transformer", request)
+    np.testing.assert_array_equal(response.outputs[0].as_numpy(), [[2, 3]])
+    # The payload is passed to the predictor without serialization.
+    assert predictor.payloads[0] is transformer.payloads[0]
+    assert predict_count("transformer") - counts[0] == 1
+    assert predict_count("predictor") - counts[1] == 1
+
+    response, _ = await server.dataplane.infer("transformer", {"instances": [[1, 2]]})
+    assert response == {"predictions": [[1, 2]]}
+
+
+@pytest.mark.asyncio
+async def test_local_predictor_errors():
+    server = ModelServer()
+    transformer = IncrementTransformer("transformer", "local://transformer")
+    server.register_model(transformer)
+    with pytest.raises(InferenceError, match="can not be the model itself"):
+        await server.dataplane.infer("transformer", {"instances": [1]})
+
+    transformer = IncrementTransformer("transformer", "local://missing")
+    server.register_model(transformer)
+    with pytest.raises(ModelNotFound):
+        await server.dataplane.infer("transformer", {"instances": [1]})
+
+    transformer = IncrementTransformer("transformer", "local://predictor")
+    with pytest.raises(InferenceError, match="must be registered in a model server"):
+        await transformer({"instances": [1]})
@@ -24,6 +24,7 @@ import avro.io
 import avro.schema
 import httpx
 import numpy as np
+import orjson
 import pandas as pd
 import pytest
 import pytest_asyncio
@@ -33,8 +34,11 @@ from fastapi.testclient import TestClient
 from ray import serve
 
 from kserve import Model, ModelRepository, ModelServer
-from kserve.constants.constants import INFERENCE_CONTENT_LENGTH_HEADER
-from kserve.errors import InvalidInput, NoModelReady
+from kserve.constants.constants import (
+    ARROW_STREAM_CONTENT_TYPE,
+    INFERENCE_CONTENT_LENGTH_HEADER,
+)
+from kserve.errors import InferenceError, InvalidInput, NoModelReady
 from kserve.model import PredictorProtocol
 from kserve.model_server import app as kserve_app
 from kserve.ray import RayModel
@@ -47,6 +51,8 @@ from kserve.protocol.infer_type import (
 )
 from kserve.protocol.rest.server import RESTServer
 from kserve.protocol.rest.v2_datamodels import is_pydantic_2
+from kserve.protocol.rest.v1_endpoints import NumpyJSONResponse
+from kserve.protocol.rest.v2_endpoints import _serialize_inference_response
 from kserve.utils.utils import get_predict_input, get_predict_response
 
 test_avsc_schema = """
@@ -176,6 +182,30 @@ class DummyModel(Model):
             return {"predictions": request["instances"]}
 
 
+class DummyTabularModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+
+    def predict(self, payload, headers=None):
+        inputs = get_predict_input(payload)
+        return get_predict_response(payload, np.asarray(inputs).sum(axis=1), self.name)
+
+
+def arrow_stream(table) -> bytes:
+    pa = pytest.importorskip("pyarrow")
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def read_arrow_stream(body: bytes):
+    pa = pytest.importorskip("pyarrow")
+    with pa.ipc.open_stream(pa.py_buffer(body)) as reader:
+        return reader.read_all()
+
+
 @serve.deployment
 class DummyServeModel(Model):
     async def predict(self, request, headers=None):
@@ -431,6 +461,210 @@ class TestV1Endpoints:
         assert resp.status_code == 200
         assert resp.content is not None
 
+    def test_numpy_json_response(self):
+        result = np.array([[0.25, 0.75], [0.5, 0.5]])
+        content = {
+            "predictions": result,
+            "transposed": result.T,
+            "fp16": result.astype(np.float16),
+            "scalar": np.int64(1),
+            "frame": pd.DataFrame({"a": [1, 2], "b": [0.5, 1.5]}),
+        }
+        assert orjson.loads(NumpyJSONResponse(content).body) == {
+            "predictions": [[0.25, 0.75], [0.5, 0.5]],
+            "transposed": [[0.25, 0.5], [0.75, 0.5]],
+            "fp16": [[0.25, 0.75], [0.5, 0.5]],
+            "scalar": 1,
+            "frame": [{"a": 1, "b": 0.5}, {"a": 2, "b": 1.5}],
+        }
+
+
+class ArrayModel(Model):
+    """Returns the numpy or pandas result of predict in the response dict, without converting it."""
+
+    def __init__(self, name, as_frame=False):
+        super().__init__(name)
+        self.as_frame = as_frame
+        self.ready = True
+
+    def predict(self, payload, headers=None):
+        inputs = get_predict_input(payload)
+        result = np.asarray(inputs).sum(axis=1)
+        if self.as_frame:
+            result = pd.DataFrame({"sum": result, "label": ["a"] * len(result)})
+        return {"predictions": result}
+
+
+class TestV1PredictResponse:
+    @pytest.fixture(scope="class")
+    def server(self):
+        server = ModelServer(registered_models=ModelRepository())
+        rest_server = RESTServer(
+            kserve_app, server.dataplane, server.model_repository_extension
+        )
+        rest_server.create_application()
+        server.register_model(ArrayModel("ArrayModel"))
+        server.register_model(ArrayModel("FrameModel", as_frame=True))
+        yield server
+        kserve_app.routes.clear()
+
+    @pytest.fixture(scope="class")
+    def http_server_client(self, server):
+        return TestClient(kserve_app)
+
+    def test_array_result(self, server, http_server_client):
+        resp = http_server_client.post(
+            "/v1/models/ArrayModel:predict", content=b'{"instances":[[1,2],[3,4]]}'
+        )
+        assert resp.status_code == 200
+        assert resp.content == b'{"predictions":[3,7]}'
+
+    def test_dataframe_result(self, server, http_server_client):
+        resp = http_server_client.post(
+            "/v1/models/FrameModel:predict", content=b'{"instances":[[1,2],[3,4]]}'
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {
+            "predictions": [{"sum": 3, "label": "a"}, {"sum": 7, "label": "a"}]
+        }
+
+    def test_get_predict_response_v1(self):
+        # The predictions are returned as JSON native lists to the postprocess handlers.
+        result = pd.DataFrame({"a": [1, 2], "b": [0.5, 1.5]})
+        response = get_predict_response({"instances": [[1], [2]]}, result, "TestModel")
+        assert response == {"predictions": [{"a": 1, "b": 0.5}, {"a": 2, "b": 1.5}]}
+        response = get_predict_response(
+            {"instances": [[1], [2]]}, np.array([[1.5], [2.5]]), "TestModel"
+        )
+        assert response == {"predictions": [[1.5], [2.5]]}
+        assert isinstance(response["predictions"], list)
+
+    @pytest.mark.parametrize("binary", [False, True])
+    def test_cloudevent_array_result(self, http_server_client, binary):
+        event = dummy_cloud_event({"instances": [[1, 2], [3, 4]]})
+        headers, body = to_binary(event) if binary else to_structured(event)
+        resp = http_server_client.post(
+            "/v1/models/ArrayModel:predict", headers=headers, content=body
+        )
+        assert resp.status_code == 200
+        body = json.loads(resp.content)
+        assert (body if binary else body["data"]) == {"predictions": [3, 7]}
+
+
+class TestArrowEndpoints:
+    @pytest.fixture(scope="class")
+    def server(self):
+        server = ModelServer(registered_models=ModelRepository())
+        rest_server = RESTServer(
+            kserve_app, server.dataplane, server.model_repository_extension
+        )
+        rest_server.create_application()
+        yield server
+        kserve_app.routes.clear()
+
+    @pytest_asyncio.fixture(scope="class")
+    async def app(self, server):
+        server.register_model(DummyTabularModel("TabularModel"))
+        yield kserve_app
+        await server.model_repository_extension.unload("TabularModel")
+
+    @pytest.fixture(scope="class")
+    def http_server_client(self, app):
+        return TestClient(app, headers={"content-type": ARROW_STREAM_CONTENT_TYPE})
+
+    @pytest.fixture(scope="class")
+    def table(self):
+        pa = pytest.importorskip("pyarrow")
+        return pa.table({"a": [1.0, 2.0, 3.0], "b": [10.0, 20.0, 30.0]})
+
+    def test_predict_arrow_v1(self, http_server_client, table):
+        resp = http_server_client.post(
+            "/v1/models/TabularModel:predict", content=arrow_stream(table)
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == ARROW_STREAM_CONTENT_TYPE
+        result = read_arrow_stream(resp.content)
+        assert result.column_names == ["predictions"]
+        assert result["predictions"].to_pylist() == [11.0, 22.0, 33.0]
+
+    def test_predict_arrow_v1_json_response(self, http_server_client, table):
+        resp = http_server_client.post(
+            "/v1/models/TabularModel:predict",
+            content=arrow_stream(table),
+            headers={"accept": "application/json"},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/json"
+        assert resp.json() == {"predictions": [11.0, 22.0, 33.0]}
+
+    def test_predict_arrow_v1_tensor(self, http_server_client):
+        pa = pytest.importorskip("pyarrow")
+        values = pa.array(np.arange(6, dtype=np.float32))
+        table = pa.table({"x": pa.FixedSizeListArray.from_arrays(values, 3)})
+        resp = http_server_client.post(
+            "/v1/models/TabularModel:predict", content=arrow_stream(table)
+        )
+        assert resp.status_code == 200
+        result = read_arrow_stream(resp.content)
+        assert result["predictions"].to_pylist() == [3.0, 12.0]
+
+    def test_predict_arrow_v1_invalid_stream(self, http_server_client):
+        pytest.importorskip("pyarrow")
+        resp = http_server_client.post(
+            "/v1/models/TabularModel:predict", content=b"not an arrow stream"
+        )
+        assert resp.status_code == 400
+        assert "Failed to decode Arrow IPC stream" in resp.json()["error"]
+
+    def test_infer_arrow_v2(self, http_server_client, table):
+        resp = http_server_client.post(
+            "/v2/models/TabularModel/infer", content=arrow_stream(table)
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == ARROW_STREAM_CONTENT_TYPE
+        result = read_arrow_stream(resp.content)
+        assert result.schema.metadata[b"model_name"] == b"TabularModel"
+        assert result.column_names == ["output-0"]
+        assert result["output-0"].to_pylist() == [11.0, 22.0, 33.0]
+
+    def test_infer_json_v2_arrow_response(self, http_server_client):
+        input_data = b'{"inputs": [{"name": "input-0","shape": [2, 2],"datatype": "INT32","data": [1,2,3,4]}]}'
+        resp = http_server_client.post(
+            "/v2/models/TabularModel/infer",
+            content=input_data,
+            headers={
+                "content-type": "application/json",
+                "accept": ARROW_STREAM_CONTENT_TYPE,
+            },
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == ARROW_STREAM_CONTENT_TYPE
+        result = read_arrow_stream(resp.content)
+        assert result["output-0"].to_pylist() == [3, 7]
+
+    def test_decode_v2_request(self):
+        pa = pytest.importorskip("pyarrow")
+        from kserve.utils import arrow_codec
+
+        values = pa.array(np.arange(8, dtype=np.int64))
+        table = pa.table(
+            {
+                "x": pa.FixedSizeListArray.from_arrays(
+                    pa.FixedSizeListArray.from_arrays(values, 2), 2
+                ),
+                "name": ["a", "b"],
+            }
+        )
+        request = arrow_codec.decode_v2_request(arrow_stream(table), "TestModel")
+        assert request.parameters is None
+        assert request.inputs[0].datatype == "INT64"
+        assert request.inputs[0].shape == [2, 2, 2]
+        np.testing.assert_array_equal(
+            request.inputs[0].as_numpy(), np.arange(8).reshape(2, 2, 2)
+        )
+        assert request.inputs[1].datatype == "BYTES"
+        assert request.inputs[1].data == ["a", "b"]
+
 
 class TestV2Endpoints:
     @pytest.fixture(scope="class")
@@ -483,6 +717,58 @@ class TestV2Endpoints:
         assert result["outputs"][0]["data"] == [1, 2]
         assert resp.headers["content-type"] == "application/json"
 
+    def test_infer_v2_openapi_request_schema(self, app):
+        app.openapi_schema = None
+        request_body = app.openapi()["paths"]["/v2/models/{model_name}/infer"]["post"][
+            "requestBody"
+        ]
+        schema = request_body["content"]["application/json"]["schema"]
+        assert schema["required"] == ["inputs"]
+        inputs = schema["properties"]["inputs"]["items"]
+        assert set(inputs["required"]) == {"name", "shape", "datatype", "data"}
+        assert "$ref" not in json.dumps(schema)
+
+    @pytest.mark.parametrize(
+        "input_data",
+        [
+            b'{"id": "1"}',
+            b'{"inputs": [{"name": "input-0","datatype": "INT32","data": [1]}]}',
+            b'{"inputs": [{"name": "input-0","shape": [1],"datatype": "INT32","data": 1}]}',
+            b"[]",
+        ],
+    )
+    def test_infer_v2_invalid_request(self, http_server_client, input_data):
+        resp = http_server_client.post(
+            "/v2/models/TestModel/infer",
+            content=input_data,
+            headers={"content-type": "application/json"},
+        )
+
+        assert resp.status_code == 400
+        assert "Unrecognized request format" in resp.json()["error"]
+
+    def test_serialize_inference_response(self):
+        response = {
+            "id": "1",
+            "model_name": "TestModel",
+            "outputs": [
+                {
+                    "name": "output-0",
+                    "shape": [2],
+                    "datatype": "FP32",
+                    "data": np.array([1.5, 2.5], dtype=np.float32),
+                }
+            ],
+        }
+        assert _serialize_inference_response(response) == (
+            b'{"model_name":"TestModel","model_version":null,"id":"1","parameters":null,'
+            b'"outputs":[{"name":"output-0","shape":[2],"datatype":"FP32","parameters":null,'
+            b'"data":[1.5,2.5]}]}'
+        )
+        del response["id"]
+        with pytest.raises(InferenceError, match="missing field 'id'"):
+            _serialize_inference_response(response)
+
     def test_infer_parameters_v2(self, http_server_client):
         model_name = "TestModel"
         req = InferRequest(
@@ -581,7 +867,7 @@ class TestV2Endpoints:
         assert resp.status_code == 200
         assert (
             resp.content
-            == b'{"model_name":"FP16InputModel","model_version":null,"id":"123","parameters":null,"outputs":[{"name":"str_output","shape":[8],"datatype":"BYTES","parameters":null,"data":["cat","dog","cat","dog","cat","dog","cat","dog"]},{"name":"fp32_output","shape":[8],"datatype":"FP32","parameters":null,"data":[6.80078125,2.80078125,4.80078125,1.400390625,6.0,3.400390625,4.5,1.599609375]}]}'
+            == b'{"model_name":"FP16InputModel","model_version":null,"id":"123","parameters":null,"outputs":[{"name":"str_output","shape":[8],"datatype":"BYTES","parameters":null,"data":["cat","dog","cat","dog","cat","dog","cat","dog"]},{"name":"fp32_output","shape":[8],"datatype":"FP32","parameters":null,"data":[6.8007812,2.8007812,4.8007812,1.4003906,6.0,3.4003906,4.5,1.5996094]}]}'
         )
 
     def test_fp16_input_not_binary_data(self, http_server_client):
@@ -656,9 +942,9 @@ class TestV2Endpoints:
         assert resp.status_code == 200
         assert (
             resp.content
-            == b'{"id":"123","model_name":"FP16OutputModel","model_version":null,"outputs":[{"name":"fp16_output","shape":[8],"datatype":"FP16","parameters":{"binary_data_size":16}},{"name":"fp32_output","shape":[8],"datatype":"FP32","data":[6.800000190734863,2.799999952316284,4.800000190734863,1.399999976158142,6.0,3.4000000953674316,4.5,1.600000023841858]}]}\xcdF\x9aA\xcdD\x9a=\x00F\xcdB\x80Df>'
+            == b'{"id":"123","model_name":"FP16OutputModel","model_version":null,"outputs":[{"name":"fp16_output","shape":[8],"datatype":"FP16","parameters":{"binary_data_size":16}},{"name":"fp32_output","shape":[8],"datatype":"FP32","data":[6.8,2.8,4.8,1.4,6.0,3.4,4.5,1.6]}]}\xcdF\x9aA\xcdD\x9a=\x00F\xcdB\x80Df>'
         )
-        assert resp.headers.get(INFERENCE_CONTENT_LENGTH_HEADER) == "345"
+        assert resp.headers.get(INFERENCE_CONTENT_LENGTH_HEADER) == "260"
 
     def test_fp16_output_not_binary_data(self, http_server_client):
         fp32_data = np.array(
@@ -727,7 +1013,7 @@ class TestV2Endpoints:
         assert resp.status_code == 200
         assert (
             resp.content
-            == b'{"model_name":"FP16OutputModel","model_version":null,"id":"123","parameters":null,"outputs":[{"name":"fp32_output","shape":[8],"datatype":"FP32","parameters":null,"data":[6.800000190734863,2.799999952316284,4.800000190734863,1.399999976158142,6.0,3.4000000953674316,4.5,1.600000023841858]}]}'
+            == b'{"model_name":"FP16OutputModel","model_version":null,"id":"123","parameters":null,"outputs":[{"name":"fp32_output","shape":[8],"datatype":"FP32","parameters":null,"data":[6.8,2.8,4.8,1.4,6.0,3.4,4.5,1.6]}]}'
         )
 
     def test_all_output_as_binary_data(self, http_server_client):
@@ -800,9 +1086,9 @@ class TestV2Endpoints:
         assert resp.status_code == 200
         assert (
             resp.content
-            == b'{"id":"123","model_name":"FP16OutputModel","model_version":null,"outputs":[{"name":"fp16_output","shape":[8],"datatype":"FP16","parameters":{"binary_data_size":16}},{"name":"fp32_output","shape":[8],"datatype":"FP32","data":[6.800000190734863,2.799999952316284,4.800000190734863,1.399999976158142,6.0,3.4000000953674316,4.5,1.600000023841858]}]}\xcdF\x9aA\xcdD\x9a=\x00F\xcdB\x80Df>'
+            == b'{"id":"123","model_name":"FP16OutputModel","model_version":null,"outputs":[{"name":"fp16_output","shape":[8],"datatype":"FP16","parameters":{"binary_data_size":16}},{"name":"fp32_output","shape":[8],"datatype":"FP32","data":[6.8,2.8,4.8,1.4,6.0,3.4,4.5,1.6]}]}\xcdF\x9aA\xcdD\x9a=\x00F\xcdB\x80Df>'
         )
-        assert resp.headers.get(INFERENCE_CONTENT_LENGTH_HEADER) == "345"
+        assert resp.headers.get(INFERENCE_CONTENT_LENGTH_HEADER) == "260"
 
 
 class TestRayServer:
@@ -0,0 +1,348 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import uuid
+from multiprocessing import resource_tracker
+from unittest.mock import patch
+
+import grpc_testing
+import numpy as np
+import orjson
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+
+from kserve import Model, ModelServer
+from kserve.errors import InvalidInput
+from kserve.model_server import app as kserve_app
+from kserve.protocol.grpc import grpc_predict_v2_pb2, servicer
+from kserve.protocol.infer_type import (
+    InferInput,
+    InferOutput,
+    InferRequest,
+    InferResponse,
+    RequestedOutput,
+)
+from kserve.protocol.rest.server import RESTServer
+from kserve.protocol.shared_memory import SharedMemoryRegion, SharedMemoryRegistry
+
+
+class DummyDoubleModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+
+    async def predict(self, request, headers=None):
+        data = request.inputs[0].as_numpy()
+        return InferResponse(
+            response_id=request.id,
+            model_name=self.name,
+            infer_outputs=[
+                InferOutput(
+                    name="output-0",
+                    shape=list(data.shape),
+                    datatype=request.inputs[0].datatype,
+                    data=data * 2,
+                )
+            ],
+        )
+
+
+@pytest.fixture
+def shm():
+    region = SharedMemoryRegion(
+        "client", f"/kserve_test_{uuid.uuid4().hex[:8]}", 1024, create=True
+    )
+    yield region
+    # The regions registered by the tests attach to the object in the same process, which
+    # unregisters it from the resource tracker.
+    resource_tracker.register(region._shm._name, "shared_memory")
+    region.close()
+
+
+class TestSharedMemoryRegistry:
+    def test_register_status_unregister(self, shm):
+        registry = SharedMemoryRegistry()
+        registry.register("input", shm.key, 64)
+        registry.register("output", shm.key, 64, offset=64)
+        assert registry.status("output") == [
+            {"name": "output", "key": shm.key, "offset": 64, "byte_size": 64}
+        ]
+        assert [status["name"] for status in registry.status()] == [
+            "input",
+            "output",
+        ]
+        with pytest.raises(InvalidInput, match="already registered"):
+            registry.register("input", shm.key, 64)
+        registry.unregister("input")
+        with pytest.raises(InvalidInput, match="Unable to find"):
+            registry.status("input")
+        registry.unregister()
+        assert registry.status() == []
+
+    def test_register_invalid_region(self, shm):
+        registry = SharedMemoryRegistry()
+        with pytest.raises(InvalidInput, match="does not exist"):
+            registry.register("input", "/kserve_test_missing", 64)
+        with pytest.raises(InvalidInput, match="exceeds"):
+            registry.register("input", shm.key, 1024, offset=64)
+        assert registry.status() == []
+
+    def test_read_inputs_and_write_outputs(self, shm):
+        registry = SharedMemoryRegistry()
+        registry.register("region", shm.key, 1024)
+        data = np.arange(6, dtype=np.float32).reshape(2, 3)
+        shm.set_numpy(data, offset=8)
+        infer_input = InferInput("input-0", [2, 3], "FP32")
+        infer_input.set_shared_memory("region", data.nbytes, offset=8)
+        requested_output = RequestedOutput("output-0")
+        requested_output.set_shared_memory("region", 64, offset=128)
+        request = InferRequest(
+            model_name="model",
+            infer_inputs=[infer_input],
+            request_outputs=[requested_output],
+        )
+
+        registry.read_inputs(request)
+        decoded = request.inputs[0].as_numpy()
+        np.testing.assert_array_equal(decoded, data)
+        assert "shared_memory_region" not in request.inputs[0].parameters
+
+        response = InferResponse(
+            response_id="1",
+            model_name="model",
+            infer_outputs=[InferOutput("output-0", [2, 3], "FP32", data=decoded * 2)],
+        )
+        registry.write_outputs(request, response)
+        np.testing.assert_array_equal(
+            shm.as_numpy("FP32", [2, 3], offset=128), data * 2
+        )
+        assert response.to_rest()[0]["outputs"][0] == {
+            "name": "output-0",
+            "shape": [2, 3],
+            "datatype": "FP32",
+            "parameters": {
+                "shared_memory_region": "region",
+                "shared_memory_byte_size": data.nbytes,
+                "shared_memory_offset": 128,
+            },
+        }
+        del decoded, infer_input, request
+        registry.unregister()
+
+    def test_write_empty_bytes_output(self, shm):
+        registry = SharedMemoryRegistry()
+        registry.register("region", shm.key, 1024)
+        requested_output = RequestedOutput("output-0")
+        requested_output.set_shared_memory("region", 64)
+        request = InferRequest(
+            model_name="model", infer_inputs=[], request_outputs=[requested_output]
+        )
+        response = InferResponse(
+            response_id="1",
+            model_name="model",
+            infer_outputs=[
+                InferOutput("output-0", [0], "BYTES", data=np.array([], np.object_))
+            ],
+        )
+        registry.write_outputs(request, response)
+        parameters = response.outputs[0].parameters
+        assert parameters["shared_memory_byte_size"] == 0
+        assert shm.as_numpy("BYTES", [0], byte_size=0).shape == (0,)
+        registry.unregister()
+
+    def test_write_outputs_exceeding_byte_size(self, shm):
+        registry = SharedMemoryRegistry()
+        registry.register("region", shm.key, 1024)
+        requested_output = RequestedOutput("output-0")
+        requested_output.set_shared_memory("region", 8)
+        request = InferRequest(
+            model_name="model", infer_inputs=[], request_outputs=[requested_output]
+        )
+        response = InferResponse(
+            response_id="1",
+            model_name="model",
+            infer_outputs=[
+                InferOutput("output-0", [4], "FP32", data=np.ones(4, np.float32))
+            ],
+        )
+        with pytest.raises(InvalidInput, match="exceeds the 8 bytes"):
+            registry.write_outputs(request, response)
+        registry.unregister()
+
+
+class TestSharedMemoryEndpoints:
+    @pytest.fixture(scope="class")
+    def server(self):
+        server = ModelServer()
+        rest_server = RESTServer(
+            kserve_app, server.dataplane, server.model_repository_extension
+        )
+        rest_server.create_application()
+        yield server
+        server.dataplane.shared_memory_registry.unregister()
+        kserve_app.routes.clear()
+
+    @pytest_asyncio.fixture(scope="class")
+    async def app(self, server):
+        server.register_model(DummyDoubleModel("TestModel"))
+        yield kserve_app
+        await server.model_repository_extension.unload("TestModel")
+
+    @pytest.fixture(scope="class")
+    def http_server_client(self, app):
+        return TestClient(app, headers={"content-type": "application/json"})
+
+    def test_register_status_unregister(self, http_server_client, shm):
+        resp = http_server_client.post(
+            "/v2/systemsharedmemory/region/input/register",
+            json={"key": shm.key, "byte_size": 64},
+        )
+        assert resp.status_code == 200
+        resp = http_server_client.get("/v2/systemsharedmemory/region/input/status")
+        assert resp.json() == [
+            {"name": "input", "key": shm.key, "offset": 0, "byte_size": 64}
+        ]
+        resp = http_server_client.post(
+            "/v2/systemsharedmemory/region/input/register",
+            json={"key": shm.key, "byte_size": 64},
+        )
+        assert resp.status_code == 400
+        resp = http_server_client.post("/v2/systemsharedmemory/region/input/unregister")
+        assert resp.status_code == 200
+        resp = http_server_client.get("/v2/systemsharedmemory/region/input/status")
+        assert resp.status_code == 400
+        assert "Unable to find" in resp.json()["error"]
+        assert http_server_client.get("/v2/systemsharedmemory/status").json() == []
+
+    def test_infer_with_shared_memory(self, http_server_client, shm):
+        data = np.arange(4, dtype=np.float32)
+        shm.set_numpy(data)
+        http_server_client.post(
+            "/v2/systemsharedmemory/region/region/register",
+            json={"key": shm.key, "byte_size": 1024},
+        )
+        request = {
+            "inputs": [
+                {
+                    "name": "input-0",
+                    "shape": [4],
+                    "datatype": "FP32",
+                    "parameters": {
+                        "shared_memory_region": "region",
+                        "shared_memory_byte_size": 16,
+                    },
+                }
+            ],
+            "outputs": [
+                {
+                    "name": "output-0",
+                    "parameters": {
+                        "shared_memory_region": "region",
+                        "shared_memory_byte_size": 16,
+                        "shared_memory_offset": 64,
+                    },
+                }
+            ],
+        }
+        resp = http_server_client.post(
+            "/v2/models/TestModel/infer", content=orjson.dumps(request)
+        )
+        assert resp.status_code == 200
+        output = resp.json()["outputs"][0]
+        assert "data" not in output
+        assert output["parameters"]["shared_memory_offset"] == 64
+        np.testing.assert_array_equal(shm.as_numpy("FP32", [4], offset=64), data * 2)
+        http_server_client.post("/v2/systemsharedmemory/unregister")
+
+
+@pytest.fixture
+def grpc_server():
+    server = ModelServer()
+    server.register_model(DummyDoubleModel("TestModel"))
+    servicers = {
+        grpc_predict_v2_pb2.DESCRIPTOR.services_by_name[
+            "GRPCInferenceService"
+        ]: servicer.InferenceServicer(
+            server.dataplane, server.model_repository_extension
+        )
+    }
+    yield grpc_testing.server_from_dictionary(
+        servicers, grpc_testing.strict_real_time()
+    )
+    server.dataplane.shared_memory_registry.unregister()
+
+
+async def invoke(grpc_server, method, request):
+    call = grpc_server.invoke_unary_unary(
+        method_descriptor=(
+            grpc_predict_v2_pb2.DESCRIPTOR.services_by_name[
+                "GRPCInferenceService"
+            ].methods_by_name[method]
+        ),
+        invocation_metadata={},
+        request=request,
+        timeout=20,
+    )
+    response, _, _, _ = call.termination()
+    return await response
+
+
+@pytest.mark.asyncio
+@patch(
+    "kserve.protocol.grpc.servicer.to_headers", return_value=[]
+)  # To avoid NotImplementedError from trailing_metadata function
+async def test_grpc_infer_with_shared_memory(mock_to_headers, grpc_server, shm):
+    data = np.arange(4, dtype=np.int32)
+    shm.set_numpy(data)
+    await invoke(
+        grpc_server,
+        "SystemSharedMemoryRegister",
+        grpc_predict_v2_pb2.SystemSharedMemoryRegisterRequest(
+            name="region", key=shm.key, byte_size=1024
+        ),
+    )
+    status = await invoke(
+        grpc_server,
+        "SystemSharedMemoryStatus",
+        grpc_predict_v2_pb2.SystemSharedMemoryStatusRequest(),
+    )
+    assert status.regions["region"].byte_size == 1024
+
+    infer_input = InferInput("input-0", [4], "INT32")
+    infer_input.set_shared_memory("region", 16)
+    requested_output = RequestedOutput("output-0")
+    requested_output.set_shared_memory("region", 16, offset=32)
+    request = InferRequest(
+        model_name="TestModel",
+        infer_inputs=[infer_input],
+        request_outputs=[requested_output],
+    )
+    response = await invoke(grpc_server, "ModelInfer", request.to_grpc())
+    assert not response.raw_output_contents
+    assert not response.outputs[0].HasField("contents")
+    assert response.outputs[0].parameters["shared_memory_offset"].int64_param == 32
+    np.testing.assert_array_equal(shm.as_numpy("INT32", [4], offset=32), data * 2)
+
+    await invoke(
+        grpc_server,
+        "SystemSharedMemoryUnregister",
+        grpc_predict_v2_pb2.SystemSharedMemoryUnregisterRequest(name="region"),
+    )
+    with pytest.raises(InvalidInput, match="Unable to find"):
+        await invoke(
+            grpc_server,
+            "SystemSharedMemoryStatus",
+            grpc_predict_v2_pb2.SystemSharedMemoryStatusRequest(name="region"),
+        )
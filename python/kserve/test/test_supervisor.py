@@ -0,0 +1,217 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import socket
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from kserve.supervisor import (
+    PROMETHEUS_MULTIPROC_DIR_ENV,
+    WorkerSupervisor,
+    check_no_running_threads,
+    configure_prometheus_multiprocess,
+    create_reuseport_socket,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.platform not in ("linux", "darwin"), reason="requires fork and SO_REUSEPORT"
+)
+
+
+def test_reuseport_sockets_share_port():
+    first = create_reuseport_socket(0, host="127.0.0.1")
+    port = first.getsockname()[1]
+    second = create_reuseport_socket(port, host="127.0.0.1")
+    try:
+        assert second.getsockname()[1] == port
+    finally:
+        first.close()
+        second.close()
+
+
+def wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_supervisor_restarts_and_stops_workers(tmp_path, monkeypatch):
+    dead_pids = []
+    monkeypatch.setattr("kserve.supervisor.mark_process_dead", dead_pids.append)
+
+    def target(worker_id):
+        marker = tmp_path / f"worker-{worker_id}-{os.getpid()}"
+        marker.touch()
+        if worker_id == 0 and len(list(tmp_path.glob("worker-0-*"))) == 1:
+            # The first incarnation of worker 0 crashes
+            os._exit(1)
+        while True:
+            time.sleep(0.1)
+
+    supervisor = WorkerSupervisor(target, workers=2, restart_delay_seconds=0.1)
+
+    def stop_when_restarted():
+        wait_for(lambda: len(list(tmp_path.glob("worker-*"))) == 3)
+        supervisor.stop()
+
+    stopper = threading.Thread(target=stop_when_restarted)
+    stopper.start()
+    supervisor.run()
+    stopper.join()
+
+    assert len(list(tmp_path.glob("worker-0-*"))) == 2
+    assert len(list(tmp_path.glob("worker-1-*"))) == 1
+    assert all(not process.is_alive() for process in supervisor.processes.values())
+    # The crashed worker and the workers stopped on shutdown are marked dead.
+    assert len(dead_pids) == 3
+    assert {process.pid for process in supervisor.processes.values()} <= set(dead_pids)
+
+
+def test_supervisor_serves_on_shared_port(tmp_path):
+    probe = create_reuseport_socket(0, host="127.0.0.1")
+    port = probe.getsockname()[1]
+
+    def target(worker_id):
+        sock = create_reuseport_socket(port, host="127.0.0.1")
+        while True:
+            conn, _ = sock.accept()
+            conn.sendall(str(os.getpid()).encode())
+            conn.close()
+
+    supervisor = WorkerSupervisor(target, workers=2, shutdown_timeout_seconds=5)
+    pids = set()
+
+    def connect():
+        probe.close()
+        for _ in range(200):
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=1) as conn:
+                    pids.add(int(conn.recv(16)))
+            except OSError:
+                time.sleep(0.01)
+            if len(pids) == 2:
+                break
+        supervisor.stop()
+
+    client = threading.Thread(target=connect)
+    client.start()
+    supervisor.run()
+    client.join()
+
+    assert pids == {process.pid for process in supervisor.processes.values()}
+
+
+def test_check_no_running_threads():
+    check_no_running_threads()
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait, name="model-thread")
+    thread.start()
+    try:
+        with pytest.raises(RuntimeError, match="model-thread"):
+            check_no_running_threads()
+    finally:
+        stop.set()
+        thread.join()
+    daemon = threading.Thread(target=stop.wait, daemon=True)
+    daemon.start()
+    check_no_running_threads()
+
+
+PROMETHEUS_WORKERS_SCRIPT = textwrap.dedent(
+    """
+    import multiprocessing
+    import os
+
+    import kserve
+    from prometheus_client import CollectorRegistry, Counter, multiprocess
+
+    requests = Counter("worker_requests", "Requests served by the workers")
+
+
+    def serve():
+        requests.inc()
+
+
+    workers = [multiprocessing.get_context("fork").Process(target=serve) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    registry = CollectorRegistry()
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.MultiProcessCollector(registry)
+    print(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+    print(registry.get_sample_value("worker_requests_total"))
+    """
+)
+
+
+def run_prometheus_workers(*args, metrics_dir=None):
+    env = {k: v for k, v in os.environ.items() if k != PROMETHEUS_MULTIPROC_DIR_ENV}
+    if metrics_dir is not None:
+        env[PROMETHEUS_MULTIPROC_DIR_ENV] = metrics_dir
+    result = subprocess.run(
+        [sys.executable, "-c", PROMETHEUS_WORKERS_SCRIPT, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    metrics_dir, requests = result.stdout.split()
+    return metrics_dir, requests
+
+
+def test_prometheus_multiprocess_enabled_on_import():
+    metrics_dir, requests = run_prometheus_workers(
+        "--enable_prefork", "true", "--workers", "2"
+    )
+    # The values of the forked workers are aggregated and the temporary directory is removed on exit.
+    assert requests == "2.0"
+    assert not os.path.exists(metrics_dir)
+
+    metrics_dir, requests = run_prometheus_workers("--workers", "2")
+    assert metrics_dir == "None"
+
+
+def test_prometheus_multiprocess_dir_set_by_user(tmp_path):
+    metrics_dir, requests = run_prometheus_workers(metrics_dir=str(tmp_path))
+    assert metrics_dir == str(tmp_path)
+    assert requests == "2.0"
+    # A directory set by the user is kept.
+    assert list(tmp_path.glob("counter_*.db"))
+
+
+def test_prometheus_multiprocess_not_enabled_after_import(monkeypatch):
+    monkeypatch.delenv(PROMETHEUS_MULTIPROC_DIR_ENV, raising=False)
+    # prometheus_client is already imported by the tests.
+    with mock.patch("kserve.supervisor.logger") as logger:
+        assert (
+            configure_prometheus_multiprocess(
+                ["--enable_prefork", "true", "--workers", "2"]
+            )
+            is None
+        )
+    logger.warning.assert_called_once()
+    assert PROMETHEUS_MULTIPROC_DIR_ENV not in os.environ
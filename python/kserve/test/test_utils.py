@@ -0,0 +1,55 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kserve.utils.utils import _instances_to_dataframe, get_predict_input
+
+DICT_OF_DICTS = {"a": {0: 3.5}, "b": {0: 1.4}, "c": {0: 0.2}}
+RECORDS = [{"a": 3.5}, {"b": 1.4}, {"c": 0.2, "a": 1}]
+DICT_OF_LISTS = {"a": [1, 2], "b": ["x", "y"]}
+
+
+@pytest.mark.parametrize(
+    "instances",
+    [
+        [DICT_OF_DICTS, DICT_OF_DICTS],
+        [RECORDS, RECORDS],
+        [DICT_OF_LISTS, DICT_OF_LISTS],
+        [DICT_OF_LISTS, DICT_OF_DICTS, RECORDS],
+        [{"a": [1, 2]}, {"b": [3]}],
+        [{"a": {1: "x", 0: "y"}, "c": {1: 2, 0: 3}, "d": {1: 4, 0: 5}}],
+        [RECORDS, [{"a": True}, {"d": "z"}]],
+    ],
+)
+@pytest.mark.parametrize("columns", [None, ["c", "a", "d"]])
+def test_get_predict_input_dict_instances(instances, columns):
+    expected = pd.concat(
+        [pd.DataFrame(instance, columns=columns) for instance in instances], axis=0
+    )
+    for key in ("instances", "inputs"):
+        inputs = get_predict_input({key: instances}, columns=columns)
+        pd.testing.assert_frame_equal(inputs, expected)
+
+
+def test_get_predict_input_dict_instances_column_order():
+    columns = ["f2", "f0", "f1"]
+    instances = [{f"f{i}": [float(row + i)] for i in range(3)} for row in range(4)]
+    assert _instances_to_dataframe(instances, columns) is not None
+    inputs = get_predict_input({"instances": instances}, columns=columns)
+    assert list(inputs.columns) == columns
+    np.testing.assert_array_equal(inputs["f2"].to_numpy(), [2.0, 3.0, 4.0, 5.0])
+    assert inputs["f0"].dtype == np.float64